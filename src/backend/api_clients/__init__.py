@@ -28,6 +28,8 @@ from .google_sheets_client import (
 from .gmail_client import (
     GmailClient,
     create_message,
+    build_email_message,
+    parse_delivery_status,
     add_attachment,
     validate_email_addresses
 )
@@ -38,6 +40,14 @@ from .gemini_client import (
     load_prompt_template
 )
 
+# Record/replay support for API client traffic
+from .cassette import (
+    Cassette,
+    CassetteMissError,
+    use_cassette,
+    get_active_cassette
+)
+
 # Export all classes and functions
 __all__ = [
     # Client classes
@@ -45,6 +55,8 @@ __all__ = [
     'GoogleSheetsClient',
     'GmailClient',
     'GeminiClient',
+    'Cassette',
+    'CassetteMissError',
     
     # Utility functions
     'format_date_for_api',
@@ -53,7 +65,11 @@ __all__ = [
     'parse_sheet_range',
     'format_sheet_range',
     'create_message',
+    'build_email_message',
+    'parse_delivery_status',
     'add_attachment',
     'validate_email_addresses',
-    'load_prompt_template'
+    'load_prompt_template',
+    'use_cassette',
+    'get_active_cassette'
 ]
\ No newline at end of file
@@ -0,0 +1,677 @@
+"""
+cassette.py - Record/replay layer for the Budget Management Application API clients
+
+This module captures every HTTP interaction made by the API clients during a run
+into a compressed cassette file keyed by correlation ID, and can later serve those
+interactions back so that a production run can be replayed locally without
+touching live services.
+
+Interception happens at the transport level so that all four clients are covered
+without changing their call sites:
+- requests.Session.send (Capital One, Gemini and OAuth token requests)
+- httplib2.Http.request (Google Sheets and Gmail through google-api-python-client)
+
+Secrets are masked before anything is written to disk: values of fields, headers and
+query parameters whose names match the SensitiveDataFilter patterns (token, key,
+secret, account...id, ...) are redacted, as are cookies, and free-text bodies go
+through SensitiveDataFilter.
+
+Date query parameters (e.g. the Capital One startDate/endDate) are matched relative to
+the day the interaction was recorded, so a cassette can be replayed on a later day.
+
+Usage:
+    with use_cassette(correlation_id, mode='record'):
+        run_budget_management_process(correlation_id)
+
+    with use_cassette(correlation_id, mode='replay', replay_speed='original'):
+        run_budget_management_process(correlation_id)
+"""
+
+import os  # standard library
+import re  # standard library
+import json  # standard library
+import gzip  # standard library
+import time  # standard library
+import base64  # standard library
+import threading  # standard library
+import contextlib  # standard library
+import datetime  # standard library
+from collections import defaultdict, deque  # standard library
+from typing import Dict, List, Optional, Any, Tuple  # standard library
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode  # standard library
+
+import requests  # requests 2.31.0+
+from requests.structures import CaseInsensitiveDict  # requests 2.31.0+
+
+from ..config.settings import CASSETTE_SETTINGS
+from ..config.logging_config import get_logger, SensitiveDataFilter, SENSITIVE_REGEX
+from ..utils.error_handlers import APIError
+
+try:
+    import httplib2  # httplib2 0.22.0+ (installed with google-api-python-client)
+except ImportError:  # pragma: no cover - google-api-python-client always provides it
+    httplib2 = None
+
+# Set up logger
+logger = get_logger('cassette')
+
+# Supported cassette modes
+CASSETTE_MODES = ['off', 'record', 'replay']
+
+# Supported replay speeds
+REPLAY_SPEEDS = ['original', 'max']
+
+# Version of the cassette file format
+CASSETTE_FORMAT_VERSION = 1
+
+# Placeholder written in place of masked values
+REDACTED = '[REDACTED]'
+
+# Names matching the sensitive data patterns whose values are kept, because they are
+# opaque pagination cursors that tell recorded requests apart (lower-case)
+UNMASKED_KEYS = {'pagetoken', 'nextpagetoken'}
+
+# Headers masked in addition to the names matching the sensitive data patterns (lower-case)
+SENSITIVE_HEADERS = {'cookie', 'set-cookie'}
+
+# Query parameter values starting with a date (YYYY-MM-DD)
+DATE_VALUE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+
+# Host name fragments used to label interactions with the service they belong to
+SERVICE_HOSTS = [
+    ('capitalone', 'capital_one'),
+    ('sheets.googleapis.com', 'google_sheets'),
+    ('gmail.googleapis.com', 'gmail'),
+    ('generativelanguage.googleapis.com', 'gemini'),
+    ('oauth2.googleapis.com', 'google_oauth')
+]
+
+# Currently active cassette (only one may be installed at a time)
+_active_cassette = None
+_install_lock = threading.Lock()
+_original_session_send = None
+_original_httplib2_request = None
+
+_sensitive_data_filter = SensitiveDataFilter()
+
+
+class CassetteMissError(APIError):
+    """Raised in replay mode when a request has no recorded interaction"""
+
+    def __init__(self, method: str, url: str, service: str):
+        """
+        Initialize the cassette miss error.
+
+        Args:
+            method: HTTP method of the unmatched request
+            url: Masked URL of the unmatched request
+            service: Service the request was addressed to
+        """
+        super().__init__(
+            f"No recorded interaction for {method} {url}",
+            service,
+            'cassette_replay',
+            context={'method': method, 'url': url}
+        )
+
+
+def get_service_name(url: str) -> str:
+    """
+    Determines the service an interaction belongs to from its URL.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        Service name (capital_one, google_sheets, gmail, gemini, google_oauth) or the host name
+    """
+    host = urlsplit(url).netloc.lower()
+    for fragment, service in SERVICE_HOSTS:
+        if fragment in host:
+            return service
+    return host
+
+
+def is_sensitive_key(key: str) -> bool:
+    """
+    Checks whether a field name matches the sensitive data patterns.
+
+    Uses the same patterns as SensitiveDataFilter, so every name redacted in the logs
+    is also redacted in cassettes, except for the pagination cursors in UNMASKED_KEYS.
+
+    Args:
+        key: Field, header or query parameter name
+
+    Returns:
+        True if the value for this key must be masked
+    """
+    key = str(key).lower()
+    return key not in UNMASKED_KEYS and SENSITIVE_REGEX.search(key) is not None
+
+
+def mask_structure(data: Any) -> Any:
+    """
+    Masks values whose keys match the sensitive data patterns.
+
+    Unlike SensitiveDataFilter.mask_sensitive_data, free-text values are left intact
+    so that recorded responses (e.g. Gemini completions) stay replayable.
+
+    Args:
+        data: Parsed JSON structure
+
+    Returns:
+        Copy of the structure with sensitive values redacted
+    """
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if is_sensitive_key(key) else mask_structure(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [mask_structure(item) for item in data]
+    return data
+
+
+def mask_url(url: str) -> str:
+    """
+    Masks sensitive query parameters (e.g. the Gemini API key) in a URL.
+
+    Args:
+        url: URL to mask
+
+    Returns:
+        URL with sensitive query parameter values redacted
+    """
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [
+        (key, REDACTED if is_sensitive_key(key) else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+def normalize_date_params(url: str, reference_date: datetime.date) -> str:
+    """
+    Replaces dates in query parameters by their offset in days from a reference date.
+
+    Args:
+        url: Request URL
+        reference_date: Day the request was made
+
+    Returns:
+        URL with date values such as startDate=2024-05-01 rewritten to startDate=today-7d
+    """
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        match = DATE_VALUE_PATTERN.match(value)
+        if match:
+            try:
+                offset = (datetime.date.fromisoformat(match.group(1)) - reference_date).days
+                value = f"today{offset:+d}d{value[match.end():]}"
+            except ValueError:
+                pass
+        query.append((key, value))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+def mask_headers(headers: Optional[Dict]) -> Dict[str, str]:
+    """
+    Masks sensitive HTTP headers (Authorization, API keys, cookies).
+
+    Args:
+        headers: Header mapping
+
+    Returns:
+        Plain dictionary with sensitive header values redacted
+    """
+    masked = {}
+    for key, value in (headers or {}).items():
+        key = key.decode('utf-8') if isinstance(key, bytes) else str(key)
+        value = value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+        if key.lower() in SENSITIVE_HEADERS or is_sensitive_key(key):
+            masked[key] = REDACTED
+        else:
+            masked[key] = value
+    return masked
+
+
+def encode_body(body: Any, mask: bool = True) -> Dict[str, Any]:
+    """
+    Encodes a request or response body for storage in a cassette.
+
+    JSON bodies are stored parsed and masked, form-encoded bodies are masked by
+    field name, other text is masked with SensitiveDataFilter and binary content
+    is stored base64-encoded.
+
+    Args:
+        body: Body as bytes, str or None
+        mask: Whether to mask sensitive values
+
+    Returns:
+        Dictionary with 'encoding' and 'data' keys
+    """
+    if body is None:
+        return {'encoding': 'none', 'data': None}
+
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+
+    try:
+        text = body.decode('utf-8')
+    except (UnicodeDecodeError, AttributeError):
+        return {'encoding': 'base64', 'data': base64.b64encode(bytes(body)).decode('ascii')}
+
+    try:
+        parsed = json.loads(text)
+        return {'encoding': 'json', 'data': mask_structure(parsed) if mask else parsed}
+    except ValueError:
+        pass
+
+    if mask and '=' in text and '\n' not in text:
+        fields = parse_qsl(text, keep_blank_values=True)
+        if fields:
+            masked_fields = [(key, REDACTED if is_sensitive_key(key) else value) for key, value in fields]
+            return {'encoding': 'form', 'data': urlencode(masked_fields)}
+
+    if mask:
+        text = _sensitive_data_filter.mask_sensitive_data(text)
+    return {'encoding': 'text', 'data': text}
+
+
+def decode_body(encoded: Dict[str, Any]) -> bytes:
+    """
+    Decodes a body stored with encode_body back into bytes.
+
+    Args:
+        encoded: Dictionary produced by encode_body
+
+    Returns:
+        Body content as bytes
+    """
+    encoding = encoded.get('encoding')
+    data = encoded.get('data')
+    if encoding == 'none' or data is None:
+        return b''
+    if encoding == 'json':
+        return json.dumps(data).encode('utf-8')
+    if encoding == 'base64':
+        return base64.b64decode(data)
+    return str(data).encode('utf-8')
+
+
+def get_cassette_path(correlation_id: str, cassette_dir: Optional[str] = None) -> str:
+    """
+    Gets the file path of the cassette for a correlation ID.
+
+    Args:
+        correlation_id: Correlation ID of the run
+        cassette_dir: Directory containing cassettes, defaults to CASSETTE_SETTINGS['DIR']
+
+    Returns:
+        Absolute path of the cassette file
+    """
+    cassette_dir = cassette_dir or CASSETTE_SETTINGS['DIR']
+    safe_id = ''.join(c for c in correlation_id if c.isalnum() or c in '-_.')
+    return os.path.abspath(os.path.join(cassette_dir, f"{safe_id}.json.gz"))
+
+
+class Cassette:
+    """
+    Collection of recorded HTTP interactions for a single run.
+
+    Interactions are matched on replay by (method, masked URL) in the order they
+    were recorded, so repeated calls to the same endpoint replay in sequence. Dates in
+    the query are compared relative to the day of recording and the day of replay.
+    """
+
+    def __init__(self, correlation_id: str, mode: str = 'record', replay_speed: str = 'max',
+                 cassette_dir: Optional[str] = None):
+        """
+        Initialize a cassette.
+
+        Args:
+            correlation_id: Correlation ID the cassette is keyed by
+            mode: 'record' or 'replay'
+            replay_speed: 'original' to reproduce recorded latencies, 'max' to replay immediately
+            cassette_dir: Directory containing cassettes, defaults to CASSETTE_SETTINGS['DIR']
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Invalid cassette mode '{mode}', expected 'record' or 'replay'")
+        if replay_speed not in REPLAY_SPEEDS:
+            raise ValueError(f"Invalid replay speed '{replay_speed}', expected one of {REPLAY_SPEEDS}")
+
+        self.correlation_id = correlation_id
+        self.mode = mode
+        self.replay_speed = replay_speed
+        self.path = get_cassette_path(correlation_id, cassette_dir)
+        self.interactions: List[Dict[str, Any]] = []
+        self.recorded_at = datetime.datetime.utcnow().isoformat()
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str], deque] = defaultdict(deque)
+
+        if mode == 'replay':
+            self.load()
+
+    @staticmethod
+    def match_key(method: str, url: str, reference_date: Optional[datetime.date] = None) -> Tuple[str, str]:
+        """
+        Builds the key used to match a request to recorded interactions.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            reference_date: Day the request was made, defaults to today
+
+        Returns:
+            Tuple of (upper-case method, masked URL with dates relative to reference_date)
+        """
+        return (method.upper(), normalize_date_params(mask_url(url), reference_date or datetime.date.today()))
+
+    def record(self, method: str, url: str, request_headers: Optional[Dict], request_body: Any,
+               status_code: int, response_headers: Optional[Dict], response_body: Any,
+               elapsed: float) -> None:
+        """
+        Records a completed HTTP interaction.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            request_headers: Request headers
+            request_body: Request body
+            status_code: Response status code
+            response_headers: Response headers
+            response_body: Response body
+            elapsed: Time taken by the request in seconds
+        """
+        interaction = {
+            'service': get_service_name(url),
+            'method': method.upper(),
+            'url': mask_url(url),
+            'request': {
+                'headers': mask_headers(request_headers),
+                'body': encode_body(request_body)
+            },
+            'response': {
+                'status': int(status_code),
+                'headers': mask_headers(response_headers),
+                'body': encode_body(response_body)
+            },
+            'elapsed': elapsed,
+            'recorded_at': datetime.datetime.utcnow().isoformat(),
+            'recorded_on': datetime.date.today().isoformat()
+        }
+        with self._lock:
+            interaction['sequence'] = len(self.interactions)
+            self.interactions.append(interaction)
+
+    def next_interaction(self, method: str, url: str) -> Dict[str, Any]:
+        """
+        Gets the next unplayed interaction matching a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+
+        Returns:
+            Recorded interaction
+
+        Raises:
+            CassetteMissError: If no unplayed interaction matches the request
+        """
+        key = self.match_key(method, url)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteMissError(key[0], mask_url(url), get_service_name(url))
+            interaction = queue.popleft()
+
+        if self.replay_speed == 'original' and interaction.get('elapsed'):
+            time.sleep(interaction['elapsed'])
+        return interaction
+
+    def save(self) -> str:
+        """
+        Writes the cassette to disk as gzip-compressed JSON.
+
+        Returns:
+            Path of the written cassette
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            payload = {
+                'version': CASSETTE_FORMAT_VERSION,
+                'correlation_id': self.correlation_id,
+                'recorded_at': self.recorded_at,
+                'interactions': list(self.interactions)
+            }
+        # Write to a temporary file first so an interrupted run never leaves a truncated cassette
+        temp_path = f"{self.path}.tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(temp_path, self.path)
+
+        logger.info(f"Saved cassette with {len(payload['interactions'])} interactions",
+                    context={'correlation_id': self.correlation_id, 'path': self.path})
+        return self.path
+
+    def load(self) -> None:
+        """
+        Loads the cassette from disk and prepares replay queues.
+
+        Raises:
+            FileNotFoundError: If no cassette exists for the correlation ID
+            ValueError: If the cassette format version is not supported
+        """
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+
+        if payload.get('version') != CASSETTE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported cassette format version: {payload.get('version')}")
+
+        self.recorded_at = payload.get('recorded_at', self.recorded_at)
+        self.interactions = payload.get('interactions', [])
+        self._queues = defaultdict(deque)
+        for interaction in sorted(self.interactions, key=lambda i: i.get('sequence', 0)):
+            # Requests build dates from the local day, older cassettes only have the UTC timestamp
+            recorded_on = interaction.get('recorded_on') or interaction.get('recorded_at') or self.recorded_at
+            key = self.match_key(interaction['method'], interaction['url'],
+                                 datetime.date.fromisoformat(recorded_on[:10]))
+            self._queues[key].append(interaction)
+
+        logger.info(f"Loaded cassette with {len(self.interactions)} interactions",
+                    context={'correlation_id': self.correlation_id, 'path': self.path})
+
+    def remaining(self) -> int:
+        """
+        Gets the number of recorded interactions not yet replayed.
+
+        Returns:
+            Count of unplayed interactions
+        """
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+
+def build_requests_response(interaction: Dict[str, Any],
+                            prepared_request: requests.PreparedRequest) -> requests.Response:
+    """
+    Builds a requests.Response from a recorded interaction.
+
+    Args:
+        interaction: Recorded interaction
+        prepared_request: Request being answered
+
+    Returns:
+        Response populated with the recorded status, headers and body
+    """
+    recorded = interaction['response']
+    response = requests.Response()
+    response.status_code = recorded['status']
+    response.headers = CaseInsensitiveDict(recorded.get('headers', {}))
+    response._content = decode_body(recorded['body'])
+    response.encoding = 'utf-8'
+    response.url = prepared_request.url
+    response.request = prepared_request
+    response.reason = 'Replayed'
+    response.elapsed = datetime.timedelta(seconds=interaction.get('elapsed') or 0)
+    return response
+
+
+def _session_send(session, prepared_request, **kwargs):
+    """Replacement for requests.Session.send that records or replays interactions."""
+    cassette = _active_cassette
+    if cassette is None:
+        return _original_session_send(session, prepared_request, **kwargs)
+
+    if cassette.mode == 'replay':
+        interaction = cassette.next_interaction(prepared_request.method, prepared_request.url)
+        return build_requests_response(interaction, prepared_request)
+
+    start_time = time.perf_counter()
+    response = _original_session_send(session, prepared_request, **kwargs)
+    cassette.record(
+        prepared_request.method,
+        prepared_request.url,
+        prepared_request.headers,
+        prepared_request.body,
+        response.status_code,
+        response.headers,
+        response.content,
+        time.perf_counter() - start_time
+    )
+    return response
+
+
+def _httplib2_request(http, uri, method='GET', body=None, headers=None, *args, **kwargs):
+    """Replacement for httplib2.Http.request that records or replays interactions."""
+    cassette = _active_cassette
+    if cassette is None:
+        return _original_httplib2_request(http, uri, method, body, headers, *args, **kwargs)
+
+    if cassette.mode == 'replay':
+        interaction = cassette.next_interaction(method, uri)
+        recorded = interaction['response']
+        info = dict(recorded.get('headers', {}))
+        info['status'] = str(recorded['status'])
+        return httplib2.Response(info), decode_body(recorded['body'])
+
+    start_time = time.perf_counter()
+    response, content = _original_httplib2_request(http, uri, method, body, headers, *args, **kwargs)
+    cassette.record(
+        method,
+        uri,
+        headers,
+        body,
+        response.status,
+        {key: value for key, value in response.items() if key != 'status'},
+        content,
+        time.perf_counter() - start_time
+    )
+    return response, content
+
+
+def install_cassette(cassette: Cassette) -> None:
+    """
+    Activates a cassette by patching the HTTP transports used by the API clients.
+
+    Args:
+        cassette: Cassette to activate
+
+    Raises:
+        RuntimeError: If another cassette is already active
+    """
+    global _active_cassette, _original_session_send, _original_httplib2_request
+
+    with _install_lock:
+        if _active_cassette is not None:
+            raise RuntimeError("A cassette is already active")
+
+        _original_session_send = requests.Session.send
+        requests.Session.send = _session_send
+
+        if httplib2 is not None:
+            _original_httplib2_request = httplib2.Http.request
+            httplib2.Http.request = _httplib2_request
+
+        _active_cassette = cassette
+
+    logger.info(f"Cassette {cassette.mode} mode enabled",
+                context={'correlation_id': cassette.correlation_id, 'replay_speed': cassette.replay_speed})
+
+
+def uninstall_cassette() -> Optional[Cassette]:
+    """
+    Deactivates the active cassette and restores the original HTTP transports.
+
+    Returns:
+        The cassette that was active, or None
+    """
+    global _active_cassette, _original_session_send, _original_httplib2_request
+
+    with _install_lock:
+        cassette = _active_cassette
+        if cassette is None:
+            return None
+
+        requests.Session.send = _original_session_send
+        if httplib2 is not None and _original_httplib2_request is not None:
+            httplib2.Http.request = _original_httplib2_request
+
+        _active_cassette = None
+        _original_session_send = None
+        _original_httplib2_request = None
+
+    return cassette
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """
+    Gets the currently active cassette.
+
+    Returns:
+        Active cassette or None if record/replay is disabled
+    """
+    return _active_cassette
+
+
+@contextlib.contextmanager
+def use_cassette(correlation_id: str, mode: Optional[str] = None, replay_speed: Optional[str] = None,
+                 cassette_dir: Optional[str] = None):
+    """
+    Context manager that records or replays all API client traffic for a run.
+
+    Args:
+        correlation_id: Correlation ID the cassette is keyed by
+        mode: 'off', 'record' or 'replay', defaults to CASSETTE_SETTINGS['MODE']
+        replay_speed: 'original' or 'max', defaults to CASSETTE_SETTINGS['REPLAY_SPEED']
+        cassette_dir: Directory containing cassettes, defaults to CASSETTE_SETTINGS['DIR']
+
+    Yields:
+        The active Cassette, or None when mode is 'off'
+    """
+    mode = (mode or CASSETTE_SETTINGS['MODE']).lower()
+    replay_speed = (replay_speed or CASSETTE_SETTINGS['REPLAY_SPEED']).lower()
+
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Invalid cassette mode '{mode}', expected one of {CASSETTE_MODES}")
+
+    if mode == 'off':
+        yield None
+        return
+
+    cassette = Cassette(correlation_id, mode, replay_speed, cassette_dir)
+    install_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        uninstall_cassette()
+        if mode == 'record':
+            cassette.save()
+        elif cassette.remaining():
+            logger.warning(f"{cassette.remaining()} recorded interactions were not replayed",
+                           context={'correlation_id': correlation_id})
@@ -9,29 +9,53 @@ import base64  # standard library
 import os  # standard library
 import mimetypes  # standard library
 import re  # standard library
+import io  # standard library
+import time  # standard library
+import tempfile  # standard library
+import uuid  # standard library
+from email.mime.base import MIMEBase  # standard library
 from email.mime.text import MIMEText  # standard library
 from email.mime.multipart import MIMEMultipart  # standard library
 from email.mime.image import MIMEImage  # standard library
 from email.mime.application import MIMEApplication  # standard library
-from typing import List, Dict, Optional, Union, Any  # standard library
+from typing import List, Dict, Optional, Union, Any, BinaryIO  # standard library
 
 from googleapiclient.discovery import build  # google-api-python-client 2.100.0+
 from googleapiclient.errors import HttpError  # google-api-python-client 2.100.0+
+from googleapiclient.http import MediaIoBaseUpload  # google-api-python-client 2.100.0+
 
-from ..config.settings import API_SETTINGS, APP_SETTINGS
+try:
+    from PIL import Image  # pillow 9.0.0+ (installed with matplotlib)
+except ImportError:
+    Image = None
+
+from ..config.settings import API_SETTINGS, APP_SETTINGS, EMAIL_SETTINGS, RETRY_SETTINGS
 from ..config.logging_config import get_logger
 from ..services.authentication_service import AuthenticationService
 from ..utils.error_handlers import (
-    retry_with_backoff, handle_api_error, APIError, ValidationError
+    retry_with_backoff, calculate_backoff_delay, handle_api_error, APIError, ValidationError
 )
 
 # Set up logger
 logger = get_logger('gmail_client')
 
+# Attachments are base64 encoded in chunks of whole 57-byte input lines (76 characters encoded)
+ATTACHMENT_CHUNK_SIZE = 57 * 1024
 
-def create_message(sender: str, recipients: List[str], subject: str, html_content: str) -> Dict:
+# Messages larger than this are spooled to disk while they are being built, and
+# uploaded from disk in resumable chunks instead of in a single request
+MESSAGE_SPOOL_SIZE = 1024 * 1024
+
+# Size of the chunks a resumable message upload reads from disk
+MESSAGE_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Smallest width a chart is downscaled to when fitting it into the image budget
+MIN_IMAGE_WIDTH = 320
+
+
+def validate_message_fields(sender: str, recipients: List[str], subject: str, html_content: str) -> None:
     """
-    Creates an email message suitable for the Gmail API.
+    Validates the fields required to build an email message.
     
     Args:
         sender: Email address of the sender
@@ -39,10 +63,9 @@ def create_message(sender: str, recipients: List[str], subject: str, html_conten
         subject: Email subject line
         html_content: HTML content of the email
         
-    Returns:
-        Dictionary with the raw message for Gmail API
+    Raises:
+        ValidationError: If a required field is missing
     """
-    # Validate inputs
     if not sender:
         raise ValidationError("Sender email address is required", "email")
     
@@ -54,6 +77,23 @@ def create_message(sender: str, recipients: List[str], subject: str, html_conten
     
     if not html_content:
         raise ValidationError("Email content is required", "email")
+
+
+def create_message(sender: str, recipients: List[str], subject: str, html_content: str) -> Dict:
+    """
+    Creates an email message suitable for the Gmail API.
+    
+    Args:
+        sender: Email address of the sender
+        recipients: List of recipient email addresses
+        subject: Email subject line
+        html_content: HTML content of the email
+        
+    Returns:
+        Dictionary with the raw message for Gmail API
+    """
+    # Validate inputs
+    validate_message_fields(sender, recipients, subject, html_content)
     
     # Create multipart message
     message = MIMEMultipart('related')
@@ -138,6 +178,247 @@ def add_attachment(message: MIMEMultipart, file_path: str, content_id: Optional[
         return False
 
 
+def get_content_id(index: int) -> str:
+    """
+    Returns the Content-ID assigned to the inline image at the given attachment index.
+    
+    Args:
+        index: Position of the image in the attachment list
+        
+    Returns:
+        Content-ID referenced from the HTML body as cid:<content_id>
+    """
+    return f"image_{index}"
+
+
+def fit_image_to_budget(file_path: str, max_bytes: int) -> Optional[bytes]:
+    """
+    Optimizes and, if needed, downscales a PNG image until it fits within a size budget.
+    
+    Args:
+        file_path: Path to the PNG image
+        max_bytes: Size budget in bytes
+        
+    Returns:
+        PNG data that fits the budget, or None if the file should be sent unchanged
+    """
+    if Image is None or max_bytes <= 0 or os.path.getsize(file_path) <= max_bytes:
+        return None
+    
+    try:
+        with Image.open(file_path) as original:
+            image = original.convert('RGBA')
+        
+        # Charts use few colours, so a palette image is usually enough on its own
+        image = image.quantize(colors=256)
+        while True:
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG', optimize=True)
+            data = buffer.getvalue()
+            if len(data) <= max_bytes or image.width <= MIN_IMAGE_WIDTH:
+                break
+            
+            # Scale the pixel count down in proportion to the overshoot
+            scale = max((max_bytes / len(data)) ** 0.5 * 0.9, MIN_IMAGE_WIDTH / image.width)
+            image = image.resize((int(image.width * scale), max(int(image.height * scale), 1)))
+        
+        logger.debug(
+            "Optimized image to fit budget",
+            context={
+                "file": os.path.basename(file_path),
+                "original_bytes": os.path.getsize(file_path),
+                "optimized_bytes": len(data),
+                "width": image.width
+            }
+        )
+        return data
+        
+    except Exception as e:
+        logger.warning(
+            f"Failed to optimize image, sending original: {str(e)}",
+            context={"file_path": file_path, "error": str(e)}
+        )
+        return None
+
+
+def write_header_block(stream: BinaryIO, part: MIMEBase) -> None:
+    """
+    Writes the headers of a MIME part, followed by the blank separator line.
+    
+    Args:
+        stream: Binary stream the message is written to
+        part: MIME part whose headers are written
+    """
+    for name, value in part.items():
+        stream.write(part.policy.fold_binary(name, value))
+    stream.write(b'\n')
+
+
+def write_base64_payload(stream: BinaryIO, source: BinaryIO) -> None:
+    """
+    Base64 encodes a binary source into a stream without loading it fully into memory.
+    
+    Args:
+        stream: Binary stream the message is written to
+        source: Binary file-like object with the attachment data
+    """
+    while True:
+        chunk = source.read(ATTACHMENT_CHUNK_SIZE)
+        if not chunk:
+            break
+        stream.write(base64.encodebytes(chunk))
+
+
+def write_attachment(stream: BinaryIO, boundary: str, file_path: str, content_id: Optional[str] = None) -> bool:
+    """
+    Writes an attachment part to a message stream, reading the file from disk in chunks.
+    
+    Args:
+        stream: Binary stream the message is written to
+        boundary: Multipart boundary of the enclosing message
+        file_path: Path to the file to attach
+        content_id: Optional Content-ID for inline images
+        
+    Returns:
+        True if attachment was written, False otherwise
+    """
+    if not os.path.isfile(file_path):
+        logger.warning(f"Attachment file not found: {file_path}")
+        return False
+    
+    # Determine content type
+    content_type, _ = mimetypes.guess_type(file_path)
+    if not content_type:
+        content_type = 'application/octet-stream'
+    main_type, sub_type = content_type.split('/', 1)
+    
+    try:
+        # Only PNG charts are optimized; everything else is streamed as-is
+        optimized = None
+        if content_type == 'image/png':
+            optimized = fit_image_to_budget(file_path, EMAIL_SETTINGS['MAX_IMAGE_BYTES'])
+        
+        if main_type == 'image' and content_id:
+            # Inline image referenced from the HTML body
+            part = MIMEBase(main_type, sub_type)
+            part.add_header('Content-Transfer-Encoding', 'base64')
+            part.add_header('Content-ID', f'<{content_id}>')
+            part.add_header('Content-Disposition', 'inline', filename=os.path.basename(file_path))
+        else:
+            part = MIMEBase('application', sub_type)
+            part.add_header('Content-Transfer-Encoding', 'base64')
+            part.add_header('Content-Disposition', 'attachment', filename=os.path.basename(file_path))
+        
+        stream.write(f'--{boundary}\n'.encode())
+        write_header_block(stream, part)
+        if optimized is not None:
+            write_base64_payload(stream, io.BytesIO(optimized))
+        else:
+            with open(file_path, 'rb') as source:
+                write_base64_payload(stream, source)
+        
+        logger.debug(
+            f"Added {'inline' if content_id else 'attachment'} to email",
+            context={"file": os.path.basename(file_path), "content_type": content_type}
+        )
+        return True
+        
+    except Exception as e:
+        logger.error(
+            f"Failed to add attachment: {str(e)}",
+            context={"file_path": file_path, "error": str(e)}
+        )
+        return False
+
+
+def write_email_message(stream: BinaryIO, sender: str, recipients: List[str], subject: str,
+                        html_content: str, attachment_paths: Optional[List[str]] = None) -> int:
+    """
+    Writes a complete MIME message to a binary stream in a single pass.
+    
+    Image attachments are sent inline with the Content-ID from get_content_id, so the HTML
+    body can reference them as cid:image_<index> instead of embedding them a second time.
+    
+    Args:
+        stream: Binary stream the message is written to
+        sender: Email address of the sender
+        recipients: List of recipient email addresses
+        subject: Email subject line
+        html_content: HTML content of the email
+        attachment_paths: Optional list of file paths to attach
+        
+    Returns:
+        Size of the MIME message in bytes
+    """
+    validate_message_fields(sender, recipients, subject, html_content)
+    start = stream.tell()
+    boundary = f'==============={uuid.uuid4().hex}=='
+    
+    # Top-level headers
+    message = MIMEBase('multipart', 'related', boundary=boundary)
+    message['From'] = sender
+    message['To'] = ', '.join(recipients)
+    message['Subject'] = subject
+    write_header_block(stream, message)
+    
+    # HTML body
+    stream.write(f'--{boundary}\n'.encode())
+    stream.write(MIMEText(html_content, 'html').as_bytes())
+    stream.write(b'\n')
+    
+    # Attachments, streamed from disk
+    for i, file_path in enumerate(attachment_paths or []):
+        content_id = get_content_id(i) if file_path.lower().endswith(('png', 'jpg', 'jpeg', 'gif')) else None
+        write_attachment(stream, boundary, file_path, content_id)
+    
+    stream.write(f'--{boundary}--\n'.encode())
+    return stream.tell() - start
+
+
+def build_email_message(sender: str, recipients: List[str], subject: str, html_content: str,
+                        attachment_paths: Optional[List[str]] = None) -> MediaIoBaseUpload:
+    """
+    Builds a complete email message, including attachments and inline images, as a Gmail API upload.
+    
+    The message is sent as message/rfc822 media rather than a base64 encoded raw string.
+    Messages spooled to disk are uploaded in resumable chunks, so they are never held in
+    memory as a whole; resumable uploads cannot go through the batch endpoint.
+    
+    Args:
+        sender: Email address of the sender
+        recipients: List of recipient email addresses
+        subject: Email subject line
+        html_content: HTML content of the email
+        attachment_paths: Optional list of file paths to attach
+        
+    Returns:
+        Media upload for the messages.send media_body; close its stream() once sent
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=MESSAGE_SPOOL_SIZE)
+    try:
+        size = write_email_message(spool, sender, recipients, subject, html_content, attachment_paths)
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+    
+    logger.debug(
+        "Built email message",
+        context={
+            "subject": subject,
+            "attachments": len(attachment_paths or []),
+            "size_bytes": size
+        }
+    )
+    
+    return MediaIoBaseUpload(
+        spool,
+        mimetype='message/rfc822',
+        chunksize=MESSAGE_UPLOAD_CHUNK_SIZE,
+        resumable=size > MESSAGE_SPOOL_SIZE
+    )
+
+
 def validate_email_addresses(email_addresses: List[str]) -> bool:
     """
     Validates email addresses format.
@@ -172,6 +453,40 @@ def validate_email_addresses(email_addresses: List[str]) -> bool:
     return True
 
 
+def parse_delivery_status(message_id: str, message: Dict) -> Dict:
+    """
+    Determines the delivery status of a sent message from its Gmail labels.
+    
+    Args:
+        message_id: ID of the message
+        message: Message resource returned by the Gmail API
+        
+    Returns:
+        Dictionary with delivery status information
+    """
+    # Check label IDs for status
+    labels = message.get('labelIds', [])
+    
+    is_sent = 'SENT' in labels
+    is_delivered = not ('UNDELIVERED' in labels or 'BOUNCED' in labels)
+    
+    # A message without the SENT label has not left the outbox yet
+    if not is_delivered:
+        status = "failed"
+    elif is_sent:
+        status = "delivered"
+    else:
+        status = "pending"
+    
+    return {
+        "message_id": message_id,
+        "is_sent": is_sent,
+        "is_delivered": is_delivered,
+        "labels": labels,
+        "status": status
+    }
+
+
 class GmailClient:
     """
     Client for interacting with Gmail API to send emails.
@@ -272,33 +587,18 @@ class GmailClient:
             if not self.is_authenticated():
                 self.authenticate()
             
-            # Create message
-            message = create_message(self.sender_email, recipients, subject, html_content)
-            message_obj = MIMEMultipart('related')
-            message_obj['From'] = self.sender_email
-            message_obj['To'] = ', '.join(recipients)
-            message_obj['Subject'] = subject
-            
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html')
-            message_obj.attach(html_part)
-            
-            # Add attachments if provided
-            if attachment_paths:
-                for i, file_path in enumerate(attachment_paths):
-                    # Use the filename as content ID for inline images
-                    content_id = f"image_{i}" if file_path.lower().endswith(('png', 'jpg', 'jpeg', 'gif')) else None
-                    add_attachment(message_obj, file_path, content_id)
-            
-            # Encode the message for Gmail API
-            encoded_message = base64.urlsafe_b64encode(message_obj.as_bytes()).decode()
-            message = {'raw': encoded_message}
+            # Create message with attachments
+            message = build_email_message(self.sender_email, recipients, subject, html_content, attachment_paths)
+            size_bytes = message.size()
             
             # Send the message
-            send_response = self.service.users().messages().send(
-                userId=self.user_id,
-                body=message
-            ).execute()
+            try:
+                send_response = self.service.users().messages().send(
+                    userId=self.user_id,
+                    media_body=message
+                ).execute()
+            finally:
+                message.stream().close()
             
             message_id = send_response.get('id', '')
             
@@ -307,14 +607,16 @@ class GmailClient:
                 context={
                     "message_id": message_id,
                     "recipients": recipients,
-                    "subject": subject
+                    "subject": subject,
+                    "size_bytes": size_bytes
                 }
             )
             
             return {
                 "status": "success",
                 "message_id": message_id,
-                "recipients": recipients
+                "recipients": recipients,
+                "size_bytes": size_bytes
             }
             
         except ValidationError as e:
@@ -381,20 +683,8 @@ class GmailClient:
                 id=message_id
             ).execute()
             
-            # Check label IDs for status
-            labels = message.get('labelIds', [])
-            
             # Determine delivery status based on labels
-            is_sent = 'SENT' in labels
-            is_delivered = not ('UNDELIVERED' in labels or 'BOUNCED' in labels)
-            
-            delivery_status = {
-                "message_id": message_id,
-                "is_sent": is_sent,
-                "is_delivered": is_delivered,
-                "labels": labels,
-                "status": "delivered" if is_delivered else "failed"
-            }
+            delivery_status = parse_delivery_status(message_id, message)
             
             logger.info(
                 f"Email delivery verification: {delivery_status['status']}",
@@ -431,6 +721,195 @@ class GmailClient:
                 context={"message_id": message_id}
             )
     
+    def execute_batch(self, requests: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executes Gmail API requests through the batch HTTP endpoint.
+        
+        Args:
+            requests: Mapping of request ID to an unexecuted Gmail API request
+            
+        Returns:
+            Mapping of request ID to the response, or the HttpError raised for that request
+        """
+        results = {}
+        
+        def collect(request_id, response, exception):
+            results[request_id] = exception if exception is not None else response
+        
+        request_ids = list(requests)
+        batch_size = max(1, min(EMAIL_SETTINGS['BATCH_SIZE'], 100))
+        for start in range(0, len(request_ids), batch_size):
+            batch = self.service.new_batch_http_request(callback=collect)
+            for request_id in request_ids[start:start + batch_size]:
+                batch.add(requests[request_id], request_id=request_id)
+            batch.execute()
+        
+        return results
+    
+    def send_emails_batch(self, emails: List[Dict], max_retries: Optional[int] = None) -> List[Dict]:
+        """
+        Sends several emails through Gmail batch requests, retrying transient failures.
+        
+        Args:
+            emails: Emails to send, each with subject, html_content, recipients and
+                optional attachment_paths
+            max_retries: Maximum retry rounds for transient failures (defaults to RETRY_SETTINGS)
+            
+        Returns:
+            Send result for each email, in the same order as emails
+            
+        Raises:
+            ValidationError: If email validation fails
+            APIError: If a batch request fails as a whole
+        """
+        if max_retries is None:
+            max_retries = RETRY_SETTINGS['DEFAULT_MAX_RETRIES']
+        
+        # Validate every email before anything is sent
+        for email in emails:
+            validate_email_addresses(email.get('recipients'))
+        
+        # Ensure authenticated
+        if not self.is_authenticated():
+            self.authenticate()
+        
+        results: List[Optional[Dict]] = [None] * len(emails)
+        pending = [str(i) for i in range(len(emails))]
+        sizes = {}
+        
+        try:
+            for attempt in range(max_retries + 1):
+                if attempt:
+                    time.sleep(calculate_backoff_delay(
+                        attempt - 1,
+                        RETRY_SETTINGS['DEFAULT_RETRY_DELAY'],
+                        RETRY_SETTINGS['DEFAULT_RETRY_BACKOFF_FACTOR'],
+                        RETRY_SETTINGS['DEFAULT_RETRY_JITTER']
+                    ))
+                
+                # Messages are built per round so only the pending ones are kept
+                requests = {}
+                responses = {}
+                messages = []
+                try:
+                    for request_id in pending:
+                        email = emails[int(request_id)]
+                        message = build_email_message(
+                            self.sender_email, email['recipients'], email['subject'],
+                            email['html_content'], email.get('attachment_paths')
+                        )
+                        messages.append(message)
+                        sizes[request_id] = message.size()
+                        send_request = self.service.users().messages().send(userId=self.user_id, media_body=message)
+                        
+                        # Large messages stream from disk in a resumable upload of their own
+                        if message.resumable():
+                            try:
+                                responses[request_id] = send_request.execute()
+                            except HttpError as e:
+                                responses[request_id] = e
+                        else:
+                            requests[request_id] = send_request
+                    
+                    responses.update(self.execute_batch(requests))
+                finally:
+                    for message in messages:
+                        message.stream().close()
+                
+                retry = []
+                for request_id in pending:
+                    email = emails[int(request_id)]
+                    response = responses.get(request_id)
+                    status_code = getattr(getattr(response, 'resp', None), 'status', None)
+                    if isinstance(response, Exception):
+                        if status_code in RETRY_SETTINGS['RETRIABLE_STATUS_CODES'] and attempt < max_retries:
+                            retry.append(request_id)
+                            continue
+                        results[int(request_id)] = {
+                            "status": "error",
+                            "recipients": email['recipients'],
+                            "status_code": status_code,
+                            "error": str(response)
+                        }
+                    else:
+                        results[int(request_id)] = {
+                            "status": "success",
+                            "message_id": (response or {}).get('id', ''),
+                            "recipients": email['recipients'],
+                            "size_bytes": sizes.get(request_id)
+                        }
+                
+                pending = retry
+                if not pending:
+                    break
+            
+        except HttpError as e:
+            error_details = handle_api_error(e, "Gmail API", "send_emails_batch", {"emails": len(emails)})
+            raise APIError(
+                f"Failed to send email batch: {str(e)}",
+                "Gmail API",
+                "send_emails_batch",
+                getattr(e.resp, 'status', None),
+                getattr(e, 'content', None),
+                error_details
+            )
+        
+        sent = sum(1 for result in results if result and result['status'] == 'success')
+        logger.info(
+            f"Sent {sent} of {len(emails)} emails in batch",
+            context={"emails": len(emails), "sent": sent}
+        )
+        
+        return results
+    
+    def get_delivery_statuses(self, message_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Looks up the delivery status of several messages with Gmail batch requests.
+        
+        Args:
+            message_ids: IDs of the messages to check
+            
+        Returns:
+            Mapping of message ID to delivery status information
+            
+        Raises:
+            APIError: If a batch request fails as a whole
+        """
+        if not message_ids:
+            return {}
+        
+        # Ensure authenticated
+        if not self.is_authenticated():
+            self.authenticate()
+        
+        requests = {
+            message_id: self.service.users().messages().get(userId=self.user_id, id=message_id, format='minimal')
+            for message_id in message_ids
+        }
+        
+        try:
+            responses = self.execute_batch(requests)
+        except HttpError as e:
+            error_details = handle_api_error(e, "Gmail API", "get_delivery_statuses", {"messages": len(message_ids)})
+            raise APIError(
+                f"Failed to check email delivery: {str(e)}",
+                "Gmail API",
+                "get_delivery_statuses",
+                getattr(e.resp, 'status', None),
+                getattr(e, 'content', None),
+                error_details
+            )
+        
+        statuses = {}
+        for message_id in message_ids:
+            response = responses.get(message_id)
+            if isinstance(response, Exception) or response is None:
+                statuses[message_id] = {"message_id": message_id, "status": "unknown", "error": str(response)}
+            else:
+                statuses[message_id] = parse_delivery_status(message_id, response)
+        
+        return statuses
+    
     def is_authenticated(self) -> bool:
         """
         Checks if the client is authenticated with Gmail API.
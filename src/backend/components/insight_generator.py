@@ -7,12 +7,22 @@ visualizations for the weekly budget report.
 """
 
 import os  # standard library
+import io  # standard library
+import json  # standard library
 import time  # standard library
+import atexit  # standard library
+import hashlib  # standard library
 import logging  # standard library
+import threading  # standard library
+import multiprocessing  # standard library
+from concurrent.futures import ProcessPoolExecutor  # standard library
 from typing import Dict, List, Optional, Any  # standard library
 
-# Visualization libraries
+# Visualization libraries (Agg renders to files without a display)
+import matplotlib  # matplotlib 3.7.0+
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt  # matplotlib 3.7.0+
+import pandas as pd  # pandas 2.1.0+
 import seaborn as sns  # seaborn 0.12.0+
 
 # Internal imports
@@ -23,6 +33,7 @@ from ..services.logging_service import get_component_logger
 from ..services.error_handling_service import ErrorHandlingContext
 from ..utils.error_handlers import retry_with_backoff, APIError, ValidationError
 from ..services.authentication_service import AuthenticationService
+from ..config.settings import CHART_SETTINGS
 
 # Set up logger for this component
 logger = get_component_logger('insight_generator')
@@ -30,6 +41,16 @@ logger = get_component_logger('insight_generator')
 # Directory for storing chart images
 CHART_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'temp', 'charts')
 
+# Version of the chart rendering code; part of the cache key so style changes invalidate cached charts
+CHART_CACHE_VERSION = 1
+
+# Budget analysis fields the charts are drawn from (other fields do not affect the cache key)
+CHART_INPUT_KEYS = ['category_analysis', 'total_budget', 'total_spent', 'total_variance']
+
+# Process pool used to render charts, created on first use and reused for the life of the process
+_chart_executor = None
+_chart_executor_lock = threading.Lock()
+
 
 def ensure_chart_directory() -> str:
     """
@@ -49,12 +70,48 @@ def ensure_chart_directory() -> str:
         raise
 
 
-def create_category_comparison_chart(budget_analysis: Dict) -> str:
+def save_chart(chart_path: Optional[str], chart_name: str) -> str:
+    """
+    Saves the current figure as a PNG and closes it.
+    
+    The image is rendered in memory and moved into place atomically so that an
+    interrupted render never leaves a truncated file that would be reused from the cache.
+    
+    Args:
+        chart_path: Destination path, or None for a timestamped file in the chart directory
+        chart_name: Chart name used for the timestamped file name
+        
+    Returns:
+        Path to the saved chart file
+    """
+    # Ensure chart directory exists
+    chart_dir = ensure_chart_directory()
+    
+    # Default to a file name with timestamp
+    if chart_path is None:
+        chart_path = os.path.join(chart_dir, f"{chart_name}_{int(time.time())}.png")
+    
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    
+    # Close the figure to free memory
+    plt.close()
+    
+    temp_path = f"{chart_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(temp_path, chart_path)
+    
+    return chart_path
+
+
+def create_category_comparison_chart(budget_analysis: Dict, chart_path: Optional[str] = None) -> str:
     """
     Creates a horizontal bar chart comparing budget vs. actual spending by category.
     
     Args:
         budget_analysis: Dictionary containing budget analysis data
+        chart_path: Optional destination path (defaults to a timestamped file in CHART_DIR)
         
     Returns:
         Path to the saved chart file
@@ -87,7 +144,6 @@ def create_category_comparison_chart(budget_analysis: Dict) -> str:
         sns.set_style("whitegrid")
         
         # Create DataFrame for seaborn
-        import pandas as pd
         df = pd.DataFrame({
             'Category': categories,
             'Budget': budget_amounts,
@@ -112,16 +168,8 @@ def create_category_comparison_chart(budget_analysis: Dict) -> str:
         plt.ylabel('Category', fontsize=12)
         plt.tight_layout()
         
-        # Ensure chart directory exists
-        chart_dir = ensure_chart_directory()
-        
-        # Save chart to file with timestamp
-        timestamp = int(time.time())
-        chart_path = os.path.join(chart_dir, f"category_comparison_{timestamp}.png")
-        plt.savefig(chart_path, dpi=100, bbox_inches='tight')
-        
-        # Close the figure to free memory
-        plt.close()
+        # Save chart to file
+        chart_path = save_chart(chart_path, 'category_comparison')
         
         logger.info(f"Created category comparison chart at {chart_path}")
         return chart_path
@@ -131,12 +179,13 @@ def create_category_comparison_chart(budget_analysis: Dict) -> str:
         raise
 
 
-def create_budget_overview_chart(budget_analysis: Dict) -> str:
+def create_budget_overview_chart(budget_analysis: Dict, chart_path: Optional[str] = None) -> str:
     """
     Creates a pie chart showing overall budget allocation and spending.
     
     Args:
         budget_analysis: Dictionary containing budget analysis data
+        chart_path: Optional destination path (defaults to a timestamped file in CHART_DIR)
         
     Returns:
         Path to the saved chart file
@@ -182,16 +231,8 @@ def create_budget_overview_chart(budget_analysis: Dict) -> str:
         else:
             plt.title(f'Weekly Budget Overview\n${abs(total_variance):.2f} Over Budget', fontsize=14)
         
-        # Ensure chart directory exists
-        chart_dir = ensure_chart_directory()
-        
-        # Save chart to file with timestamp
-        timestamp = int(time.time())
-        chart_path = os.path.join(chart_dir, f"budget_overview_{timestamp}.png")
-        plt.savefig(chart_path, dpi=100, bbox_inches='tight')
-        
-        # Close the figure to free memory
-        plt.close()
+        # Save chart to file
+        chart_path = save_chart(chart_path, 'budget_overview')
         
         logger.info(f"Created budget overview chart at {chart_path}")
         return chart_path
@@ -201,6 +242,152 @@ def create_budget_overview_chart(budget_analysis: Dict) -> str:
         raise
 
 
+# Charts included in the report, in display order
+CHART_RENDERERS = {
+    'category_comparison': create_category_comparison_chart,
+    'budget_overview': create_budget_overview_chart
+}
+
+
+def get_chart_cache_key(budget_analysis: Dict) -> str:
+    """
+    Computes a content hash of the analysis fields the charts are drawn from.
+    
+    Args:
+        budget_analysis: Dictionary containing budget analysis data
+        
+    Returns:
+        Hex digest identifying the rendered charts
+    """
+    chart_input = {key: budget_analysis.get(key) for key in CHART_INPUT_KEYS}
+    payload = json.dumps(chart_input, sort_keys=True, default=str)
+    return hashlib.sha256(f"v{CHART_CACHE_VERSION}:{payload}".encode('utf-8')).hexdigest()
+
+
+def get_cached_chart_path(chart_type: str, cache_key: str) -> str:
+    """
+    Gets the content-addressed path of a chart.
+    
+    Args:
+        chart_type: Chart name (key of CHART_RENDERERS)
+        cache_key: Cache key from get_chart_cache_key
+        
+    Returns:
+        Path of the chart file in the chart directory
+    """
+    return os.path.join(ensure_chart_directory(), f"{chart_type}_{cache_key[:16]}.png")
+
+
+def render_chart(chart_type: str, budget_analysis: Dict, chart_path: str) -> str:
+    """
+    Renders a single chart to a path. Runs in the chart worker processes.
+    
+    Args:
+        chart_type: Chart name (key of CHART_RENDERERS)
+        budget_analysis: Dictionary containing budget analysis data
+        chart_path: Destination path
+        
+    Returns:
+        Path to the saved chart file
+    """
+    return CHART_RENDERERS[chart_type](budget_analysis, chart_path)
+
+
+def init_chart_worker() -> None:
+    """Prepares a chart worker process: headless backend and plotting libraries loaded once."""
+    matplotlib.use('Agg')
+    sns.set_style("whitegrid")
+
+
+def get_chart_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Gets the shared chart rendering process pool, creating it on first use.
+    
+    Workers are started with 'spawn' so forking a process that already runs
+    threads (e.g. the async pipeline) cannot deadlock them.
+    
+    Returns:
+        Process pool, or None if charts are rendered in-process (CHART_RENDER_WORKERS=0)
+    """
+    global _chart_executor
+    
+    if CHART_SETTINGS['RENDER_WORKERS'] <= 0:
+        return None
+    
+    with _chart_executor_lock:
+        if _chart_executor is None:
+            _chart_executor = ProcessPoolExecutor(
+                max_workers=CHART_SETTINGS['RENDER_WORKERS'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_chart_worker
+            )
+            atexit.register(shutdown_chart_executor)
+        return _chart_executor
+
+
+def warm_up_chart_executor() -> None:
+    """Starts the chart workers in the background so their start-up overlaps other work."""
+    try:
+        executor = get_chart_executor()
+        if executor is not None:
+            for _ in range(CHART_SETTINGS['RENDER_WORKERS']):
+                executor.submit(ensure_chart_directory)
+    except Exception as e:
+        logger.warning(f"Failed to start chart workers: {str(e)}")
+
+
+def shutdown_chart_executor() -> None:
+    """Shuts down the chart rendering process pool if it was started."""
+    global _chart_executor
+    
+    with _chart_executor_lock:
+        if _chart_executor is not None:
+            _chart_executor.shutdown(wait=True, cancel_futures=True)
+            _chart_executor = None
+
+
+def render_charts(budget_analysis: Dict) -> List[str]:
+    """
+    Renders all report charts, reusing previously rendered files for identical analysis.
+    
+    Charts missing from the cache are rendered concurrently in the chart process pool;
+    if the pool is unavailable they are rendered in-process.
+    
+    Args:
+        budget_analysis: Dictionary containing budget analysis data
+        
+    Returns:
+        List of paths to chart files, in CHART_RENDERERS order
+    """
+    cache_key = get_chart_cache_key(budget_analysis)
+    chart_paths = {chart_type: get_cached_chart_path(chart_type, cache_key) for chart_type in CHART_RENDERERS}
+    
+    # Reuse charts already rendered for the same analysis (e.g. on retry or resume)
+    pending = [
+        chart_type for chart_type, chart_path in chart_paths.items()
+        if not (CHART_SETTINGS['CACHE_ENABLED'] and os.path.isfile(chart_path) and os.path.getsize(chart_path) > 0)
+    ]
+    if len(pending) < len(chart_paths):
+        logger.info(f"Reusing {len(chart_paths) - len(pending)} cached chart(s)", extra={'context': {'chart_hash': cache_key[:16]}})
+    
+    executor = get_chart_executor() if pending else None
+    if executor is not None:
+        try:
+            futures = [executor.submit(render_chart, chart_type, budget_analysis, chart_paths[chart_type])
+                       for chart_type in pending]
+            for future in futures:
+                future.result()
+            pending = []
+        except Exception as e:
+            logger.warning(f"Chart process pool failed, rendering in-process: {str(e)}")
+            shutdown_chart_executor()
+    
+    for chart_type in pending:
+        render_chart(chart_type, budget_analysis, chart_paths[chart_type])
+    
+    return list(chart_paths.values())
+
+
 class InsightGenerator:
     """Component responsible for generating spending insights and visualizations"""
     
@@ -295,15 +482,8 @@ class InsightGenerator:
         logger.info("Creating data visualizations for budget analysis")
         
         try:
-            chart_files = []
-            
-            # Create category comparison chart
-            category_chart = create_category_comparison_chart(budget_analysis)
-            chart_files.append(category_chart)
-            
-            # Create budget overview chart
-            overview_chart = create_budget_overview_chart(budget_analysis)
-            chart_files.append(overview_chart)
+            # Render the category comparison and budget overview charts
+            chart_files = render_charts(budget_analysis)
             
             logger.info(f"Successfully created {len(chart_files)} visualizations")
             return chart_files
@@ -329,6 +509,9 @@ class InsightGenerator:
             # Extract budget from analysis
             budget = budget_analysis.get('budget', {})
             
+            # Start chart workers while waiting on Gemini
+            warm_up_chart_executor()
+            
             # Generate AI insights
             insights = self.generate_insights(budget_analysis)
             
@@ -7,20 +7,178 @@ Gmail API, with support for retry logic, verification, and robust error handling
 """
 
 import time  # standard library
+import threading  # standard library
 from typing import Dict, List, Optional  # standard library
 import googleapiclient.errors  # google-api-python-client 2.100.0+
 
 from ..api_clients.gmail_client import GmailClient
 from ..models.report import Report
-from ..config.settings import APP_SETTINGS
+from ..config.settings import APP_SETTINGS, EMAIL_SETTINGS, RETRY_SETTINGS
 from ..services.authentication_service import AuthenticationService
-from ..services.logging_service import get_component_logger
+from ..services.logging_service import get_component_logger, bind_run_context
 from ..services.error_handling_service import ErrorHandlingContext
-from ..utils.error_handlers import retry_with_backoff, APIError, ValidationError
+from ..utils.error_handlers import retry_with_backoff, calculate_backoff_delay, APIError, ValidationError
 
 # Set up logger
 logger = get_component_logger('report_distributor')
 
+# Delivery statuses that no longer change
+FINAL_DELIVERY_STATUSES = ('delivered', 'failed')
+
+# Verifiers still polling in the background (waited for by wait_for_pending_deliveries)
+_active_verifiers: List['DeliveryVerifier'] = []
+_active_verifiers_lock = threading.Lock()
+
+
+class DeliveryVerifier:
+    """Polls the delivery status of sent messages in a background thread until each one is final"""
+    
+    def __init__(
+        self,
+        gmail_client: GmailClient,
+        message_ids: List[str],
+        correlation_id: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay: Optional[float] = None
+    ):
+        """
+        Initialize the delivery verifier
+        
+        Args:
+            gmail_client: GmailClient used to look up delivery statuses
+            message_ids: IDs of the messages to verify
+            correlation_id: Optional correlation ID of the pipeline run
+            max_attempts: Maximum number of polls (defaults to EMAIL_SETTINGS)
+            delay: Seconds before the first poll, doubled after each (defaults to EMAIL_SETTINGS)
+        """
+        self.gmail_client = gmail_client
+        self.message_ids = list(message_ids)
+        self.correlation_id = correlation_id
+        self.max_attempts = max_attempts if max_attempts is not None else EMAIL_SETTINGS['DELIVERY_POLL_ATTEMPTS']
+        self.delay = delay if delay is not None else EMAIL_SETTINGS['DELIVERY_POLL_DELAY']
+        self.results: Dict[str, Dict] = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=bind_run_context(self._poll), name='delivery-verifier', daemon=True)
+    
+    def start(self) -> 'DeliveryVerifier':
+        """
+        Start polling in the background
+        
+        Returns:
+            The started verifier
+        """
+        with _active_verifiers_lock:
+            _active_verifiers.append(self)
+        self._thread.start()
+        return self
+    
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Wait for polling to finish
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits until polling finishes)
+            
+        Returns:
+            Delivery status by message ID (messages still being polled are 'pending')
+        """
+        self._thread.join(timeout)
+        return self.get_results()
+    
+    def stop(self) -> None:
+        """Stop polling after the current attempt"""
+        self._stop_event.set()
+    
+    def is_done(self) -> bool:
+        """
+        Check whether polling has finished
+        
+        Returns:
+            True if every message has a recorded final status or polling gave up
+        """
+        return not self._thread.is_alive()
+    
+    def get_results(self) -> Dict[str, Dict]:
+        """
+        Get the delivery status recorded so far for every message
+        
+        Returns:
+            Delivery status by message ID
+        """
+        return {
+            message_id: self.results.get(message_id, {'message_id': message_id, 'status': 'pending'})
+            for message_id in self.message_ids
+        }
+    
+    def _poll(self) -> None:
+        """Poll pending messages with exponential backoff and record their final status"""
+        pending = list(self.message_ids)
+        try:
+            for attempt in range(self.max_attempts):
+                # Wait before every poll; the SENT label is usually not there right after sending
+                wait_time = calculate_backoff_delay(
+                    attempt, self.delay, RETRY_SETTINGS['DEFAULT_RETRY_BACKOFF_FACTOR'], RETRY_SETTINGS['DEFAULT_RETRY_JITTER']
+                )
+                if self._stop_event.wait(wait_time):
+                    break
+                
+                try:
+                    statuses = self.gmail_client.get_delivery_statuses(pending)
+                except Exception as e:
+                    logger.warning(
+                        f"Email delivery check failed: {str(e)}",
+                        extra={'context': {'error': str(e), 'attempt': attempt + 1}, 'correlation_id': self.correlation_id}
+                    )
+                    continue
+                
+                for message_id, status in statuses.items():
+                    self.results[message_id] = status
+                pending = [
+                    message_id for message_id in pending
+                    if self.results.get(message_id, {}).get('status') not in FINAL_DELIVERY_STATUSES
+                ]
+                if not pending:
+                    break
+            
+            summary = {}
+            for result in self.get_results().values():
+                summary[result.get('status', 'unknown')] = summary.get(result.get('status', 'unknown'), 0) + 1
+            logger.info(
+                f"Email delivery verification finished: {summary}",
+                extra={'context': {'delivery_statuses': summary, 'messages': len(self.message_ids)},
+                       'correlation_id': self.correlation_id}
+            )
+        finally:
+            with _active_verifiers_lock:
+                if self in _active_verifiers:
+                    _active_verifiers.remove(self)
+
+
+def wait_for_pending_deliveries(timeout: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Wait for background delivery verification started by this process to finish
+    
+    Args:
+        timeout: Maximum total seconds to wait (defaults to EMAIL_SETTINGS)
+        
+    Returns:
+        Delivery status by message ID for every verifier that was still running
+    """
+    if timeout is None:
+        timeout = EMAIL_SETTINGS['DELIVERY_WAIT_TIMEOUT']
+    
+    with _active_verifiers_lock:
+        verifiers = list(_active_verifiers)
+    
+    deadline = time.monotonic() + timeout
+    results = {}
+    for verifier in verifiers:
+        results.update(verifier.wait(max(0.0, deadline - time.monotonic())))
+        if not verifier.is_done():
+            verifier.stop()
+    
+    return results
+
 
 class ReportDistributor:
     """Component responsible for sending budget reports via email"""
@@ -30,7 +188,8 @@ class ReportDistributor:
         gmail_client: Optional[GmailClient] = None,
         auth_service: Optional[AuthenticationService] = None,
         recipients: Optional[List[str]] = None,
-        sender_email: Optional[str] = None
+        sender_email: Optional[str] = None,
+        recipient_groups: Optional[List[List[str]]] = None
     ):
         """
         Initialize the ReportDistributor component
@@ -40,6 +199,8 @@ class ReportDistributor:
             auth_service: Optional AuthenticationService instance (created if not provided)
             recipients: Optional list of email recipients (defaults to APP_SETTINGS)
             sender_email: Optional sender email address (defaults to APP_SETTINGS)
+            recipient_groups: Optional recipient lists that each receive their own message,
+                e.g. one per household (defaults to EMAIL_SETTINGS, or a single group of recipients)
         """
         # Initialize auth_service with provided service or create new instance
         self.auth_service = auth_service or AuthenticationService()
@@ -53,6 +214,12 @@ class ReportDistributor:
         # Set sender_email to provided value or default from settings
         self.sender_email = sender_email or APP_SETTINGS.get('EMAIL_SENDER', '')
         
+        # Each group of recipients gets its own message
+        self.recipient_groups = recipient_groups or EMAIL_SETTINGS.get('RECIPIENT_GROUPS') or [self.recipients]
+        
+        # Background delivery verification of the last distribution
+        self.delivery_verifier = None
+        
         # Initialize correlation_id to None (will be set during execute)
         self.correlation_id = None
         
@@ -172,6 +339,73 @@ class ReportDistributor:
                 "send_email"
             )
     
+    def send_report_batch(self, report: Report, recipient_groups: Optional[List[List[str]]] = None) -> List[Dict]:
+        """
+        Send the report to every recipient group using Gmail batch requests
+        
+        Args:
+            report: Report to send
+            recipient_groups: Recipient groups to send to (defaults to all recipient groups)
+            
+        Returns:
+            Email delivery status for each recipient group, in order
+            
+        Raises:
+            ValidationError: If report is invalid
+            APIError: If a batch request fails
+        """
+        # Validate the report is complete and ready to send
+        self.validate_report(report)
+        
+        # The body is rendered once and shared by every group
+        subject, body = report.get_email_content()
+        emails = [
+            {
+                'subject': subject,
+                'html_content': body,
+                'recipients': recipients,
+                'attachment_paths': report.chart_files
+            }
+            for recipients in (self.recipient_groups if recipient_groups is None else recipient_groups)
+        ]
+        
+        send_results = self.gmail_client.send_emails_batch(emails)
+        
+        sent = [result for result in send_results if result.get('status') == 'success']
+        logger.info(
+            f"Report sent to {len(sent)} of {len(emails)} recipient groups",
+            extra={'context': {'groups': len(emails), 'sent': len(sent)}, 'correlation_id': self.correlation_id}
+        )
+        
+        return send_results
+    
+    def start_delivery_verification(self, message_ids: List[str]) -> DeliveryVerifier:
+        """
+        Start verifying delivery of sent messages in the background
+        
+        Args:
+            message_ids: IDs of the sent messages
+            
+        Returns:
+            The running DeliveryVerifier
+        """
+        self.delivery_verifier = DeliveryVerifier(self.gmail_client, message_ids, self.correlation_id).start()
+        return self.delivery_verifier
+    
+    def wait_for_delivery(self, timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Wait for background delivery verification of the last distribution
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits until polling finishes)
+            
+        Returns:
+            Delivery status by message ID
+        """
+        if self.delivery_verifier is None:
+            return {}
+        return self.delivery_verifier.wait(timeout)
+    
     @retry_with_backoff(exceptions=(APIError, googleapiclient.errors.HttpError), max_retries=2)
     def verify_delivery(self, message_id: str) -> Dict:
         """
@@ -216,7 +450,8 @@ class ReportDistributor:
         Execute the report distribution process
         
         Args:
-            previous_status: Status information from previous component
+            previous_status: Status information from previous component, with the output of a
+                partial previous distribution as 'previous_attempt' when the run is resumed
             
         Returns:
             Execution status and email delivery status
@@ -245,24 +480,52 @@ class ReportDistributor:
                         'correlation_id': self.correlation_id
                     }
                 
-                # Send the report via email
-                send_result = self.send_report(report)
+                # Groups that already received the report in a partial previous attempt are skipped
+                previous_attempt = previous_status.get('previous_attempt') or {}
+                sent_groups = list(previous_attempt.get('sent_recipient_groups', []))
+                message_ids = list(previous_attempt.get('message_ids', []))
+                pending_groups = [group for group in self.recipient_groups if group not in sent_groups]
+                if sent_groups:
+                    logger.info(
+                        f"Resuming distribution, {len(sent_groups)} recipient groups already received the report",
+                        extra={'context': {'pending_groups': len(pending_groups)}, 'correlation_id': self.correlation_id}
+                    )
                 
-                # If email sent successfully, verify delivery
-                if send_result.get('status') == 'success':
-                    message_id = send_result.get('message_id')
-                    verification_result = self.verify_delivery(message_id)
-                    
+                # Send the report via email, batching when there are several recipient groups
+                if not pending_groups:
+                    send_results = []
+                elif len(self.recipient_groups) > 1:
+                    send_results = self.send_report_batch(report, pending_groups)
+                else:
+                    send_results = [self.send_report(report)]
+                new_message_ids = []
+                for recipients, result in zip(pending_groups, send_results):
+                    if result.get('status') == 'success':
+                        sent_groups.append(recipients)
+                        new_message_ids.append(result.get('message_id'))
+                message_ids.extend(new_message_ids)
+                failed_groups = [group for group in self.recipient_groups if group not in sent_groups]
+                
+                # If emails were sent, verify delivery in the background without blocking the pipeline
+                if new_message_ids:
+                    self.start_delivery_verification(new_message_ids)
+                
+                if message_ids:
                     # Calculate execution duration
                     duration = time.time() - start_time
                     
+                    # A partial status is not complete, so resuming the run sends to the failed groups only
                     return {
-                        'status': 'success',
-                        'message': 'Report distributed successfully',
-                        'delivery_status': verification_result.get('status', 'unknown'),
-                        'message_id': message_id,
+                        'status': 'partial' if failed_groups else 'success',
+                        'message': f'Report distributed to {len(sent_groups)} of {len(self.recipient_groups)} recipient groups',
+                        'delivery_status': 'pending',
+                        'message_id': message_ids[0],
+                        'message_ids': message_ids,
                         'email_subject': report.email_subject,
                         'recipients': self.recipients,
+                        'recipient_groups': self.recipient_groups,
+                        'sent_recipient_groups': sent_groups,
+                        'failed_recipient_groups': failed_groups,
                         'execution_time': duration,
                         'correlation_id': self.correlation_id
                     }
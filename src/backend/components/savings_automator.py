@@ -15,17 +15,21 @@ from ..api_clients.capital_one_client import CapitalOneClient
 from ..models.transfer import Transfer, create_transfer_from_capital_one_response
 from ..utils.validation import is_valid_transfer_amount
 from ..config.settings import APP_SETTINGS
-from ..services.logging_service import get_component_logger, LoggingContext
+from ..services.logging_service import get_component_logger, LoggingContext, ContextThreadPoolExecutor
 from ..services.error_handling_service import (
     with_error_handling,
     graceful_degradation,
     with_circuit_breaker
 )
 from ..services.authentication_service import AuthenticationService
+from ..services.transfer_watch_service import TransferWatcher, resume_pending_transfers
 
 # Set up logger for this component
 logger = get_component_logger('savings_automator')
 
+# Accounts fetched together for the per-run account snapshot
+SNAPSHOT_ACCOUNTS = ('checking', 'savings')
+
 class SavingsAutomator:
     """Component responsible for automating the transfer of budget surplus to a savings account"""
     
@@ -49,6 +53,8 @@ class SavingsAutomator:
         self.transfer_amount = Decimal('0')
         self.transfer = None
         self.transfer_successful = False
+        self.transfer_watcher = None
+        self.account_snapshot = None
         
         logger.info("Savings Automator component initialized")
     
@@ -97,6 +103,41 @@ class SavingsAutomator:
         logger.info(f"Transfer amount {amount} is valid for processing")
         return True
     
+    def get_account_snapshot(self) -> Dict:
+        """
+        Get checking and savings account details for the current run
+        
+        Both accounts are requested concurrently on first use and reused by every
+        validation step until the snapshot is invalidated. Snapshots containing an
+        API error are not kept, so the next step requests the accounts again.
+        
+        Returns:
+            Account details keyed by 'checking' and 'savings'
+        """
+        if self.account_snapshot is not None:
+            return self.account_snapshot
+        
+        logger.info("Fetching checking and savings account details")
+        
+        # Request both accounts at the same time instead of one after the other
+        with ContextThreadPoolExecutor(max_workers=len(SNAPSHOT_ACCOUNTS)) as executor:
+            checking_future = executor.submit(self.capital_one_client.get_checking_account_details)
+            savings_future = executor.submit(self.capital_one_client.get_savings_account_details)
+            snapshot = {
+                'checking': checking_future.result() or {},
+                'savings': savings_future.result() or {}
+            }
+        
+        # Only keep the snapshot if both accounts were retrieved
+        if all(snapshot[account].get('status') != 'error' for account in SNAPSHOT_ACCOUNTS):
+            self.account_snapshot = snapshot
+        
+        return snapshot
+    
+    def invalidate_account_snapshot(self) -> None:
+        """Discard the account snapshot so the next validation step fetches current balances"""
+        self.account_snapshot = None
+    
     @with_circuit_breaker('capital_one', failure_threshold=3, recovery_timeout=300)
     def verify_account_status(self) -> bool:
         """
@@ -107,17 +148,16 @@ class SavingsAutomator:
         """
         logger.info("Verifying account status for checking and savings accounts")
         
-        # Get checking account details
-        checking_account = self.capital_one_client.get_checking_account_details()
+        # Get checking and savings account details from the run's account snapshot
+        snapshot = self.get_account_snapshot()
+        checking_account = snapshot['checking']
+        savings_account = snapshot['savings']
         
         # Verify checking account is active
         if checking_account.get('status') != 'active':
             logger.error(f"Checking account is not active: {checking_account.get('status')}")
             return False
         
-        # Get savings account details
-        savings_account = self.capital_one_client.get_savings_account_details()
-        
         # Verify savings account is active
         if savings_account.get('status') != 'active':
             logger.error(f"Savings account is not active: {savings_account.get('status')}")
@@ -139,8 +179,8 @@ class SavingsAutomator:
         """
         logger.info(f"Verifying sufficient funds for transfer of {amount}")
         
-        # Get checking account details
-        checking_account = self.capital_one_client.get_checking_account_details()
+        # Get checking account details from the run's account snapshot
+        checking_account = self.get_account_snapshot()['checking']
         
         # Extract available balance
         available_balance = Decimal(str(checking_account.get('availableBalance', '0')))
@@ -175,6 +215,9 @@ class SavingsAutomator:
         # Call Capital One API to transfer funds
         transfer_response = self.capital_one_client.transfer_to_savings(amount)
         
+        # Balances change once a transfer is attempted
+        self.invalidate_account_snapshot()
+        
         # Create Transfer object from response
         self.transfer = create_transfer_from_capital_one_response(transfer_response)
         
@@ -212,19 +255,39 @@ class SavingsAutomator:
         # Call Capital One API to check transfer status
         verification_result = self.capital_one_client.verify_transfer_completion(transfer_id)
         
-        # Update transfer status based on verification
-        if self.transfer:
-            transfer_status = 'completed' if verification_result else 'failed'
-            self.transfer.update_status(transfer_status)
-        
         if verification_result:
+            if self.transfer:
+                self.transfer.update_status('completed')
             logger.info(f"Transfer {transfer_id} verified as completed")
             self.transfer_successful = True
+        elif self.transfer and self.transfer.transfer_id == transfer_id:
+            # Transfers are usually still pending right after initiation; keep checking in the
+            # background instead of marking the transfer failed or blocking the pipeline
+            logger.info(f"Transfer {transfer_id} not completed yet, verifying in the background")
+            self.watch_transfer(self.transfer)
         else:
             logger.warning(f"Transfer {transfer_id} could not be verified as completed")
         
         return verification_result
     
+    def watch_transfer(self, transfer: Transfer) -> TransferWatcher:
+        """
+        Start verifying a pending transfer in the background
+        
+        The transfer is persisted until it completes or fails, so a later run finishes
+        verifying it if this one exits first.
+        
+        Args:
+            transfer: Pending transfer to watch
+            
+        Returns:
+            The running TransferWatcher
+        """
+        self.transfer_watcher = TransferWatcher(
+            self.capital_one_client, [transfer], correlation_id=self.correlation_id
+        ).start()
+        return self.transfer_watcher
+    
     @with_error_handling('savings_automator', 'transfer_surplus', {})
     def transfer_surplus(self, amount: Decimal) -> Dict:
         """
@@ -274,6 +337,7 @@ class SavingsAutomator:
             verification_result = self.verify_transfer(transfer_id)
             
             transfer_result['verified'] = verification_result
+            transfer_result['verification'] = 'completed' if verification_result else 'pending'
             transfer_result['transfer_successful'] = self.transfer_successful
         
         return transfer_result
@@ -297,6 +361,9 @@ class SavingsAutomator:
             # Extract correlation_id from previous_status if available
             self.correlation_id = previous_status.get('correlation_id')
             
+            # Account details are fetched fresh for every run
+            self.invalidate_account_snapshot()
+            
             # Extract transfer amount from budget analysis results
             budget_analysis = previous_status.get('budget_analysis', {})
             self.transfer_amount = Decimal(str(budget_analysis.get('total_variance', '0')))
@@ -316,6 +383,12 @@ class SavingsAutomator:
                         'execution_time': time.time() - start_time
                     }
                 
+                # Finish verifying transfers that previous runs left pending, in the background
+                try:
+                    resume_pending_transfers(self.capital_one_client, self.correlation_id)
+                except Exception as e:
+                    logger.warning(f"Could not resume pending transfer verification: {str(e)}")
+                
                 # If no surplus or negative (deficit), log and return success with no transfer
                 if self.transfer_amount <= 0:
                     logger.info(f"No budget surplus to transfer (amount: {self.transfer_amount})")
@@ -0,0 +1,141 @@
+"""
+log_fastpath.py - Structured logging fast path shared by the application and the utility scripts
+
+Both config/logging_config.py and scripts/config/logging_setup.py format and redact
+records with these helpers, so the orjson serialization and the redaction caches are
+maintained in one place:
+- combine_patterns joins the sensitive patterns into one regex, so a string is scanned once
+- SensitiveKeyCache remembers which keys of a dictionary shape are sensitive
+- resolve_format_fields and render_format_fields resolve a JSON log format once per formatter
+- dumps_log_record serializes a formatted record, with orjson when it is installed
+"""
+
+import re  # standard library
+import json  # standard library
+
+try:
+    import orjson  # orjson 3.9.0+ (optional, faster JSON serialization of log records)
+except ImportError:
+    orjson = None
+
+# Maximum number of distinct dictionary key sets whose sensitive keys are remembered
+KEY_SHAPE_CACHE_SIZE = 1024
+
+# Log format values that copy a single record attribute, e.g. '%(context)s'
+RECORD_FIELD_PATTERN = re.compile(r'%\((\w+)\)s')
+
+
+def combine_patterns(patterns):
+    """
+    Combine sensitive data patterns into one regex.
+
+    Args:
+        patterns (list): Compiled patterns
+
+    Returns:
+        re.Pattern: Alternation matching any of the patterns
+    """
+    return re.compile('|'.join(pattern.pattern for pattern in patterns))
+
+
+class SensitiveKeyCache:
+    """
+    Sensitive key flags by dictionary key set, so dictionaries of the same shape
+    are only matched against the sensitive patterns once.
+    """
+
+    def __init__(self, regex, max_size=KEY_SHAPE_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            regex (re.Pattern): Regex matching sensitive key names (matched against lower-case keys)
+            max_size (int): Number of key sets remembered before the cache is cleared
+        """
+        self.regex = regex
+        self.max_size = max_size
+        self.key_shapes = {}
+
+    def get_flags(self, data):
+        """
+        Check which keys of a dictionary are sensitive.
+
+        Args:
+            data (dict): Dictionary whose keys are checked
+
+        Returns:
+            tuple: True for each sensitive key, in the order of the dictionary
+        """
+        shape = tuple(data)
+        flags = self.key_shapes.get(shape)
+        if flags is None:
+            flags = tuple(
+                isinstance(key, str) and self.regex.search(key.lower()) is not None
+                for key in shape
+            )
+            if len(self.key_shapes) >= self.max_size:
+                self.key_shapes.clear()
+            self.key_shapes[shape] = flags
+        return flags
+
+
+def resolve_format_fields(format_dict):
+    """
+    Resolve a JSON log format once: values copying a single record attribute are looked
+    up directly (keeping the context a JSON object), the others are %-formatted.
+
+    Args:
+        format_dict (dict): Dictionary defining the JSON log structure
+
+    Returns:
+        tuple: (list of (key, record attribute or None, format value), whether asctime is used)
+    """
+    fields = []
+    for key, value in format_dict.items():
+        match = RECORD_FIELD_PATTERN.fullmatch(value) if isinstance(value, str) else None
+        fields.append((key, match.group(1) if match else None, value))
+    uses_asctime = any('%(asctime)' in str(value) for value in format_dict.values())
+    return fields, uses_asctime
+
+
+def render_format_fields(fields, values):
+    """
+    Replace format placeholders with record values.
+
+    Args:
+        fields (list): Fields returned by resolve_format_fields
+        values (dict): Attributes of the log record
+
+    Returns:
+        dict: Formatted log record
+    """
+    output = {}
+    for key, attribute, value in fields:
+        if attribute is not None:
+            output[key] = values.get(attribute, value)
+            continue
+        try:
+            output[key] = value % values
+        except (KeyError, TypeError):
+            # Keep the original placeholder if formatting fails
+            output[key] = value
+    return output
+
+
+def dumps_log_record(output):
+    """
+    Serialize a formatted log record to JSON, using orjson when it is installed.
+
+    Args:
+        output (dict): Formatted log record
+
+    Returns:
+        str: JSON string; values that are not JSON types are converted with str()
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(output, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson rejects some values the json module accepts (e.g. integers above 64 bits)
+            pass
+    return json.dumps(output, default=str)
@@ -4,16 +4,47 @@ logging_config.py - Logging configuration for the Budget Management Application
 This module provides structured logging setup with JSON formatting, sensitive data
 masking, and integration with Google Cloud Logging. It implements correlation IDs
 for request tracing and context enrichment for comprehensive monitoring.
+
+The correlation ID, pipeline stage and retry attempt of the running work live in a
+context variable (see run_context). RunContextFilter copies them into every record on
+the logging thread, asyncio tasks inherit them, and thread pools created with
+ContextThreadPoolExecutor or functions wrapped with bind_run_context carry them over,
+so records logged anywhere during a run share its correlation ID.
+
+When LOG_FILE is set, records are also written to a file that is rotated by size and
+age; rotated files are compressed (gzip, or zstd when zstandard is installed) and pruned
+in the background.
 """
 
 import logging  # standard library
-import json  # standard library
+import logging.handlers  # standard library
 import uuid  # standard library
 import os  # standard library
 import re  # standard library
+import copy  # standard library
+import queue  # standard library
+import atexit  # standard library
+import threading  # standard library
+import time  # standard library
+import gzip  # standard library
+import shutil  # standard library
+import datetime  # standard library
+import functools  # standard library
+import contextlib  # standard library
+import contextvars  # standard library
+from concurrent.futures import ThreadPoolExecutor  # standard library
+from logging.handlers import QueueHandler, QueueListener  # standard library
 from google.cloud import logging as cloud_logging  # google-cloud-logging 3.5.0+
 
-from .settings import APP_SETTINGS  # Internal import for app configuration
+try:
+    import zstandard  # zstandard 0.21.0+ (optional, zstd compression of rotated log files)
+except ImportError:
+    zstandard = None
+
+from .settings import APP_SETTINGS, LOG_QUEUE_SETTINGS, LOG_FILE_SETTINGS  # Internal import for app configuration
+from .log_fastpath import (  # Formatting and redaction fast path shared with the utility scripts
+    combine_patterns, SensitiveKeyCache, resolve_format_fields, render_format_fields, dumps_log_record
+)
 
 # Default logging configuration
 DEFAULT_LOG_LEVEL = logging.INFO
@@ -26,6 +57,9 @@ SENSITIVE_PATTERNS = [
     ]
 ]
 
+# All sensitive patterns combined into one regex, so each string is scanned only once
+SENSITIVE_REGEX = combine_patterns(SENSITIVE_PATTERNS)
+
 # JSON log format structure
 LOG_FORMAT = {
     'timestamp': '%(asctime)s',
@@ -36,9 +70,34 @@ LOG_FORMAT = {
     'context': '%(context)s'
 }
 
+# Suffix of compressed log files by compression method
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Compression levels: fast enough to keep up with rotation, still ~10x smaller for JSON logs
+GZIP_COMPRESSION_LEVEL = 6
+ZSTD_COMPRESSION_LEVEL = 10
+
+# Buffer size used when compressing log files
+COMPRESSION_BUFFER_SIZE = 1024 * 1024
+
+# Timestamp added to the name of rotated log files, so they sort in rotation order
+ROTATED_TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
+
+# Run context values other than the correlation ID, added to the context of every record
+RUN_CONTEXT_FIELDS = ('stage', 'retry_attempt')
+
+# Correlation ID, stage and retry attempt of the work running in the current thread or task
+# (a dict that is replaced, never modified, so copied contexts cannot affect each other)
+_run_context = contextvars.ContextVar('run_context', default={})
+
 # Flag to track if logging has been initialized
 initialized = False
 
+# Queue handler and listener moving log handling to a background thread (see setup_logging)
+_queue_handler = None
+_queue_listener = None
+_queue_logger = None
+
 
 class JsonFormatter(logging.Formatter):
     """
@@ -57,6 +116,9 @@ class JsonFormatter(logging.Formatter):
         """
         super().__init__()
         self.format_dict = format_dict
+        
+        # Resolve the format once instead of for every record
+        self.fields, self.uses_asctime = resolve_format_fields(format_dict)
     
     def format(self, record):
         """
@@ -68,30 +130,29 @@ class JsonFormatter(logging.Formatter):
         Returns:
             str: JSON formatted log string
         """
-        # Create a copy of the format dictionary
-        output = self.format_dict.copy()
+        values = record.__dict__
         
         # Ensure record has correlation_id and context attributes
-        if not hasattr(record, 'correlation_id'):
+        if 'correlation_id' not in values:
             record.correlation_id = 'unknown'
         
-        if not hasattr(record, 'context'):
+        if 'context' not in values:
             record.context = {}
         
+        # Render the message and timestamp the format refers to
+        record.message = record.getMessage()
+        if self.uses_asctime:
+            record.asctime = self.formatTime(record)
+        
         # Replace format placeholders with record values
-        for key, value in output.items():
-            try:
-                output[key] = value % record.__dict__
-            except (KeyError, TypeError):
-                # Keep the original placeholder if formatting fails
-                pass
+        output = render_format_fields(self.fields, values)
         
         # Add exception info if present
         if record.exc_info:
             output['exception'] = self.formatException(record.exc_info)
         
         # Convert to JSON string
-        return json.dumps(output)
+        return dumps_log_record(output)
     
     def formatException(self, exc_info):
         """
@@ -106,6 +167,19 @@ class JsonFormatter(logging.Formatter):
         return super().formatException(exc_info)
 
 
+def redact_match(match):
+    """
+    Replace a sensitive match, keeping its first character.
+    
+    Args:
+        match (re.Match): Match of SENSITIVE_REGEX
+        
+    Returns:
+        str: Redacted text
+    """
+    return match.group(0)[0:1] + '[REDACTED]'
+
+
 class SensitiveDataFilter(logging.Filter):
     """
     Log filter that masks sensitive data in log records.
@@ -117,6 +191,8 @@ class SensitiveDataFilter(logging.Filter):
     def __init__(self):
         """Initialize the sensitive data filter."""
         super().__init__()
+        # Dictionaries of the same shape are only matched against the patterns once
+        self.sensitive_keys = SensitiveKeyCache(SENSITIVE_REGEX)
     
     def filter(self, record):
         """
@@ -128,6 +204,11 @@ class SensitiveDataFilter(logging.Filter):
         Returns:
             bool: True to include the record in the log output
         """
+        # Records reaching several handlers are only masked once
+        if getattr(record, 'sensitive_data_masked', False):
+            return True
+        record.sensitive_data_masked = True
+        
         # Mask sensitive data in context
         if hasattr(record, 'context') and record.context:
             record.context = self.mask_sensitive_data(record.context)
@@ -151,21 +232,13 @@ class SensitiveDataFilter(logging.Filter):
         """
         # Handle string data
         if isinstance(data, str):
-            for pattern in SENSITIVE_PATTERNS:
-                # Use regex to find and replace sensitive data
-                data = pattern.sub(
-                    lambda m: m.group(0)[0:1] + '[REDACTED]', 
-                    data
-                )
-            return data
+            # Use regex to find and replace sensitive data
+            return SENSITIVE_REGEX.sub(redact_match, data)
         
         # Handle dictionary data
         elif isinstance(data, dict):
             result = {}
-            for key, value in data.items():
-                # Check if the key itself might be sensitive
-                sensitive_key = any(pattern.search(key.lower()) for pattern in SENSITIVE_PATTERNS)
-                
+            for (key, value), sensitive_key in zip(data.items(), self.sensitive_keys.get_flags(data)):
                 if sensitive_key:
                     # Completely redact sensitive values
                     result[key] = '[REDACTED]'
@@ -182,6 +255,493 @@ class SensitiveDataFilter(logging.Filter):
         return data
 
 
+def get_run_context():
+    """
+    Get the run context of the current thread or asyncio task.
+    
+    Returns:
+        dict: correlation_id, stage and retry_attempt values that are set (do not modify)
+    """
+    return _run_context.get()
+
+
+def get_correlation_id(default='unknown'):
+    """
+    Get the correlation ID of the current run context.
+    
+    Args:
+        default (str): Value returned when no correlation ID is set
+        
+    Returns:
+        str: Correlation ID of the running work, or the default
+    """
+    return _run_context.get().get('correlation_id', default)
+
+
+@contextlib.contextmanager
+def run_context(correlation_id=None, stage=None, retry_attempt=None):
+    """
+    Set run context values for the code in the with block, keeping the other values.
+    
+    Args:
+        correlation_id (str): Correlation ID of the run, None keeps the current one
+        stage (str): Pipeline stage being executed, None keeps the current one
+        retry_attempt (int): Retry attempt of the current call, None keeps the current one
+        
+    Yields:
+        dict: The new run context
+    """
+    updates = {'correlation_id': correlation_id, 'stage': stage, 'retry_attempt': retry_attempt}
+    values = dict(_run_context.get())
+    values.update((key, value) for key, value in updates.items() if value is not None)
+    token = _run_context.set(values)
+    try:
+        yield values
+    finally:
+        _run_context.reset(token)
+
+
+def bind_run_context(function):
+    """
+    Wrap a function so it runs with the run context of the caller, e.g. as a thread target.
+    
+    Args:
+        function (callable): Function to run in another thread
+        
+    Returns:
+        callable: Function running in a copy of the current context on every call
+    """
+    context = contextvars.copy_context()
+    
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # A context can only be entered by one thread at a time, so run a copy per call
+        return context.copy().run(function, *args, **kwargs)
+    
+    return wrapper
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Thread pool running every task with the run context of the code that submitted it.
+    
+    Worker threads of a plain ThreadPoolExecutor start with an empty context, so their
+    records would lose the correlation ID of the run.
+    """
+    
+    def submit(self, fn, /, *args, **kwargs):
+        """
+        Submit a task that runs in a copy of the current context.
+        
+        Args:
+            fn (callable): Function to execute
+            *args: Positional arguments of the function
+            **kwargs: Keyword arguments of the function
+            
+        Returns:
+            concurrent.futures.Future: Future of the task
+        """
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class RunContextFilter(logging.Filter):
+    """
+    Filter adding the run context to log records.
+    
+    Must run on the thread that logged the record, so it is attached to the handler
+    added to the root logger (the queue handler when logging in the background).
+    Correlation IDs passed explicitly with the record are kept.
+    """
+    
+    def filter(self, record):
+        """
+        Add the correlation ID, stage and retry attempt of the current run to a record.
+        
+        Args:
+            record (logging.LogRecord): The log record to enrich
+            
+        Returns:
+            bool: Always True (records are never filtered out)
+        """
+        values = _run_context.get()
+        if not values:
+            return True
+        
+        correlation_id = values.get('correlation_id')
+        if correlation_id and getattr(record, 'correlation_id', None) in (None, 'unknown'):
+            record.correlation_id = correlation_id
+        
+        fields = {key: values[key] for key in RUN_CONTEXT_FIELDS if key in values}
+        if fields:
+            context = getattr(record, 'context', None)
+            if not isinstance(context, dict):
+                context = {}
+            # The record context may be shared with other records, so replace it
+            if any(key not in context for key in fields):
+                record.context = {**fields, **context}
+        
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+    
+    Records are only snapshotted here; formatting, redaction and shipping happen on the
+    listener thread. When the bounded queue is full the record is dropped and counted.
+    """
+    
+    def __init__(self, log_queue):
+        """
+        Initialize the queue handler.
+        
+        Args:
+            log_queue (queue.Queue): Bounded queue read by the listener
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+    
+    def prepare(self, record):
+        """
+        Snapshot a log record so it can be handled later on another thread.
+        
+        Args:
+            record (logging.LogRecord): The log record to enqueue
+            
+        Returns:
+            logging.LogRecord: Copy with the message rendered and the context copied
+        """
+        record = copy.copy(record)
+        # Render the message now, the arguments may change before the listener runs
+        record.msg = record.getMessage()
+        record.args = None
+        context = getattr(record, 'context', None)
+        if isinstance(context, dict):
+            record.context = dict(context)
+        return record
+    
+    def enqueue(self, record):
+        """
+        Put a record on the queue, dropping it if the queue is full.
+        
+        Args:
+            record (logging.LogRecord): Prepared log record
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class BatchQueueListener(QueueListener):
+    """
+    Queue listener that handles every record already queued before flushing its handlers.
+    
+    Handlers are expected not to flush on every record (see BatchStreamHandler), so a
+    burst of records is written and shipped in one flush instead of one per record.
+    
+    The listener runs its own thread and stop marker instead of overriding the private
+    QueueListener._monitor loop; only the public dequeue, handle and queue attributes of
+    QueueListener are used.
+    """
+    
+    # Marker queued by stop() after the last record
+    STOP_MARKER = object()
+    
+    def __init__(self, log_queue, *handlers, batch_size=100):
+        """
+        Initialize the batching listener.
+        
+        Args:
+            log_queue (queue.Queue): Queue filled by DroppingQueueHandler
+            *handlers: Handlers receiving the records
+            batch_size (int): Maximum records handled between flushes
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self._listener_thread = None
+    
+    def start(self):
+        """Start handling queued records in a background thread."""
+        if self._listener_thread is not None:
+            raise RuntimeError("Listener already started")
+        self._listener_thread = threading.Thread(target=self.run, name='log-queue-listener', daemon=True)
+        self._listener_thread.start()
+    
+    def stop(self):
+        """Handle every record queued so far, then stop the background thread."""
+        if self._listener_thread is None:
+            return
+        self.enqueue_sentinel()
+        self._listener_thread.join()
+        self._listener_thread = None
+    
+    def enqueue_sentinel(self):
+        """Queue the stop marker, waiting for room instead of failing on a full queue."""
+        self.queue.put(self.STOP_MARKER)
+    
+    def flush_handlers(self):
+        """Flush every handler after a batch."""
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                # A handler that cannot flush must not stop the listener thread
+                pass
+    
+    def run(self):
+        """Handle queued records in batches until the stop marker is received."""
+        log_queue = self.queue
+        stopping = False
+        while not stopping:
+            # Wait for one record, then take whatever else is already queued
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            
+            for record in batch:
+                if record is self.STOP_MARKER:
+                    stopping = True
+                else:
+                    self.handle(record)
+            self.flush_handlers()
+            
+            for _ in batch:
+                log_queue.task_done()
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler that leaves flushing to the BatchQueueListener instead of flushing every record."""
+    
+    def emit(self, record):
+        """
+        Write a formatted record to the stream without flushing.
+        
+        Args:
+            record (logging.LogRecord): The log record to write
+        """
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def resolve_compression(method):
+    """
+    Resolve a configured compression method to one that is available.
+    
+    Args:
+        method (str): 'gzip', 'zstd' or 'none'
+        
+    Returns:
+        str: Compression method, 'gzip' if zstd is requested but zstandard is not installed
+    """
+    method = (method or 'none').lower()
+    if method == 'zstd' and zstandard is None:
+        return 'gzip'
+    return method if method in COMPRESSION_SUFFIXES else 'none'
+
+
+def compress_log_file(path, method='gzip'):
+    """
+    Compress a log file next to the original and remove the original.
+    
+    The compressed file is written under a temporary name and keeps the modification
+    time of the original, so age-based pruning still sees when the logs were written.
+    
+    Args:
+        path (str): Path to the log file
+        method (str): 'gzip', 'zstd' or 'none'
+        
+    Returns:
+        str: Path to the compressed file, or the original path if method is 'none'
+    """
+    method = resolve_compression(method)
+    if method == 'none':
+        return path
+    
+    target = path + COMPRESSION_SUFFIXES[method]
+    temp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(path, 'rb') as source:
+            if method == 'zstd':
+                compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL)
+                with open(temp_path, 'wb') as raw, compressor.stream_writer(raw, closefd=False) as output:
+                    shutil.copyfileobj(source, output, COMPRESSION_BUFFER_SIZE)
+            else:
+                with gzip.open(temp_path, 'wb', compresslevel=GZIP_COMPRESSION_LEVEL) as output:
+                    shutil.copyfileobj(source, output, COMPRESSION_BUFFER_SIZE)
+        shutil.copystat(path, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    os.remove(path)
+    return target
+
+
+class CompressingRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    File handler rotating by size and age, compressing rotated files in the background.
+    
+    Rotated files are renamed to <file>.<timestamp> and compressed by a background thread,
+    which then prunes the oldest rotated files. The file must be written by one process only.
+    """
+    
+    def __init__(self, filename, max_bytes=0, interval_hours=0, backup_count=0,
+                 retention_days=0, compression='gzip', encoding='utf-8'):
+        """
+        Initialize the rotating file handler.
+        
+        Args:
+            filename (str): Path to the log file
+            max_bytes (int): Size after which the file is rotated, 0 disables size-based rotation
+            interval_hours (int): Hours after which the file is rotated, 0 disables age-based rotation
+            backup_count (int): Number of rotated files kept, 0 keeps all
+            retention_days (int): Days rotated files are kept, 0 keeps them regardless of age
+            compression (str): 'gzip', 'zstd' or 'none'
+            encoding (str): Encoding of the log file
+        """
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(filename, 'a', encoding=encoding)
+        self.max_bytes = max_bytes
+        self.interval = interval_hours * 3600
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        self.compression = resolve_compression(compression)
+        self._compressor = None
+        
+        # Periods are aligned to the epoch, so a file last written in an earlier period is
+        # rotated by the first record of a later run
+        self.rollover_at = self.compute_rollover(os.path.getmtime(self.baseFilename))
+    
+    def compute_rollover(self, current_time):
+        """
+        Compute when the period containing a time ends.
+        
+        Args:
+            current_time (float): Time as seconds since the epoch
+            
+        Returns:
+            float: End of the period, or None if age-based rotation is disabled
+        """
+        if self.interval <= 0:
+            return None
+        return (int(current_time // self.interval) + 1) * self.interval
+    
+    def shouldRollover(self, record):
+        """
+        Check whether the file has to be rotated before writing a record.
+        
+        Args:
+            record (logging.LogRecord): The log record about to be written
+            
+        Returns:
+            bool: True if the current period ended or the file reached its maximum size
+        """
+        if self.stream is None:
+            self.stream = self._open()
+        if self.stream.tell() == 0:
+            return False
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return self.max_bytes > 0 and self.stream.tell() >= self.max_bytes
+    
+    def doRollover(self):
+        """Rename the current file, reopen it and compress the rotated file in the background."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        
+        self.rollover_at = self.compute_rollover(time.time())
+        if not os.path.exists(self.baseFilename):
+            self.stream = self._open()
+            return
+        
+        timestamp = datetime.datetime.now().strftime(ROTATED_TIMESTAMP_FORMAT)
+        rotated = f"{self.baseFilename}.{timestamp}"
+        counter = 1
+        while any(os.path.exists(rotated + suffix) for suffix in ['', *COMPRESSION_SUFFIXES.values()]):
+            rotated = f"{self.baseFilename}.{timestamp}.{counter}"
+            counter += 1
+        os.replace(self.baseFilename, rotated)
+        self.stream = self._open()
+        
+        # One rotation is compressed at a time, so pruning never races with compression
+        if self._compressor is not None:
+            self._compressor.join()
+        self._compressor = threading.Thread(target=self._compress_and_prune, args=(rotated,),
+                                            name='log-compressor', daemon=True)
+        self._compressor.start()
+    
+    def _compress_and_prune(self, rotated):
+        """
+        Compress a rotated file, then remove rotated files beyond the backup count or retention.
+        
+        Args:
+            rotated (str): Path to the rotated file
+        """
+        try:
+            compress_log_file(rotated, self.compression)
+        except OSError:
+            # The rotated file stays uncompressed and is still pruned
+            pass
+        
+        directory, name = os.path.split(self.baseFilename)
+        prefix = name + '.'
+        rotated_files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and not entry.name.endswith('.tmp') and entry.is_file():
+                    rotated_files.append((entry.name, entry.path, entry.stat().st_mtime))
+        rotated_files.sort()
+        
+        expired_before = time.time() - self.retention_days * 86400
+        for index, (_, path, modified) in enumerate(rotated_files):
+            beyond_count = self.backup_count > 0 and index < len(rotated_files) - self.backup_count
+            if beyond_count or (self.retention_days > 0 and modified < expired_before):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def close(self):
+        """Close the file and wait for the background compression to finish."""
+        super().close()
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+
+
+def create_log_file_handler():
+    """
+    Create the rotating file handler configured by LOG_FILE_SETTINGS.
+    
+    Returns:
+        CompressingRotatingFileHandler: Handler writing to LOG_FILE, or None if LOG_FILE is not set
+    """
+    if not LOG_FILE_SETTINGS['PATH']:
+        return None
+    return CompressingRotatingFileHandler(
+        LOG_FILE_SETTINGS['PATH'],
+        max_bytes=LOG_FILE_SETTINGS['MAX_BYTES'],
+        interval_hours=LOG_FILE_SETTINGS['INTERVAL_HOURS'],
+        backup_count=LOG_FILE_SETTINGS['BACKUP_COUNT'],
+        retention_days=LOG_FILE_SETTINGS['RETENTION_DAYS'],
+        compression=LOG_FILE_SETTINGS['COMPRESSION']
+    )
+
+
 class ContextAdapter:
     """
     Adapter for adding context and correlation ID to log records.
@@ -201,10 +761,8 @@ class ContextAdapter:
         self.logger = logger
         self.extra = extra or {}
         
-        # Ensure we have correlation_id and context
-        if 'correlation_id' not in self.extra:
-            self.extra['correlation_id'] = 'unknown'
-        
+        # Ensure we have a context (the correlation ID comes from the run context
+        # unless one is given)
         if 'context' not in self.extra:
             self.extra['context'] = {}
     
@@ -245,8 +803,16 @@ class ContextAdapter:
         """Log with critical level."""
         self._log(logging.CRITICAL, msg, args, kwargs)
     
+    def isEnabledFor(self, level):
+        """Check whether the underlying logger handles records of this level."""
+        return self.logger.isEnabledFor(level)
+    
     def _log(self, level, msg, args, kwargs):
         """Internal logging implementation with context."""
+        # Skip merging contexts for records below the effective level
+        if not self.logger.isEnabledFor(level):
+            return
+        
         # Extract and merge extra context
         extra = kwargs.pop('extra', {})
         context = kwargs.pop('context', {})
@@ -336,15 +902,19 @@ def setup_logging(log_level=None, use_cloud_logging=None):
         root_logger = logging.getLogger()
         root_logger.setLevel(numeric_level)
         
-        # Remove any existing handlers to prevent duplication
+        # Stop a previous background listener and remove any existing handlers to prevent duplication
+        shutdown_logging()
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
+            if isinstance(handler, CompressingRotatingFileHandler):
+                handler.close()
         
         # Create formatter for structured JSON logs
         formatter = JsonFormatter(LOG_FORMAT)
         
-        # Create sensitive data filter
+        # Create sensitive data and run context filters
         sensitive_filter = SensitiveDataFilter()
+        run_context_filter = RunContextFilter()
         
         # Set up appropriate handler based on environment
         if use_cloud_logging:
@@ -352,15 +922,29 @@ def setup_logging(log_level=None, use_cloud_logging=None):
             cloud_client = cloud_logging.Client()
             handler = cloud_client.get_default_handler()
         else:
-            # Setup console logging
-            handler = logging.StreamHandler()
+            # Setup console logging (flushed per batch when logging in the background)
+            handler = BatchStreamHandler() if LOG_QUEUE_SETTINGS['ENABLED'] else logging.StreamHandler()
             handler.setFormatter(formatter)
         
-        # Add filter to handler
-        handler.addFilter(sensitive_filter)
+        # Also write to a rotating, compressed log file when LOG_FILE is set
+        file_handler = create_log_file_handler()
+        extra_handlers = [file_handler] if file_handler is not None else []
+        for extra_handler in extra_handlers:
+            extra_handler.setFormatter(formatter)
         
-        # Add handler to root logger
-        root_logger.addHandler(handler)
+        # Add filters to handlers
+        for added_handler in [handler, *extra_handlers]:
+            added_handler.addFilter(run_context_filter)
+            added_handler.addFilter(sensitive_filter)
+        
+        # Add handlers to root logger, behind a bounded queue so callers never wait for
+        # formatting, redaction, compression or network shipping
+        if LOG_QUEUE_SETTINGS['ENABLED']:
+            start_queue_listener(root_logger, handler, run_context_filter, extra_handlers)
+        else:
+            root_logger.addHandler(handler)
+            for extra_handler in extra_handlers:
+                root_logger.addHandler(extra_handler)
         
         # Mark logging as initialized
         initialized = True
@@ -368,7 +952,6 @@ def setup_logging(log_level=None, use_cloud_logging=None):
         # Log successful setup
         logger = logging.getLogger(__name__)
         logger.info("Logging system initialized", extra={
-            'correlation_id': generate_correlation_id(),
             'context': {'log_level': log_level, 'use_cloud_logging': use_cloud_logging}
         })
         
@@ -380,6 +963,77 @@ def setup_logging(log_level=None, use_cloud_logging=None):
         return False
 
 
+def start_queue_listener(root_logger, handler, run_context_filter=None, extra_handlers=()):
+    """
+    Route root logger records through a bounded queue to a handler on a background thread.
+    
+    Args:
+        root_logger (logging.Logger): Root logger receiving the queue handler
+        handler (logging.Handler): Handler formatting and shipping the records
+        run_context_filter (RunContextFilter): Filter applied before records are queued,
+            while still on the thread that logged them
+        extra_handlers (list): Further handlers receiving the records, e.g. the log file handler
+    """
+    global _queue_handler, _queue_listener, _queue_logger
+    
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SETTINGS['MAX_SIZE'])
+    _queue_handler = DroppingQueueHandler(log_queue)
+    if run_context_filter is not None:
+        _queue_handler.addFilter(run_context_filter)
+    _queue_listener = BatchQueueListener(log_queue, handler, *extra_handlers, batch_size=LOG_QUEUE_SETTINGS['BATCH_SIZE'])
+    _queue_listener.start()
+    _queue_logger = root_logger
+    root_logger.addHandler(_queue_handler)
+
+
+def get_dropped_log_count():
+    """
+    Get the number of records dropped because the log queue was full.
+    
+    Returns:
+        int: Dropped records since logging was set up
+    """
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def shutdown_logging():
+    """
+    Drain the log queue and stop the background listener.
+    
+    Every record queued so far is handled and flushed before this returns; records
+    logged afterwards are handled synchronously by the same handlers. Safe to call more
+    than once (it also runs at interpreter exit).
+    """
+    global _queue_handler, _queue_listener, _queue_logger
+    
+    if _queue_listener is None:
+        return
+    
+    queue_handler, listener, root_logger = _queue_handler, _queue_listener, _queue_logger
+    _queue_handler = _queue_listener = _queue_logger = None
+    
+    # Handle everything still queued, then stop the listener thread
+    listener.stop()
+    
+    # Hand the root logger back to the real handlers so late records are not lost
+    root_logger.removeHandler(queue_handler)
+    for handler in listener.handlers:
+        root_logger.addHandler(handler)
+    
+    if queue_handler.dropped:
+        logging.getLogger(__name__).warning(
+            f"Dropped {queue_handler.dropped} log records because the log queue was full",
+            extra={'correlation_id': 'unknown', 'context': {'max_queue_size': queue_handler.queue.maxsize}}
+        )
+    
+    # Streams may already be closed at interpreter exit
+    listener.flush_handlers()
+
+
+# Drain queued records even when the process exits without calling shutdown_logging
+atexit.register(shutdown_logging)
+
+
 def get_logger(name):
     """
     Get a configured logger for a specific component.
@@ -399,8 +1053,5 @@ def get_logger(name):
     # Get the named logger
     logger = logging.getLogger(name)
     
-    # Wrap with context adapter
-    return ContextAdapter(logger, {
-        'correlation_id': generate_correlation_id(),
-        'context': {}
-    })
\ No newline at end of file
+    # Wrap with context adapter (records get the correlation ID of the run context)
+    return ContextAdapter(logger, {'context': {}})
\ No newline at end of file
@@ -32,6 +32,24 @@ APP_SETTINGS = {
     "EMAIL_SENDER": 'njdifiore@gmail.com'
 }
 
+# Background logging settings (records are formatted, redacted and shipped by a listener thread)
+LOG_QUEUE_SETTINGS = {
+    "ENABLED": os.getenv('LOG_QUEUE_ENABLED', 'true').lower() == 'true',
+    "MAX_SIZE": int(os.getenv('LOG_QUEUE_MAX_SIZE', '10000')),  # Records beyond this are dropped and counted
+    "BATCH_SIZE": int(os.getenv('LOG_QUEUE_BATCH_SIZE', '100'))  # Records handled between handler flushes
+}
+
+# Log file settings (disabled unless LOG_FILE is set; the file is rotated by size and age and
+# rotated files are compressed in the background)
+LOG_FILE_SETTINGS = {
+    "PATH": os.getenv('LOG_FILE', ''),
+    "MAX_BYTES": int(os.getenv('LOG_FILE_MAX_BYTES', str(50 * 1024 * 1024))),
+    "INTERVAL_HOURS": int(os.getenv('LOG_FILE_INTERVAL_HOURS', '24')),  # 0 rotates by size only
+    "BACKUP_COUNT": int(os.getenv('LOG_FILE_BACKUP_COUNT', '30')),
+    "RETENTION_DAYS": int(os.getenv('LOG_FILE_RETENTION_DAYS', '30')),
+    "COMPRESSION": os.getenv('LOG_COMPRESSION', 'gzip')  # gzip, zstd or none
+}
+
 # API integration settings
 API_SETTINGS = {
     "CAPITAL_ONE": {
@@ -68,6 +86,84 @@ RETRY_SETTINGS = {
     "RETRIABLE_STATUS_CODES": [429, 500, 502, 503, 504]  # HTTP status codes to retry
 }
 
+# Run-wide deadline and retry budget shared by every nested retry (stage timeouts bound each stage)
+DEADLINE_SETTINGS = {
+    "RUN_TIMEOUT": float(os.getenv('RUN_TIMEOUT', '1800')),  # Seconds before retries stop for the whole run
+    "RUN_RETRY_BUDGET": int(os.getenv('RUN_RETRY_BUDGET', '20')),  # Retries allowed across all API calls in a run
+    "STAGE_TIMEOUTS": {
+        stage: float(os.getenv(f'STAGE_TIMEOUT_{stage.upper()}', default))
+        for stage, default in (('retriever', '300'), ('categorizer', '300'), ('analyzer', '120'),
+                               ('insight', '300'), ('report', '300'), ('savings', '300'))
+    }
+}
+
+# Report chart rendering settings
+CHART_SETTINGS = {
+    "RENDER_WORKERS": int(os.getenv('CHART_RENDER_WORKERS', '2')),  # 0 renders charts in-process
+    "CACHE_ENABLED": os.getenv('CHART_CACHE_ENABLED', 'true').lower() == 'true'
+}
+
+# Report email settings
+EMAIL_SETTINGS = {
+    "MAX_IMAGE_BYTES": int(os.getenv('EMAIL_MAX_IMAGE_BYTES', '0')),  # PNG size budget per chart, 0 sends charts unchanged
+    "BATCH_SIZE": int(os.getenv('EMAIL_BATCH_SIZE', '10')),  # Requests per Gmail batch call (Gmail allows up to 100)
+    # Households receiving their own copy of the report, e.g. "a@example.com,b@example.com;c@example.com"
+    "RECIPIENT_GROUPS": [
+        [address.strip() for address in group.split(',') if address.strip()]
+        for group in os.getenv('EMAIL_RECIPIENT_GROUPS', '').split(';') if group.strip()
+    ],
+    "DELIVERY_POLL_ATTEMPTS": int(os.getenv('EMAIL_DELIVERY_POLL_ATTEMPTS', '6')),
+    "DELIVERY_POLL_DELAY": float(os.getenv('EMAIL_DELIVERY_POLL_DELAY', '2')),  # Seconds before the first poll, doubled after each
+    "DELIVERY_WAIT_TIMEOUT": float(os.getenv('EMAIL_DELIVERY_WAIT_TIMEOUT', '120'))  # Seconds main waits for pending checks at exit
+}
+
+# Background verification of savings transfers
+TRANSFER_WATCH_SETTINGS = {
+    # Must be a mounted volume or bucket in Cloud Run; the container-local default is lost after each execution
+    "DIR": os.getenv('TRANSFER_WATCH_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'transfers')),
+    "POLL_DELAY": float(os.getenv('TRANSFER_POLL_DELAY', '5')),  # Seconds before the first status check, doubled after each
+    "MAX_POLL_DELAY": float(os.getenv('TRANSFER_MAX_POLL_DELAY', '60')),
+    "DEADLINE": float(os.getenv('TRANSFER_WATCH_DEADLINE', '600')),  # Seconds a run keeps polling a transfer
+    "EXIT_WAIT_TIMEOUT": float(os.getenv('TRANSFER_EXIT_WAIT_TIMEOUT', '120')),  # Seconds main waits for pending checks at exit
+    "EXPIRY_DAYS": int(os.getenv('TRANSFER_WATCH_EXPIRY_DAYS', '14'))  # Persisted transfers older than this are dropped
+}
+
+# Record/replay settings for API client traffic
+CASSETTE_SETTINGS = {
+    "MODE": os.getenv('API_CASSETTE_MODE', 'off'),  # off, record or replay
+    "DIR": os.getenv('API_CASSETTE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cassettes')),
+    "REPLAY_SPEED": os.getenv('API_CASSETTE_REPLAY_SPEED', 'max')  # original or max
+}
+
+# Pipeline stage checkpoint settings (used to resume partially failed runs)
+CHECKPOINT_SETTINGS = {
+    "ENABLED": os.getenv('CHECKPOINTS_ENABLED', 'true').lower() == 'true',
+    "DIR": os.getenv('CHECKPOINT_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'checkpoints'))
+}
+
+# Authentication token cache settings (file keeps tokens encrypted across runs, requires TOKEN_CACHE_KEY)
+TOKEN_CACHE_SETTINGS = {
+    "BACKEND": os.getenv('TOKEN_CACHE_BACKEND', 'memory'),  # memory or file
+    # Must be on a mounted volume or bucket in Cloud Run; the container-local default is lost after each execution
+    "PATH": os.getenv('TOKEN_CACHE_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'tokens', 'token_cache.bin')),
+    "KEY": os.getenv('TOKEN_CACHE_KEY'),  # Fernet key used to encrypt the token file
+    "REFRESH_MARGIN": int(os.getenv('TOKEN_REFRESH_MARGIN', '300'))  # Seconds before expiry to refresh in the background
+}
+
+# Circuit breaker state settings (sqlite shares circuits between the job and maintenance scripts)
+CIRCUIT_BREAKER_SETTINGS = {
+    "BACKEND": os.getenv('CIRCUIT_BREAKER_BACKEND', 'memory'),  # memory or sqlite
+    "PATH": os.getenv('CIRCUIT_BREAKER_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'circuit_breakers.db')),
+    "LOCK_TIMEOUT": float(os.getenv('CIRCUIT_BREAKER_LOCK_TIMEOUT', '5'))  # Seconds to wait for another process
+}
+
+
+# Health check settings (healthy results are cached so repeated checks within the TTL do not probe the APIs)
+HEALTH_CHECK_SETTINGS = {
+    "TIMEOUT": float(os.getenv('HEALTH_CHECK_TIMEOUT', '20')),  # Seconds each probe may take
+    "CACHE_TTL": float(os.getenv('HEALTH_CHECK_CACHE_TTL', '300')),  # Seconds a healthy result is reused
+    "CACHE_FILE": os.getenv('HEALTH_CHECK_CACHE_FILE', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'health_check_cache.json'))
+}
 
 def get_env_var(var_name, default=None):
     """
@@ -19,10 +19,15 @@ from components.transaction_retriever import TransactionRetriever  # Import the
 from components.transaction_categorizer import TransactionCategorizer  # Import the TransactionCategorizer class
 from components.budget_analyzer import BudgetAnalyzer  # Import the BudgetAnalyzer class
 from components.insight_generator import InsightGenerator  # Import the InsightGenerator class
-from components.report_distributor import ReportDistributor  # Import the ReportDistributor class
+from components.report_distributor import ReportDistributor, wait_for_pending_deliveries  # Import the ReportDistributor class and background delivery checks
 from components.savings_automator import SavingsAutomator  # Import the SavingsAutomator class
-from config.settings import APP_SETTINGS, initialize_settings  # Import application settings and initialization function
-from services.logging_service import initialize_logging, get_component_logger, LoggingContext, PerformanceLogger  # Import logging utilities
+from config.settings import APP_SETTINGS, CASSETTE_SETTINGS, CHECKPOINT_SETTINGS, DEADLINE_SETTINGS, initialize_settings  # Import application settings and initialization function
+from api_clients.cassette import use_cassette  # Import record/replay support for API traffic
+from services.checkpoint_service import CheckpointStore, validate_correlation_id  # Import stage checkpointing for resumable runs
+from services.transfer_watch_service import wait_for_pending_transfers  # Import background transfer verification
+from services.health_check_service import run_health_checks, get_integration_probes  # Import concurrent health checks
+from utils.error_handlers import retry_budget  # Import the run-wide retry budget
+from services.logging_service import initialize_logging, shutdown_logging, get_component_logger, LoggingContext, PerformanceLogger, run_context  # Import logging utilities
 
 # Initialize logger for this module
 logger = get_component_logger('main')
@@ -57,35 +62,130 @@ def setup_application() -> bool:
         return False
 
 
-def check_system_health() -> Dict:
+def check_system_health(use_cache: bool = True) -> Dict:
     """
-    Checks the health of all system components and their integrations.
+    Checks the health of every external integration concurrently.
+
+    Args:
+        use_cache: Whether results of a recent health check may be reused
 
     Returns:
-        Dict: Health status of all components and integrations
+        Dict: Health status and latency of each integration
     """
-    health_status: Dict[str, Any] = {}
-
-    # Instantiate each component
-    for ComponentClass in COMPONENTS:
-        try:
-            component = ComponentClass()
-            health_status[ComponentClass.__name__] = component.check_health()
-        except Exception as e:
-            logger.error(f"Failed to instantiate {ComponentClass.__name__}: {str(e)}")
-            health_status[ComponentClass.__name__] = {'status': 'error', 'message': str(e)}
+    # Probe all integrations at once with one shared authentication service, instead of
+    # instantiating every component and re-authenticating for each of them
+    health_status = run_health_checks(get_integration_probes(), use_cache=use_cache)
 
     # Log overall system health status
     logger.info(f"System health check completed: {health_status}")
     return health_status
 
 
-def run_budget_management_process(correlation_id: Optional[str] = None) -> Dict:
+def execute_stage(stage: str, component_factory: Any, previous_status: Optional[Dict], correlation_id: str,
+                  checkpoints: Optional[CheckpointStore] = None) -> Dict:
+    """
+    Executes a single pipeline stage, reusing its checkpointed output when available.
+
+    Args:
+        stage: Stage name used as the status and checkpoint key
+        component_factory: Component class to instantiate when the stage must run
+        previous_status: Status returned by the stage this one depends on (None for the first stage),
+            passed with the stage's partial output from a previous attempt as 'previous_attempt'
+        correlation_id: Unique identifier for this execution
+        checkpoints: Optional checkpoint store for this run
+
+    Returns:
+        Dict: Status returned by the stage (or restored from its checkpoint)
+    """
+    component_name = component_factory.__name__
+
+    # Reuse the stored output of a stage that completed in a previous attempt
+    if checkpoints is not None and checkpoints.is_stage_complete(stage):
+        stage_status = checkpoints.load_stage(stage)
+        report = stage_status.get('report') if isinstance(stage_status, dict) else None
+        if report is not None and getattr(report, 'chart_files', None):
+            report.chart_files = [checkpoints.get_artifact_path(stage, path) for path in report.chart_files]
+        logger.info(f"Skipping {component_name}, restored from checkpoint", extra={'correlation_id': correlation_id})
+        return stage_status
+
+    # A stage that did part of its work in a previous attempt continues from where it stopped
+    previous_attempt = checkpoints.load_partial_stage(stage) if checkpoints is not None else None
+    if previous_attempt is not None and previous_status is not None:
+        logger.info(f"Resuming {component_name} from a partial checkpoint", extra={'correlation_id': correlation_id})
+        previous_status = dict(previous_status, previous_attempt=previous_attempt)
+
+    # Retries inside the stage stop at the stage timeout (or the run deadline, if earlier); records
+    # logged by the component, including its worker threads, carry the run's correlation ID and stage
+    with run_context(correlation_id=correlation_id, stage=stage), \
+            LoggingContext(logger, f"{component_name}.execute", correlation_id=correlation_id) as log_ctx, \
+            retry_budget(timeout=DEADLINE_SETTINGS['STAGE_TIMEOUTS'].get(stage)) as budget:
+        component = component_factory()
+        stage_status = component.execute() if previous_status is None else component.execute(previous_status)
+        log_ctx.update_context(stage_status)
+
+    if budget.is_expired():
+        logger.warning(f"{component_name} ran past its deadline, retries were skipped", extra={'correlation_id': correlation_id})
+
+    if checkpoints is not None:
+        report = stage_status.get('report')
+        artifacts = list(getattr(report, 'chart_files', []) or []) if report is not None else None
+        try:
+            checkpoints.save_stage(stage, stage_status, artifacts=artifacts)
+        except Exception as e:
+            # A checkpoint failure must never fail the run itself, but is reported in the run status
+            checkpoints.write_failures[stage] = str(e)
+            logger.warning(f"Failed to save checkpoint for {component_name}: {str(e)}", extra={'correlation_id': correlation_id})
+
+    return stage_status
+
+
+def prepare_checkpoints(correlation_id: str, resume: bool, status: Dict) -> Optional[CheckpointStore]:
+    """
+    Sets up per-stage checkpoints so a partially failed run can be resumed.
+
+    Args:
+        correlation_id: Unique identifier for this execution
+        resume: Whether to skip stages completed by a previous attempt with the same correlation_id
+        status: Run status dictionary, updated with the resumed stages and the stages whose
+            checkpoint could not be written ('checkpoint_failures')
+
+    Returns:
+        Optional[CheckpointStore]: Checkpoint store for this run, or None if checkpoints are disabled
+
+    Raises:
+        ValueError: If resuming with a correlation_id that is not a valid checkpoint directory name
+    """
+    if not (CHECKPOINT_SETTINGS['ENABLED'] or resume):
+        return None
+
+    try:
+        checkpoints = CheckpointStore(correlation_id)
+    except ValueError as e:
+        if resume:
+            raise
+        logger.warning(f"Checkpoints disabled for this run: {str(e)}", extra={'correlation_id': correlation_id})
+        return None
+
+    status['checkpoint_failures'] = checkpoints.write_failures
+    if resume:
+        completed = checkpoints.get_completed_stages()
+        status['resumed_stages'] = completed
+        logger.info(f"Resuming run {correlation_id} (week {checkpoints.week}), completed stages: {completed}",
+                    extra={'correlation_id': correlation_id})
+    elif checkpoints.exists():
+        # A fresh run must not silently reuse outputs from an earlier attempt
+        checkpoints.clear()
+
+    return checkpoints
+
+
+def run_budget_management_process(correlation_id: Optional[str] = None, resume: bool = False) -> Dict:
     """
     Executes the complete budget management workflow.
 
     Args:
         correlation_id: Unique identifier for this execution
+        resume: Whether to skip stages completed by a previous attempt with the same correlation_id
 
     Returns:
         Dict: Final execution status with results from all components
@@ -102,81 +202,67 @@ def run_budget_management_process(correlation_id: Optional[str] = None) -> Dict:
     # Initialize status dictionary with correlation_id
     status: Dict[str, Any] = {'correlation_id': correlation_id}
 
-    # Create component instances in the correct execution order
-    transaction_retriever = TransactionRetriever()
-    transaction_categorizer = TransactionCategorizer()
-    budget_analyzer = BudgetAnalyzer()
-    insight_generator = InsightGenerator()
-    report_distributor = ReportDistributor()
-    savings_automator = SavingsAutomator()
+    # Set up per-stage checkpoints so a partially failed run can be resumed
+    checkpoints = prepare_checkpoints(correlation_id, resume, status)
 
     # Execute TransactionRetriever and update status with results
-    with LoggingContext(logger, "TransactionRetriever.execute", {'correlation_id': correlation_id}) as log_ctx:
-        retriever_status = transaction_retriever.execute()
-        status['retriever'] = retriever_status
-        log_ctx.update_context(retriever_status)
+    retriever_status = execute_stage('retriever', TransactionRetriever, None, correlation_id, checkpoints)
+    status['retriever'] = retriever_status
 
-        # If TransactionRetriever fails, log error and return failure status
-        if retriever_status.get('status') == 'error':
-            logger.error("TransactionRetriever failed", extra={'correlation_id': correlation_id, 'status': retriever_status})
-            perf_logger.stop()
-            return status
+    # If TransactionRetriever fails, log error and return failure status
+    if retriever_status.get('status') == 'error':
+        logger.error("TransactionRetriever failed", extra={'correlation_id': correlation_id, 'status': retriever_status})
+        perf_logger.stop()
+        return status
 
     # Execute TransactionCategorizer with previous status and update status
-    with LoggingContext(logger, "TransactionCategorizer.execute", {'correlation_id': correlation_id}) as log_ctx:
-        categorizer_status = transaction_categorizer.execute(retriever_status)
-        status['categorizer'] = categorizer_status
-        log_ctx.update_context(categorizer_status)
+    categorizer_status = execute_stage('categorizer', TransactionCategorizer, retriever_status, correlation_id, checkpoints)
+    status['categorizer'] = categorizer_status
 
-        # If TransactionCategorizer fails, log error and return failure status
-        if categorizer_status.get('status') == 'error':
-            logger.error("TransactionCategorizer failed", extra={'correlation_id': correlation_id, 'status': categorizer_status})
-            perf_logger.stop()
-            return status
+    # If TransactionCategorizer fails, log error and return failure status
+    if categorizer_status.get('status') == 'error':
+        logger.error("TransactionCategorizer failed", extra={'correlation_id': correlation_id, 'status': categorizer_status})
+        perf_logger.stop()
+        return status
 
     # Execute BudgetAnalyzer with previous status and update status
-    with LoggingContext(logger, "BudgetAnalyzer.execute", {'correlation_id': correlation_id}) as log_ctx:
-        analyzer_status = budget_analyzer.execute(categorizer_status)
-        status['analyzer'] = analyzer_status
-        log_ctx.update_context(analyzer_status)
+    analyzer_status = execute_stage('analyzer', BudgetAnalyzer, categorizer_status, correlation_id, checkpoints)
+    status['analyzer'] = analyzer_status
 
-        # If BudgetAnalyzer fails, log error and return failure status
-        if analyzer_status.get('status') == 'error':
-            logger.error("BudgetAnalyzer failed", extra={'correlation_id': correlation_id, 'status': analyzer_status})
-            perf_logger.stop()
-            return status
+    # If BudgetAnalyzer fails, log error and return failure status
+    if analyzer_status.get('status') == 'error':
+        logger.error("BudgetAnalyzer failed", extra={'correlation_id': correlation_id, 'status': analyzer_status})
+        perf_logger.stop()
+        return status
 
     # Execute InsightGenerator with previous status and update status
-    with LoggingContext(logger, "InsightGenerator.execute", {'correlation_id': correlation_id}) as log_ctx:
-        insight_status = insight_generator.execute(analyzer_status)
-        status['insight'] = insight_status
-        log_ctx.update_context(insight_status)
+    insight_status = execute_stage('insight', InsightGenerator, analyzer_status, correlation_id, checkpoints)
+    status['insight'] = insight_status
 
-        # If InsightGenerator fails, log error and return failure status
-        if insight_status.get('status') == 'error':
-            logger.error("InsightGenerator failed", extra={'correlation_id': correlation_id, 'status': insight_status})
-            perf_logger.stop()
-            return status
+    # If InsightGenerator fails, log error and return failure status
+    if insight_status.get('status') == 'error':
+        logger.error("InsightGenerator failed", extra={'correlation_id': correlation_id, 'status': insight_status})
+        perf_logger.stop()
+        return status
 
     # Execute ReportDistributor with previous status and update status
-    with LoggingContext(logger, "ReportDistributor.execute", {'correlation_id': correlation_id}) as log_ctx:
-        report_status = report_distributor.execute(insight_status)
-        status['report'] = report_status
-        log_ctx.update_context(report_status)
+    report_status = execute_stage('report', ReportDistributor, insight_status, correlation_id, checkpoints)
+    status['report'] = report_status
 
-        # If ReportDistributor fails, log warning but continue (non-critical)
-        if report_status.get('status') == 'error':
-            logger.warning("ReportDistributor failed", extra={'correlation_id': correlation_id, 'status': report_status})
+    # If ReportDistributor fails, log warning but continue (non-critical)
+    if report_status.get('status') == 'error':
+        logger.warning("ReportDistributor failed", extra={'correlation_id': correlation_id, 'status': report_status})
+    elif report_status.get('status') == 'partial':
+        logger.warning(f"Report not sent to recipient groups {report_status.get('failed_recipient_groups')}; "
+                       f"resuming this run sends it to those groups only", extra={'correlation_id': correlation_id})
 
     # Execute SavingsAutomator with previous status and update status
-    with LoggingContext(logger, "SavingsAutomator.execute", {'correlation_id': correlation_id}) as log_ctx:
-        savings_status = savings_automator.execute(analyzer_status)
-        status['savings'] = savings_status
-        log_ctx.update_context(savings_status)
+    savings_status = execute_stage('savings', SavingsAutomator, analyzer_status, correlation_id, checkpoints)
+    status['savings'] = savings_status
 
-        # If SavingsAutomator fails, log warning but continue (non-critical)
-        if savings_status.get('status') == 'error':
-            logger.warning("SavingsAutomator failed", extra={'correlation_id': correlation_id, 'status': savings_status})
+    # If SavingsAutomator fails, log warning but continue (non-critical)
+    if savings_status.get('status') == 'error':
+        logger.warning("SavingsAutomator failed", extra={'correlation_id': correlation_id, 'status': savings_status})
 
     # Stop the performance timer and log total execution time
     total_time = perf_logger.stop()
@@ -195,8 +281,13 @@ def parse_arguments() -> argparse.Namespace:
     """
     parser = argparse.ArgumentParser(description="Run the Budget Management Application")
     parser.add_argument('--check-health', action='store_true', help='Run system health check')
-    parser.add_argument('--correlation-id', type=str, help='Provide a custom correlation ID')
+    parser.add_argument('--refresh-health', action='store_true', help='Ignore cached health check results')
+    parser.add_argument('--correlation-id', type=str, default=os.getenv('CORRELATION_ID'), help='Provide a custom correlation ID')
+    parser.add_argument('--resume', type=str, metavar='CORRELATION_ID', default=os.getenv('RESUME_CORRELATION_ID'), help='Resume a failed run from its first incomplete stage')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    parser.add_argument('--record-cassette', action='store_true', help='Record all API traffic into a cassette keyed by correlation ID')
+    parser.add_argument('--replay-cassette', type=str, metavar='CORRELATION_ID', help='Replay API traffic from the cassette recorded for a correlation ID')
+    parser.add_argument('--replay-speed', choices=['original', 'max'], default=CASSETTE_SETTINGS['REPLAY_SPEED'], help='Replay with recorded latencies or as fast as possible')
     return parser.parse_args()
 
 
@@ -218,18 +309,47 @@ def main() -> int:
 
         # If --check-health argument is provided, run system health check
         if args.check_health:
-            health_status = check_system_health()
+            health_status = check_system_health(use_cache=not args.refresh_health)
             logger.info(f"System health check results: {health_status}")
 
-            # Exit with code 0 if all components are healthy, 1 otherwise
+            # Exit with code 0 if all integrations are healthy, 1 otherwise
             if all(status.get('status') == 'healthy' for status in health_status.values() if isinstance(status, dict)):
                 return 0
             else:
                 return 1
 
-        # If normal execution, run run_budget_management_process() with correlation_id
-        results = run_budget_management_process(args.correlation_id)
+        # Determine record/replay mode for API traffic (replay reuses the recorded correlation_id)
+        cassette_mode = CASSETTE_SETTINGS['MODE']
+        correlation_id = args.resume or args.correlation_id
+        if args.replay_cassette:
+            cassette_mode = 'replay'
+            correlation_id = args.replay_cassette
+        elif args.record_cassette:
+            cassette_mode = 'record'
+        correlation_id = correlation_id or str(uuid.uuid4())
+
+        # The resumed correlation_id names the checkpoint directory to read from
+        if args.resume:
+            try:
+                validate_correlation_id(args.resume)
+            except ValueError as e:
+                logger.error(str(e))
+                return 1
+
+        # If normal execution, run run_budget_management_process() with correlation_id, bounding the
+        # retries of every stage by one run-wide deadline and retry budget
+        with run_context(correlation_id=correlation_id), \
+                use_cassette(correlation_id, mode=cassette_mode, replay_speed=args.replay_speed), \
+                retry_budget(timeout=DEADLINE_SETTINGS['RUN_TIMEOUT'], max_retries=DEADLINE_SETTINGS['RUN_RETRY_BUDGET']):
+            results = run_budget_management_process(correlation_id, resume=bool(args.resume))
+
+            # Let background email delivery and transfer checks record their final status before exiting
+            wait_for_pending_deliveries()
+            wait_for_pending_transfers()
         logger.info(f"Execution results: {results}")
+        if results.get('checkpoint_failures'):
+            logger.warning(f"Checkpoints could not be saved for stages {sorted(results['checkpoint_failures'])}; "
+                           f"resuming this run will re-run them", extra={'correlation_id': correlation_id})
 
         # Return exit code 0 if successful, 1 if failed
         if results.get('status') == 'error':
@@ -241,6 +361,10 @@ def main() -> int:
         logger.critical(f"Unhandled exception in main: {str(e)}", exc_info=True)
         return 1
 
+    finally:
+        # Write out every log record still queued for the background listener before exiting
+        shutdown_logging()
+
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
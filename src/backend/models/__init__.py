@@ -26,7 +26,7 @@ from .budget import (
 
 # Import Transfer model for fund transfers
 from .transfer import (
-    Transfer, create_transfer, create_transfer_from_capital_one_response
+    Transfer, create_transfer, create_transfer_from_capital_one_response, create_transfer_from_dict
 )
 
 # Import Report model for budget reports
@@ -46,7 +46,7 @@ __all__ = [
     "group_transactions_by_category", "calculate_category_totals",
     "Budget", "create_budget", "create_budget_from_sheet_data",
     "calculate_category_variances", "calculate_transfer_amount",
-    "Transfer", "create_transfer", "create_transfer_from_capital_one_response",
+    "Transfer", "create_transfer", "create_transfer_from_capital_one_response", "create_transfer_from_dict",
     "Report", "create_report", "create_report_with_insights",
     "create_report_with_charts", "create_complete_report"
 ]
\ No newline at end of file
@@ -6,13 +6,14 @@ providing methods for generating email content for the weekly budget report.
 """
 
 import os  # standard library
-import base64  # standard library
 import logging  # standard library
+from datetime import datetime  # standard library
 from typing import List, Dict, Optional  # standard library
 
 from .budget import Budget
 from ..utils.formatters import format_currency, format_percentage
-from ..config.settings import EMAIL_TEMPLATE_PATH
+from ..utils.date_utils import format_iso_date, EST_TIMEZONE
+from ..templates import get_email_template
 from ..utils.error_handlers import ValidationError
 
 # Set up logger
@@ -34,6 +35,8 @@ class Report:
         self.chart_files = []
         self.email_body = None
         self.email_subject = None
+        self._budget_data = None
+        self._formatted_analysis = None
         
         logger.debug(f"Created report for budget: {budget}")
     
@@ -103,36 +106,17 @@ class Report:
         
         logger.debug(f"Added {len(chart_file_paths)} charts to report")
     
-    def encode_chart_for_email(self, chart_file_path: str) -> str:
+    def get_budget_data(self) -> Dict:
         """
-        Encode a chart image as base64 for embedding in HTML email
+        Get the budget analysis as a dictionary, converted once per report
         
-        Args:
-            chart_file_path (str): Path to chart image file
-            
         Returns:
-            str: Base64 encoded image data
+            dict: Dictionary with budget data
         """
-        if not os.path.exists(chart_file_path):
-            logger.warning(f"Chart file not found for encoding: {chart_file_path}")
-            raise ValidationError(f"Chart file not found: {chart_file_path}", "chart_file")
-        
-        try:
-            with open(chart_file_path, 'rb') as img_file:
-                img_data = img_file.read()
-                
-            encoded = base64.b64encode(img_data).decode('utf-8')
-            
-            # Get file extension from path
-            file_ext = os.path.splitext(chart_file_path)[1].lower().lstrip('.')
-            if not file_ext or file_ext not in ['png', 'jpg', 'jpeg', 'gif']:
-                file_ext = 'png'  # Default to PNG if extension not recognized
-            
-            return f"data:image/{file_ext};base64,{encoded}"
+        if self._budget_data is None:
+            self._budget_data = self.budget.to_dict()
         
-        except Exception as e:
-            logger.error(f"Error encoding chart file {chart_file_path}: {str(e)}")
-            raise ValidationError(f"Error encoding chart: {str(e)}", "chart_encoding")
+        return self._budget_data
     
     def format_budget_status(self) -> str:
         """
@@ -141,19 +125,10 @@ class Report:
         Returns:
             str: Formatted budget status HTML
         """
-        total_variance = self.budget.total_variance
-        
-        # Determine status class (surplus or deficit)
-        status_class = "surplus" if total_variance >= 0 else "deficit"
-        
-        # Format variance amount
-        formatted_variance = format_currency(abs(total_variance))
-        
-        # Create status text
-        status_text = "under budget" if total_variance >= 0 else "over budget"
+        analysis = self.get_formatted_analysis()
         
         # Return formatted HTML
-        return f'<span class="{status_class}">{formatted_variance} {status_text}</span>'
+        return f'<span class="{analysis["status_class"]}">{analysis["variance_amount"]} {analysis["status_text"]}</span>'
     
     def format_category_details(self) -> str:
         """
@@ -162,11 +137,22 @@ class Report:
         Returns:
             str: Formatted category details HTML
         """
-        budget_data = self.budget.to_dict()
-        category_analysis = budget_data.get('category_analysis', {})
+        return self.get_formatted_analysis()['category_details']
+    
+    def get_formatted_analysis(self) -> Dict[str, str]:
+        """
+        Format the budget analysis for the email template, once per report
         
-        html_content = ""
+        Returns:
+            dict: Formatted template values that depend only on the budget analysis
+        """
+        if self._formatted_analysis is not None:
+            return self._formatted_analysis
+        
+        total_variance = self.budget.total_variance
+        category_analysis = self.get_budget_data().get('category_analysis', {})
         
+        category_blocks = []
         for category, details in category_analysis.items():
             budget_amount = details.get('budget_amount', 0)
             actual_amount = details.get('actual_amount', 0)
@@ -192,8 +178,7 @@ class Report:
             # Format status text
             status_text = "over budget" if is_over_budget else "under budget"
             
-            # Add to HTML content
-            html_content += f"""
+            category_blocks.append(f"""
             <div class="category {category_class}">
                 <div class="category-name">{category}</div>
                 <div class="category-details">
@@ -202,9 +187,59 @@ class Report:
                     Variance: {variance_sign}{formatted_variance} ({formatted_percentage}) {status_text}
                 </div>
             </div>
-            """
+            """)
+        
+        self._formatted_analysis = {
+            # Status class (surplus or deficit) and text for the header
+            'status_class': "surplus" if total_variance >= 0 else "deficit",
+            'variance_amount': format_currency(abs(total_variance)),
+            'status_text': "under budget" if total_variance >= 0 else "over budget",
+            'category_details': ''.join(category_blocks),
+            'report_date': format_iso_date(datetime.now(EST_TIMEZONE))
+        }
         
-        return html_content
+        return self._formatted_analysis
+    
+    def format_charts_content(self) -> str:
+        """
+        Format the chart images for display in email
+        
+        Returns:
+            str: Formatted charts HTML
+        """
+        # Reference the inline attachments by Content-ID so each chart is only
+        # encoded once (as the image_<index> attachment)
+        charts_content = ""
+        for i, chart_file in enumerate(self.chart_files):
+            if not os.path.exists(chart_file):
+                logger.warning(f"Chart file not found for email: {chart_file}")
+                continue
+            chart_id = f"chart_{i}"
+            charts_content += f'<div class="chart-container"><img src="cid:image_{i}" id="{chart_id}" alt="Budget Chart" style="max-width: 100%;"></div>'
+        
+        if not charts_content:
+            charts_content = "<p>No charts available for this week.</p>"
+        
+        return charts_content
+    
+    def render_email_body(self, overrides: Optional[Dict[str, str]] = None) -> str:
+        """
+        Render the HTML email body with the compiled email template
+        
+        Args:
+            overrides (dict): Optional template values replacing the report's own,
+                e.g. per-recipient insights for personalized reports
+            
+        Returns:
+            str: Complete HTML email body
+        """
+        values = dict(self.get_formatted_analysis())
+        values['charts_content'] = self.format_charts_content()
+        values['ai_generated_insights'] = self.insights if self.insights else "No insights available for this week."
+        if overrides:
+            values.update(overrides)
+        
+        return get_email_template().render(values)
     
     def generate_email_body(self) -> str:
         """
@@ -218,53 +253,15 @@ class Report:
             return self.email_body
         
         try:
-            # Load email template
-            if not os.path.exists(EMAIL_TEMPLATE_PATH):
-                logger.error(f"Email template not found: {EMAIL_TEMPLATE_PATH}")
-                raise ValidationError(f"Email template not found: {EMAIL_TEMPLATE_PATH}", "email_template")
-            
-            with open(EMAIL_TEMPLATE_PATH, 'r') as template_file:
-                template = template_file.read()
-            
-            # Format budget status
-            budget_status = self.format_budget_status()
-            
-            # Format category details
-            category_details = self.format_category_details()
-            
-            # Format insights
-            insights_content = self.insights if self.insights else "No insights available for this week."
-            
-            # Format charts
-            charts_content = ""
-            if self.chart_files:
-                for i, chart_file in enumerate(self.chart_files):
-                    try:
-                        encoded_chart = self.encode_chart_for_email(chart_file)
-                        chart_id = f"chart_{i}"
-                        charts_content += f'<div class="chart-container"><img src="{encoded_chart}" id="{chart_id}" alt="Budget Chart" style="max-width: 100%;"></div>'
-                    except Exception as e:
-                        logger.warning(f"Error encoding chart {chart_file}: {str(e)}")
-                        # Continue with other charts if one fails
-            
-            if not charts_content:
-                charts_content = "<p>No charts available for this week.</p>"
-            
-            # Replace placeholders in template
-            email_body = template.replace("{{budget_status}}", budget_status)
-            email_body = email_body.replace("{{charts_content}}", charts_content)
-            email_body = email_body.replace("{{insights_content}}", insights_content)
-            email_body = email_body.replace("{{category_details}}", category_details)
-            
             # Store for future use
-            self.email_body = email_body
+            self.email_body = self.render_email_body()
             
-            return email_body
+            return self.email_body
             
         except Exception as e:
             logger.error(f"Error generating email body: {str(e)}")
             # Provide a simple fallback
-            budget_data = self.budget.to_dict()
+            budget_data = self.get_budget_data()
             total_variance = budget_data.get('total_variance', 0)
             status = "under budget" if total_variance >= 0 else "over budget"
             fallback = f"""
@@ -332,7 +329,7 @@ class Report:
         Returns:
             dict: Dictionary with report data
         """
-        budget_dict = self.budget.to_dict()
+        budget_dict = self.get_budget_data()
         
         report_dict = {
             'budget': budget_dict,
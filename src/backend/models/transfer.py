@@ -277,4 +277,36 @@ def create_transfer_from_capital_one_response(response_data: Dict) -> Optional[T
             f"Error creating transfer from Capital One response: {str(e)}",
             extra={"response_data": response_data}
         )
-        return None
\ No newline at end of file
+        return None
+
+def create_transfer_from_dict(transfer_data: Dict) -> Optional[Transfer]:
+    """
+    Recreates a Transfer object from its to_dict() representation
+    
+    Args:
+        transfer_data: Dictionary produced by Transfer.to_dict()
+        
+    Returns:
+        Transfer: A Transfer instance with the stored data, or None if the data is invalid
+    """
+    try:
+        transfer = create_transfer(
+            amount=parse_amount(transfer_data.get('amount')),
+            source_account_id=transfer_data.get('source_account_id'),
+            destination_account_id=transfer_data.get('destination_account_id'),
+            transfer_id=transfer_data.get('transfer_id'),
+            status=transfer_data.get('status', 'pending')
+        )
+        
+        # Keep the original initiation time
+        if transfer and transfer_data.get('timestamp'):
+            transfer.timestamp = datetime.datetime.fromisoformat(transfer_data['timestamp'])
+        
+        return transfer
+    
+    except Exception as e:
+        logger.error(
+            f"Error creating transfer from dictionary: {str(e)}",
+            extra={"transfer_data": transfer_data}
+        )
+        return None
@@ -6,8 +6,9 @@ error handling, authentication, and data transformation services.
 
 # Import logging services
 from .logging_service import (
-    initialize_logging, get_component_logger, log_exception, with_logging,
-    mask_sensitive_data, LoggingContext, PerformanceLogger
+    initialize_logging, shutdown_logging, get_component_logger, log_exception, with_logging,
+    mask_sensitive_data, LoggingContext, PerformanceLogger, run_context, get_run_context,
+    bind_run_context, ContextThreadPoolExecutor
 )
 
 # Import error handling services
@@ -16,17 +17,36 @@ from .error_handling_service import (
     graceful_degradation, ErrorHandlingService, CircuitBreaker
 )
 
+# Import circuit breaker state stores
+from .circuit_breaker_store import MemoryCircuitStore, SQLiteCircuitStore, create_circuit_store
+
 # Import authentication service
 from .authentication_service import AuthenticationService
 
 # Import data transformation service
 from .data_transformation_service import DataTransformationService
 
+# Import pipeline checkpointing
+from .checkpoint_service import CheckpointStore, get_week_key, validate_correlation_id
+
+# Import background transfer verification
+from .transfer_watch_service import (
+    TransferWatcher, PendingTransferStore, resume_pending_transfers, wait_for_pending_transfers
+)
+
+# Import concurrent health checks
+from .health_check_service import HealthCheckCache, run_health_checks, get_integration_probes
+
 # Define what's available when using "from services import *"
 __all__ = [
-    "initialize_logging", "get_component_logger", "log_exception", "with_logging", 
-    "mask_sensitive_data", "LoggingContext", "PerformanceLogger",
+    "initialize_logging", "shutdown_logging", "get_component_logger", "log_exception", "with_logging", 
+    "mask_sensitive_data", "LoggingContext", "PerformanceLogger", "run_context", "get_run_context",
+    "bind_run_context", "ContextThreadPoolExecutor",
     "handle_error", "with_error_handling", "with_circuit_breaker", "with_fallback", 
     "graceful_degradation", "ErrorHandlingService", "CircuitBreaker",
-    "AuthenticationService", "DataTransformationService"
+    "MemoryCircuitStore", "SQLiteCircuitStore", "create_circuit_store",
+    "AuthenticationService", "DataTransformationService",
+    "CheckpointStore", "get_week_key", "validate_correlation_id",
+    "TransferWatcher", "PendingTransferStore", "resume_pending_transfers", "wait_for_pending_transfers",
+    "HealthCheckCache", "run_health_checks", "get_integration_probes"
 ]
\ No newline at end of file
@@ -9,14 +9,23 @@ Management Application.
 import os  # standard library
 import json  # standard library
 import time  # standard library
+import fcntl  # standard library
+import datetime  # standard library
+import threading  # standard library
 import requests  # requests 2.31.0+
 from typing import Dict, Optional, Any  # standard library
 import google.oauth2.service_account  # google-auth 2.22.0+
 import google.auth.transport.requests  # google-auth 2.22.0+
 import google.auth.exceptions  # google-auth 2.22.0+
 
-from ..config.settings import API_SETTINGS, get_secret, load_json_secret, get_api_credentials
-from ..config.logging_config import get_logger
+try:
+    from cryptography.fernet import Fernet, InvalidToken  # cryptography 41.0.0+ (encrypted token file)
+except ImportError:  # pragma: no cover - tokens are only cached in memory
+    Fernet = None
+    InvalidToken = Exception
+
+from ..config.settings import API_SETTINGS, TOKEN_CACHE_SETTINGS, get_secret, load_json_secret, get_api_credentials
+from ..config.logging_config import get_logger, bind_run_context
 from ..utils.error_handlers import (
     retry_with_backoff, handle_api_error, handle_auth_error,
     APIError, AuthenticationError
@@ -25,9 +34,169 @@ from ..utils.error_handlers import (
 # Set up logger
 logger = get_logger('authentication_service')
 
-# In-memory token cache
+# In-memory token cache, guarded by _token_lock and mirrored to the token file when enabled
 TOKEN_CACHE = {}
 TOKEN_EXPIRY = {}
+_token_lock = threading.RLock()
+_token_file = None
+_token_file_loaded = False
+
+# One lock per service so concurrent callers share a single authentication request
+_service_locks: Dict[str, threading.Lock] = {}
+
+# Background refreshes in progress, by service name
+_refresh_threads: Dict[str, threading.Thread] = {}
+_refresh_threads_lock = threading.Lock()
+
+
+class EncryptedTokenFile:
+    """
+    Token cache file encrypted with Fernet, shared by every process using the same path.
+    
+    Reads and writes hold an exclusive lock on a side file so concurrent processes never
+    interleave their updates, and writes are atomic. The file only outlives a Cloud Run
+    execution if TOKEN_CACHE_PATH is on a mounted volume.
+    """
+    
+    def __init__(self, path: str, key: str):
+        """
+        Initialize the token file
+        
+        Args:
+            path: Path of the encrypted token file
+            key: Fernet key used to encrypt the file
+        """
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.fernet = Fernet(key.encode() if isinstance(key, str) else key)
+    
+    def _read(self) -> Dict[str, Dict]:
+        """
+        Reads and decrypts the cached tokens
+        
+        Returns:
+            Cached tokens by service name ({'token': ..., 'expiry': ...})
+        """
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except (OSError, ValueError, InvalidToken) as e:
+            logger.warning(f"Ignoring unreadable token cache file: {str(e)}")
+            return {}
+    
+    def _write(self, entries: Dict[str, Dict]) -> None:
+        """
+        Encrypts and writes the cached tokens atomically
+        
+        Args:
+            entries: Cached tokens by service name
+        """
+        temp_path = f"{self.path}.tmp"
+        with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+            f.write(self.fernet.encrypt(json.dumps(entries).encode()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+    
+    def load(self) -> Dict[str, Dict]:
+        """
+        Loads the cached tokens that have not expired yet
+        
+        Returns:
+            Cached tokens by service name
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            entries = self._read()
+        
+        current_time = int(time.time())
+        return {service: entry for service, entry in entries.items() if entry.get('expiry', 0) > current_time}
+    
+    def update(self, service_name: str, entry: Optional[Dict]) -> None:
+        """
+        Stores or removes the token of a service
+        
+        Args:
+            service_name: Name of the service, or None to remove every token
+            entry: Token entry ({'token': ..., 'expiry': ...}), or None to remove it
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = self._read() if service_name is not None else {}
+            if entry is not None:
+                entries[service_name] = entry
+            else:
+                entries.pop(service_name, None)
+            self._write(entries)
+
+
+def get_token_file() -> Optional[EncryptedTokenFile]:
+    """
+    Gets the encrypted token file when the file backend is configured
+    
+    Returns:
+        EncryptedTokenFile, or None if tokens are only cached in memory
+    """
+    global _token_file
+    if TOKEN_CACHE_SETTINGS['BACKEND'] != 'file':
+        return None
+    
+    with _token_lock:
+        if _token_file is None:
+            if Fernet is None or not TOKEN_CACHE_SETTINGS['KEY']:
+                logger.warning("Token cache file requires the cryptography package and TOKEN_CACHE_KEY, "
+                               "caching tokens in memory only")
+                TOKEN_CACHE_SETTINGS['BACKEND'] = 'memory'
+                return None
+            _token_file = EncryptedTokenFile(TOKEN_CACHE_SETTINGS['PATH'], TOKEN_CACHE_SETTINGS['KEY'])
+        return _token_file
+
+
+def _persist_token(service_name: Optional[str], entry: Optional[Dict]) -> None:
+    """
+    Mirrors a token cache change to the token file, if enabled
+    
+    Args:
+        service_name: Name of the service, or None for every service
+        entry: Token entry to store, or None to remove it
+    """
+    token_file = get_token_file()
+    if token_file is None:
+        return
+    try:
+        token_file.update(service_name, entry)
+    except OSError as e:
+        # The in-memory cache still works, the next run just authenticates again
+        logger.warning(f"Could not update token cache file: {str(e)}")
+
+
+def _load_persisted_tokens() -> None:
+    """Loads tokens cached by previous runs into memory, once per process"""
+    global _token_file_loaded
+    with _token_lock:
+        if _token_file_loaded:
+            return
+        _token_file_loaded = True
+        
+        token_file = get_token_file()
+        if token_file is None:
+            return
+        try:
+            entries = token_file.load()
+        except OSError as e:
+            logger.warning(f"Could not read token cache file: {str(e)}")
+            return
+        
+        for service_name, entry in entries.items():
+            if service_name not in TOKEN_CACHE:
+                TOKEN_CACHE[service_name] = entry['token']
+                TOKEN_EXPIRY[service_name] = entry['expiry']
+        if entries:
+            logger.info(f"Loaded cached tokens for {', '.join(sorted(entries))}")
 
 
 def is_token_expired(service_name: str) -> bool:
@@ -40,15 +209,64 @@ def is_token_expired(service_name: str) -> bool:
     Returns:
         True if token is expired or not found, False otherwise
     """
-    if service_name not in TOKEN_EXPIRY:
-        return True
-    
-    expiry_time = TOKEN_EXPIRY[service_name]
+    _load_persisted_tokens()
+    with _token_lock:
+        if service_name not in TOKEN_EXPIRY:
+            return True
+        
+        expiry_time = TOKEN_EXPIRY[service_name]
     current_time = int(time.time())
     
     return current_time >= expiry_time
 
 
+def get_cached_token(service_name: str) -> Optional[str]:
+    """
+    Gets a cached token that has not expired
+    
+    Args:
+        service_name: Name of the service
+        
+    Returns:
+        Cached token, or None if there is no valid token
+    """
+    _load_persisted_tokens()
+    with _token_lock:
+        token = TOKEN_CACHE.get(service_name)
+        if token is None or int(time.time()) >= TOKEN_EXPIRY.get(service_name, 0):
+            return None
+        return token
+
+
+def get_token_expiry(service_name: str) -> Optional[int]:
+    """
+    Gets the expiry time of a cached token
+    
+    Args:
+        service_name: Name of the service
+        
+    Returns:
+        Expiry time in seconds since the epoch, or None if no token is cached
+    """
+    _load_persisted_tokens()
+    with _token_lock:
+        return TOKEN_EXPIRY.get(service_name)
+
+
+def is_token_expiring(service_name: str) -> bool:
+    """
+    Checks if a token expires within the refresh margin
+    
+    Args:
+        service_name: Name of the service
+        
+    Returns:
+        True if the token should be refreshed ahead of its expiry, False otherwise
+    """
+    expiry_time = get_token_expiry(service_name)
+    return expiry_time is None or expiry_time - int(time.time()) <= TOKEN_CACHE_SETTINGS['REFRESH_MARGIN']
+
+
 def cache_token(service_name: str, token: str, expires_in: int) -> None:
     """
     Caches an authentication token with expiry time
@@ -58,11 +276,13 @@ def cache_token(service_name: str, token: str, expires_in: int) -> None:
         token: Authentication token
         expires_in: Expiration time in seconds
     """
-    TOKEN_CACHE[service_name] = token
-    
     # Set expiry time with a small buffer (10 seconds) to account for processing time
     expiry_time = int(time.time()) + expires_in - 10
-    TOKEN_EXPIRY[service_name] = expiry_time
+    
+    with _token_lock:
+        TOKEN_CACHE[service_name] = token
+        TOKEN_EXPIRY[service_name] = expiry_time
+    _persist_token(service_name, {'token': token, 'expiry': expiry_time})
     
     # Log with masked token for security
     masked_token = token[:5] + "..." + token[-5:] if len(token) > 10 else "***"
@@ -77,18 +297,34 @@ def clear_token_cache(service_name: Optional[str] = None) -> None:
     Args:
         service_name: Name of the service, or None to clear all
     """
+    with _token_lock:
+        if service_name:
+            TOKEN_CACHE.pop(service_name, None)
+            TOKEN_EXPIRY.pop(service_name, None)
+        else:
+            TOKEN_CACHE.clear()
+            TOKEN_EXPIRY.clear()
+    _persist_token(service_name or None, None)
+    
     if service_name:
-        if service_name in TOKEN_CACHE:
-            del TOKEN_CACHE[service_name]
-        if service_name in TOKEN_EXPIRY:
-            del TOKEN_EXPIRY[service_name]
         logger.info(f"Cleared token cache for {service_name}")
     else:
-        TOKEN_CACHE.clear()
-        TOKEN_EXPIRY.clear()
         logger.info("Cleared all token caches")
 
 
+def get_service_lock(service_name: str) -> threading.Lock:
+    """
+    Gets the lock serializing authentication requests for a service
+    
+    Args:
+        service_name: Name of the service
+        
+    Returns:
+        Lock shared by every AuthenticationService in the process
+    """
+    return _service_locks.setdefault(service_name, threading.Lock())
+
+
 class AuthenticationService:
     """
     Service for handling authentication with external APIs
@@ -102,65 +338,79 @@ class AuthenticationService:
         logger.info("Authentication service initialized")
     
     @retry_with_backoff(exceptions=(requests.RequestException,), max_retries=3)
-    def authenticate_capital_one(self) -> Dict:
+    def authenticate_capital_one(self, force_refresh: bool = False) -> Dict:
         """
         Authenticate with Capital One API using OAuth 2.0
         
+        A cached token is returned without blocking; when it is about to expire a new
+        one is requested in the background.
+        
+        Args:
+            force_refresh: Whether to request a new token even if a valid one is cached
+        
         Returns:
             Authentication response with token
         """
         try:
             # Check if we have a valid token in cache
-            if 'CAPITAL_ONE' in TOKEN_CACHE and not is_token_expired('CAPITAL_ONE'):
+            cached_token = None if force_refresh else get_cached_token('CAPITAL_ONE')
+            if cached_token:
                 logger.debug("Using cached Capital One token")
-                return {"access_token": TOKEN_CACHE['CAPITAL_ONE']}
-            
-            # Get Capital One API credentials
-            credentials = get_api_credentials('CAPITAL_ONE')
-            client_id = credentials.get('client_id')
-            client_secret = credentials.get('client_secret')
-            
-            if not client_id or not client_secret:
-                raise AuthenticationError(
-                    "Missing required Capital One credentials", 
-                    'CAPITAL_ONE',
-                    {"error": "Missing client_id or client_secret"}
-                )
-            
-            # Prepare OAuth 2.0 token request
-            auth_url = API_SETTINGS['CAPITAL_ONE']['AUTH_URL']
-            data = {
-                'grant_type': 'client_credentials',
-                'client_id': client_id,
-                'client_secret': client_secret
-            }
-            
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'Accept': 'application/json'
-            }
-            
-            # Make authentication request
-            response = requests.post(auth_url, data=data, headers=headers)
-            response.raise_for_status()
-            
-            # Parse response
-            auth_data = response.json()
-            
-            if 'access_token' not in auth_data or 'expires_in' not in auth_data:
-                raise AuthenticationError(
-                    "Invalid authentication response from Capital One API", 
-                    'CAPITAL_ONE',
-                    {"response": auth_data}
-                )
-            
-            # Cache the token
-            access_token = auth_data['access_token']
-            expires_in = auth_data['expires_in']
-            cache_token('CAPITAL_ONE', access_token, expires_in)
-            
-            logger.info("Successfully authenticated with Capital One API")
-            return auth_data
+                self.refresh_in_background('CAPITAL_ONE')
+                return {"access_token": cached_token}
+            
+            # Only one thread requests a token, the others reuse it
+            with get_service_lock('CAPITAL_ONE'):
+                cached_token = None if force_refresh else get_cached_token('CAPITAL_ONE')
+                if cached_token:
+                    return {"access_token": cached_token}
+                
+                # Get Capital One API credentials
+                credentials = get_api_credentials('CAPITAL_ONE')
+                client_id = credentials.get('client_id')
+                client_secret = credentials.get('client_secret')
+                
+                if not client_id or not client_secret:
+                    raise AuthenticationError(
+                        "Missing required Capital One credentials", 
+                        'CAPITAL_ONE',
+                        {"error": "Missing client_id or client_secret"}
+                    )
+                
+                # Prepare OAuth 2.0 token request
+                auth_url = API_SETTINGS['CAPITAL_ONE']['AUTH_URL']
+                data = {
+                    'grant_type': 'client_credentials',
+                    'client_id': client_id,
+                    'client_secret': client_secret
+                }
+                
+                headers = {
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                    'Accept': 'application/json'
+                }
+                
+                # Make authentication request
+                response = requests.post(auth_url, data=data, headers=headers)
+                response.raise_for_status()
+                
+                # Parse response
+                auth_data = response.json()
+                
+                if 'access_token' not in auth_data or 'expires_in' not in auth_data:
+                    raise AuthenticationError(
+                        "Invalid authentication response from Capital One API", 
+                        'CAPITAL_ONE',
+                        {"response": auth_data}
+                    )
+                
+                # Cache the token
+                access_token = auth_data['access_token']
+                expires_in = auth_data['expires_in']
+                cache_token('CAPITAL_ONE', access_token, expires_in)
+                
+                logger.info("Successfully authenticated with Capital One API")
+                return auth_data
             
         except requests.RequestException as e:
             error_msg = f"Capital One API authentication request failed: {str(e)}"
@@ -173,31 +423,25 @@ class AuthenticationService:
             raise AuthenticationError(error_msg, 'CAPITAL_ONE')
     
     @retry_with_backoff(exceptions=(google.auth.exceptions.GoogleAuthError,), max_retries=3)
-    def authenticate_google_sheets(self):
+    def authenticate_google_sheets(self, force_refresh: bool = False):
         """
         Authenticate with Google Sheets API using service account
         
+        Args:
+            force_refresh: Whether to request a new access token even if a valid one is cached
+        
         Returns:
             Google credentials object
         """
         try:
             # Check if we have cached credentials
-            if 'GOOGLE_SHEETS' in self.credentials_cache:
+            if not force_refresh and 'GOOGLE_SHEETS' in self.credentials_cache:
                 logger.debug("Using cached Google Sheets credentials")
+                self.refresh_in_background('GOOGLE_SHEETS')
                 return self.credentials_cache['GOOGLE_SHEETS']
             
-            # Get Google Sheets API credentials
-            credentials_json = get_api_credentials('GOOGLE_SHEETS')
-            
-            # Create service account credentials
-            credentials = google.oauth2.service_account.Credentials.from_service_account_info(
-                credentials_json,
-                scopes=API_SETTINGS['GOOGLE_SHEETS']['SCOPES']
-            )
-            
-            # Ensure credentials are valid
-            auth_req = google.auth.transport.requests.Request()
-            credentials.refresh(auth_req)
+            # Create service account credentials with a valid access token
+            credentials = self.create_google_credentials('GOOGLE_SHEETS', force_refresh)
             
             # Cache credentials
             self.credentials_cache['GOOGLE_SHEETS'] = credentials
@@ -216,31 +460,25 @@ class AuthenticationService:
             raise AuthenticationError(error_msg, 'GOOGLE_SHEETS')
     
     @retry_with_backoff(exceptions=(google.auth.exceptions.GoogleAuthError,), max_retries=3)
-    def authenticate_gmail(self):
+    def authenticate_gmail(self, force_refresh: bool = False):
         """
         Authenticate with Gmail API using service account
         
+        Args:
+            force_refresh: Whether to request a new access token even if a valid one is cached
+        
         Returns:
             Google credentials object
         """
         try:
             # Check if we have cached credentials
-            if 'GMAIL' in self.credentials_cache:
+            if not force_refresh and 'GMAIL' in self.credentials_cache:
                 logger.debug("Using cached Gmail credentials")
+                self.refresh_in_background('GMAIL')
                 return self.credentials_cache['GMAIL']
             
-            # Get Gmail API credentials
-            credentials_json = get_api_credentials('GMAIL')
-            
-            # Create service account credentials
-            credentials = google.oauth2.service_account.Credentials.from_service_account_info(
-                credentials_json,
-                scopes=API_SETTINGS['GMAIL']['SCOPES']
-            )
-            
-            # Ensure credentials are valid
-            auth_req = google.auth.transport.requests.Request()
-            credentials.refresh(auth_req)
+            # Create service account credentials with a valid access token
+            credentials = self.create_google_credentials('GMAIL', force_refresh)
             
             # Cache credentials
             self.credentials_cache['GMAIL'] = credentials
@@ -258,6 +496,100 @@ class AuthenticationService:
             logger.error(error_msg, context={"error": str(e)})
             raise AuthenticationError(error_msg, 'GMAIL')
     
+    def create_google_credentials(self, service_name: str, force_refresh: bool = False):
+        """
+        Create service account credentials, reusing a cached access token when possible
+        
+        Args:
+            service_name: GOOGLE_SHEETS or GMAIL
+            force_refresh: Whether to request a new access token even if a valid one is cached
+            
+        Returns:
+            Google credentials object with a valid access token
+        """
+        # Get API credentials
+        credentials_json = get_api_credentials(service_name)
+        
+        # Create service account credentials
+        credentials = google.oauth2.service_account.Credentials.from_service_account_info(
+            credentials_json,
+            scopes=API_SETTINGS[service_name]['SCOPES']
+        )
+        
+        # Reuse the access token of a previous run instead of requesting a new one
+        cached_token = None if force_refresh else get_cached_token(service_name)
+        if cached_token:
+            credentials.token = cached_token
+            credentials.expiry = datetime.datetime.utcfromtimestamp(get_token_expiry(service_name))
+            return credentials
+        
+        # Ensure credentials are valid
+        auth_req = google.auth.transport.requests.Request()
+        credentials.refresh(auth_req)
+        self.cache_google_token(service_name, credentials)
+        return credentials
+    
+    def cache_google_token(self, service_name: str, credentials) -> None:
+        """
+        Cache the access token of Google credentials
+        
+        Args:
+            service_name: GOOGLE_SHEETS or GMAIL
+            credentials: Refreshed Google credentials object
+        """
+        if not credentials.token:
+            return
+        expires_in = 3600
+        if credentials.expiry is not None:
+            expires_in = int((credentials.expiry - datetime.datetime.utcnow()).total_seconds())
+        cache_token(service_name, credentials.token, expires_in)
+    
+    def refresh_in_background(self, service_name: str) -> Optional[threading.Thread]:
+        """
+        Refresh a token in a background thread if it expires within the refresh margin
+        
+        Callers keep using the cached token, which is still valid, so no request
+        waits for the renewal. At most one refresh runs per service.
+        
+        Args:
+            service_name: Name of the service
+            
+        Returns:
+            The running refresh thread, or None if the token is not about to expire
+        """
+        if not is_token_expiring(service_name):
+            return None
+        
+        with _refresh_threads_lock:
+            thread = _refresh_threads.get(service_name)
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=bind_run_context(self._refresh_ahead), args=(service_name,),
+                                          name=f"token-refresh-{service_name.lower()}", daemon=True)
+                _refresh_threads[service_name] = thread
+                thread.start()
+        return thread
+    
+    def _refresh_ahead(self, service_name: str) -> None:
+        """
+        Request a new token for a service while the cached one is still valid
+        
+        Args:
+            service_name: Name of the service
+        """
+        try:
+            if service_name == 'CAPITAL_ONE':
+                self.authenticate_capital_one(force_refresh=True)
+            elif service_name in self.credentials_cache:
+                # Refresh in place so API clients holding these credentials get the new token
+                credentials = self.credentials_cache[service_name]
+                credentials.refresh(google.auth.transport.requests.Request())
+                self.cache_google_token(service_name, credentials)
+            logger.info(f"Refreshed token for {service_name} ahead of expiry")
+        except Exception as e:
+            # The cached token stays in use until it expires
+            logger.warning(f"Background token refresh failed for {service_name}: {str(e)}",
+                           context={"service": service_name, "error": str(e)})
+    
     def authenticate_gemini(self) -> Dict:
         """
         Authenticate with Gemini API using API key
@@ -300,8 +632,9 @@ class AuthenticationService:
                 raise ValueError(f"Unknown service: {service_name}")
             
             # Check if token exists and is not expired
-            if service_name in TOKEN_CACHE and not is_token_expired(service_name):
-                return TOKEN_CACHE[service_name]
+            cached_token = get_cached_token(service_name)
+            if cached_token:
+                return cached_token
             
             # Get new token based on service
             if service_name == 'CAPITAL_ONE':
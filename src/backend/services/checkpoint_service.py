@@ -0,0 +1,315 @@
+"""
+checkpoint_service.py - Durable stage checkpoints for the weekly budget management pipeline
+
+This module persists the output of each pipeline stage keyed by correlation ID and
+ISO week, so that a failed run can be resumed from the first failed stage instead of
+re-running retrieval, categorization, analysis and (paid) insight generation.
+
+Layout on disk:
+    <CHECKPOINT_DIR>/<week>/<correlation_id>/manifest.json
+    <CHECKPOINT_DIR>/<week>/<correlation_id>/<stage>.pkl
+    <CHECKPOINT_DIR>/<week>/<correlation_id>/<stage>_artifacts/<file>
+
+Usage:
+    store = CheckpointStore(correlation_id)
+    if store.is_stage_complete('retriever'):
+        retriever_status = store.load_stage('retriever')
+    else:
+        retriever_status = transaction_retriever.execute()
+        store.save_stage('retriever', retriever_status)
+"""
+
+import os
+import re
+import json
+import glob
+import shutil
+import pickle
+import datetime
+import threading
+from typing import Dict, List, Any, Optional
+
+from .logging_service import get_component_logger
+from ..config.settings import CHECKPOINT_SETTINGS
+
+# Set up logger for the checkpoint service
+logger = get_component_logger('checkpoint_service')
+
+# Name of the manifest file in each checkpoint directory
+MANIFEST_FILE = 'manifest.json'
+
+# Stage statuses that count as completed for resume purposes
+COMPLETED_STATUSES = ['success', 'warning']
+
+# Stage status of a stage that did part of its work, which a resumed attempt continues
+PARTIAL_STATUS = 'partial'
+
+# Correlation IDs are used as directory names, so only UUID-like IDs are accepted
+CORRELATION_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,128}')
+
+
+def validate_correlation_id(correlation_id: str) -> str:
+    """
+    Checks that a correlation ID is safe to use as a checkpoint directory name.
+
+    Args:
+        correlation_id: Correlation ID of a run (e.g. from --resume)
+
+    Returns:
+        The correlation ID
+
+    Raises:
+        ValueError: If the ID contains anything but letters, digits, '_' and '-'
+    """
+    if not isinstance(correlation_id, str) or not CORRELATION_ID_PATTERN.fullmatch(correlation_id):
+        raise ValueError(f"Invalid correlation ID {correlation_id!r}: only letters, digits, '_' and '-' are allowed")
+    return correlation_id
+
+
+def get_week_key(date: Optional[datetime.date] = None) -> str:
+    """
+    Gets the ISO week key a run belongs to.
+
+    Args:
+        date: Date to compute the week for, defaults to today
+
+    Returns:
+        Week key in the form YYYY-Www (e.g. 2024-W18)
+    """
+    date = date or datetime.date.today()
+    iso_year, iso_week, _ = date.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def find_checkpoint_week(correlation_id: str, checkpoint_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Finds the most recent week that has checkpoints for a correlation ID.
+
+    Args:
+        correlation_id: Correlation ID of the run to resume
+        checkpoint_dir: Root checkpoint directory, defaults to CHECKPOINT_SETTINGS['DIR']
+
+    Returns:
+        Week key, or None if no checkpoints exist for the correlation ID
+
+    Raises:
+        ValueError: If the correlation ID is not a valid directory name
+    """
+    checkpoint_dir = checkpoint_dir or CHECKPOINT_SETTINGS['DIR']
+    pattern = os.path.join(checkpoint_dir, '*', validate_correlation_id(correlation_id), MANIFEST_FILE)
+    matches = sorted(glob.glob(pattern))
+    if not matches:
+        return None
+    return os.path.basename(os.path.dirname(os.path.dirname(matches[-1])))
+
+
+class CheckpointStore:
+    """
+    File-backed store of pipeline stage outputs for a single run.
+
+    Stage outputs are pickled because they carry model objects (e.g. the Report
+    produced by InsightGenerator) that are not JSON serializable. Writes are atomic
+    so an interrupted job never leaves a partially written checkpoint behind.
+    """
+
+    def __init__(self, correlation_id: str, week: Optional[str] = None, checkpoint_dir: Optional[str] = None):
+        """
+        Initialize the checkpoint store.
+
+        Args:
+            correlation_id: Correlation ID of the run
+            week: ISO week key, defaults to the week of an existing checkpoint or the current week
+            checkpoint_dir: Root checkpoint directory, defaults to CHECKPOINT_SETTINGS['DIR']
+
+        Raises:
+            ValueError: If the correlation ID is not a valid directory name
+        """
+        self.correlation_id = validate_correlation_id(correlation_id)
+        self.checkpoint_dir = checkpoint_dir or CHECKPOINT_SETTINGS['DIR']
+        self.week = week or find_checkpoint_week(correlation_id, self.checkpoint_dir) or get_week_key()
+        self.path = os.path.join(self.checkpoint_dir, self.week, correlation_id)
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+        # Errors of stage checkpoints that could not be written, by stage
+        self.write_failures: Dict[str, str] = {}
+
+    def _manifest_path(self) -> str:
+        """Gets the path of the manifest file."""
+        return os.path.join(self.path, MANIFEST_FILE)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """
+        Loads the manifest for this run, or creates an empty one.
+
+        Returns:
+            Manifest dictionary
+        """
+        manifest_path = self._manifest_path()
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint manifest {manifest_path}: {str(e)}")
+
+        return {
+            'correlation_id': self.correlation_id,
+            'week': self.week,
+            'created_at': datetime.datetime.utcnow().isoformat(),
+            'stages': {}
+        }
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """
+        Writes a file atomically by renaming a temporary file into place.
+
+        Args:
+            path: Destination path
+            data: File content
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _save_manifest(self) -> None:
+        """Persists the manifest to disk."""
+        self.manifest['updated_at'] = datetime.datetime.utcnow().isoformat()
+        self._write_atomic(self._manifest_path(), json.dumps(self.manifest, indent=2).encode('utf-8'))
+
+    def exists(self) -> bool:
+        """
+        Checks whether any checkpoint has been written for this run.
+
+        Returns:
+            True if a manifest exists on disk
+        """
+        return os.path.exists(self._manifest_path())
+
+    def save_stage(self, stage: str, status: Dict, artifacts: Optional[List[str]] = None) -> None:
+        """
+        Saves the output of a pipeline stage.
+
+        Args:
+            stage: Stage name (e.g. 'retriever', 'insight')
+            status: Status dictionary returned by the stage
+            artifacts: Optional files produced by the stage (e.g. chart images) to copy alongside
+        """
+        with self._lock:
+            stage_file = os.path.join(self.path, f"{stage}.pkl")
+            self._write_atomic(stage_file, pickle.dumps(status, protocol=pickle.HIGHEST_PROTOCOL))
+
+            stored_artifacts = {}
+            if artifacts:
+                artifact_dir = os.path.join(self.path, f"{stage}_artifacts")
+                os.makedirs(artifact_dir, exist_ok=True)
+                for artifact in artifacts:
+                    if artifact and os.path.exists(artifact):
+                        stored_path = os.path.join(artifact_dir, os.path.basename(artifact))
+                        shutil.copy2(artifact, stored_path)
+                        stored_artifacts[artifact] = stored_path
+
+            self.manifest['stages'][stage] = {
+                'status': status.get('status', 'unknown') if isinstance(status, dict) else 'unknown',
+                'file': os.path.basename(stage_file),
+                'artifacts': stored_artifacts,
+                'saved_at': datetime.datetime.utcnow().isoformat()
+            }
+            self._save_manifest()
+
+        logger.info(f"Saved checkpoint for stage '{stage}'",
+                    extra={'correlation_id': self.correlation_id,
+                           'context': {'week': self.week, 'stage': stage}})
+
+    def is_stage_complete(self, stage: str) -> bool:
+        """
+        Checks whether a stage completed successfully in a previous attempt.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            True if the stage has a stored output with a successful status
+        """
+        entry = self.manifest['stages'].get(stage)
+        if not entry or entry.get('status') not in COMPLETED_STATUSES:
+            return False
+        return os.path.exists(os.path.join(self.path, entry['file']))
+
+    def load_stage(self, stage: str) -> Dict:
+        """
+        Loads the stored output of a stage.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Status dictionary originally returned by the stage
+
+        Raises:
+            KeyError: If the stage has no checkpoint
+        """
+        entry = self.manifest['stages'].get(stage)
+        if not entry:
+            raise KeyError(f"No checkpoint for stage '{stage}'")
+
+        with open(os.path.join(self.path, entry['file']), 'rb') as f:
+            status = pickle.load(f)
+
+        logger.info(f"Loaded checkpoint for stage '{stage}'",
+                    extra={'correlation_id': self.correlation_id,
+                           'context': {'week': self.week, 'stage': stage}})
+        return status
+
+    def load_partial_stage(self, stage: str) -> Optional[Dict]:
+        """
+        Loads the stored output of a stage that only did part of its work in a previous
+        attempt (e.g. a report sent to some of its recipient groups).
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Status dictionary of the partial attempt, or None if the stage has no partial checkpoint
+        """
+        entry = self.manifest['stages'].get(stage)
+        if not entry or entry.get('status') != PARTIAL_STATUS:
+            return None
+        if not os.path.exists(os.path.join(self.path, entry['file'])):
+            return None
+        return self.load_stage(stage)
+
+    def get_artifact_path(self, stage: str, original_path: str) -> str:
+        """
+        Resolves a file produced by a stage, preferring the original when it still exists.
+
+        Args:
+            stage: Stage name
+            original_path: Path the file was written to during the original run
+
+        Returns:
+            Path of a readable copy of the file (the original path if none is stored)
+        """
+        if os.path.exists(original_path):
+            return original_path
+        entry = self.manifest['stages'].get(stage, {})
+        return entry.get('artifacts', {}).get(original_path, original_path)
+
+    def get_completed_stages(self) -> List[str]:
+        """
+        Gets the stages that completed successfully.
+
+        Returns:
+            List of completed stage names
+        """
+        return [stage for stage in self.manifest['stages'] if self.is_stage_complete(stage)]
+
+    def clear(self) -> None:
+        """Deletes all checkpoints for this run."""
+        with self._lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.manifest = self._load_manifest()
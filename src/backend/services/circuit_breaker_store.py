@@ -0,0 +1,267 @@
+"""
+circuit_breaker_store.py - Shared state backends for circuit breakers
+
+Circuit breakers used to keep their state in plain dicts, so concurrent pipeline stages
+raced on the failure counters and every script process had its own view of which
+services were failing. Every state change now goes through a store that applies it
+atomically:
+
+    memory  - process-wide dict guarded by a lock (default)
+    sqlite  - SQLite database shared by every process on the host, so the job and
+              scripts/maintenance/health_check.py see the same circuits:
+              <CIRCUIT_BREAKER_PATH>
+
+Usage:
+    store = create_circuit_store()
+    retry_after = store.update('capital_one', lambda circuit: ...)
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Callable, Any, Optional
+
+from .logging_service import get_component_logger
+from ..config.settings import CIRCUIT_BREAKER_SETTINGS
+
+# Set up logger for the circuit breaker store
+logger = get_component_logger('circuit_breaker_store')
+
+# Supported circuit breaker state backends
+CIRCUIT_STORE_BACKENDS = ['memory', 'sqlite']
+
+
+def new_circuit_state() -> Dict:
+    """
+    Creates the state of a circuit that has not seen any calls.
+
+    Returns:
+        Closed circuit state
+    """
+    return {
+        'state': 'CLOSED',
+        'failure_count': 0,
+        'last_success_time': 0,
+        'last_failure_time': 0,
+        'probe_started_at': 0
+    }
+
+
+class MemoryCircuitStore:
+    """Circuit states of the current process, guarded by a lock"""
+
+    def __init__(self, states: Optional[Dict[str, Dict]] = None):
+        """
+        Initialize the in-memory circuit store.
+
+        Args:
+            states: Dictionary holding circuit states by service name, defaults to a new one
+        """
+        self.states = states if states is not None else {}
+        self._lock = threading.RLock()
+
+    def update(self, service_name: str, function: Callable[[Dict], Any]) -> Any:
+        """
+        Applies a change to the state of a circuit atomically.
+
+        Args:
+            service_name: Name of the protected service
+            function: Function modifying the circuit state in place
+
+        Returns:
+            Return value of the function
+        """
+        with self._lock:
+            circuit = self.states.setdefault(service_name, new_circuit_state())
+            return function(circuit)
+
+    def get(self, service_name: str) -> Dict:
+        """
+        Gets a copy of the state of a circuit.
+
+        Args:
+            service_name: Name of the protected service
+
+        Returns:
+            Circuit state
+        """
+        with self._lock:
+            return dict(self.states.setdefault(service_name, new_circuit_state()))
+
+    def reset(self, service_name: str, state: Dict) -> bool:
+        """
+        Replaces the state of a known circuit.
+
+        Args:
+            service_name: Name of the protected service
+            state: New circuit state
+
+        Returns:
+            True if the circuit existed, False otherwise
+        """
+        with self._lock:
+            if service_name not in self.states:
+                return False
+            self.states[service_name] = dict(state)
+            return True
+
+
+class SQLiteCircuitStore:
+    """Circuit states shared between processes through a SQLite database"""
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Initialize the SQLite circuit store, creating the database if needed.
+
+        Args:
+            path: Database file, defaults to CIRCUIT_BREAKER_SETTINGS['PATH']
+            timeout: Seconds to wait for another process holding the database lock,
+                defaults to CIRCUIT_BREAKER_SETTINGS['LOCK_TIMEOUT']
+        """
+        self.path = path or CIRCUIT_BREAKER_SETTINGS['PATH']
+        self.timeout = timeout if timeout is not None else CIRCUIT_BREAKER_SETTINGS['LOCK_TIMEOUT']
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connect()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS circuits (service_name TEXT PRIMARY KEY, state TEXT NOT NULL)'
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Gets the database connection of the current thread.
+
+        Returns:
+            SQLite connection in autocommit mode (transactions are started explicitly)
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def _read(self, connection: sqlite3.Connection, service_name: str) -> Optional[Dict]:
+        """
+        Reads the state of a circuit.
+
+        Args:
+            connection: Database connection
+            service_name: Name of the protected service
+
+        Returns:
+            Circuit state, or None if the circuit is unknown
+        """
+        row = connection.execute(
+            'SELECT state FROM circuits WHERE service_name = ?', (service_name,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, connection: sqlite3.Connection, service_name: str, state: Dict) -> None:
+        """
+        Writes the state of a circuit.
+
+        Args:
+            connection: Database connection
+            service_name: Name of the protected service
+            state: Circuit state
+        """
+        connection.execute(
+            'INSERT OR REPLACE INTO circuits (service_name, state) VALUES (?, ?)',
+            (service_name, json.dumps(state))
+        )
+
+    def update(self, service_name: str, function: Callable[[Dict], Any]) -> Any:
+        """
+        Applies a change to the state of a circuit atomically across processes.
+
+        Args:
+            service_name: Name of the protected service
+            function: Function modifying the circuit state in place
+
+        Returns:
+            Return value of the function
+        """
+        connection = self._connect()
+        # BEGIN IMMEDIATE takes the write lock up front, so no other process can change
+        # the circuit between reading and writing it
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            circuit = self._read(connection, service_name) or new_circuit_state()
+            result = function(circuit)
+            self._write(connection, service_name, circuit)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return result
+
+    def get(self, service_name: str) -> Dict:
+        """
+        Gets the state of a circuit.
+
+        Args:
+            service_name: Name of the protected service
+
+        Returns:
+            Circuit state
+        """
+        return self._read(self._connect(), service_name) or new_circuit_state()
+
+    def reset(self, service_name: str, state: Dict) -> bool:
+        """
+        Replaces the state of a known circuit.
+
+        Args:
+            service_name: Name of the protected service
+            state: New circuit state
+
+        Returns:
+            True if the circuit existed, False otherwise
+        """
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            exists = self._read(connection, service_name) is not None
+            if exists:
+                self._write(connection, service_name, state)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return exists
+
+
+def create_circuit_store(backend: Optional[str] = None, path: Optional[str] = None,
+                         states: Optional[Dict[str, Dict]] = None):
+    """
+    Creates the circuit store for the configured backend.
+
+    Falls back to the in-memory store if the shared database cannot be opened, so a
+    broken state file never blocks API calls.
+
+    Args:
+        backend: 'memory' or 'sqlite', defaults to CIRCUIT_BREAKER_SETTINGS['BACKEND']
+        path: Database file of the sqlite backend
+        states: Dictionary backing the memory store
+
+    Returns:
+        MemoryCircuitStore or SQLiteCircuitStore
+    """
+    backend = (backend or CIRCUIT_BREAKER_SETTINGS['BACKEND']).lower()
+    if backend not in CIRCUIT_STORE_BACKENDS:
+        logger.warning(f"Unknown circuit breaker backend {backend}, using memory")
+        backend = 'memory'
+
+    if backend == 'sqlite':
+        try:
+            return SQLiteCircuitStore(path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open shared circuit breaker state, using memory: {str(e)}")
+
+    return MemoryCircuitStore(states)
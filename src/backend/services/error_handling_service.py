@@ -11,11 +11,13 @@ import time
 import random
 import traceback
 import sys
+import threading
 from typing import Dict, List, Any, Optional, Callable, Union, TypeVar, cast
 
 import requests
 
 from .logging_service import get_component_logger, log_exception, LoggingContext
+from .circuit_breaker_store import MemoryCircuitStore, create_circuit_store, new_circuit_state
 from ..config.settings import RETRY_SETTINGS, APP_SETTINGS
 from ..utils.error_handlers import (
     APIError, ValidationError, AuthenticationError,
@@ -25,9 +27,13 @@ from ..utils.error_handlers import (
 # Set up logger for the error handling service
 logger = get_component_logger('error_handling_service')
 
-# Global circuit breaker state tracker
+# Global circuit breaker state tracker (backs the in-memory circuit store)
 CIRCUIT_BREAKER_STATES = {'services': {}}
 
+# Store applying circuit state changes for with_circuit_breaker, created on first use
+_circuit_store = None
+_circuit_store_lock = threading.Lock()
+
 def handle_error(exception: Exception, component: str, operation: str, context: Dict) -> Dict:
     """
     Central error handling function that processes exceptions based on their type.
@@ -251,11 +257,176 @@ def with_error_handling(component: str, operation: str, context: Dict = None):
     
     return decorator
 
+def get_circuit_store():
+    """
+    Gets the store holding the circuit state used by with_circuit_breaker.
+    
+    The backend is chosen by CIRCUIT_BREAKER_SETTINGS['BACKEND']; with 'sqlite' every
+    process on the host shares the same circuits.
+    
+    Returns:
+        Circuit store shared by all circuit breaker decorators
+    """
+    global _circuit_store
+    with _circuit_store_lock:
+        if _circuit_store is None:
+            _circuit_store = create_circuit_store(states=CIRCUIT_BREAKER_STATES['services'])
+        return _circuit_store
+
+def _acquire_circuit(circuit: Dict, service_name: str, recovery_timeout: int, current_time: float) -> Optional[int]:
+    """
+    Decides whether a call may proceed, letting a single probe call through once an OPEN circuit expires.
+    
+    Args:
+        circuit: Circuit state, updated in place
+        service_name: Name of the protected service
+        recovery_timeout: Time in seconds before testing if service has recovered
+        current_time: Current time in seconds since the epoch
+        
+    Returns:
+        Seconds until the circuit can be retried if the call is rejected, None if it may proceed
+    """
+    # Check if circuit is OPEN (tripped)
+    if circuit['state'] == 'OPEN':
+        # Check if recovery timeout has elapsed
+        if current_time - circuit['last_failure_time'] > recovery_timeout:
+            # Set to HALF_OPEN and let this call test if service has recovered
+            circuit['state'] = 'HALF_OPEN'
+            circuit['probe_started_at'] = current_time
+            logger.info(f"Circuit for {service_name} changed from OPEN to HALF_OPEN")
+            return None
+        
+        retry_after = int(recovery_timeout - (current_time - circuit['last_failure_time']))
+        logger.warning(f"Circuit for {service_name} is OPEN. Will try again in {retry_after}s")
+        return retry_after
+    
+    # Only one probe call at a time while HALF_OPEN; a probe that never reported back
+    # (e.g. its process died) is replaced once the recovery timeout has passed
+    if circuit['state'] == 'HALF_OPEN':
+        probe_age = current_time - circuit.get('probe_started_at', 0)
+        if probe_age < recovery_timeout:
+            logger.warning(f"Circuit for {service_name} is HALF_OPEN with a probe call in progress")
+            return int(recovery_timeout - probe_age)
+        circuit['probe_started_at'] = current_time
+    
+    return None
+
+def _apply_circuit_success(circuit: Dict, service_name: str, current_time: float,
+                           reset_failure_count: bool = False) -> None:
+    """
+    Records a successful call, closing a HALF_OPEN circuit.
+    
+    Args:
+        circuit: Circuit state, updated in place
+        service_name: Name of the protected service
+        current_time: Current time in seconds since the epoch
+        reset_failure_count: Whether a success also clears failures of a CLOSED circuit
+    """
+    if circuit['state'] == 'HALF_OPEN':
+        circuit['state'] = 'CLOSED'
+        circuit['probe_started_at'] = 0
+        logger.info(f"Circuit for {service_name} reset to CLOSED after successful test")
+    elif not reset_failure_count:
+        return
+    
+    circuit['failure_count'] = 0
+    circuit['last_success_time'] = current_time
+
+def _apply_circuit_failure(circuit: Dict, service_name: str, failure_threshold: int, current_time: float,
+                           exception: Exception = None) -> bool:
+    """
+    Records a failed call, tripping the circuit at the threshold or when the probe call fails.
+    
+    Args:
+        circuit: Circuit state, updated in place
+        service_name: Name of the protected service
+        failure_threshold: Number of failures before tripping the circuit
+        current_time: Current time in seconds since the epoch
+        exception: The exception that occurred
+        
+    Returns:
+        True if the circuit is now OPEN, False otherwise
+    """
+    circuit['failure_count'] += 1
+    circuit['last_failure_time'] = current_time
+    
+    # Trip circuit if failure threshold exceeded or the recovery probe failed
+    old_state = circuit['state']
+    if old_state == 'HALF_OPEN' or circuit['failure_count'] >= failure_threshold:
+        circuit['state'] = 'OPEN'
+        circuit['probe_started_at'] = 0
+        
+        if old_state != 'OPEN':
+            reason = f": {str(exception)}" if exception is not None else ''
+            logger.warning(
+                f"Circuit for {service_name} tripped to OPEN after {circuit['failure_count']} failures{reason}")
+    
+    return circuit['state'] == 'OPEN'
+
+def _check_circuit(service_name: str, recovery_timeout: int) -> Optional[int]:
+    """
+    Checks whether a call to a service is allowed, moving an expired OPEN circuit to HALF_OPEN.
+    
+    Args:
+        service_name: Name of the protected service
+        recovery_timeout: Time in seconds before testing if service has recovered
+        
+    Returns:
+        Seconds until the circuit can be retried if the call is rejected, None if the call may proceed
+    """
+    return get_circuit_store().update(
+        service_name, lambda circuit: _acquire_circuit(circuit, service_name, recovery_timeout, time.time())
+    )
+
+def _circuit_open_response(service_name: str, retry_after: int) -> Dict:
+    """
+    Builds the error response returned when a circuit is open and no fallback is set.
+    
+    Args:
+        service_name: Name of the protected service
+        retry_after: Seconds until the circuit can be retried
+        
+    Returns:
+        Error response dictionary
+    """
+    return {
+        'status': 'error',
+        'error_type': 'circuit_open',
+        'service_name': service_name,
+        'message': f"Circuit breaker for {service_name} is open",
+        'retry_after': retry_after
+    }
+
+def _record_circuit_success(service_name: str) -> None:
+    """
+    Closes a HALF_OPEN circuit after a successful test call.
+    
+    Args:
+        service_name: Name of the protected service
+    """
+    get_circuit_store().update(
+        service_name, lambda circuit: _apply_circuit_success(circuit, service_name, time.time())
+    )
+
+def _record_circuit_failure(service_name: str, failure_threshold: int) -> None:
+    """
+    Records a failed call and trips the circuit once the failure threshold is reached.
+    
+    Args:
+        service_name: Name of the protected service
+        failure_threshold: Number of failures before tripping the circuit
+    """
+    get_circuit_store().update(
+        service_name, lambda circuit: _apply_circuit_failure(circuit, service_name, failure_threshold, time.time())
+    )
+
 def with_circuit_breaker(service_name: str, failure_threshold: int = 5, 
                         recovery_timeout: int = 60, fallback_function: Callable = None):
     """
     Implements circuit breaker pattern to prevent repeated calls to failing services.
     
+    State changes are atomic, and while HALF_OPEN only a single probe call is let through.
+    
     Args:
         service_name: Name of the service to protect
         failure_threshold: Number of failures before tripping the circuit
@@ -268,72 +439,24 @@ def with_circuit_breaker(service_name: str, failure_threshold: int = 5,
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Get current circuit state
-            circuit = get_circuit_state(service_name)
-            current_time = time.time()
-            
-            # Check if circuit is OPEN (tripped)
-            if circuit['state'] == 'OPEN':
-                # Check if recovery timeout has elapsed
-                if current_time - circuit['last_failure_time'] > recovery_timeout:
-                    # Set to HALF_OPEN to test if service has recovered
-                    CIRCUIT_BREAKER_STATES['services'][service_name]['state'] = 'HALF_OPEN'
-                    logger.info(f"Circuit for {service_name} changed from OPEN to HALF_OPEN")
-                else:
-                    # Circuit is still OPEN, use fallback or return error
-                    logger.warning(
-                        f"Circuit for {service_name} is OPEN. "
-                        f"Will try again in {int(recovery_timeout - (current_time - circuit['last_failure_time']))}s")
-                    
-                    if fallback_function:
-                        return fallback_function(*args, **kwargs)
-                    else:
-                        return {
-                            'status': 'error',
-                            'error_type': 'circuit_open',
-                            'service_name': service_name,
-                            'message': f"Circuit breaker for {service_name} is open",
-                            'retry_after': int(recovery_timeout - (current_time - circuit['last_failure_time']))
-                        }
+            # Circuit is still OPEN, use fallback or return error
+            retry_after = _check_circuit(service_name, recovery_timeout)
+            if retry_after is not None:
+                if fallback_function:
+                    return fallback_function(*args, **kwargs)
+                return _circuit_open_response(service_name, retry_after)
             
             # Circuit is CLOSED or HALF_OPEN, try the function
             try:
                 result = func(*args, **kwargs)
-                
-                # If successful and was HALF_OPEN, reset to CLOSED
-                if circuit['state'] == 'HALF_OPEN':
-                    CIRCUIT_BREAKER_STATES['services'][service_name] = {
-                        'state': 'CLOSED',
-                        'failure_count': 0,
-                        'last_success_time': current_time,
-                        'last_failure_time': circuit['last_failure_time']
-                    }
-                    logger.info(f"Circuit for {service_name} reset to CLOSED after successful test")
-                
-                return result
-            
-            except Exception as e:
-                # Increment failure count
-                service_circuit = CIRCUIT_BREAKER_STATES['services'].get(service_name, {
-                    'state': 'CLOSED',
-                    'failure_count': 0,
-                    'last_success_time': 0,
-                    'last_failure_time': 0
-                })
-                
-                service_circuit['failure_count'] += 1
-                service_circuit['last_failure_time'] = current_time
-                
-                # Trip circuit if failure threshold exceeded
-                if service_circuit['failure_count'] >= failure_threshold:
-                    service_circuit['state'] = 'OPEN'
-                    logger.warning(
-                        f"Circuit for {service_name} tripped to OPEN after {service_circuit['failure_count']} failures")
-                
-                CIRCUIT_BREAKER_STATES['services'][service_name] = service_circuit
-                
-                # Re-raise the exception
+            except Exception:
+                # Increment failure count and re-raise the exception
+                _record_circuit_failure(service_name, failure_threshold)
                 raise
+            
+            # If successful and was HALF_OPEN, reset to CLOSED
+            _record_circuit_success(service_name)
+            return result
         
         return wrapper
     
@@ -347,18 +470,9 @@ def get_circuit_state(service_name: str) -> Dict:
         service_name: Name of the service to check
         
     Returns:
-        Circuit breaker state information
-    """
-    # Initialize state if it doesn't exist
-    if service_name not in CIRCUIT_BREAKER_STATES['services']:
-        CIRCUIT_BREAKER_STATES['services'][service_name] = {
-            'state': 'CLOSED',
-            'failure_count': 0,
-            'last_success_time': 0,
-            'last_failure_time': 0
-        }
-    
-    return CIRCUIT_BREAKER_STATES['services'][service_name]
+        Copy of the circuit breaker state information
+    """
+    return get_circuit_store().get(service_name)
 
 def reset_circuit(service_name: str) -> bool:
     """
@@ -370,14 +484,10 @@ def reset_circuit(service_name: str) -> bool:
     Returns:
         True if reset was successful, False if service not found
     """
-    if service_name in CIRCUIT_BREAKER_STATES['services']:
-        CIRCUIT_BREAKER_STATES['services'][service_name] = {
-            'state': 'CLOSED',
-            'failure_count': 0,
-            'last_success_time': time.time(),
-            'last_failure_time': 0
-        }
-        
+    state = new_circuit_state()
+    state['last_success_time'] = time.time()
+    
+    if get_circuit_store().reset(service_name, state):
         logger.info(f"Circuit for {service_name} manually reset to CLOSED")
         return True
     
@@ -617,18 +727,23 @@ class ErrorHandlingService:
 class CircuitBreaker:
     """
     Implementation of the circuit breaker pattern for service resilience.
+    
+    Circuit state changes are applied atomically through a circuit store, so the breaker
+    can be shared between threads and, with a SQLiteCircuitStore, between processes.
     """
     
-    def __init__(self, default_failure_threshold: int = 5, default_recovery_timeout: int = 60):
+    def __init__(self, default_failure_threshold: int = 5, default_recovery_timeout: int = 60, store=None):
         """
         Initializes the circuit breaker.
         
         Args:
             default_failure_threshold: Default number of failures before tripping circuit
             default_recovery_timeout: Default time in seconds before testing recovery
+            store: Circuit store holding the state, defaults to a private in-memory store
         """
-        # Dictionary to track circuit state for each service
+        # Dictionary to track circuit state for each service (used by the in-memory store)
         self.circuits = {}
+        self.store = store or MemoryCircuitStore(self.circuits)
         
         # Default settings
         self.default_failure_threshold = default_failure_threshold
@@ -645,18 +760,9 @@ class CircuitBreaker:
             service_name: Name of the service to check
             
         Returns:
-            Circuit state information
+            Copy of the circuit state information
         """
-        # Initialize circuit if it doesn't exist
-        if service_name not in self.circuits:
-            self.circuits[service_name] = {
-                'state': 'CLOSED',
-                'failure_count': 0,
-                'last_success_time': 0,
-                'last_failure_time': 0
-            }
-        
-        return self.circuits[service_name]
+        return self.store.get(service_name)
     
     def record_success(self, service_name: str) -> None:
         """
@@ -665,20 +771,10 @@ class CircuitBreaker:
         Args:
             service_name: Name of the service
         """
-        circuit = self.get_circuit(service_name)
-        current_time = time.time()
-        
-        # If circuit was HALF_OPEN, reset to CLOSED
-        if circuit['state'] == 'HALF_OPEN':
-            circuit['state'] = 'CLOSED'
-            logger.info(f"Circuit for {service_name} reset to CLOSED after successful test")
-        
-        # Reset failure count and update last success time
-        circuit['failure_count'] = 0
-        circuit['last_success_time'] = current_time
-        
-        # Update circuit
-        self.circuits[service_name] = circuit
+        self.store.update(
+            service_name,
+            lambda circuit: _apply_circuit_success(circuit, service_name, time.time(), reset_failure_count=True)
+        )
     
     def record_failure(self, service_name: str, exception: Exception, 
                       failure_threshold: int = None) -> bool:
@@ -693,59 +789,38 @@ class CircuitBreaker:
         Returns:
             True if circuit is now open, False otherwise
         """
-        circuit = self.get_circuit(service_name)
-        current_time = time.time()
-        
         # Use provided threshold or default
         if failure_threshold is None:
             failure_threshold = self.default_failure_threshold
         
-        # Increment failure count and update last failure time
-        circuit['failure_count'] += 1
-        circuit['last_failure_time'] = current_time
-        
-        # Trip circuit if failure threshold exceeded
-        if circuit['failure_count'] >= failure_threshold:
-            old_state = circuit['state']
-            circuit['state'] = 'OPEN'
-            
-            if old_state != 'OPEN':
-                logger.warning(
-                    f"Circuit for {service_name} tripped to OPEN after {circuit['failure_count']} failures: {str(exception)}")
-        
-        # Update circuit
-        self.circuits[service_name] = circuit
-        
-        # Return whether circuit is open
-        return circuit['state'] == 'OPEN'
+        return self.store.update(
+            service_name,
+            lambda circuit: _apply_circuit_failure(circuit, service_name, failure_threshold, time.time(), exception)
+        )
     
-    def is_circuit_open(self, service_name: str) -> bool:
+    def is_circuit_open(self, service_name: str, recovery_timeout: int = None) -> bool:
         """
-        Checks if the circuit for a service is open (tripped).
+        Checks if calls to a service are currently rejected.
+        
+        Once the recovery timeout has elapsed the circuit moves to HALF_OPEN and the
+        caller that gets False is the single probe call; other callers keep getting True
+        until the probe reports back.
         
         Args:
             service_name: Name of the service
+            recovery_timeout: Time in seconds before testing recovery
             
         Returns:
             True if circuit is open, False otherwise
         """
-        circuit = self.get_circuit(service_name)
-        current_time = time.time()
-        
-        # If circuit is OPEN, check if recovery timeout has elapsed
-        if circuit['state'] == 'OPEN':
-            recovery_time_elapsed = current_time - circuit['last_failure_time'] > self.default_recovery_timeout
-            
-            if recovery_time_elapsed:
-                # Change to HALF_OPEN to test if service has recovered
-                circuit['state'] = 'HALF_OPEN'
-                self.circuits[service_name] = circuit
-                logger.info(f"Circuit for {service_name} changed from OPEN to HALF_OPEN for testing")
-                return False
-            
-            return True
+        if recovery_timeout is None:
+            recovery_timeout = self.default_recovery_timeout
         
-        return False
+        retry_after = self.store.update(
+            service_name,
+            lambda circuit: _acquire_circuit(circuit, service_name, recovery_timeout, time.time())
+        )
+        return retry_after is not None
     
     def reset(self, service_name: str) -> bool:
         """
@@ -757,14 +832,10 @@ class CircuitBreaker:
         Returns:
             True if reset was successful, False if service not found
         """
-        if service_name in self.circuits:
-            self.circuits[service_name] = {
-                'state': 'CLOSED',
-                'failure_count': 0,
-                'last_success_time': time.time(),
-                'last_failure_time': 0
-            }
-            
+        state = new_circuit_state()
+        state['last_success_time'] = time.time()
+        
+        if self.store.reset(service_name, state):
             logger.info(f"Circuit for {service_name} manually reset to CLOSED")
             return True
         
@@ -798,7 +869,7 @@ class CircuitBreaker:
             recovery_timeout = self.default_recovery_timeout
         
         # Check if circuit is open
-        if self.is_circuit_open(service_name):
+        if self.is_circuit_open(service_name, recovery_timeout):
             logger.warning(f"Circuit for {service_name} is OPEN, preventing execution")
             
             # Use fallback if provided
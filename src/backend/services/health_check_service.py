@@ -0,0 +1,253 @@
+"""
+health_check_service.py - Concurrent health checks of the external integrations
+
+Health checks used to instantiate every component and probe each integration one after
+the other, re-authenticating for every probe. This module runs all probes concurrently,
+each bounded by a timeout, reports the latency of every dependency and caches healthy
+results for a TTL, so repeated checks within a few minutes (main --check-health, the
+maintenance health check and the weekly cron check) do not probe the APIs again:
+    <HEALTH_CHECK_CACHE_FILE>
+
+Usage:
+    results = run_health_checks(get_integration_probes())
+    results['capital_one'] == {'status': 'healthy', 'latency_ms': 182.4, 'cached': False, ...}
+"""
+
+import os
+import json
+import time
+import datetime
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .logging_service import get_component_logger, bind_run_context
+from ..config.settings import HEALTH_CHECK_SETTINGS
+
+# Set up logger for the health check service
+logger = get_component_logger('health_check_service')
+
+# Probe statuses reported by a probe result dictionary that mean the dependency is down
+UNHEALTHY_STATUSES = ['error', 'failed', 'unhealthy']
+
+
+def resolve_probe_status(result: Any) -> str:
+    """
+    Maps the return value of a probe to a health status.
+
+    Args:
+        result: Value returned by the probe (bool, or a dictionary with a 'status' key)
+
+    Returns:
+        'healthy' or 'unhealthy'
+    """
+    if isinstance(result, dict):
+        status = str(result.get('status', 'healthy')).lower()
+        return 'unhealthy' if status in UNHEALTHY_STATUSES else 'healthy'
+    return 'healthy' if result else 'unhealthy'
+
+
+class HealthCheckCache:
+    """Probe results kept for a TTL, in memory and optionally in a file shared by other processes"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the health check cache.
+
+        Args:
+            path: File shared with other processes, None keeps results in memory only
+        """
+        self.path = path
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        """
+        Loads the cached results on first use.
+
+        Returns:
+            Cached probe results by probe name
+        """
+        if self._entries is None:
+            self._entries = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable health check cache {self.path}: {str(e)}")
+        return self._entries
+
+    def get(self, name: str, ttl: float) -> Optional[Dict]:
+        """
+        Gets a cached healthy probe result that is younger than the TTL.
+
+        Failed and timed-out results are never reused, so one transient failure does not
+        keep reporting a dependency as down for the whole TTL.
+
+        Args:
+            name: Probe name
+            ttl: Maximum age in seconds
+
+        Returns:
+            Cached result, or None if there is no fresh healthy result
+        """
+        with self._lock:
+            entry = self._load().get(name)
+        if entry is None or entry.get('status') != 'healthy':
+            return None
+        if time.time() - entry.get('checked_at_ts', 0) > ttl:
+            return None
+        return dict(entry, cached=True)
+
+    def put(self, results: Dict[str, Dict]) -> None:
+        """
+        Stores probe results, writing the cache file atomically.
+
+        Args:
+            results: Probe results by probe name
+        """
+        with self._lock:
+            entries = self._load()
+            entries.update(results)
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(entries, f, indent=2, default=str)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write health check cache {self.path}: {str(e)}")
+
+
+# Cache shared by every health check in this process, created on first use
+_default_cache: Optional[HealthCheckCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_health_check_cache() -> HealthCheckCache:
+    """
+    Gets the health check cache configured by HEALTH_CHECK_SETTINGS['CACHE_FILE'].
+
+    Returns:
+        Process-wide HealthCheckCache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HealthCheckCache(HEALTH_CHECK_SETTINGS['CACHE_FILE'] or None)
+        return _default_cache
+
+
+def _run_probe(probe: Callable[[], Any], outcome: Dict) -> None:
+    """
+    Runs a probe and records its result, error and latency.
+
+    Args:
+        probe: Function checking a dependency
+        outcome: Dictionary receiving the result
+    """
+    start_time = time.perf_counter()
+    try:
+        outcome['details'] = probe()
+        outcome['status'] = resolve_probe_status(outcome['details'])
+    except Exception as e:
+        outcome['status'] = 'unhealthy'
+        outcome['error'] = str(e)
+    outcome['latency_ms'] = round((time.perf_counter() - start_time) * 1000, 1)
+
+
+def run_health_checks(probes: Dict[str, Callable[[], Any]], timeout: Optional[float] = None,
+                      ttl: Optional[float] = None, use_cache: bool = True,
+                      cache: Optional[HealthCheckCache] = None) -> Dict[str, Dict]:
+    """
+    Runs health probes concurrently, reusing healthy results that are younger than the TTL.
+
+    Each probe runs in its own daemon thread: a probe that hangs past the timeout is
+    reported as 'timeout' and never keeps the process from exiting.
+
+    Args:
+        probes: Functions checking each dependency by name; they return a bool or a
+            dictionary with a 'status' key, or raise an exception
+        timeout: Seconds each probe may take, defaults to HEALTH_CHECK_SETTINGS['TIMEOUT']
+        ttl: Seconds a healthy result is reused, defaults to HEALTH_CHECK_SETTINGS['CACHE_TTL']
+        use_cache: Whether cached results may be returned
+        cache: Result cache, defaults to the process-wide cache
+
+    Returns:
+        Result by probe name with status ('healthy', 'unhealthy' or 'timeout'), latency_ms,
+        checked_at, cached and the probe's details or error
+    """
+    timeout = timeout if timeout is not None else HEALTH_CHECK_SETTINGS['TIMEOUT']
+    ttl = ttl if ttl is not None else HEALTH_CHECK_SETTINGS['CACHE_TTL']
+    cache = cache or get_health_check_cache()
+
+    # Reuse fresh results, probe everything else
+    results: Dict[str, Dict] = {}
+    if use_cache:
+        for name in probes:
+            cached = cache.get(name, ttl)
+            if cached is not None:
+                results[name] = cached
+
+    # Start every remaining probe at once
+    running = {}
+    for name, probe in probes.items():
+        if name in results:
+            continue
+        outcome: Dict[str, Any] = {}
+        thread = threading.Thread(target=bind_run_context(_run_probe), args=(probe, outcome), name=f"health-{name}", daemon=True)
+        thread.start()
+        running[name] = (thread, outcome)
+
+    # Wait for all probes against a single deadline
+    deadline = time.monotonic() + timeout
+    fresh: Dict[str, Dict] = {}
+    for name, (thread, outcome) in running.items():
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            outcome = {'status': 'timeout', 'error': f"No response within {timeout}s", 'latency_ms': round(timeout * 1000, 1)}
+
+        outcome.update({
+            'checked_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'checked_at_ts': time.time(),
+            'cached': False
+        })
+        fresh[name] = outcome
+
+    if fresh:
+        cache.put(fresh)
+        unhealthy = [name for name, result in fresh.items() if result['status'] != 'healthy']
+        logger.info(f"Health checks completed for {', '.join(fresh)}",
+                    extra={'context': {'latency_ms': {name: result['latency_ms'] for name, result in fresh.items()},
+                                       'unhealthy': unhealthy}})
+
+    results.update(fresh)
+    return {name: results[name] for name in probes}
+
+
+def get_integration_probes(auth_service=None) -> Dict[str, Callable[[], Any]]:
+    """
+    Creates lightweight probes of every external integration sharing one authentication service.
+
+    Args:
+        auth_service: AuthenticationService shared by the probes, created if not provided
+
+    Returns:
+        Probes by integration name (capital_one, google_sheets, gemini, gmail)
+    """
+    # Imported here so the engine itself does not pull in every API client
+    from .authentication_service import AuthenticationService
+    from ..api_clients.capital_one_client import CapitalOneClient
+    from ..api_clients.google_sheets_client import GoogleSheetsClient
+    from ..api_clients.gemini_client import GeminiClient
+    from ..api_clients.gmail_client import GmailClient
+
+    auth_service = auth_service or AuthenticationService()
+    return {
+        'capital_one': lambda: CapitalOneClient(auth_service).test_connectivity(),
+        'google_sheets': lambda: GoogleSheetsClient(auth_service).authenticate(),
+        'gemini': lambda: GeminiClient(auth_service).authenticate(),
+        'gmail': lambda: GmailClient(auth_service).authenticate()
+    }
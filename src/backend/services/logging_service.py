@@ -34,6 +34,11 @@ Usage:
     @with_logging(logger, "operation_name")
     def some_function(arg1, arg2):
         return result
+
+    # With a run context (records logged in the block, in asyncio tasks it starts and
+    # in ContextThreadPoolExecutor tasks share the correlation ID and stage)
+    with run_context(correlation_id=correlation_id, stage="stage_name"):
+        logger.info("Processing")
 """
 
 import logging
@@ -45,7 +50,14 @@ from typing import Dict, List, Any, Optional, Callable, Union, TypeVar, cast
 
 from ..config.logging_config import (
     setup_logging,
+    shutdown_logging,
+    get_dropped_log_count,
     generate_correlation_id,
+    get_correlation_id,
+    get_run_context,
+    run_context,
+    bind_run_context,
+    ContextThreadPoolExecutor,
     ContextAdapter,
     SensitiveDataFilter
 )
@@ -112,6 +124,19 @@ def get_component_logger(component_name: str) -> logging.Logger:
     return logger
 
 
+def get_logger_correlation_id(logger: logging.Logger) -> str:
+    """
+    Gets the correlation ID of a logger, falling back to the one of the current run context.
+    
+    Args:
+        logger: Logger or ContextAdapter
+        
+    Returns:
+        Correlation ID to attach to log records
+    """
+    return getattr(logger, 'correlation_id', None) or get_correlation_id()
+
+
 def log_exception(
     logger: logging.Logger,
     exception: Exception,
@@ -149,7 +174,7 @@ def log_exception(
     
     # Log at the specified level
     logger.log(level, f"{message}: {str(exception)}", extra={
-        'correlation_id': getattr(logger, 'correlation_id', generate_correlation_id()),
+        'correlation_id': get_logger_correlation_id(logger),
         'context': log_context
     }, exc_info=exc_info)
 
@@ -176,24 +201,30 @@ def with_logging(
     def decorator(func: F) -> F:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            correlation_id = getattr(logger, 'correlation_id', generate_correlation_id())
+            correlation_id = get_logger_correlation_id(logger)
+            
+            # Skip masking the context and result when INFO records are not handled
+            log_info = logger.isEnabledFor(logging.INFO)
+            masked_context = mask_sensitive_data(context) if log_info else None
             
             # Log entry with operation name and context
-            logger.info(f"Starting {operation}", extra={
-                'correlation_id': correlation_id,
-                'context': mask_sensitive_data(context)
-            })
+            if log_info:
+                logger.info(f"Starting {operation}", extra={
+                    'correlation_id': correlation_id,
+                    'context': masked_context
+                })
             
             try:
                 # Execute the function
                 result = func(*args, **kwargs)
                 
                 # Log success with masked result
-                masked_result = mask_sensitive_data(result) if result is not None else None
-                logger.info(f"Completed {operation}", extra={
-                    'correlation_id': correlation_id,
-                    'context': {**mask_sensitive_data(context), 'result': masked_result}
-                })
+                if log_info:
+                    masked_result = mask_sensitive_data(result) if result is not None else None
+                    logger.info(f"Completed {operation}", extra={
+                        'correlation_id': correlation_id,
+                        'context': {**masked_context, 'result': masked_result}
+                    })
                 
                 return result
             except Exception as e:
@@ -284,12 +315,14 @@ class LoggingContext:
             logger: Logger to use
             operation: Name of the operation being performed
             context: Context information to include in logs
-            correlation_id: Optional correlation ID (generated if not provided)
+            correlation_id: Optional correlation ID (defaults to the one of the current run
+                context, generated if there is none)
         """
         self.logger = logger
         self.operation = operation
         self.context = context or {}
-        self.correlation_id = correlation_id or generate_correlation_id()
+        self.correlation_id = correlation_id or get_correlation_id(None) or generate_correlation_id()
+        self._run_context = None
         
         # Create adapter with correlation ID and context
         self.adapter = ContextAdapter(logger, {
@@ -301,9 +334,14 @@ class LoggingContext:
         """
         Enters the logging context and logs the operation start.
         
+        Code running inside the context logs with its correlation ID as well.
+        
         Returns:
             Self reference for context manager
         """
+        self._run_context = run_context(correlation_id=self.correlation_id)
+        self._run_context.__enter__()
+        
         # Log operation start with context
         self.adapter.info(f"Starting {self.operation}", context=self.context)
         return self
@@ -337,6 +375,9 @@ class LoggingContext:
                 context=self.context
             )
         
+        self._run_context.__exit__(None, None, None)
+        self._run_context = None
+        
         # Return False to propagate the exception
         return False
     
@@ -389,6 +430,7 @@ class PerformanceLogger:
         self.context = context or {}
         self.start_time = None
         self.checkpoints = {}
+        self.masked_context = None
     
     def start(self) -> None:
         """
@@ -397,10 +439,13 @@ class PerformanceLogger:
         self.start_time = time.time()
         self.checkpoints = {}
         
+        # Mask the context once for the start, every checkpoint and the stop
+        self.masked_context = mask_sensitive_data(self.context)
+        
         # Log operation start
         self.logger.info(f"Starting performance measurement for {self.operation}", extra={
-            'correlation_id': getattr(self.logger, 'correlation_id', generate_correlation_id()),
-            'context': mask_sensitive_data(self.context)
+            'correlation_id': get_logger_correlation_id(self.logger),
+            'context': self.masked_context
         })
     
     def checkpoint(self, checkpoint_name: str) -> float:
@@ -420,11 +465,13 @@ class PerformanceLogger:
         elapsed = time.time() - self.start_time
         self.checkpoints[checkpoint_name] = elapsed
         
-        # Log checkpoint
+        # Log checkpoint (skipped entirely when INFO records are not handled)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return elapsed
         self.logger.info(f"Checkpoint '{checkpoint_name}' reached in {elapsed:.4f}s", extra={
-            'correlation_id': getattr(self.logger, 'correlation_id', generate_correlation_id()),
+            'correlation_id': get_logger_correlation_id(self.logger),
             'context': {
-                **mask_sensitive_data(self.context),
+                **self.masked_context,
                 'checkpoint': checkpoint_name,
                 'elapsed_seconds': elapsed
             }
@@ -447,9 +494,9 @@ class PerformanceLogger:
         
         # Log operation completion with total time
         self.logger.info(f"Completed {self.operation} in {total_time:.4f}s", extra={
-            'correlation_id': getattr(self.logger, 'correlation_id', generate_correlation_id()),
+            'correlation_id': get_logger_correlation_id(self.logger),
             'context': {
-                **mask_sensitive_data(self.context),
+                **self.masked_context,
                 'total_seconds': total_time,
                 'checkpoints': self.checkpoints
             }
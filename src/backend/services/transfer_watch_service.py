@@ -0,0 +1,368 @@
+"""
+transfer_watch_service.py - Background verification of savings transfers
+
+Capital One transfers are usually still pending right after they are initiated, so
+verifying them once marks almost every transfer as failed. This module polls the
+transfer status in a background thread with exponential backoff up to a deadline,
+while the rest of the pipeline keeps running, and updates the Transfer model when the
+transfer completes or fails.
+
+Transfers that are still pending are persisted, so a later run can finish verifying
+them (SavingsAutomator resumes them at the start of every run):
+    <TRANSFER_WATCH_DIR>/pending_transfers.json
+
+The default directory is inside the container, which Cloud Run discards after every
+execution; point TRANSFER_WATCH_DIR at a mounted volume or bucket so the next run sees
+the transfers this one could not verify.
+
+Usage:
+    watcher = TransferWatcher(capital_one_client, [transfer], correlation_id=correlation_id).start()
+    ...
+    wait_for_pending_transfers()  # at exit, bounded by TRANSFER_WATCH_SETTINGS['EXIT_WAIT_TIMEOUT']
+"""
+
+import os
+import json
+import time
+import datetime
+import threading
+from typing import Dict, List, Optional
+
+from .logging_service import get_component_logger, bind_run_context
+from ..config.settings import TRANSFER_WATCH_SETTINGS, RETRY_SETTINGS
+from ..models.transfer import Transfer, create_transfer_from_dict
+from ..utils.error_handlers import calculate_backoff_delay
+
+# Set up logger for the transfer watch service
+logger = get_component_logger('transfer_watch_service')
+
+# Name of the file holding transfers that are still being verified
+PENDING_TRANSFERS_FILE = 'pending_transfers.json'
+
+# Capital One transfer statuses that mean the money did not move
+FAILED_TRANSFER_STATUSES = ['failed', 'cancelled', 'canceled', 'rejected', 'returned']
+
+# Watchers still polling in the background (waited for by wait_for_pending_transfers)
+_active_watchers: List['TransferWatcher'] = []
+_active_watchers_lock = threading.Lock()
+
+# Serializes read-modify-write cycles of every PendingTransferStore in this process
+# (the savings automator and resume_pending_transfers each create their own store)
+_pending_transfers_lock = threading.Lock()
+
+
+def resolve_transfer_status(status_response: Dict) -> str:
+    """
+    Maps a Capital One transfer status response to a Transfer model status.
+
+    Args:
+        status_response: Response from CapitalOneClient.get_transfer_status
+
+    Returns:
+        'completed', 'failed', or 'pending' if the transfer is not final yet (or the
+        status could not be retrieved)
+    """
+    status = str((status_response or {}).get('status', '')).lower()
+    if status == 'completed':
+        return 'completed'
+    if status in FAILED_TRANSFER_STATUSES:
+        return 'failed'
+    return 'pending'
+
+
+class PendingTransferStore:
+    """
+    File-backed set of transfers that are still being verified.
+
+    Writes are atomic so an interrupted job never leaves a partially written file behind,
+    and all stores in a process share one lock so concurrent updates are not lost.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the pending transfer store.
+
+        Args:
+            directory: Directory of the store, defaults to TRANSFER_WATCH_SETTINGS['DIR']
+        """
+        self.directory = directory or TRANSFER_WATCH_SETTINGS['DIR']
+        self.path = os.path.join(self.directory, PENDING_TRANSFERS_FILE)
+        self._lock = _pending_transfers_lock
+
+    def _read(self) -> Dict[str, Dict]:
+        """
+        Reads the pending transfers from disk.
+
+        Returns:
+            Pending transfer records by transfer ID
+        """
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable pending transfer file {self.path}: {str(e)}")
+            return {}
+
+    def _write(self, records: Dict[str, Dict]) -> None:
+        """
+        Writes the pending transfers to disk atomically.
+
+        Args:
+            records: Pending transfer records by transfer ID
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Unique per writer, so another process replacing the file never picks up a half-written one
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(records, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def add(self, transfer: Transfer, correlation_id: Optional[str] = None) -> None:
+        """
+        Records a transfer that still has to be verified.
+
+        Args:
+            transfer: Pending transfer
+            correlation_id: Correlation ID of the run that initiated the transfer
+        """
+        with self._lock:
+            records = self._read()
+            record = records.get(transfer.transfer_id) or {
+                'first_seen_at': datetime.datetime.utcnow().isoformat(),
+                'correlation_id': correlation_id
+            }
+            record['transfer'] = transfer.to_dict()
+            records[transfer.transfer_id] = record
+            self._write(records)
+
+    def remove(self, transfer_id: str) -> None:
+        """
+        Removes a transfer whose verification has finished.
+
+        Args:
+            transfer_id: ID of the transfer
+        """
+        with self._lock:
+            records = self._read()
+            if records.pop(transfer_id, None) is not None:
+                self._write(records)
+
+    def load(self) -> List[Transfer]:
+        """
+        Loads the pending transfers, dropping the ones older than the expiry period.
+
+        Returns:
+            Transfers that still have to be verified
+        """
+        with self._lock:
+            records = self._read()
+            expiry = datetime.datetime.utcnow() - datetime.timedelta(days=TRANSFER_WATCH_SETTINGS['EXPIRY_DAYS'])
+
+            transfers = []
+            expired = []
+            for transfer_id, record in records.items():
+                first_seen_at = datetime.datetime.fromisoformat(record.get('first_seen_at', datetime.datetime.utcnow().isoformat()))
+                transfer = create_transfer_from_dict(record.get('transfer', {}))
+                if first_seen_at < expiry or transfer is None:
+                    expired.append(transfer_id)
+                else:
+                    transfers.append(transfer)
+
+            if expired:
+                logger.warning(f"Dropping {len(expired)} pending transfers that could not be verified",
+                               extra={'context': {'transfer_ids': expired}})
+                for transfer_id in expired:
+                    records.pop(transfer_id)
+                self._write(records)
+
+        return transfers
+
+
+class TransferWatcher:
+    """Polls the status of pending transfers in a background thread until each one is final"""
+
+    def __init__(self, capital_one_client, transfers: List[Transfer], store: Optional[PendingTransferStore] = None,
+                 correlation_id: Optional[str] = None, deadline: Optional[float] = None,
+                 delay: Optional[float] = None):
+        """
+        Initialize the transfer watcher.
+
+        Args:
+            capital_one_client: CapitalOneClient used to check transfer status
+            transfers: Pending transfers to watch
+            store: Store of pending transfers, defaults to a PendingTransferStore in TRANSFER_WATCH_SETTINGS['DIR']
+            correlation_id: Correlation ID of the current run
+            deadline: Seconds to keep polling, defaults to TRANSFER_WATCH_SETTINGS['DEADLINE']
+            delay: Seconds before the first poll, defaults to TRANSFER_WATCH_SETTINGS['POLL_DELAY']
+        """
+        self.capital_one_client = capital_one_client
+        self.transfers = list(transfers)
+        self.store = store or PendingTransferStore()
+        self.correlation_id = correlation_id
+        self.deadline = deadline if deadline is not None else TRANSFER_WATCH_SETTINGS['DEADLINE']
+        self.delay = delay if delay is not None else TRANSFER_WATCH_SETTINGS['POLL_DELAY']
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=bind_run_context(self._poll), name='transfer-watcher', daemon=True)
+
+    def start(self) -> 'TransferWatcher':
+        """
+        Persists the transfers and starts polling in the background.
+
+        Returns:
+            The started watcher
+        """
+        for transfer in self.transfers:
+            try:
+                self.store.add(transfer, self.correlation_id)
+            except OSError as e:
+                logger.warning(f"Could not persist pending transfer, a later run will not resume it: {str(e)}",
+                               extra={'correlation_id': self.correlation_id,
+                                      'context': {'transfer_id': transfer.transfer_id, 'error': str(e)}})
+
+        with _active_watchers_lock:
+            _active_watchers.append(self)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> List[Transfer]:
+        """
+        Waits for polling to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits until the deadline)
+
+        Returns:
+            The watched transfers with their current status
+        """
+        self._thread.join(timeout)
+        return self.transfers
+
+    def stop(self) -> None:
+        """Stops polling after the current attempt; unfinished transfers stay persisted."""
+        self._stop_event.set()
+
+    def is_done(self) -> bool:
+        """
+        Checks whether polling has finished.
+
+        Returns:
+            True if every transfer is final or the deadline was reached
+        """
+        return not self._thread.is_alive()
+
+    def check_transfer(self, transfer: Transfer) -> str:
+        """
+        Checks the status of a transfer once and records it when it is final.
+
+        Args:
+            transfer: Transfer to check
+
+        Returns:
+            Resolved transfer status ('completed', 'failed' or 'pending')
+        """
+        try:
+            status = resolve_transfer_status(self.capital_one_client.get_transfer_status(transfer.transfer_id))
+        except Exception as e:
+            logger.warning(f"Transfer status check failed: {str(e)}",
+                           extra={'correlation_id': self.correlation_id,
+                                  'context': {'transfer_id': transfer.transfer_id, 'error': str(e)}})
+            return 'pending'
+
+        if status != 'pending':
+            transfer.update_status(status)
+            try:
+                self.store.remove(transfer.transfer_id)
+            except OSError as e:
+                # The transfer is final either way; a later run just checks it once more
+                logger.warning(f"Could not remove verified transfer from the pending store: {str(e)}",
+                               extra={'correlation_id': self.correlation_id,
+                                      'context': {'transfer_id': transfer.transfer_id, 'error': str(e)}})
+            logger.info(f"Transfer {transfer.transfer_id} {status}",
+                        extra={'correlation_id': self.correlation_id,
+                               'context': {'transfer_id': transfer.transfer_id, 'status': status}})
+        return status
+
+    def _poll(self) -> None:
+        """Polls pending transfers with exponential backoff until they are final or the deadline passes."""
+        deadline = time.monotonic() + self.deadline
+        pending = [transfer for transfer in self.transfers if transfer.is_pending()]
+        attempt = 0
+        try:
+            while pending:
+                # Wait before every poll, but never past the deadline
+                wait_time = min(
+                    calculate_backoff_delay(attempt, self.delay, RETRY_SETTINGS['DEFAULT_RETRY_BACKOFF_FACTOR'],
+                                            RETRY_SETTINGS['DEFAULT_RETRY_JITTER']),
+                    TRANSFER_WATCH_SETTINGS['MAX_POLL_DELAY'],
+                    deadline - time.monotonic()
+                )
+                if wait_time < 0 or self._stop_event.wait(wait_time):
+                    break
+
+                pending = [transfer for transfer in pending if self.check_transfer(transfer) == 'pending']
+                attempt += 1
+
+            if pending:
+                logger.info(f"{len(pending)} transfers still pending, verification continues in a later run",
+                            extra={'correlation_id': self.correlation_id,
+                                   'context': {'transfer_ids': [transfer.transfer_id for transfer in pending]}})
+        finally:
+            with _active_watchers_lock:
+                if self in _active_watchers:
+                    _active_watchers.remove(self)
+
+
+def resume_pending_transfers(capital_one_client, correlation_id: Optional[str] = None,
+                             store: Optional[PendingTransferStore] = None) -> Optional[TransferWatcher]:
+    """
+    Starts watching the transfers that previous runs could not finish verifying.
+
+    Args:
+        capital_one_client: CapitalOneClient used to check transfer status
+        correlation_id: Correlation ID of the current run
+        store: Store of pending transfers, defaults to a PendingTransferStore in TRANSFER_WATCH_SETTINGS['DIR']
+
+    Returns:
+        The started TransferWatcher, or None if no transfers are pending
+    """
+    store = store or PendingTransferStore()
+    transfers = store.load()
+    if not transfers:
+        return None
+
+    logger.info(f"Resuming verification of {len(transfers)} pending transfers",
+                extra={'correlation_id': correlation_id,
+                       'context': {'transfer_ids': [transfer.transfer_id for transfer in transfers]}})
+    return TransferWatcher(capital_one_client, transfers, store=store, correlation_id=correlation_id).start()
+
+
+def wait_for_pending_transfers(timeout: Optional[float] = None) -> List[Transfer]:
+    """
+    Waits for background transfer verification started by this process to finish.
+
+    Transfers still pending when the timeout expires stay persisted for the next run.
+
+    Args:
+        timeout: Maximum total seconds to wait, defaults to TRANSFER_WATCH_SETTINGS['EXIT_WAIT_TIMEOUT']
+
+    Returns:
+        Transfers of every watcher that was still running
+    """
+    if timeout is None:
+        timeout = TRANSFER_WATCH_SETTINGS['EXIT_WAIT_TIMEOUT']
+
+    with _active_watchers_lock:
+        watchers = list(_active_watchers)
+
+    deadline = time.monotonic() + timeout
+    transfers = []
+    for watcher in watchers:
+        transfers.extend(watcher.wait(max(0.0, deadline - time.monotonic())))
+        if not watcher.is_done():
+            watcher.stop()
+
+    return transfers
@@ -6,6 +6,9 @@ including email templates and AI prompt templates for various operations.
 """
 
 import os
+import re
+import functools
+from typing import Dict, Iterable
 from .ai_prompts import (
     categorization_prompt_template,
     insight_generation_prompt_template,
@@ -19,6 +22,57 @@ TEMPLATES_DIR = os.path.dirname(os.path.abspath(__file__))
 # Define the path to the email template
 EMAIL_TEMPLATE_PATH = os.path.join(TEMPLATES_DIR, 'email_template.html')
 
+# Placeholders filled in by the report when rendering the email template
+EMAIL_TEMPLATE_FIELDS = (
+    'status_class',
+    'variance_amount',
+    'status_text',
+    'charts_content',
+    'ai_generated_insights',
+    'category_details',
+    'report_date'
+)
+
+
+class CompiledTemplate:
+    """Template split once into literal text and {field} slots, so rendering is a single join"""
+    
+    def __init__(self, text: str, fields: Iterable[str]):
+        """
+        Compiles template text for the given placeholder names.
+        
+        Only {field} placeholders for the listed names are replaced, so the CSS braces
+        in HTML templates are left untouched.
+        
+        Args:
+            text (str): Template text
+            fields (iterable): Names of the placeholders in the template
+        """
+        self.fields = tuple(fields)
+        pattern = re.compile(r'\{(' + '|'.join(re.escape(field) for field in self.fields) + r')\}')
+        
+        # split() alternates literal text and placeholder names
+        parts = pattern.split(text)
+        self.literals = parts[0::2]
+        self.slots = parts[1::2]
+    
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Renders the template with the given placeholder values.
+        
+        Args:
+            values (dict): Rendered value for every placeholder in the template
+            
+        Returns:
+            str: Rendered template
+        """
+        output = [self.literals[0]]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            output.append(values[slot])
+            output.append(literal)
+        return ''.join(output)
+
+
 def load_email_template():
     """
     Loads the HTML email template for budget reports.
@@ -35,6 +89,20 @@ def load_email_template():
         logging.error(f"Error loading email template: {str(e)}")
         return ""
 
+@functools.lru_cache(maxsize=None)
+def get_email_template() -> CompiledTemplate:
+    """
+    Loads and compiles the HTML email template once per process.
+    
+    Returns:
+        CompiledTemplate: Compiled email template
+        
+    Raises:
+        FileNotFoundError: If the email template file does not exist
+    """
+    with open(EMAIL_TEMPLATE_PATH, 'r') as file:
+        return CompiledTemplate(file.read(), EMAIL_TEMPLATE_FIELDS)
+
 def get_template_path(template_name):
     """
     Gets the absolute path to a template file.
@@ -50,6 +118,9 @@ def get_template_path(template_name):
 # Define what should be accessible when importing from this package
 __all__ = [
     'load_email_template',
+    'get_email_template',
+    'CompiledTemplate',
+    'EMAIL_TEMPLATE_FIELDS',
     'get_template_path',
     'EMAIL_TEMPLATE_PATH',
     'TEMPLATES_DIR',
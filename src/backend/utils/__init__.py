@@ -62,6 +62,7 @@ __all__ = [
     
     # Error handling utilities (from error_handlers)
     'retry_with_backoff',
+    'calculate_backoff_delay',
     'is_retriable_error',
     'handle_api_error',
     'handle_validation_error',
@@ -6,7 +6,11 @@ with exponential backoff, error classification, and custom exception types to
 ensure robust handling of failures across all application components.
 """
 
+import contextlib  # standard library
+import contextvars  # standard library
+import email.utils  # standard library
 import functools  # standard library
+import threading  # standard library
 import time  # standard library
 import random  # standard library
 import traceback  # standard library
@@ -15,11 +19,17 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union  # st
 import requests  # requests 2.31.0+
 
 from ..config.settings import RETRY_SETTINGS, APP_SETTINGS
-from ..config.logging_config import get_logger
+from ..config.logging_config import get_logger, run_context
 
 # Set up logger
 logger = get_logger('error_handlers')
 
+# Retry budget of the current run or stage, shared by every nested retry_with_backoff
+_current_retry_budget: contextvars.ContextVar[Optional['RetryBudget']] = contextvars.ContextVar(
+    'retry_budget', default=None
+)
+_retry_budget_lock = threading.Lock()
+
 
 class APIError(Exception):
     """Custom exception for API-related errors"""
@@ -150,6 +160,227 @@ class AuthenticationError(Exception):
         return error_dict
 
 
+def calculate_backoff_delay(retries: int, delay: float, backoff_factor: float,
+                            jitter: Optional[float] = None) -> float:
+    """
+    Calculates the wait time before a retry attempt using exponential backoff
+    
+    Args:
+        retries: Number of retries already attempted
+        delay: Initial delay between retries in seconds
+        backoff_factor: Multiplier applied to delay between retries
+        jitter: Random factor to add to delay to prevent thundering herd
+        
+    Returns:
+        Wait time in seconds
+    """
+    wait_time = delay * (backoff_factor ** retries)
+    if jitter:
+        wait_time = wait_time + (wait_time * random.uniform(-jitter, jitter))
+    return wait_time
+
+
+class RetryBudget:
+    """
+    Deadline and number of retries shared by every retry made within a run or stage.
+    
+    Budgets nest: a stage budget never ends after the run deadline, and each retry it
+    allows also counts against the run's retry budget.
+    """
+    
+    def __init__(self, timeout: Optional[float] = None, max_retries: Optional[int] = None,
+                 parent: Optional['RetryBudget'] = None):
+        """
+        Initialize a retry budget
+        
+        Args:
+            timeout: Seconds from now until the deadline (None for no deadline of its own)
+            max_retries: Retries allowed in total (None for no limit of its own)
+            parent: Enclosing budget whose deadline and retries are shared
+        """
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        if parent is not None and parent.deadline is not None:
+            self.deadline = parent.deadline if self.deadline is None else min(self.deadline, parent.deadline)
+        self.retries_left = max_retries
+        self.parent = parent
+    
+    def remaining_time(self) -> Optional[float]:
+        """
+        Gets the time left until the deadline
+        
+        Returns:
+            Seconds left (0 once the deadline has passed), None if there is no deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def is_expired(self) -> bool:
+        """
+        Checks whether the deadline has passed
+        
+        Returns:
+            True if the deadline has passed, False otherwise
+        """
+        return self.remaining_time() == 0
+    
+    def consume_retry(self) -> bool:
+        """
+        Takes one retry from this budget and every enclosing one
+        
+        Returns:
+            True if a retry was available, False if any budget in the chain is exhausted
+        """
+        with _retry_budget_lock:
+            budgets = []
+            budget = self
+            while budget is not None:
+                if budget.retries_left is not None:
+                    if budget.retries_left <= 0:
+                        return False
+                    budgets.append(budget)
+                budget = budget.parent
+            
+            for budget in budgets:
+                budget.retries_left -= 1
+            return True
+
+
+def get_retry_budget() -> Optional[RetryBudget]:
+    """
+    Gets the retry budget of the current run or stage
+    
+    Returns:
+        Active RetryBudget, or None if retries are not bounded by a budget
+    """
+    return _current_retry_budget.get()
+
+
+@contextlib.contextmanager
+def retry_budget(timeout: Optional[float] = None, max_retries: Optional[int] = None):
+    """
+    Context manager bounding every retry made inside it by a deadline and a number of retries
+    
+    The budget is stored in a context variable, so it follows the code into nested
+    calls and into threads that run in a copy of the context. A budget opened inside another one
+    shares its deadline and retries.
+    
+    Args:
+        timeout: Seconds until the deadline
+        max_retries: Retries allowed in total
+        
+    Yields:
+        The active RetryBudget
+    """
+    budget = RetryBudget(timeout, max_retries, parent=get_retry_budget())
+    token = _current_retry_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_retry_budget.reset(token)
+
+
+def get_retry_after(exception: Exception) -> Optional[float]:
+    """
+    Extracts the wait requested by a Retry-After response header
+    
+    Args:
+        exception: Exception raised for an API response (requests or Google API client)
+        
+    Returns:
+        Seconds to wait before retrying, or None if the response did not ask for a wait
+    """
+    retry_after = getattr(exception, 'retry_after', None)
+    
+    if retry_after is None:
+        # requests keeps the response on .response, the Google API client on .resp
+        response = getattr(exception, 'response', None)
+        if response is None:
+            response = getattr(exception, 'resp', None)
+        headers = getattr(response, 'headers', response)
+        if hasattr(headers, 'get'):
+            retry_after = headers.get('Retry-After') or headers.get('retry-after')
+    
+    if retry_after is None:
+        return None
+    
+    # Retry-After is either a number of seconds or an HTTP date
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(str(retry_after))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def plan_retry(func_name: str, exception: Exception, retries: int, max_retries: int, delay: float,
+               backoff_factor: float, jitter: Optional[float]) -> Optional[float]:
+    """
+    Decides whether a failed call is retried and how long to wait first
+    
+    The wait is the exponential backoff, extended to any Retry-After the service asked
+    for and capped by the time left in the active retry budget. The retry is skipped
+    once the attempts, the budget's retries or its deadline are used up.
+    
+    Args:
+        func_name: Name of the retried function, for logging
+        exception: Exception raised by the failed call
+        retries: Number of retries already attempted
+        max_retries: Maximum number of retry attempts
+        delay: Initial delay between retries in seconds
+        backoff_factor: Multiplier applied to delay between retries
+        jitter: Random factor to add to delay to prevent thundering herd
+        
+    Returns:
+        Wait time in seconds, or None if the exception should be re-raised
+    """
+    # If we've exceeded max retries, re-raise the exception
+    if retries >= max_retries:
+        logger.warning(
+            f"Maximum retries ({max_retries}) exceeded for {func_name}",
+            context={"exception": str(exception), "retries": retries}
+        )
+        return None
+    
+    # Calculate backoff with jitter, waiting at least as long as the service asked
+    wait_time = calculate_backoff_delay(retries, delay, backoff_factor, jitter)
+    retry_after = get_retry_after(exception)
+    if retry_after is not None:
+        wait_time = max(wait_time, retry_after)
+    
+    # Stay within the deadline and retries shared by the whole run
+    budget = get_retry_budget()
+    if budget is not None:
+        remaining = budget.remaining_time()
+        if remaining is not None:
+            if remaining == 0 or (retry_after is not None and retry_after > remaining):
+                logger.warning(
+                    f"Not retrying {func_name}: deadline reached",
+                    context={"exception": str(exception), "retries": retries,
+                             "remaining_time": remaining, "retry_after": retry_after}
+                )
+                return None
+            wait_time = min(wait_time, remaining)
+        
+        if not budget.consume_retry():
+            logger.warning(
+                f"Not retrying {func_name}: retry budget exhausted",
+                context={"exception": str(exception), "retries": retries}
+            )
+            return None
+    
+    # Log retry attempt
+    logger.info(
+        f"Retrying {func_name} after exception: {str(exception)}. "
+        f"Retry {retries + 1}/{max_retries} in {wait_time:.2f}s",
+        context={"exception": str(exception), "retry_count": retries + 1}
+    )
+    return wait_time
+
+
 def retry_with_backoff(exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = (Exception,), 
                       max_retries: Optional[int] = None, 
                       delay: Optional[int] = None,
@@ -158,6 +389,9 @@ def retry_with_backoff(exceptions: Union[Type[Exception], Tuple[Type[Exception],
     """
     Decorator that retries a function with exponential backoff on specified exceptions
     
+    Retries also respect Retry-After and the active retry budget (see retry_budget), so
+    nested retrying functions never multiply their attempts past the run's limits.
+    
     Args:
         exceptions: Exception or tuple of exception types to catch and retry
         max_retries: Maximum number of retry attempts
@@ -183,28 +417,17 @@ def retry_with_backoff(exceptions: Union[Type[Exception], Tuple[Type[Exception],
             while True:
                 try:
                     # Attempt to execute the function
-                    return func(*args, **kwargs)
+                    if not retries:
+                        return func(*args, **kwargs)
+                    # Records logged by a retried call show which attempt they belong to
+                    with run_context(retry_attempt=retries):
+                        return func(*args, **kwargs)
                 except exceptions as e:
-                    # If we've exceeded max retries, re-raise the exception
-                    if retries >= max_retries:
-                        logger.warning(
-                            f"Maximum retries ({max_retries}) exceeded for {func.__name__}",
-                            context={"exception": str(e), "retries": retries}
-                        )
+                    # Re-raise once retries, the retry budget or the deadline are used up
+                    wait_time = plan_retry(func.__name__, e, retries, max_retries, delay, backoff_factor, jitter)
+                    if wait_time is None:
                         raise
                     
-                    # Calculate backoff with jitter
-                    wait_time = delay * (backoff_factor ** retries)
-                    if jitter:
-                        wait_time = wait_time + (wait_time * random.uniform(-jitter, jitter))
-                    
-                    # Log retry attempt
-                    logger.info(
-                        f"Retrying {func.__name__} after exception: {str(e)}. "
-                        f"Retry {retries + 1}/{max_retries} in {wait_time:.2f}s",
-                        context={"exception": str(e), "retry_count": retries + 1}
-                    )
-                    
                     # Wait before retrying
                     time.sleep(wait_time)
                     
@@ -258,9 +481,11 @@ def handle_api_error(exception: Exception, api_name: str, operation: str,
     status_code = None
     response_text = None
     
-    if isinstance(exception, requests.HTTPError) and hasattr(exception, 'response'):
-        status_code = exception.response.status_code
-        response_text = exception.response.text
+    # requests.HTTPError carries the failed response
+    response = getattr(exception, 'response', None)
+    if response is not None and hasattr(response, 'status_code'):
+        status_code = response.status_code
+        response_text = response.text
     
     # Create error response
     error_response = {
@@ -15,18 +15,25 @@ Functions:
     get_logger: Gets a configured logger for a specific script component
     generate_correlation_id: Generates unique correlation IDs for request tracing
     mask_sensitive_data: Masks sensitive data in logs
+
+Log files are rotated and compressed by the application's CompressingRotatingFileHandler
+(src/backend/config/logging_config.py).
 """
 
 import logging
-import json
 import os
 import datetime
 import re
 import uuid
 
-from .script_settings import SCRIPT_SETTINGS
+from .script_settings import SCRIPT_SETTINGS, LOG_ROTATION_SETTINGS, MAINTENANCE_SETTINGS
 from .path_constants import LOGS_DIR, ensure_dir_exists
 
+from src.backend.config.logging_config import CompressingRotatingFileHandler  # Log rotation shared with the application
+from src.backend.config.log_fastpath import (  # Formatting and redaction fast path shared with the application
+    combine_patterns, SensitiveKeyCache, resolve_format_fields, render_format_fields, dumps_log_record
+)
+
 # Default logging level if not specified
 DEFAULT_LOG_LEVEL = logging.INFO
 
@@ -38,6 +45,9 @@ SENSITIVE_PATTERNS = [
     ]
 ]
 
+# All sensitive patterns combined into one regex, so each string is scanned only once
+SENSITIVE_REGEX = combine_patterns(SENSITIVE_PATTERNS)
+
 # Format for structured JSON logs
 LOG_FORMAT = {
     'timestamp': '%(asctime)s',
@@ -64,6 +74,9 @@ class JsonFormatter(logging.Formatter):
         """
         super().__init__()
         self.format_dict = format_dict
+        
+        # Resolve the format once instead of for every record
+        self.fields, self.uses_asctime = resolve_format_fields(format_dict)
     
     def format(self, record):
         """
@@ -75,31 +88,30 @@ class JsonFormatter(logging.Formatter):
         Returns:
             JSON formatted log string
         """
-        # Create a copy of the format dictionary
-        output_dict = self.format_dict.copy()
+        values = record.__dict__
         
         # Add correlation_id to record if not present
-        if not hasattr(record, 'correlation_id'):
+        if 'correlation_id' not in values:
             record.correlation_id = ''
             
         # Add context to record if not present
-        if not hasattr(record, 'context'):
+        if 'context' not in values:
             record.context = {}
+        
+        # Render the message and timestamp the format refers to
+        record.message = record.getMessage()
+        if self.uses_asctime:
+            record.asctime = self.formatTime(record)
             
         # Replace format placeholders with record values
-        for key, value in output_dict.items():
-            try:
-                output_dict[key] = value % record.__dict__
-            except (KeyError, TypeError):
-                # Keep the original value if formatting fails
-                pass
+        output_dict = render_format_fields(self.fields, values)
         
         # If there's an exception, include it
         if record.exc_info:
             output_dict['exception'] = self.formatException(record.exc_info)
             
         # Convert to JSON string
-        return json.dumps(output_dict)
+        return dumps_log_record(output_dict)
     
     def formatException(self, exc_info):
         """
@@ -120,6 +132,8 @@ class SensitiveDataFilter(logging.Filter):
     def __init__(self):
         """Initializes the sensitive data filter."""
         super().__init__()
+        # Dictionaries of the same shape are only matched against the patterns once
+        self.sensitive_keys = SensitiveKeyCache(SENSITIVE_REGEX)
     
     def filter(self, record):
         """
@@ -131,6 +145,11 @@ class SensitiveDataFilter(logging.Filter):
         Returns:
             True to include the record in the log output
         """
+        # Records reaching both the file and console handlers are only masked once
+        if getattr(record, 'sensitive_data_masked', False):
+            return True
+        record.sensitive_data_masked = True
+        
         # Mask sensitive data in context
         if hasattr(record, 'context') and record.context:
             record.context = self.mask_sensitive_data(record.context)
@@ -153,20 +172,12 @@ class SensitiveDataFilter(logging.Filter):
             Data with sensitive information masked
         """
         if isinstance(data, str):
-            # Check if the string contains any sensitive patterns
-            for pattern in SENSITIVE_PATTERNS:
-                if pattern.search(data):
-                    data = pattern.sub('[REDACTED]', data)
-            return data
+            # Replace every sensitive pattern in a single scan
+            return SENSITIVE_REGEX.sub('[REDACTED]', data)
         elif isinstance(data, dict):
             # Recursively process dictionary values
             masked_data = {}
-            for key, value in data.items():
-                # Check if the key contains any sensitive patterns
-                is_sensitive = False
-                if isinstance(key, str):
-                    is_sensitive = any(pattern.search(key.lower()) for pattern in SENSITIVE_PATTERNS)
-                
+            for (key, value), is_sensitive in zip(data.items(), self.sensitive_keys.get_flags(data)):
                 if is_sensitive and isinstance(value, (str, int, float)):
                     masked_data[key] = '[REDACTED]'
                 else:
@@ -180,6 +191,10 @@ class SensitiveDataFilter(logging.Filter):
             return data
 
 
+# Filter instance used by mask_sensitive_data
+_sensitive_data_filter = SensitiveDataFilter()
+
+
 class ContextAdapter(logging.LoggerAdapter):
     """Adapter for adding context and correlation ID to log records."""
     
@@ -302,9 +317,8 @@ def mask_sensitive_data(data):
     Returns:
         Data with sensitive information masked
     """
-    # Create a filter instance to use its masking method
-    filter_instance = SensitiveDataFilter()
-    return filter_instance.mask_sensitive_data(data)
+    # Reuse one filter instance so its sensitive key cache persists between calls
+    return _sensitive_data_filter.mask_sensitive_data(data)
 
 
 def setup_logging(log_level=None, use_json_logs=None, log_file=None):
@@ -358,8 +372,18 @@ def setup_logging(log_level=None, use_json_logs=None, log_file=None):
         # Create a filter to mask sensitive data
         sensitive_filter = SensitiveDataFilter()
         
-        # Set up file handler
-        file_handler = logging.FileHandler(log_file_path)
+        # Set up file handler, rotating and compressing the file as it grows
+        if LOG_ROTATION_SETTINGS['ENABLED']:
+            file_handler = CompressingRotatingFileHandler(
+                log_file_path,
+                max_bytes=LOG_ROTATION_SETTINGS['MAX_BYTES'],
+                interval_hours=LOG_ROTATION_SETTINGS['INTERVAL_HOURS'],
+                backup_count=LOG_ROTATION_SETTINGS['BACKUP_COUNT'],
+                retention_days=MAINTENANCE_SETTINGS['LOG_RETENTION_DAYS'],
+                compression=LOG_ROTATION_SETTINGS['COMPRESSION']
+            )
+        else:
+            file_handler = logging.FileHandler(log_file_path)
         file_handler.setFormatter(formatter)
         file_handler.addFilter(sensitive_filter)
         root_logger.addHandler(file_handler)
@@ -255,10 +255,65 @@ MAINTENANCE_SETTINGS = {
     'ALERT_ON_ERROR': get_boolean_env_var('ALERT_ON_ERROR', True)
 }
 
+# Sheets backup settings (JSON backups are incremental snapshots: rows are kept in compressed,
+# content-addressed blocks and each backup only writes the blocks that changed)
+BACKUP_SETTINGS = {
+    'INCREMENTAL': get_boolean_env_var('BACKUP_INCREMENTAL', True),
+    'COMPRESSION': os.getenv('BACKUP_COMPRESSION', 'zstd'),  # zstd (gzip if zstandard is missing), gzip or none
+    'BLOCK_ROWS': get_int_env_var('BACKUP_BLOCK_ROWS', 256),  # Average rows per block
+    'KEEP_SNAPSHOTS': get_int_env_var('BACKUP_KEEP_SNAPSHOTS', 60),  # Per sheet
+    'WORKERS': get_int_env_var('BACKUP_WORKERS', 2)  # Sheets backed up at the same time
+}
+
+# Restore settings (backups are written back in chunks sized to the Sheets request payload
+# limit, each verified against the backed-up rows; progress is recorded so an interrupted
+# restore resumes after the last verified chunk)
+RESTORE_SETTINGS = {
+    'MAX_REQUEST_BYTES': get_int_env_var('RESTORE_MAX_REQUEST_BYTES', 2 * 1024 * 1024),
+    'MAX_CHUNK_ROWS': get_int_env_var('RESTORE_MAX_CHUNK_ROWS', 10000),
+    'CHUNK_ATTEMPTS': get_int_env_var('RESTORE_CHUNK_ATTEMPTS', 3),
+    'VERIFY': get_boolean_env_var('RESTORE_VERIFY', True)
+}
+
+# Log rotation settings (script log files are rotated by size and age, rotated files are
+# compressed in the background; cleanup_logs.py compresses older plain logs the same way)
+LOG_ROTATION_SETTINGS = {
+    'ENABLED': get_boolean_env_var('LOG_ROTATION_ENABLED', True),
+    'MAX_BYTES': get_int_env_var('LOG_ROTATION_MAX_BYTES', 10 * 1024 * 1024),
+    'INTERVAL_HOURS': get_int_env_var('LOG_ROTATION_INTERVAL_HOURS', 24),  # 0 rotates by size only
+    'BACKUP_COUNT': get_int_env_var('LOG_ROTATION_BACKUP_COUNT', 30),
+    'COMPRESSION': os.getenv('LOG_COMPRESSION', 'gzip'),  # gzip, zstd or none
+    'COMPRESS_AFTER_HOURS': get_float_env_var('LOG_COMPRESS_AFTER_HOURS', 24),
+    'COMPRESSION_WORKERS': get_int_env_var('LOG_COMPRESSION_WORKERS', 4)
+}
+
+# Log index settings (Parquet copy of the logs queried by the monitoring scripts)
+LOG_INDEX_SETTINGS = {
+    'ENABLED': get_boolean_env_var('LOG_INDEX_ENABLED', True),
+    'DIR': os.getenv('LOG_INDEX_DIR', os.path.join(LOGS_DIR, 'index'))
+}
+
+# Performance sketch settings (mergeable quantile sketches kept per day by performance_report.py)
+PERFORMANCE_SKETCH_SETTINGS = {
+    'RELATIVE_ACCURACY': get_float_env_var('PERFORMANCE_SKETCH_ACCURACY', 0.01),
+    'MAX_BINS': get_int_env_var('PERFORMANCE_SKETCH_MAX_BINS', 2048),
+    'DIR': os.getenv('PERFORMANCE_SKETCH_DIR', os.path.join(LOGS_DIR, 'performance', 'sketches'))
+}
+
+# Job status settings (execution details are fetched concurrently; finalized executions are
+# cached, since they never change, so each check only fetches new executions)
+JOB_STATUS_SETTINGS = {
+    'MAX_WORKERS': get_int_env_var('JOB_STATUS_MAX_WORKERS', 8),
+    'CACHE_ENABLED': get_boolean_env_var('JOB_STATUS_CACHE_ENABLED', True),
+    'CACHE_DIR': os.getenv('JOB_STATUS_CACHE_DIR', os.path.join(LOGS_DIR, 'job_executions')),
+    'CACHE_RETENTION_DAYS': get_int_env_var('JOB_STATUS_CACHE_RETENTION_DAYS', 90)
+}
+
 # Development script settings
 DEVELOPMENT_SETTINGS = {
     'LOCAL_PORT': get_int_env_var('LOCAL_PORT', 8080),
     'MOCK_SERVER_PORT': get_int_env_var('MOCK_SERVER_PORT', 8081),
+    'MOCK_SERVER_THREADS': get_int_env_var('MOCK_SERVER_THREADS', 64),
     'GENERATE_TEST_DATA_COUNT': get_int_env_var('GENERATE_TEST_DATA_COUNT', 50),
     'USE_LOCAL_MOCKS': get_boolean_env_var('USE_LOCAL_MOCKS', True),
     'AUTO_RELOAD': get_boolean_env_var('AUTO_RELOAD', True)
@@ -27,6 +27,7 @@ from ...monitoring.check_job_status import JobStatusChecker
 from ...utils.api_testing import APITester
 from ....backend.api_clients.gmail_client import GmailClient
 from ....backend.services.authentication_service import AuthenticationService
+from ....backend.services.health_check_service import run_health_checks
 
 # Initialize logger
 logger = get_logger('weekly_healthcheck')
@@ -194,8 +195,19 @@ def check_api_integrations() -> Dict:
     # Create API tester
     api_tester = APITester(auth_service=auth_service)
     
-    # Test all APIs
-    api_results = api_tester.test_all()
+    # Test all APIs concurrently, each bounded by the health check timeout; results of a
+    # recent check are reused (probe names are prefixed so other health checks do not share them)
+    apis = ['capital_one', 'google_sheets', 'gemini', 'gmail']
+    probes = {f"api_test:{api}": (lambda api=api: api_tester.test_api(api)) for api in apis}
+    results = run_health_checks(probes)
+    
+    api_results = {}
+    for api in apis:
+        result = results[f"api_test:{api}"]
+        api_result = result.get('details') if isinstance(result.get('details'), dict) else {
+            'status': 'failed', 'error': result.get('error', 'No test result')
+        }
+        api_results[api] = dict(api_result, latency_ms=result['latency_ms'], cached=result['cached'])
     
     logger.info("API integration tests completed")
     return api_results
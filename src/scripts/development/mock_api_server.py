@@ -7,7 +7,15 @@ testing and development without requiring actual API credentials or making real
 
 Usage:
     python mock_api_server.py [--port PORT] [--host HOST] [--debug]
+    python mock_api_server.py --load-test [--threads N] [--profile PROFILE.json]
+                              [--latency-ms MS] [--error-rate RATE]
     
+    Load-test mode serves requests from a multi-threaded WSGI server and injects
+    configurable latency, 429/5xx errors and Retry-After headers per endpoint.
+    Per-endpoint request counts and concurrency high-water marks are exposed at
+    GET /__metrics (and reset with POST /__metrics/reset).
+    
+
     Or import and use programmatically:
     from scripts.development.mock_api_server import run_server, stop_server
     server_thread = run_server()
@@ -18,14 +26,18 @@ Usage:
 import os
 import json
 import logging
+import math
 import re
 import threading
 import datetime
 import decimal
 import argparse
+import random
+import time
 from decimal import Decimal
 
 from flask import Flask, request, jsonify, Blueprint
+from werkzeug.serving import make_server
 
 from ..config.script_settings import DEVELOPMENT_SETTINGS
 from ..config.logging_setup import get_script_logger
@@ -48,6 +60,18 @@ gmail_bp = Blueprint('gmail', __name__, url_prefix='/gmail')
 server_thread = None
 is_running = False
 
+# Whether setup_routes has registered the API routes
+routes_registered = False
+
+# Active load-test controller (None when load-test mode is disabled)
+load_test_controller = None
+
+# Supported latency distributions for load-test mode
+LATENCY_DISTRIBUTIONS = ['fixed', 'uniform', 'normal', 'lognormal', 'exponential']
+
+# Server-side error codes that may be injected in load-test mode
+INJECTABLE_SERVER_ERRORS = [500, 502, 503, 504]
+
 
 class MockResponseHandler:
     """Handler for generating appropriate mock API responses"""
@@ -523,6 +547,438 @@ class MockResponseHandler:
         return message_response, 200
 
 
+class EndpointBehavior:
+    """Latency and error injection settings for a single mock endpoint"""
+    
+    def __init__(self, latency_distribution='fixed', latency_ms=0.0, latency_jitter_ms=0.0,
+                 rate_limit_rate=0.0, server_error_rate=0.0, retry_after_seconds=1,
+                 server_error_codes=None):
+        """
+        Initialize endpoint behavior
+        
+        Args:
+            latency_distribution: One of LATENCY_DISTRIBUTIONS
+            latency_ms: Mean (or fixed/lower-bound) latency in milliseconds
+            latency_jitter_ms: Spread of the distribution in milliseconds (stddev for
+                normal/lognormal, upper range for uniform; ignored for fixed/exponential)
+            rate_limit_rate: Probability (0-1) of answering with 429 Too Many Requests
+            server_error_rate: Probability (0-1) of answering with a 5xx error; clamped so
+                both rates together never exceed 1
+            retry_after_seconds: Value of the Retry-After header on injected 429/503 responses
+            server_error_codes: 5xx status codes to choose from for injected server errors
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_distribution}', "
+                f"expected one of {LATENCY_DISTRIBUTIONS}"
+            )
+        
+        self.latency_distribution = latency_distribution
+        self.latency_ms = float(latency_ms)
+        self.latency_jitter_ms = float(latency_jitter_ms)
+        
+        # Endpoint overrides inherit the default rates, so out-of-range combinations are clamped
+        self.rate_limit_rate = min(max(float(rate_limit_rate), 0.0), 1.0)
+        self.server_error_rate = min(max(float(server_error_rate), 0.0), 1.0 - self.rate_limit_rate)
+        if (self.rate_limit_rate, self.server_error_rate) != (rate_limit_rate, server_error_rate):
+            logger.warning(
+                f"Clamped error rates to rate_limit_rate={self.rate_limit_rate}, "
+                f"server_error_rate={self.server_error_rate}"
+            )
+        self.retry_after_seconds = retry_after_seconds
+        self.server_error_codes = server_error_codes or INJECTABLE_SERVER_ERRORS
+    
+    @classmethod
+    def from_dict(cls, data, defaults=None):
+        """
+        Create an endpoint behavior from a profile dictionary
+        
+        Args:
+            data: Dictionary of behavior settings (keys match __init__ arguments)
+            defaults: Optional EndpointBehavior whose values fill missing keys
+            
+        Returns:
+            EndpointBehavior: The configured behavior
+        """
+        base = defaults.to_dict() if defaults else {}
+        base.update(data or {})
+        return cls(**base)
+    
+    def to_dict(self):
+        """
+        Convert the behavior to a dictionary
+        
+        Returns:
+            dict: Behavior settings
+        """
+        return {
+            'latency_distribution': self.latency_distribution,
+            'latency_ms': self.latency_ms,
+            'latency_jitter_ms': self.latency_jitter_ms,
+            'rate_limit_rate': self.rate_limit_rate,
+            'server_error_rate': self.server_error_rate,
+            'retry_after_seconds': self.retry_after_seconds,
+            'server_error_codes': list(self.server_error_codes)
+        }
+    
+    def sample_latency(self, rng):
+        """
+        Draw a latency sample from the configured distribution
+        
+        Args:
+            rng: random.Random instance to draw from
+            
+        Returns:
+            float: Latency in seconds (never negative)
+        """
+        mean = self.latency_ms
+        jitter = self.latency_jitter_ms
+        
+        if self.latency_distribution == 'uniform':
+            value = rng.uniform(mean, mean + jitter)
+        elif self.latency_distribution == 'normal':
+            value = rng.gauss(mean, jitter)
+        elif self.latency_distribution == 'lognormal':
+            # Parameterize by the desired mean/stddev of the resulting distribution
+            if mean <= 0:
+                value = 0.0
+            else:
+                sigma_sq = math.log(1 + (jitter ** 2) / (mean ** 2))
+                mu = math.log(mean) - sigma_sq / 2
+                value = rng.lognormvariate(mu, math.sqrt(sigma_sq))
+        elif self.latency_distribution == 'exponential':
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        else:
+            value = mean
+        
+        return max(value, 0.0) / 1000.0
+    
+    def sample_error(self, rng):
+        """
+        Decide whether to inject an error for a request
+        
+        Args:
+            rng: random.Random instance to draw from
+            
+        Returns:
+            int or None: Status code to inject, or None to serve normally
+        """
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.server_error_rate:
+            return rng.choice(self.server_error_codes)
+        return None
+
+
+class LoadTestController:
+    """Injects latency and errors and records per-endpoint traffic statistics"""
+    
+    def __init__(self, default_behavior=None, endpoint_behaviors=None, seed=None):
+        """
+        Initialize the load-test controller
+        
+        Args:
+            default_behavior: EndpointBehavior applied to endpoints without an override
+            endpoint_behaviors: Dictionary mapping endpoint names (e.g.
+                'capital_one.get_transactions' or a blueprint name such as 'gemini')
+                to EndpointBehavior overrides
+            seed: Optional random seed for reproducible runs
+        """
+        self.default_behavior = default_behavior or EndpointBehavior()
+        self.endpoint_behaviors = endpoint_behaviors or {}
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._in_flight_total = 0
+        self._peak_in_flight_total = 0
+        self._started_at = time.time()
+    
+    @classmethod
+    def from_profile(cls, profile, seed=None):
+        """
+        Create a controller from a profile dictionary
+        
+        The profile has the form::
+        
+            {
+                "default": {"latency_distribution": "lognormal", "latency_ms": 120,
+                            "latency_jitter_ms": 80},
+                "endpoints": {
+                    "gemini": {"latency_ms": 2500, "rate_limit_rate": 0.05,
+                               "retry_after_seconds": 2},
+                    "capital_one.create_transfer": {"server_error_rate": 0.1}
+                }
+            }
+        
+        Args:
+            profile: Profile dictionary
+            seed: Optional random seed for reproducible runs
+            
+        Returns:
+            LoadTestController: The configured controller
+        """
+        default_behavior = EndpointBehavior.from_dict(profile.get('default', {}))
+        endpoint_behaviors = {
+            name: EndpointBehavior.from_dict(settings, defaults=default_behavior)
+            for name, settings in profile.get('endpoints', {}).items()
+        }
+        return cls(default_behavior, endpoint_behaviors, seed=profile.get('seed', seed))
+    
+    def get_behavior(self, endpoint):
+        """
+        Resolve the behavior for an endpoint, falling back to its blueprint and then the default
+        
+        Args:
+            endpoint: Flask endpoint name (blueprint.function)
+            
+        Returns:
+            EndpointBehavior: The behavior to apply
+        """
+        if endpoint in self.endpoint_behaviors:
+            return self.endpoint_behaviors[endpoint]
+        blueprint = endpoint.split('.', 1)[0] if endpoint else None
+        if blueprint in self.endpoint_behaviors:
+            return self.endpoint_behaviors[blueprint]
+        return self.default_behavior
+    
+    def request_started(self, endpoint):
+        """
+        Record the start of a request and update concurrency high-water marks
+        
+        Args:
+            endpoint: Flask endpoint name
+        """
+        with self._lock:
+            stats = self._metrics.setdefault(endpoint, {
+                'requests': 0,
+                'in_flight': 0,
+                'peak_concurrency': 0,
+                'injected_errors': {},
+                'total_latency_ms': 0.0,
+                'max_latency_ms': 0.0
+            })
+            stats['requests'] += 1
+            stats['in_flight'] += 1
+            stats['peak_concurrency'] = max(stats['peak_concurrency'], stats['in_flight'])
+            self._in_flight_total += 1
+            self._peak_in_flight_total = max(self._peak_in_flight_total, self._in_flight_total)
+    
+    def request_finished(self, endpoint, elapsed_seconds):
+        """
+        Record the end of a request
+        
+        Args:
+            endpoint: Flask endpoint name
+            elapsed_seconds: Wall-clock time the request took to serve
+        """
+        elapsed_ms = elapsed_seconds * 1000.0
+        with self._lock:
+            stats = self._metrics.get(endpoint)
+            if stats is None:
+                return
+            stats['in_flight'] -= 1
+            stats['total_latency_ms'] += elapsed_ms
+            stats['max_latency_ms'] = max(stats['max_latency_ms'], elapsed_ms)
+            self._in_flight_total -= 1
+    
+    def record_injected_error(self, endpoint, status_code):
+        """
+        Count an injected error for an endpoint
+        
+        Args:
+            endpoint: Flask endpoint name
+            status_code: Injected HTTP status code
+        """
+        with self._lock:
+            errors = self._metrics[endpoint]['injected_errors']
+            errors[str(status_code)] = errors.get(str(status_code), 0) + 1
+    
+    def apply(self, endpoint):
+        """
+        Sleep for an injected latency and optionally produce an error response
+        
+        Args:
+            endpoint: Flask endpoint name
+            
+        Returns:
+            tuple or None: (response_data, status_code, headers) for an injected error,
+            or None when the request should be served normally
+        """
+        behavior = self.get_behavior(endpoint)
+        with self._rng_lock:
+            delay = behavior.sample_latency(self._rng)
+            status_code = behavior.sample_error(self._rng)
+        
+        if delay > 0:
+            time.sleep(delay)
+        
+        if status_code is None:
+            return None
+        
+        self.record_injected_error(endpoint, status_code)
+        headers = {}
+        if status_code in (429, 503) and behavior.retry_after_seconds is not None:
+            headers['Retry-After'] = str(behavior.retry_after_seconds)
+        
+        error_body = {
+            'error': {
+                'code': status_code,
+                'message': 'Injected by mock API server load-test mode',
+                'status': 'RESOURCE_EXHAUSTED' if status_code == 429 else 'UNAVAILABLE'
+            }
+        }
+        return error_body, status_code, headers
+    
+    def get_metrics(self):
+        """
+        Get a snapshot of per-endpoint traffic statistics
+        
+        Returns:
+            dict: Aggregate and per-endpoint request counts, concurrency and latency
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._metrics.items():
+                snapshot = dict(stats)
+                snapshot['injected_errors'] = dict(stats['injected_errors'])
+                snapshot['avg_latency_ms'] = (
+                    stats['total_latency_ms'] / stats['requests'] if stats['requests'] else 0.0
+                )
+                endpoints[endpoint] = snapshot
+            
+            return {
+                'uptime_seconds': time.time() - self._started_at,
+                'total_requests': sum(s['requests'] for s in self._metrics.values()),
+                'in_flight': self._in_flight_total,
+                'peak_concurrency': self._peak_in_flight_total,
+                'endpoints': endpoints
+            }
+    
+    def reset_metrics(self):
+        """Clear all recorded statistics (requests currently in flight keep their counters)"""
+        with self._lock:
+            self._metrics = {
+                endpoint: {
+                    'requests': 0,
+                    'in_flight': stats['in_flight'],
+                    'peak_concurrency': stats['in_flight'],
+                    'injected_errors': {},
+                    'total_latency_ms': 0.0,
+                    'max_latency_ms': 0.0
+                }
+                for endpoint, stats in self._metrics.items() if stats['in_flight'] > 0
+            }
+            self._peak_in_flight_total = self._in_flight_total
+            self._started_at = time.time()
+
+
+def load_load_test_profile(profile_path):
+    """
+    Load a load-test profile from a JSON file
+    
+    Args:
+        profile_path: Path to the JSON profile
+        
+    Returns:
+        dict: Profile dictionary
+    """
+    with open(profile_path, 'r') as f:
+        return json.load(f)
+
+
+# Load-test hooks and metrics routes are registered once and apply whichever controller
+# install_load_test_hooks made active, so the server can be started again in the same process
+@app.before_request
+def inject_faults():
+    """Inject latency and errors into a request when load-test mode is enabled"""
+    controller = load_test_controller
+    if controller is None or request.endpoint in (None, 'metrics', 'reset_metrics', 'shutdown'):
+        return None
+    
+    endpoint = request.endpoint
+    request.environ['mock_api.load_test_started'] = time.perf_counter()
+    request.environ['mock_api.load_test_controller'] = controller
+    controller.request_started(endpoint)
+    
+    injected = controller.apply(endpoint)
+    if injected is not None:
+        body, status_code, headers = injected
+        return jsonify(body), status_code, headers
+    return None
+
+
+@app.teardown_request
+def record_completion(exc):
+    """Record the latency of a request counted by inject_faults"""
+    started = request.environ.pop('mock_api.load_test_started', None)
+    controller = request.environ.pop('mock_api.load_test_controller', None)
+    if controller is not None and started is not None:
+        controller.request_finished(request.endpoint, time.perf_counter() - started)
+
+
+@app.route('/__metrics', methods=['GET'], endpoint='metrics')
+def metrics():
+    """Return the load-test metrics"""
+    if load_test_controller is None:
+        return jsonify({'error': 'Load-test mode is not enabled'}), 404
+    return jsonify(load_test_controller.get_metrics())
+
+
+@app.route('/__metrics/reset', methods=['POST'], endpoint='reset_metrics')
+def reset_metrics():
+    """Reset the load-test metrics"""
+    if load_test_controller is None:
+        return jsonify({'error': 'Load-test mode is not enabled'}), 404
+    load_test_controller.reset_metrics()
+    return jsonify({'status': 'reset'})
+
+
+def install_load_test_hooks(controller):
+    """
+    Make a load-test controller apply to every request
+    
+    Args:
+        controller: LoadTestController to install, or None to disable load-test mode
+    """
+    global load_test_controller
+    load_test_controller = controller
+    
+    if controller is not None:
+        logger.info("Load-test mode enabled: latency/error injection and metrics at /__metrics")
+
+
+def build_load_test_controller(args):
+    """
+    Build a load-test controller from parsed command line arguments
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        LoadTestController: Configured controller
+    """
+    profile = load_load_test_profile(args.profile) if args.profile else {}
+    
+    # Command line values override the profile defaults
+    default_settings = profile.setdefault('default', {})
+    if args.latency_distribution is not None:
+        default_settings['latency_distribution'] = args.latency_distribution
+    if args.latency_ms is not None:
+        default_settings['latency_ms'] = args.latency_ms
+    if args.latency_jitter_ms is not None:
+        default_settings['latency_jitter_ms'] = args.latency_jitter_ms
+    if args.rate_limit_rate is not None:
+        default_settings['rate_limit_rate'] = args.rate_limit_rate
+    if args.error_rate is not None:
+        default_settings['server_error_rate'] = args.error_rate
+    if args.retry_after is not None:
+        default_settings['retry_after_seconds'] = args.retry_after
+    
+    return LoadTestController.from_profile(profile, seed=args.seed)
+
+
 def load_mock_responses():
     """
     Load all mock API responses from fixture files
@@ -619,6 +1075,59 @@ def parse_arguments():
         help='Run the server in debug mode'
     )
     
+    load_test = parser.add_argument_group('load-test mode')
+    load_test.add_argument(
+        '--load-test',
+        action='store_true',
+        help='Serve from a multi-threaded server with latency/error injection and metrics'
+    )
+    load_test.add_argument(
+        '--threads',
+        type=int,
+        default=DEVELOPMENT_SETTINGS.get('MOCK_SERVER_THREADS', 64),
+        help='Maximum concurrent requests served in load-test mode'
+    )
+    load_test.add_argument(
+        '--profile',
+        type=str,
+        help='JSON file with default and per-endpoint latency/error settings'
+    )
+    load_test.add_argument(
+        '--latency-distribution',
+        choices=LATENCY_DISTRIBUTIONS,
+        help='Default latency distribution'
+    )
+    load_test.add_argument(
+        '--latency-ms',
+        type=float,
+        help='Default mean latency in milliseconds'
+    )
+    load_test.add_argument(
+        '--latency-jitter-ms',
+        type=float,
+        help='Default latency spread in milliseconds'
+    )
+    load_test.add_argument(
+        '--rate-limit-rate',
+        type=float,
+        help='Default probability of a 429 response'
+    )
+    load_test.add_argument(
+        '--error-rate',
+        type=float,
+        help='Default probability of a 5xx response'
+    )
+    load_test.add_argument(
+        '--retry-after',
+        type=int,
+        help='Retry-After seconds sent with injected 429/503 responses'
+    )
+    load_test.add_argument(
+        '--seed',
+        type=int,
+        help='Random seed for reproducible latency/error injection'
+    )
+    
     return parser.parse_args()
 
 
@@ -755,6 +1264,13 @@ def setup_gmail_routes(mock_responses):
 
 def setup_routes():
     """Set up all API routes for the mock server"""
+    global routes_registered
+    
+    # Routes can only be registered once per process; later starts reuse them
+    if routes_registered:
+        return
+    routes_registered = True
+    
     # Load mock responses
     mock_responses = load_mock_responses()
     
@@ -785,7 +1301,63 @@ def setup_routes():
         })
 
 
-def start_server(host, port, debug):
+class BoundedThreadingWSGIServer:
+    """Threaded WSGI server that caps the number of requests handled concurrently"""
+    
+    def __init__(self, host, port, wsgi_app, max_threads):
+        """
+        Initialize the server
+        
+        Args:
+            host: Host to bind to
+            port: Port to bind to
+            wsgi_app: WSGI application to serve
+            max_threads: Maximum number of concurrently served requests
+        """
+        self.server = make_server(host, port, wsgi_app, threaded=True)
+        self.server.request_queue_size = max(max_threads, 5)
+        self._slots = threading.BoundedSemaphore(max_threads)
+        
+        original_process_request = self.server.process_request
+        slots = self._slots
+        
+        def process_request(req, client_address):
+            # Block the accept loop when all worker slots are busy so that excess
+            # connections queue in the listen backlog instead of spawning threads
+            slots.acquire()
+            try:
+                original_process_request(req, client_address)
+            except Exception:
+                slots.release()
+                raise
+        
+        original_process_request_thread = self.server.process_request_thread
+        
+        def process_request_thread(req, client_address):
+            try:
+                original_process_request_thread(req, client_address)
+            finally:
+                slots.release()
+        
+        self.server.process_request = process_request
+        self.server.process_request_thread = process_request_thread
+        self.server.daemon_threads = True
+    
+    def serve_forever(self):
+        """Serve requests until shutdown() is called"""
+        self.server.serve_forever()
+    
+    def shutdown(self):
+        """Stop serving requests and close the listening socket"""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# Active WSGI server in load-test mode (None when using the development server)
+wsgi_server = None
+
+
+def start_server(host, port, debug, load_test=None, threads=64):
     """
     Start the mock API server
     
@@ -793,13 +1365,27 @@ def start_server(host, port, debug):
         host: Host to run the server on
         port: Port to run the server on
         debug: Whether to run in debug mode
+        load_test: Optional LoadTestController enabling load-test mode
+        threads: Maximum concurrent requests served in load-test mode
     """
+    global wsgi_server
+    
     setup_routes()
-    logger.info(f"Starting mock API server on {host}:{port}")
-    app.run(host=host, port=port, debug=debug)
+    install_load_test_hooks(load_test)
+    if load_test is None:
+        logger.info(f"Starting mock API server on {host}:{port}")
+        app.run(host=host, port=port, debug=debug)
+        return
+    
+    wsgi_server = BoundedThreadingWSGIServer(host, port, app, threads)
+    logger.info(f"Starting mock API server in load-test mode on {host}:{port} with {threads} threads")
+    try:
+        wsgi_server.serve_forever()
+    finally:
+        wsgi_server = None
 
 
-def run_server_thread(host, port, debug):
+def run_server_thread(host, port, debug, load_test=None, threads=64):
     """
     Run the mock API server in a separate thread
     
@@ -807,16 +1393,18 @@ def run_server_thread(host, port, debug):
         host: Host to run the server on
         port: Port to run the server on
         debug: Whether to run in debug mode
+        load_test: Optional LoadTestController enabling load-test mode
+        threads: Maximum concurrent requests served in load-test mode
     """
     global is_running
     is_running = True
     try:
-        start_server(host, port, debug)
+        start_server(host, port, debug, load_test=load_test, threads=threads)
     finally:
         is_running = False
 
 
-def run_server(host=None, port=None, debug=False):
+def run_server(host=None, port=None, debug=False, load_test=None, threads=64):
     """
     Start the mock API server in a separate thread
     
@@ -824,6 +1412,8 @@ def run_server(host=None, port=None, debug=False):
         host: Host to run the server on (defaults to MOCK_API_HOST from settings)
         port: Port to run the server on (defaults to MOCK_API_PORT from settings)
         debug: Whether to run in debug mode
+        load_test: Optional LoadTestController (or profile dictionary) enabling load-test mode
+        threads: Maximum concurrent requests served in load-test mode
         
     Returns:
         threading.Thread: Thread running the mock API server
@@ -836,10 +1426,13 @@ def run_server(host=None, port=None, debug=False):
     if port is None:
         port = DEVELOPMENT_SETTINGS.get('MOCK_API_PORT', 8081)
     
+    if isinstance(load_test, dict):
+        load_test = LoadTestController.from_profile(load_test)
+    
     # Create and start a new thread for the server
     thread = threading.Thread(
         target=run_server_thread,
-        args=(host, port, debug),
+        args=(host, port, debug, load_test, threads),
         daemon=True
     )
     thread.start()
@@ -859,9 +1452,13 @@ def stop_server():
     global server_thread, is_running
     
     if server_thread is not None and is_running:
-        # Use Flask's shutdown functionality
-        with app.test_client() as client:
-            client.get('/shutdown')
+        if wsgi_server is not None:
+            # Load-test mode runs its own WSGI server which can be shut down directly
+            wsgi_server.shutdown()
+        else:
+            # Use Flask's shutdown functionality
+            with app.test_client() as client:
+                client.get('/shutdown')
         
         # Wait for the thread to terminate
         server_thread.join(timeout=5.0)
@@ -881,7 +1478,8 @@ def main():
         int: Exit code (0 for success)
     """
     args = parse_arguments()
-    start_server(args.host, args.port, args.debug)
+    load_test = build_load_test_controller(args) if args.load_test else None
+    start_server(args.host, args.port, args.debug, load_test=load_test, threads=args.threads)
     return 0
 
 
@@ -6,6 +6,13 @@ This script provides functionality to restore both the Master Budget and Weekly
 from JSON backup files or in-spreadsheet backup sheets. Supports restoring from the latest backup
 or a specific date.
 
+JSON backups (full JSON files or incremental snapshots written by backup_sheets.py) are
+streamed rather than loaded, and written in chunks sized to the Sheets request payload
+limit. Each chunk is verified against the hash of its backed-up rows, and progress is
+recorded after every verified chunk, so running the restore again after an interruption
+resumes where it stopped:
+    <backup_dir>/restore_progress/<sheet>_<spreadsheet_id>.json
+
 Usage:
     python restore_from_backup.py [options]
 
@@ -37,18 +44,32 @@ import datetime
 import sys
 import json
 import re
-from typing import List, Dict, Optional, Any, Tuple, Union
+import time
+import itertools
+from typing import List, Dict, Optional, Any, Tuple, Union, Iterator
 
 # Internal imports
 from ..config.logging_setup import get_logger
 from ..config.path_constants import BACKUP_DIR, ensure_dir_exists
+from ..config.script_settings import RESTORE_SETTINGS
 from ...backend.config.settings import APP_SETTINGS
 from ..utils.sheet_operations import (
     get_sheets_service, 
-    import_json_to_sheet, 
     list_sheets,
     copy_sheet_data,
-    clear_sheet_range
+    clear_sheet_range,
+    batch_update_values,
+    ensure_sheet_rows
+)
+from ..maintenance.snapshot_store import (
+    SnapshotStore,
+    SNAPSHOTS_DIR,
+    MANIFESTS_DIR,
+    SNAPSHOT_FILE_PATTERN,
+    SNAPSHOT_TIMESTAMP_FORMAT,
+    canonical_json,
+    hash_rows,
+    write_file_atomic
 )
 
 # Set up logger
@@ -59,6 +80,45 @@ WEEKLY_SPENDING_SHEET_NAME = "Weekly Spending"
 MASTER_BUDGET_SHEET_NAME = "Master Budget"
 BACKUP_FILE_PATTERN = re.compile(r'(.+)_backup_(\d{8}_\d{6})\.json')
 BACKUP_SHEET_PATTERN = re.compile(r'Backup_(.+)_(\d{8}_\d{6})')
+RESTORE_PROGRESS_DIR = "restore_progress"
+
+# Bytes of each write request reserved for the range, options and JSON framing
+REQUEST_OVERHEAD_BYTES = 4 * 1024
+
+# Characters read at a time when streaming a JSON backup
+JSON_READ_BUFFER_SIZE = 64 * 1024
+JSON_WHITESPACE = re.compile(r'\s*')
+
+
+def list_backup_files(sheet_name: str, backup_dir: str) -> List[Tuple[str, datetime.datetime]]:
+    """
+    Lists the JSON backup files and snapshot manifests of a specific sheet
+    
+    Args:
+        sheet_name: Name of the sheet to find backups for
+        backup_dir: Directory containing backup files
+        
+    Returns:
+        List of (backup path, backup time) tuples
+    """
+    backup_files = []
+    manifests_dir = os.path.join(backup_dir, SNAPSHOTS_DIR, MANIFESTS_DIR)
+    
+    for directory, pattern in [(backup_dir, BACKUP_FILE_PATTERN), (manifests_dir, SNAPSHOT_FILE_PATTERN)]:
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            # Check if the file is a backup for the requested sheet
+            match = pattern.match(filename)
+            if match and match.group(1) == sheet_name:
+                try:
+                    timestamp = datetime.datetime.strptime(match.group(2), SNAPSHOT_TIMESTAMP_FORMAT)
+                    backup_files.append((os.path.join(directory, filename), timestamp))
+                except ValueError:
+                    logger.warning(f"Invalid timestamp format in filename: {filename}")
+                    continue
+    
+    return backup_files
 
 
 def find_latest_backup(sheet_name: str, backup_dir: str) -> Optional[str]:
@@ -70,21 +130,13 @@ def find_latest_backup(sheet_name: str, backup_dir: str) -> Optional[str]:
         backup_dir: Directory containing backup files
         
     Returns:
-        Path to the latest backup file or None if not found
+        Path to the latest backup file (or snapshot manifest) or None if not found
     """
     # Ensure backup directory exists
     ensure_dir_exists(backup_dir)
     
-    # List all files in the backup directory
-    backup_files = []
     try:
-        for filename in os.listdir(backup_dir):
-            # Check if the file is a backup for the requested sheet
-            match = BACKUP_FILE_PATTERN.match(filename)
-            if match and match.group(1) == sheet_name:
-                # Extract timestamp and add to list
-                timestamp = match.group(2)
-                backup_files.append((filename, timestamp))
+        backup_files = list_backup_files(sheet_name, backup_dir)
     except Exception as e:
         logger.error(f"Error searching for backup files: {str(e)}")
         return None
@@ -94,11 +146,8 @@ def find_latest_backup(sheet_name: str, backup_dir: str) -> Optional[str]:
         logger.warning(f"No backup files found for {sheet_name}")
         return None
     
-    # Sort by timestamp (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
-    
     # Return the path to the latest backup file
-    latest_backup = os.path.join(backup_dir, backup_files[0][0])
+    latest_backup = max(backup_files, key=lambda x: x[1])[0]
     logger.info(f"Found latest backup for {sheet_name}: {latest_backup}")
     return latest_backup
 
@@ -113,26 +162,13 @@ def find_backup_by_date(sheet_name: str, target_date: datetime.datetime, backup_
         backup_dir: Directory containing backup files
         
     Returns:
-        Path to the closest backup file or None if not found
+        Path to the closest backup file (or snapshot manifest) or None if not found
     """
     # Ensure backup directory exists
     ensure_dir_exists(backup_dir)
     
-    # List all files in the backup directory
-    backup_files = []
     try:
-        for filename in os.listdir(backup_dir):
-            # Check if the file is a backup for the requested sheet
-            match = BACKUP_FILE_PATTERN.match(filename)
-            if match and match.group(1) == sheet_name:
-                # Extract timestamp and convert to datetime
-                timestamp_str = match.group(2)
-                try:
-                    timestamp = datetime.datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    backup_files.append((filename, timestamp))
-                except ValueError:
-                    logger.warning(f"Invalid timestamp format in filename: {filename}")
-                    continue
+        backup_files = list_backup_files(sheet_name, backup_dir)
     except Exception as e:
         logger.error(f"Error searching for backup files: {str(e)}")
         return None
@@ -143,10 +179,7 @@ def find_backup_by_date(sheet_name: str, target_date: datetime.datetime, backup_
         return None
     
     # Find the backup with timestamp closest to target_date
-    closest_backup = min(backup_files, key=lambda x: abs(x[1] - target_date))
-    
-    # Return the path to the closest backup file
-    closest_backup_path = os.path.join(backup_dir, closest_backup[0])
+    closest_backup_path = min(backup_files, key=lambda x: abs(x[1] - target_date))[0]
     logger.info(f"Found backup for {sheet_name} closest to {target_date}: {closest_backup_path}")
     return closest_backup_path
 
@@ -244,12 +277,153 @@ def find_backup_sheet_by_date(spreadsheet_id: str, original_sheet_name: str,
         return None
 
 
+def is_snapshot_manifest(backup_file: str) -> bool:
+    """
+    Checks whether a backup file is a snapshot manifest rather than a full JSON backup
+    
+    Args:
+        backup_file: Path to backup file
+        
+    Returns:
+        True if the file is a snapshot manifest
+    """
+    return SNAPSHOT_FILE_PATTERN.fullmatch(os.path.basename(backup_file)) is not None
+
+
+def iter_json_array(backup_file: str, buffer_size: int = JSON_READ_BUFFER_SIZE) -> Iterator[Any]:
+    """
+    Reads the items of a JSON array file one at a time, without loading the whole file
+    
+    Args:
+        backup_file: Path to a file holding a JSON array
+        buffer_size: Number of characters read at a time
+        
+    Yields:
+        Items of the array
+        
+    Raises:
+        ValueError: If the file does not hold a JSON array
+    """
+    decoder = json.JSONDecoder()
+    with open(backup_file, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+        expecting = '['
+        
+        while True:
+            position = JSON_WHITESPACE.match(buffer, position).end()
+            if position == len(buffer) or (expecting in ('first', 'item') and not eof and len(buffer) - position < buffer_size):
+                # Keep at least a buffer of unparsed text, so items are only cut at the end of the file
+                if not eof:
+                    chunk = f.read(buffer_size)
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                if position == len(buffer):
+                    raise ValueError(f"Unexpected end of JSON array in {backup_file}")
+            
+            char = buffer[position]
+            if expecting == '[':
+                if char != '[':
+                    raise ValueError(f"Invalid backup format: expected a list in {backup_file}")
+                position += 1
+                expecting = 'first'
+            elif char == ']' and expecting in ('first', 'separator'):
+                return
+            elif expecting == 'separator':
+                if char != ',':
+                    raise ValueError(f"Invalid JSON array in {backup_file} at '{char}'")
+                position += 1
+                expecting = 'item'
+            else:
+                try:
+                    item, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    # The item continues beyond the buffer
+                    chunk = f.read(buffer_size)
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                yield item
+                expecting = 'separator'
+
+
+class BackupReader:
+    """Streams the rows of a JSON backup file or snapshot as they are written to the sheet"""
+    
+    def __init__(self, backup_file: str):
+        """
+        Reads the headers and size of a backup, without loading its rows
+        
+        Args:
+            backup_file: Path to a JSON backup file or snapshot manifest
+        """
+        self.backup_file = backup_file
+        self.headers: Optional[List[Any]] = None
+        
+        if is_snapshot_manifest(backup_file):
+            self.manifest = SnapshotStore.load_manifest(backup_file)
+            self.store = SnapshotStore(os.path.dirname(os.path.dirname(backup_file)))
+            self.headers = self.manifest['headers']
+            self.row_count = self.manifest['row_count'] + 1
+            self.backup_id = self.manifest['content_hash']
+        else:
+            self.manifest = None
+            stat = os.stat(backup_file)
+            self.backup_id = f"{stat.st_size}-{stat.st_mtime_ns}"
+            
+            # Like import_json_to_sheet, the headers are all keys of all records
+            headers: Dict[Any, None] = {}
+            record_count = 0
+            for item in iter_json_array(backup_file):
+                if isinstance(item, dict):
+                    headers.update(dict.fromkeys(item))
+                record_count += 1
+            if headers:
+                self.headers = list(headers)
+                self.row_count = record_count + 1
+            else:
+                # Simple list of rows
+                self.row_count = record_count
+    
+    def iter_rows(self, skip_rows: int = 0) -> Iterator[List[Any]]:
+        """
+        Reads the sheet rows of the backup, starting with the header row
+        
+        Args:
+            skip_rows: Number of leading sheet rows to skip
+            
+        Yields:
+            Rows of sheet values
+        """
+        if self.manifest is not None:
+            if skip_rows == 0:
+                yield self.headers
+            for rows in self.store.iter_blocks(self.manifest, max(skip_rows - 1, 0)):
+                yield from rows
+        elif self.headers is not None:
+            rows = itertools.chain(
+                [self.headers],
+                ([item.get(header, "") for header in self.headers] for item in iter_json_array(self.backup_file))
+            )
+            yield from itertools.islice(rows, skip_rows, None)
+        else:
+            yield from itertools.islice(iter_json_array(self.backup_file), skip_rows, None)
+
+
 def validate_backup(backup_file: str) -> bool:
     """
     Validates that a backup file contains valid data
     
+    Only the start of a JSON backup is checked here; the rest is checked as it is restored.
+    
     Args:
-        backup_file: Path to backup file
+        backup_file: Path to backup file or snapshot manifest
         
     Returns:
         True if backup is valid, False otherwise
@@ -260,19 +434,17 @@ def validate_backup(backup_file: str) -> bool:
             logger.error(f"Backup file does not exist: {backup_file}")
             return False
         
-        # Try to parse the JSON file
-        with open(backup_file, 'r') as f:
-            data = json.load(f)
-        
-        # Validate that it's a list of dictionaries
-        if not isinstance(data, list):
-            logger.error(f"Invalid backup format: expected a list, got {type(data)}")
-            return False
-        
-        # Check if there's at least one item and it's a dictionary
-        if len(data) > 0 and not isinstance(data[0], dict):
-            logger.error(f"Invalid backup format: expected list of dictionaries")
-            return False
+        if is_snapshot_manifest(backup_file):
+            manifest = SnapshotStore.load_manifest(backup_file)
+            if not isinstance(manifest.get('blocks'), list) or 'headers' not in manifest:
+                logger.error(f"Invalid snapshot manifest: {backup_file}")
+                return False
+        else:
+            # Check if the first item is a dictionary
+            first_item = next(iter_json_array(backup_file), None)
+            if first_item is not None and not isinstance(first_item, (dict, list)):
+                logger.error(f"Invalid backup format: expected list of dictionaries")
+                return False
         
         logger.info(f"Backup file validated successfully: {backup_file}")
         return True
@@ -285,15 +457,141 @@ def validate_backup(backup_file: str) -> bool:
         return False
 
 
-def restore_from_json_backup(spreadsheet_id: str, sheet_name: str, backup_file: str, service) -> bool:
+def iter_restore_chunks(rows: Iterator[List[Any]], first_row: int, max_bytes: int,
+                        max_rows: int) -> Iterator[Tuple[int, List[List[Any]]]]:
+    """
+    Groups rows into chunks that each fit in one write request
+    
+    Args:
+        rows: Sheet rows to write
+        first_row: Sheet row number (1-based) of the first row
+        max_bytes: Maximum request payload size
+        max_rows: Maximum rows per chunk
+        
+    Yields:
+        Tuples of the sheet row number of the chunk's first row and its rows
+    """
+    budget = max(max_bytes - REQUEST_OVERHEAD_BYTES, 1)
+    chunk = []
+    chunk_bytes = 0
+    for row in rows:
+        row_bytes = len(canonical_json(row)) + 1
+        if chunk and (chunk_bytes + row_bytes > budget or len(chunk) >= max_rows):
+            yield first_row, chunk
+            first_row += len(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield first_row, chunk
+
+
+def normalize_rows(rows: List[List[Any]]) -> List[List[str]]:
     """
-    Restores a sheet from a JSON backup file
+    Normalizes rows the way the Sheets API returns them, so written and backed-up rows compare
+    
+    Args:
+        rows: Rows of sheet values
+        
+    Returns:
+        Rows of strings without trailing empty cells, without trailing empty rows
+    """
+    normalized = []
+    for row in rows:
+        cells = ['' if value is None else str(value) for value in row]
+        while cells and cells[-1] == '':
+            cells.pop()
+        normalized.append(cells)
+    while normalized and not normalized[-1]:
+        normalized.pop()
+    return normalized
+
+
+def write_restore_chunk(spreadsheet_id: str, sheet_name: str, first_row: int, rows: List[List[Any]],
+                        service, verify: bool = True) -> None:
+    """
+    Writes a chunk of rows and verifies the sheet holds them afterwards
     
     Args:
         spreadsheet_id: ID of the spreadsheet
         sheet_name: Name of the sheet to restore
-        backup_file: Path to backup file
+        first_row: Sheet row number (1-based) of the first row
+        rows: Rows to write
+        service: Google Sheets API service
+        verify: Whether to compare the hash of the written rows with the backed-up rows
+        
+    Raises:
+        ValueError: If the rows in the sheet do not match the backed-up rows
+    """
+    response = batch_update_values(
+        spreadsheet_id,
+        [{'range': f"{sheet_name}!A{first_row}", 'values': rows}],
+        service,
+        include_values_in_response=verify
+    )
+    
+    if verify:
+        # The response holds the rows as the sheet stored them, so no extra read is needed
+        updated = response.get('responses', [{}])[0].get('updatedData', {}).get('values', [])
+        if hash_rows(normalize_rows(updated)) != hash_rows(normalize_rows(rows)):
+            raise ValueError(f"Rows {first_row}-{first_row + len(rows) - 1} of {sheet_name} "
+                             f"do not match the backup after writing")
+
+
+def get_restore_progress_file(progress_dir: str, spreadsheet_id: str, sheet_name: str) -> str:
+    """
+    Gets the file recording the progress of restoring a sheet
+    
+    Args:
+        progress_dir: Directory of restore progress files
+        spreadsheet_id: ID of the spreadsheet
+        sheet_name: Name of the sheet to restore
+        
+    Returns:
+        Path to the progress file
+    """
+    return os.path.join(progress_dir, f"{sheet_name}_{spreadsheet_id}.json")
+
+
+def load_restore_progress(progress_file: str, backup_id: str) -> int:
+    """
+    Loads how many rows of a backup an interrupted restore already wrote
+    
+    Args:
+        progress_file: Path to the progress file
+        backup_id: Identity of the backup being restored
+        
+    Returns:
+        Number of sheet rows restored, 0 if there is nothing to resume for this backup
+    """
+    if not os.path.exists(progress_file):
+        return 0
+    try:
+        with open(progress_file, 'r') as f:
+            progress = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable restore progress {progress_file}: {str(e)}")
+        return 0
+    
+    if progress.get('backup_id') != backup_id:
+        logger.info(f"Restore progress {progress_file} is for another backup, starting over")
+        return 0
+    return progress.get('rows_restored', 0)
+
+
+def restore_from_json_backup(spreadsheet_id: str, sheet_name: str, backup_file: str, service,
+                             progress_dir: Optional[str] = None) -> bool:
+    """
+    Restores a sheet from a JSON backup file or snapshot, resuming an interrupted restore
+    
+    Args:
+        spreadsheet_id: ID of the spreadsheet
+        sheet_name: Name of the sheet to restore
+        backup_file: Path to backup file or snapshot manifest
         service: Google Sheets API service
+        progress_dir: Directory of restore progress files, defaults to
+            <BACKUP_DIR>/restore_progress
         
     Returns:
         True if restoration was successful, False otherwise
@@ -303,22 +601,69 @@ def restore_from_json_backup(spreadsheet_id: str, sheet_name: str, backup_file:
         if not validate_backup(backup_file):
             return False
         
-        # Clear the target sheet
-        range_name = f"{sheet_name}!A:Z"
-        clear_sheet_range(spreadsheet_id, range_name, service)
+        reader = BackupReader(backup_file)
+        if reader.row_count == 0:
+            logger.error(f"No data found in backup file {backup_file}")
+            return False
         
-        # Import JSON data to sheet
-        success = import_json_to_sheet(spreadsheet_id, f"{sheet_name}!A1", backup_file, service, clear_first=False)
+        progress_file = get_restore_progress_file(
+            progress_dir or os.path.join(BACKUP_DIR, RESTORE_PROGRESS_DIR), spreadsheet_id, sheet_name
+        )
+        rows_restored = load_restore_progress(progress_file, reader.backup_id)
         
-        if success:
-            logger.info(f"Successfully restored {sheet_name} from {backup_file}")
+        if rows_restored:
+            logger.info(f"Resuming restore of {sheet_name} from {backup_file} "
+                        f"after {rows_restored} of {reader.row_count} rows")
         else:
-            logger.error(f"Failed to restore {sheet_name} from {backup_file}")
+            # Clear the target sheet
+            range_name = f"{sheet_name}!A:Z"
+            clear_sheet_range(spreadsheet_id, range_name, service)
         
-        return success
+        ensure_sheet_rows(spreadsheet_id, sheet_name, reader.row_count, service)
+        
+        progress = {
+            'backup_file': backup_file,
+            'backup_id': reader.backup_id,
+            'spreadsheet_id': spreadsheet_id,
+            'sheet_name': sheet_name,
+            'row_count': reader.row_count,
+            'rows_restored': rows_restored
+        }
+        ensure_dir_exists(os.path.dirname(progress_file))
+        
+        chunks = iter_restore_chunks(
+            reader.iter_rows(rows_restored),
+            rows_restored + 1,
+            RESTORE_SETTINGS['MAX_REQUEST_BYTES'],
+            RESTORE_SETTINGS['MAX_CHUNK_ROWS']
+        )
+        for first_row, rows in chunks:
+            for attempt in range(1, RESTORE_SETTINGS['CHUNK_ATTEMPTS'] + 1):
+                try:
+                    write_restore_chunk(spreadsheet_id, sheet_name, first_row, rows, service,
+                                        verify=RESTORE_SETTINGS['VERIFY'])
+                    break
+                except Exception as e:
+                    if attempt == RESTORE_SETTINGS['CHUNK_ATTEMPTS']:
+                        raise
+                    logger.warning(f"Writing rows {first_row}-{first_row + len(rows) - 1} of {sheet_name} "
+                                   f"failed (attempt {attempt}): {str(e)}")
+                    time.sleep(2 ** attempt)
+            
+            # Record progress only after the chunk is verified
+            progress['rows_restored'] = first_row - 1 + len(rows)
+            write_file_atomic(progress_file, json.dumps(progress).encode('utf-8'))
+            logger.debug(f"Restored {progress['rows_restored']} of {reader.row_count} rows of {sheet_name}")
+        
+        if os.path.exists(progress_file):
+            os.remove(progress_file)
+        
+        logger.info(f"Successfully restored {sheet_name} from {backup_file}")
+        return True
         
     except Exception as e:
-        logger.error(f"Error restoring from JSON backup: {str(e)}")
+        logger.error(f"Failed to restore {sheet_name} from {backup_file}, "
+                     f"running the restore again resumes it: {str(e)}")
         return False
 
 
@@ -365,7 +710,8 @@ def restore_from_backup_sheet(spreadsheet_id: str, target_sheet_name: str, backu
 
 def restore_master_budget(service, use_json_backup: bool, 
                          backup_file: Optional[str] = None, 
-                         backup_sheet_name: Optional[str] = None) -> bool:
+                         backup_sheet_name: Optional[str] = None,
+                         backup_dir: str = BACKUP_DIR) -> bool:
     """
     Restores the Master Budget sheet from backup
     
@@ -374,6 +720,7 @@ def restore_master_budget(service, use_json_backup: bool,
         use_json_backup: Whether to use JSON backup file (True) or backup sheet (False)
         backup_file: Path to specific backup file (optional)
         backup_sheet_name: Name of specific backup sheet (optional)
+        backup_dir: Directory containing backup files and restore progress
         
     Returns:
         True if restoration was successful, False otherwise
@@ -385,13 +732,14 @@ def restore_master_budget(service, use_json_backup: bool,
         if use_json_backup:
             # If no specific backup file is provided, find the latest one
             if not backup_file:
-                backup_file = find_latest_backup(MASTER_BUDGET_SHEET_NAME, BACKUP_DIR)
+                backup_file = find_latest_backup(MASTER_BUDGET_SHEET_NAME, backup_dir)
                 if not backup_file:
                     logger.error("No backup file found for Master Budget")
                     return False
             
             # Restore from JSON backup
-            result = restore_from_json_backup(spreadsheet_id, MASTER_BUDGET_SHEET_NAME, backup_file, service)
+            result = restore_from_json_backup(spreadsheet_id, MASTER_BUDGET_SHEET_NAME, backup_file, service,
+                                              os.path.join(backup_dir, RESTORE_PROGRESS_DIR))
         else:
             # If no specific backup sheet is provided, find the latest one
             if not backup_sheet_name:
@@ -417,7 +765,8 @@ def restore_master_budget(service, use_json_backup: bool,
 
 def restore_weekly_spending(service, use_json_backup: bool, 
                            backup_file: Optional[str] = None, 
-                           backup_sheet_name: Optional[str] = None) -> bool:
+                           backup_sheet_name: Optional[str] = None,
+                           backup_dir: str = BACKUP_DIR) -> bool:
     """
     Restores the Weekly Spending sheet from backup
     
@@ -426,6 +775,7 @@ def restore_weekly_spending(service, use_json_backup: bool,
         use_json_backup: Whether to use JSON backup file (True) or backup sheet (False)
         backup_file: Path to specific backup file (optional)
         backup_sheet_name: Name of specific backup sheet (optional)
+        backup_dir: Directory containing backup files and restore progress
         
     Returns:
         True if restoration was successful, False otherwise
@@ -437,13 +787,14 @@ def restore_weekly_spending(service, use_json_backup: bool,
         if use_json_backup:
             # If no specific backup file is provided, find the latest one
             if not backup_file:
-                backup_file = find_latest_backup(WEEKLY_SPENDING_SHEET_NAME, BACKUP_DIR)
+                backup_file = find_latest_backup(WEEKLY_SPENDING_SHEET_NAME, backup_dir)
                 if not backup_file:
                     logger.error("No backup file found for Weekly Spending")
                     return False
             
             # Restore from JSON backup
-            result = restore_from_json_backup(spreadsheet_id, WEEKLY_SPENDING_SHEET_NAME, backup_file, service)
+            result = restore_from_json_backup(spreadsheet_id, WEEKLY_SPENDING_SHEET_NAME, backup_file, service,
+                                              os.path.join(backup_dir, RESTORE_PROGRESS_DIR))
         else:
             # If no specific backup sheet is provided, find the latest one
             if not backup_sheet_name:
@@ -485,10 +836,10 @@ def restore_from_latest(use_json_backup: bool, backup_dir: str) -> bool:
         service = get_sheets_service()
         
         # Restore Master Budget
-        master_result = restore_master_budget(service, use_json_backup)
+        master_result = restore_master_budget(service, use_json_backup, backup_dir=backup_dir)
         
         # Restore Weekly Spending
-        weekly_result = restore_weekly_spending(service, use_json_backup)
+        weekly_result = restore_weekly_spending(service, use_json_backup, backup_dir=backup_dir)
         
         # Return success if both restorations were successful
         overall_result = master_result and weekly_result
@@ -529,14 +880,14 @@ def restore_from_specific_date(target_date: datetime.datetime, use_json_backup:
             # Restore Master Budget
             master_result = False
             if master_backup:
-                master_result = restore_master_budget(service, True, backup_file=master_backup)
+                master_result = restore_master_budget(service, True, backup_file=master_backup, backup_dir=backup_dir)
             else:
                 logger.error(f"No Master Budget backup found near {target_date}")
             
             # Restore Weekly Spending
             weekly_result = False
             if weekly_backup:
-                weekly_result = restore_weekly_spending(service, True, backup_file=weekly_backup)
+                weekly_result = restore_weekly_spending(service, True, backup_file=weekly_backup, backup_dir=backup_dir)
             else:
                 logger.error(f"No Weekly Spending backup found near {target_date}")
         else:
@@ -640,7 +991,7 @@ def main() -> int:
                         if not backup_file:
                             logger.error(f"No Master Budget backup found near {target_date}")
                             return 1
-                        result = restore_master_budget(service, True, backup_file=backup_file)
+                        result = restore_master_budget(service, True, backup_file=backup_file, backup_dir=backup_dir)
                     else:
                         spreadsheet_id = APP_SETTINGS['MASTER_BUDGET_SHEET_ID']
                         backup_sheet = find_backup_sheet_by_date(spreadsheet_id, MASTER_BUDGET_SHEET_NAME, target_date, service)
@@ -654,7 +1005,7 @@ def main() -> int:
                         if not backup_file:
                             logger.error(f"No Weekly Spending backup found near {target_date}")
                             return 1
-                        result = restore_weekly_spending(service, True, backup_file=backup_file)
+                        result = restore_weekly_spending(service, True, backup_file=backup_file, backup_dir=backup_dir)
                     else:
                         spreadsheet_id = APP_SETTINGS['WEEKLY_SPENDING_SHEET_ID']
                         backup_sheet = find_backup_sheet_by_date(spreadsheet_id, WEEKLY_SPENDING_SHEET_NAME, target_date, service)
@@ -671,9 +1022,9 @@ def main() -> int:
         else:
             # Restore from latest backups
             if args.master_budget_only:
-                result = restore_master_budget(service, use_json_backup)
+                result = restore_master_budget(service, use_json_backup, backup_dir=backup_dir)
             elif args.weekly_spending_only:
-                result = restore_weekly_spending(service, use_json_backup)
+                result = restore_weekly_spending(service, use_json_backup, backup_dir=backup_dir)
             else:
                 # Restore both sheets
                 result = restore_from_latest(use_json_backup, backup_dir)
@@ -2,25 +2,33 @@
 Script for creating backups of Google Sheets data used by the Budget Management Application.
 Provides functionality to backup both the Master Budget and Weekly Spending sheets to JSON files
 and create timestamped backup sheets within the same spreadsheets.
+
+JSON backups are incremental snapshots (see snapshot_store.py): only the row blocks that
+changed since an earlier backup are written, compressed. Both sheets are backed up at the
+same time, and an in-spreadsheet backup sheet is only created when the sheet changed since
+its previous snapshot. --full-json writes complete JSON files instead.
 """
 
 import os
 import argparse
 import datetime
 import sys
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Callable
 
 # Internal imports
 from ..config.logging_setup import get_logger
 from ..config.path_constants import BACKUP_DIR, ensure_dir_exists
-from ..config.script_settings import MAINTENANCE_SETTINGS
+from ..config.script_settings import MAINTENANCE_SETTINGS, BACKUP_SETTINGS
 from ...backend.config.settings import APP_SETTINGS
 from ..utils.sheet_operations import (
     get_sheets_service,
+    read_sheet,
     export_sheet_to_json,
     create_backup_sheet,
     list_sheets
 )
+from .snapshot_store import SnapshotStore, SNAPSHOTS_DIR
 
 # Set up logger
 logger = get_logger(__name__)
@@ -77,6 +85,35 @@ def backup_sheet_to_json(spreadsheet_id: str, sheet_name: str, service, backup_d
         return ""
 
 
+def backup_sheet_snapshot(spreadsheet_id: str, sheet_name: str, service, store: SnapshotStore) -> Optional[Dict[str, Any]]:
+    """
+    Backs up a Google Sheet as an incremental snapshot, writing only the changed row blocks
+    
+    Args:
+        spreadsheet_id: ID of the spreadsheet
+        sheet_name: Name of the sheet to backup
+        service: Google Sheets API service
+        store: Snapshot store receiving the backup
+        
+    Returns:
+        Snapshot manifest, or None if the backup failed
+    """
+    try:
+        values = read_sheet(spreadsheet_id, sheet_name, service)
+        
+        if not values:
+            logger.error(f"No data found in {sheet_name}")
+            return None
+        
+        manifest_path, manifest = store.write_snapshot(sheet_name, spreadsheet_id, values)
+        logger.info(f"Successfully backed up {sheet_name} to {manifest_path}")
+        return manifest
+    
+    except Exception as e:
+        logger.error(f"Error backing up {sheet_name} to snapshot: {str(e)}")
+        return None
+
+
 def create_in_spreadsheet_backup(spreadsheet_id: str, sheet_name: str, service) -> str:
     """
     Creates a backup sheet within the same spreadsheet with timestamp
@@ -174,60 +211,101 @@ def cleanup_old_backup_sheets(spreadsheet_id: str, original_sheet_name: str, ser
         return 0
 
 
-def backup_master_budget(service, json_backup: bool, sheet_backup: bool, backup_dir: str) -> bool:
+def backup_sheet(spreadsheet_id: str, sheet_name: str, service, json_backup: bool, sheet_backup: bool,
+                 backup_dir: str, keep_limit: int = DEFAULT_BACKUP_SHEETS_LIMIT,
+                 store: Optional[SnapshotStore] = None) -> bool:
     """
-    Creates backups of the Master Budget sheet
+    Creates backups of a sheet
     
     Args:
+        spreadsheet_id: ID of the spreadsheet
+        sheet_name: Name of the sheet to backup
         service: Google Sheets API service
         json_backup: Whether to create JSON backup
         sheet_backup: Whether to create in-spreadsheet backup
         backup_dir: Directory to store JSON backups
+        keep_limit: Number of backup sheets to keep
+        store: Snapshot store for incremental JSON backups (None writes a full JSON file)
         
     Returns:
         True if backup was successful
     """
-    try:
-        logger.info("Starting Master Budget backup")
-        spreadsheet_id = APP_SETTINGS.get('MASTER_BUDGET_SHEET_ID')
-        
-        if not spreadsheet_id:
-            logger.error("Master Budget spreadsheet ID not found in settings")
-            return False
-        
-        success = True
-        
-        # Create JSON backup if requested
-        if json_backup:
+    success = True
+    changed = True
+    
+    # Create JSON backup if requested
+    if json_backup:
+        if store is not None:
+            manifest = backup_sheet_snapshot(spreadsheet_id, sheet_name, service, store)
+            if manifest is None:
+                logger.warning(f"Snapshot backup of {sheet_name} failed")
+                success = False
+            else:
+                changed = manifest['changed']
+        else:
             json_path = backup_sheet_to_json(
                 spreadsheet_id,
-                MASTER_BUDGET_SHEET_NAME,
+                sheet_name,
                 service,
                 backup_dir
             )
             if not json_path:
-                logger.warning("JSON backup of Master Budget failed")
+                logger.warning(f"JSON backup of {sheet_name} failed")
                 success = False
-        
-        # Create in-spreadsheet backup if requested
-        if sheet_backup:
-            backup_sheet_name = create_in_spreadsheet_backup(
+    
+    # Create in-spreadsheet backup if requested (the latest backup sheet is still current
+    # when the snapshot found no change)
+    if sheet_backup and not changed:
+        logger.info(f"{sheet_name} unchanged since its previous snapshot, skipping in-spreadsheet backup")
+    elif sheet_backup:
+        backup_sheet_name = create_in_spreadsheet_backup(
+            spreadsheet_id,
+            sheet_name,
+            service
+        )
+        if not backup_sheet_name:
+            logger.warning(f"In-spreadsheet backup of {sheet_name} failed")
+            success = False
+        else:
+            # Cleanup old backup sheets
+            removed_count = cleanup_old_backup_sheets(
                 spreadsheet_id,
-                MASTER_BUDGET_SHEET_NAME,
-                service
+                sheet_name,
+                service,
+                keep_limit
             )
-            if not backup_sheet_name:
-                logger.warning("In-spreadsheet backup of Master Budget failed")
-                success = False
-            else:
-                # Cleanup old backup sheets
-                removed_count = cleanup_old_backup_sheets(
-                    spreadsheet_id,
-                    MASTER_BUDGET_SHEET_NAME,
-                    service,
-                    DEFAULT_BACKUP_SHEETS_LIMIT
-                )
-                logger.info(f"Removed {removed_count} old Master Budget backup sheets")
+            logger.info(f"Removed {removed_count} old {sheet_name} backup sheets")
+    
+    return success
+
+
+def backup_master_budget(service, json_backup: bool, sheet_backup: bool, backup_dir: str,
+                         keep_limit: int = DEFAULT_BACKUP_SHEETS_LIMIT,
+                         store: Optional[SnapshotStore] = None) -> bool:
+    """
+    Creates backups of the Master Budget sheet
+    
+    Args:
+        service: Google Sheets API service
+        json_backup: Whether to create JSON backup
+        sheet_backup: Whether to create in-spreadsheet backup
+        backup_dir: Directory to store JSON backups
+        keep_limit: Number of backup sheets to keep
+        store: Snapshot store for incremental JSON backups (None writes a full JSON file)
+        
+    Returns:
+        True if backup was successful
+    """
+    try:
+        logger.info("Starting Master Budget backup")
+        spreadsheet_id = APP_SETTINGS.get('MASTER_BUDGET_SHEET_ID')
+        
+        if not spreadsheet_id:
+            logger.error("Master Budget spreadsheet ID not found in settings")
+            return False
+        
+        success = backup_sheet(spreadsheet_id, MASTER_BUDGET_SHEET_NAME, service, json_backup, sheet_backup,
+                               backup_dir, keep_limit, store)
         
         logger.info("Master Budget backup completed successfully")
         return success
@@ -237,7 +315,9 @@ def backup_master_budget(service, json_backup: bool, sheet_backup: bool, backup_
         return False
 
 
-def backup_weekly_spending(service, json_backup: bool, sheet_backup: bool, backup_dir: str) -> bool:
+def backup_weekly_spending(service, json_backup: bool, sheet_backup: bool, backup_dir: str,
+                           keep_limit: int = DEFAULT_BACKUP_SHEETS_LIMIT,
+                           store: Optional[SnapshotStore] = None) -> bool:
     """
     Creates backups of the Weekly Spending sheet
     
@@ -246,6 +326,8 @@ def backup_weekly_spending(service, json_backup: bool, sheet_backup: bool, backu
         json_backup: Whether to create JSON backup
         sheet_backup: Whether to create in-spreadsheet backup
         backup_dir: Directory to store JSON backups
+        keep_limit: Number of backup sheets to keep
+        store: Snapshot store for incremental JSON backups (None writes a full JSON file)
         
     Returns:
         True if backup was successful
@@ -258,39 +340,8 @@ def backup_weekly_spending(service, json_backup: bool, sheet_backup: bool, backu
             logger.error("Weekly Spending spreadsheet ID not found in settings")
             return False
         
-        success = True
-        
-        # Create JSON backup if requested
-        if json_backup:
-            json_path = backup_sheet_to_json(
-                spreadsheet_id,
-                WEEKLY_SPENDING_SHEET_NAME,
-                service,
-                backup_dir
-            )
-            if not json_path:
-                logger.warning("JSON backup of Weekly Spending failed")
-                success = False
-        
-        # Create in-spreadsheet backup if requested
-        if sheet_backup:
-            backup_sheet_name = create_in_spreadsheet_backup(
-                spreadsheet_id,
-                WEEKLY_SPENDING_SHEET_NAME,
-                service
-            )
-            if not backup_sheet_name:
-                logger.warning("In-spreadsheet backup of Weekly Spending failed")
-                success = False
-            else:
-                # Cleanup old backup sheets
-                removed_count = cleanup_old_backup_sheets(
-                    spreadsheet_id,
-                    WEEKLY_SPENDING_SHEET_NAME,
-                    service,
-                    DEFAULT_BACKUP_SHEETS_LIMIT
-                )
-                logger.info(f"Removed {removed_count} old Weekly Spending backup sheets")
+        success = backup_sheet(spreadsheet_id, WEEKLY_SPENDING_SHEET_NAME, service, json_backup, sheet_backup,
+                               backup_dir, keep_limit, store)
         
         logger.info("Weekly Spending backup completed successfully")
         return success
@@ -300,6 +351,33 @@ def backup_weekly_spending(service, json_backup: bool, sheet_backup: bool, backu
         return False
 
 
+def run_backups(backups: List[Callable[..., bool]], service, workers: int, **kwargs) -> List[bool]:
+    """
+    Runs sheet backups at the same time
+    
+    Args:
+        backups: Backup functions taking the service as first argument
+        service: Google Sheets API service
+        workers: Number of backups run at the same time
+        **kwargs: Arguments passed to every backup function
+        
+    Returns:
+        Success of each backup, in order
+    """
+    workers = max(1, min(workers, len(backups)))
+    
+    def run(index: int, backup: Callable[..., bool]) -> bool:
+        # googleapiclient services are not thread-safe, so concurrent backups build their own
+        backup_service = service if workers == 1 or index == 0 else get_sheets_service()
+        if not backup_service:
+            logger.error("Failed to create Google Sheets service")
+            return False
+        return backup(backup_service, **kwargs)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, range(len(backups)), backups))
+
+
 def parse_args():
     """
     Parses command line arguments for the backup script
@@ -329,6 +407,12 @@ def parse_args():
         help=f"Directory to store JSON backups (default: {BACKUP_DIR})"
     )
     
+    parser.add_argument(
+        "--full-json",
+        action="store_true",
+        help="Write complete JSON files instead of incremental snapshots"
+    )
+    
     parser.add_argument(
         "--keep-limit",
         type=int,
@@ -372,11 +456,29 @@ def main() -> int:
             logger.error("Failed to create Google Sheets service")
             return 1
         
-        # Backup Master Budget
-        master_budget_success = backup_master_budget(service, json_backup, sheet_backup, backup_dir)
+        # JSON backups are incremental snapshots unless full JSON files are requested
+        store = None
+        if json_backup and BACKUP_SETTINGS['INCREMENTAL'] and not args.full_json:
+            store = SnapshotStore(os.path.join(backup_dir, SNAPSHOTS_DIR))
+        
+        # Backup Master Budget and Weekly Spending at the same time
+        master_budget_success, weekly_spending_success = run_backups(
+            [backup_master_budget, backup_weekly_spending],
+            service,
+            BACKUP_SETTINGS['WORKERS'],
+            json_backup=json_backup,
+            sheet_backup=sheet_backup,
+            backup_dir=backup_dir,
+            keep_limit=args.keep_limit,
+            store=store
+        )
         
-        # Backup Weekly Spending
-        weekly_spending_success = backup_weekly_spending(service, json_backup, sheet_backup, backup_dir)
+        # Remove old snapshots once no backup is writing blocks anymore
+        if store is not None:
+            try:
+                store.prune(BACKUP_SETTINGS['KEEP_SNAPSHOTS'])
+            except OSError as e:
+                logger.warning(f"Error pruning old snapshots: {str(e)}")
         
         # Return success if both backups succeeded
         if master_budget_success and weekly_spending_success:
@@ -3,20 +3,31 @@
 Maintenance script that cleans up old log files from the application's logs directory
 based on the configured retention period. Helps manage disk space and maintain system
 performance by removing outdated logs that are no longer needed.
+
+The logs directory is scanned once with os.scandir (one stat per file). Log files older
+than the retention period are deleted; plain log files that have not been written to for
+LOG_COMPRESS_AFTER_HOURS (e.g. left behind before rotation was enabled) are compressed
+in parallel, so they take a fraction of the space until they expire.
 """
 
 import os
+import time
 import datetime
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from ../../scripts.config.logging_setup import get_logger, LoggingContext
-from ../../scripts.config.path_constants import LOGS_DIR
-from ../../scripts.config.script_settings import MAINTENANCE_SETTINGS
+from ..config.logging_setup import get_logger, LoggingContext
+from src.backend.config.logging_config import compress_log_file, COMPRESSION_SUFFIXES
+from ..config.path_constants import LOGS_DIR
+from ..config.script_settings import MAINTENANCE_SETTINGS, LOG_ROTATION_SETTINGS
 
 # Set up logger
 logger = get_logger('cleanup_logs')
 
+# Log files written by every run, rotated by their handler instead of compressed here
+ACTIVE_LOG_FILES = ['application.log']
+
 
 def get_file_age_days(file_path):
     """
@@ -40,9 +51,22 @@ def get_file_age_days(file_path):
     return age_delta.total_seconds() / (24 * 3600)
 
 
+def is_compressed_file(file_name):
+    """
+    Checks if a file is a compressed log file.
+    
+    Args:
+        file_name (str): Name of the file
+        
+    Returns:
+        bool: True if the file is gzip or zstd compressed, False otherwise
+    """
+    return file_name.lower().endswith(tuple(COMPRESSION_SUFFIXES.values()))
+
+
 def is_log_file(file_name):
     """
-    Checks if a file is a log file based on its extension.
+    Checks if a file is a log file based on its extension, including rotated and compressed logs.
     
     Args:
         file_name (str): Name of the file
@@ -50,65 +74,137 @@ def is_log_file(file_name):
     Returns:
         bool: True if the file is a log file, False otherwise
     """
-    # Common log file extensions
+    name = file_name.lower()
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    
+    # Common log file extensions, and rotated log files (application.log.20240101-000000)
     log_extensions = ['.log', '.json']
-    # Check if the file has a log extension
-    return any(file_name.lower().endswith(ext) for ext in log_extensions)
+    return any(name.endswith(ext) for ext in log_extensions) or '.log.' in name
+
+
+def scan_log_files(logs_dir):
+    """
+    Lists the log files of a directory with their size and modification time.
+    
+    Args:
+        logs_dir (str): Directory to scan (subdirectories are not scanned)
+        
+    Returns:
+        list: (name, path, size, modification time) of every log file
+    """
+    log_files = []
+    with os.scandir(logs_dir) as entries:
+        for entry in entries:
+            if not is_log_file(entry.name) or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError as e:
+                logger.error(f"Error processing file {entry.name}: {str(e)}")
+                continue
+            log_files.append((entry.name, entry.path, stat.st_size, stat.st_mtime))
+    return log_files
 
 
-def cleanup_logs(retention_days, dry_run=False):
+def compress_log_files(log_files, compression, workers):
     """
-    Cleans up log files older than the specified retention period.
+    Compresses log files in parallel.
+    
+    Args:
+        log_files (list): (name, path, size, modification time) of the files to compress
+        compression (str): 'gzip' or 'zstd'
+        workers (int): Number of files compressed at the same time
+        
+    Returns:
+        tuple: (int, int) - Count of compressed files and space saved
+    """
+    def compress(log_file):
+        name, path, size, _ = log_file
+        try:
+            compressed_path = compress_log_file(path, compression)
+            return size - os.path.getsize(compressed_path)
+        except OSError as e:
+            logger.error(f"Error compressing file {name}: {str(e)}")
+            return None
+    
+    # zlib and zstd release the GIL while compressing, so threads compress in parallel
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        saved = [result for result in executor.map(compress, log_files) if result is not None]
+    
+    return len(saved), sum(saved)
+
+
+def cleanup_logs(retention_days, dry_run=False, compress_after_hours=None, compression=None,
+                 workers=None, logs_dir=None):
+    """
+    Cleans up log files older than the specified retention period and compresses older plain logs.
     
     Args:
         retention_days (int): Retention period in days
         dry_run (bool): If True, only simulate deletion without actually removing files
+        compress_after_hours (float): Hours since the last write after which plain log files are
+            compressed, defaults to LOG_ROTATION_SETTINGS['COMPRESS_AFTER_HOURS']
+        compression (str): 'gzip', 'zstd' or 'none', defaults to LOG_ROTATION_SETTINGS['COMPRESSION']
+        workers (int): Number of files compressed at the same time, defaults to
+            LOG_ROTATION_SETTINGS['COMPRESSION_WORKERS']
+        logs_dir (str): Directory to clean up, defaults to LOGS_DIR
         
     Returns:
-        tuple: (int, int) - Count of deleted files and total size freed
+        tuple: (int, int) - Count of deleted files and total size freed (including space
+            saved by compression)
     """
+    compress_after_hours = compress_after_hours if compress_after_hours is not None else LOG_ROTATION_SETTINGS['COMPRESS_AFTER_HOURS']
+    compression = (compression or LOG_ROTATION_SETTINGS['COMPRESSION']).lower()
+    workers = workers or LOG_ROTATION_SETTINGS['COMPRESSION_WORKERS']
+    logs_dir = logs_dir or LOGS_DIR
+    
     logger.info(f"Starting log cleanup with retention period of {retention_days} days")
     
     # Initialize counters
     deleted_count = 0
     freed_space = 0
     
-    # Ensure LOGS_DIR exists
-    if not os.path.exists(LOGS_DIR):
-        logger.warning(f"Logs directory {LOGS_DIR} does not exist")
+    # Ensure the logs directory exists
+    if not os.path.exists(logs_dir):
+        logger.warning(f"Logs directory {logs_dir} does not exist")
         return 0, 0
     
-    # Iterate through files in the logs directory
-    for filename in os.listdir(LOGS_DIR):
-        file_path = os.path.join(LOGS_DIR, filename)
-        
-        # Skip directories
-        if os.path.isdir(file_path):
-            continue
+    # Sort every log file into expired ones and plain ones to compress
+    now = time.time()
+    to_compress = []
+    for filename, file_path, file_size, modified in scan_log_files(logs_dir):
+        file_age_days = (now - modified) / (24 * 3600)
         
-        # Check if it's a log file
-        if is_log_file(filename):
+        # If the file is older than the retention period, delete it
+        if file_age_days > retention_days:
+            if dry_run:
+                logger.info(f"Would delete: {filename} (Age: {file_age_days:.1f} days, Size: {file_size/1024:.1f} KB)")
+                continue
             try:
-                # Calculate file age
-                file_age_days = get_file_age_days(file_path)
-                
-                # If the file is older than the retention period, delete it
-                if file_age_days > retention_days:
-                    # Get file size before deletion
-                    file_size = os.path.getsize(file_path)
-                    
-                    if dry_run:
-                        logger.info(f"Would delete: {filename} (Age: {file_age_days:.1f} days, Size: {file_size/1024:.1f} KB)")
-                    else:
-                        # Delete the file
-                        os.remove(file_path)
-                        logger.info(f"Deleted: {filename} (Age: {file_age_days:.1f} days, Size: {file_size/1024:.1f} KB)")
-                        
-                        # Update counters
-                        deleted_count += 1
-                        freed_space += file_size
-            except Exception as e:
+                os.remove(file_path)
+            except OSError as e:
                 logger.error(f"Error processing file {filename}: {str(e)}")
+                continue
+            logger.info(f"Deleted: {filename} (Age: {file_age_days:.1f} days, Size: {file_size/1024:.1f} KB)")
+            
+            # Update counters
+            deleted_count += 1
+            freed_space += file_size
+        elif (compression != 'none' and not is_compressed_file(filename) and filename not in ACTIVE_LOG_FILES
+              and file_age_days * 24 >= compress_after_hours):
+            to_compress.append((filename, file_path, file_size, modified))
+    
+    # Compress plain logs that are no longer written to
+    if to_compress:
+        if dry_run:
+            logger.info(f"Would compress {len(to_compress)} files ({sum(f[2] for f in to_compress)/1024/1024:.2f} MB)")
+        else:
+            compressed_count, saved_space = compress_log_files(to_compress, compression, workers)
+            freed_space += saved_space
+            logger.info(f"Compressed {compressed_count} files, saving {saved_space/1024/1024:.2f} MB")
     
     # Log summary
     if dry_run:
@@ -137,6 +233,20 @@ def parse_arguments():
         help="Number of days to retain log files (default: %(default)s)"
     )
     
+    parser.add_argument(
+        "--compress-after-hours",
+        type=float,
+        default=LOG_ROTATION_SETTINGS['COMPRESS_AFTER_HOURS'],
+        help="Compress plain log files not written to for this many hours (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "zstd", "none"],
+        default=LOG_ROTATION_SETTINGS['COMPRESSION'],
+        help="Compression of older log files (default: %(default)s)"
+    )
+    
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -171,7 +281,9 @@ def main():
             # Call cleanup_logs function
             deleted_count, freed_space = cleanup_logs(
                 retention_days=args.retention_days,
-                dry_run=args.dry_run
+                dry_run=args.dry_run,
+                compress_after_hours=args.compress_after_hours,
+                compression=args.compression
             )
             
             logger.info(f"Log cleanup completed. " +
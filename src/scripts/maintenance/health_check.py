@@ -22,6 +22,7 @@ from src.backend.api_clients.gmail_client import GmailClient  # Test connectivit
 from src.backend.services.error_handling_service import with_error_handling  # Add error handling to health check functions
 from src.backend.services.error_handling_service import reset_circuit  # Reset circuit breakers for services
 from src.backend.services.error_handling_service import get_circuit_state  # Get circuit breaker state for services
+from src.backend.services.health_check_service import run_health_checks, get_integration_probes  # Run the checks concurrently with cached results
 
 # Initialize logger
 logger = get_logger('health_check')
@@ -29,6 +30,16 @@ logger = get_logger('health_check')
 # Define the path for the health check report file
 HEALTH_CHECK_REPORT_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'logs', 'health_check_report.json')
 
+# Report key of each health probe; the integrations use the probe names of main --check-health,
+# so both share cached results
+HEALTH_REPORT_KEYS = {
+    "authentication": "authentication_status",
+    "capital_one": "capital_one_connectivity",
+    "google_sheets": "google_sheets_connectivity",
+    "gemini": "gemini_connectivity",
+    "gmail": "gmail_connectivity",
+}
+
 
 @with_error_handling('health_check', 'check_authentication', {})
 def check_authentication() -> dict:
@@ -166,20 +177,23 @@ def check_circuit_breakers() -> dict:
     """
     Checks the status of all circuit breakers.
 
+    Reads the same circuits as the budget management job, which are only visible to this
+    script when both use the shared backend (CIRCUIT_BREAKER_BACKEND=sqlite).
+
     Returns:
         dict: Circuit breaker status for each service
     """
     # Get circuit state for Capital One service
-    capital_one_circuit = get_circuit_state('CAPITAL_ONE')
+    capital_one_circuit = get_circuit_state('capital_one')
 
     # Get circuit state for Google Sheets service
-    google_sheets_circuit = get_circuit_state('GOOGLE_SHEETS')
+    google_sheets_circuit = get_circuit_state('google_sheets')
 
     # Get circuit state for Gemini service
-    gemini_circuit = get_circuit_state('GEMINI')
+    gemini_circuit = get_circuit_state('gemini')
 
     # Get circuit state for Gmail service
-    gmail_circuit = get_circuit_state('GMAIL')
+    gmail_circuit = get_circuit_state('gmail')
 
     # Log circuit breaker status
     logger.info("Circuit breaker status checked")
@@ -202,16 +216,16 @@ def reset_circuit_breakers() -> dict:
         dict: Reset status for each service
     """
     # Reset circuit for Capital One service
-    capital_one_reset = reset_circuit('CAPITAL_ONE')
+    capital_one_reset = reset_circuit('capital_one')
 
     # Reset circuit for Google Sheets service
-    google_sheets_reset = reset_circuit('GOOGLE_SHEETS')
+    google_sheets_reset = reset_circuit('google_sheets')
 
     # Reset circuit for Gemini service
-    gemini_reset = reset_circuit('GEMINI')
+    gemini_reset = reset_circuit('gemini')
 
     # Reset circuit for Gmail service
-    gmail_reset = reset_circuit('GMAIL')
+    gmail_reset = reset_circuit('gmail')
 
     # Log circuit breaker reset results
     logger.info("Circuit breakers reset")
@@ -225,30 +239,30 @@ def reset_circuit_breakers() -> dict:
     }
 
 
-def generate_health_report() -> dict:
+def generate_health_report(use_cache: bool = True) -> dict:
     """
     Generates a comprehensive health check report.
 
+    Args:
+        use_cache: Whether results of a recent health check may be reused
+
     Returns:
         dict: Complete health check report
     """
     # Create report dictionary with timestamp
     report = {"timestamp": datetime.datetime.now().isoformat()}
 
-    # Add authentication status from check_authentication()
-    report.update(check_authentication())
-
-    # Add Capital One connectivity status from check_capital_one_connectivity()
-    report.update(check_capital_one_connectivity())
+    # Run the authentication check and the integration probes shared with main --check-health
+    # concurrently, each bounded by the health check timeout; healthy results younger than
+    # the cache TTL are reused, also when main --check-health produced them
+    probes = {"authentication": lambda: bool(check_authentication().get("authentication_status", False))}
+    probes.update(get_integration_probes())
+    results = run_health_checks(probes, use_cache=use_cache)
 
-    # Add Google Sheets connectivity status from check_google_sheets_connectivity()
-    report.update(check_google_sheets_connectivity())
-
-    # Add Gemini connectivity status from check_gemini_connectivity()
-    report.update(check_gemini_connectivity())
-
-    # Add Gmail connectivity status from check_gmail_connectivity()
-    report.update(check_gmail_connectivity())
+    # Add the status of each check, and how long each dependency took to respond
+    for name, result in results.items():
+        report[HEALTH_REPORT_KEYS[name]] = result["status"] == "healthy"
+    report["latency_ms"] = {name: result["latency_ms"] for name, result in results.items()}
 
     # Add circuit breaker status from check_circuit_breakers()
     report.update(check_circuit_breakers())
@@ -369,6 +383,11 @@ def parse_arguments() -> argparse.Namespace:
         "--email", action="store_true", help="Force sending email report even if no issues are detected."
     )
 
+    # Add --refresh flag to ignore cached results
+    parser.add_argument(
+        "--refresh", action="store_true", help="Ignore cached health check results and probe every service."
+    )
+
     # Add --verbose flag for detailed output
     parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose output for debugging."
@@ -397,7 +416,7 @@ def main() -> int:
         reset_circuit_breakers()
 
     # Generate health report by calling generate_health_report()
-    report = generate_health_report()
+    report = generate_health_report(use_cache=not (args.refresh or args.reset_circuits))
 
     # Save health report to file
     save_health_report(report)
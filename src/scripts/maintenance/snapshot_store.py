@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, compressed store of Google Sheets snapshots
+
+backup_sheets.py used to dump the full sheet as JSON on every backup. The snapshot store
+splits the rows of a sheet into blocks, names every block after the hash of its rows and
+only writes the blocks it does not hold yet, so backing up a sheet that gained a week of
+transactions writes a few kilobytes. Each snapshot is a small manifest listing its
+blocks in order:
+
+    <backup_dir>/snapshots/
+        blocks/3f/3fa4...e1.json.zst
+        manifests/Weekly Spending_snapshot_20240506_120000.json
+
+Blocks end after a row whose hash matches a boundary condition, rather than after a
+fixed number of rows, so inserting or deleting rows only changes the blocks around the
+edit instead of shifting every block after it.
+
+Usage:
+    store = SnapshotStore(os.path.join(BACKUP_DIR, SNAPSHOTS_DIR))
+    manifest_path, manifest = store.write_snapshot('Weekly Spending', spreadsheet_id, values)
+    for rows in store.iter_blocks(manifest):
+        ...
+"""
+
+import os
+import re
+import gzip
+import json
+import hashlib
+import datetime
+import threading
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+
+try:
+    import zstandard  # zstandard 0.21.0+ (optional, zstd compression of snapshot blocks)
+except ImportError:
+    zstandard = None
+
+# Internal imports
+from ..config.logging_setup import get_logger
+from src.backend.config.logging_config import (
+    resolve_compression,
+    COMPRESSION_SUFFIXES,
+    GZIP_COMPRESSION_LEVEL,
+    ZSTD_COMPRESSION_LEVEL
+)
+from ..config.script_settings import BACKUP_SETTINGS
+from ..config.path_constants import ensure_dir_exists
+
+# Initialize logger
+logger = get_logger('snapshot_store')
+
+# Version of the manifest format, stored in every manifest
+MANIFEST_FORMAT_VERSION = 1
+
+# Snapshot directory inside the backup directory, and the names used inside it
+SNAPSHOTS_DIR = 'snapshots'
+BLOCKS_DIR = 'blocks'
+MANIFESTS_DIR = 'manifests'
+BLOCK_SUFFIX = '.json'
+SNAPSHOT_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+SNAPSHOT_FILE_PATTERN = re.compile(r'(.+)_snapshot_(\d{8}_\d{6})\.json')
+
+
+def canonical_json(value: Any) -> bytes:
+    """
+    Serialize a value to JSON bytes that are identical for identical values
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        Compact UTF-8 encoded JSON
+    """
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def hash_rows(rows: List[List[Any]]) -> str:
+    """
+    Hash a list of rows, identifying a block by its content
+
+    Args:
+        rows: Rows of sheet values
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON of the rows
+    """
+    return hashlib.sha256(canonical_json(rows)).hexdigest()
+
+
+def split_into_blocks(rows: List[List[Any]], block_rows: int) -> List[List[List[Any]]]:
+    """
+    Split rows into blocks whose boundaries depend on the row contents
+
+    A block ends after a row whose hash is divisible by block_rows, so blocks hold
+    block_rows rows on average, and the same rows produce the same blocks wherever they
+    are in the sheet. Blocks hold at least a quarter and at most four times block_rows.
+
+    Args:
+        rows: Rows of sheet values
+        block_rows: Average number of rows per block
+
+    Returns:
+        List of blocks, each a list of consecutive rows
+    """
+    block_rows = max(1, block_rows)
+    min_rows = max(1, block_rows // 4)
+    max_rows = block_rows * 4
+
+    blocks = []
+    current = []
+    for row in rows:
+        current.append(row)
+        if len(current) < min_rows:
+            continue
+        row_hash = int.from_bytes(hashlib.blake2b(canonical_json(row), digest_size=8).digest(), 'big')
+        if row_hash % block_rows == 0 or len(current) >= max_rows:
+            blocks.append(current)
+            current = []
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def compress_block(data: bytes, method: str) -> bytes:
+    """
+    Compress the serialized rows of a block
+
+    Args:
+        data: Canonical JSON of the rows
+        method: 'gzip', 'zstd' or 'none'
+
+    Returns:
+        Compressed bytes
+    """
+    if method == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL).compress(data)
+    if method == 'gzip':
+        # mtime=0 keeps the output identical for identical rows
+        return gzip.compress(data, compresslevel=GZIP_COMPRESSION_LEVEL, mtime=0)
+    return data
+
+
+def decompress_block(data: bytes, path: str) -> bytes:
+    """
+    Decompress a block file according to its suffix
+
+    Args:
+        data: Contents of the block file
+        path: Path of the block file
+
+    Returns:
+        Canonical JSON of the rows
+    """
+    if path.endswith(COMPRESSION_SUFFIXES['zstd']):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if path.endswith(COMPRESSION_SUFFIXES['gzip']):
+        return gzip.decompress(data)
+    return data
+
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file through a temporary file, so readers never see a partial file
+
+    Args:
+        path: Path of the file
+        data: File contents
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class SnapshotStore:
+    """Directory of content-addressed row blocks and the snapshot manifests using them"""
+
+    def __init__(self, root_dir: str, compression: Optional[str] = None, block_rows: Optional[int] = None):
+        """
+        Initialize the snapshot store
+
+        Args:
+            root_dir: Snapshot directory
+            compression: Compression of new blocks, defaults to BACKUP_SETTINGS['COMPRESSION']
+            block_rows: Average rows per block, defaults to BACKUP_SETTINGS['BLOCK_ROWS']
+        """
+        self.root_dir = root_dir
+        self.blocks_dir = os.path.join(root_dir, BLOCKS_DIR)
+        self.manifests_dir = os.path.join(root_dir, MANIFESTS_DIR)
+        self.compression = resolve_compression(compression or BACKUP_SETTINGS['COMPRESSION'])
+        self.block_rows = block_rows or BACKUP_SETTINGS['BLOCK_ROWS']
+
+    def _block_base_path(self, block_hash: str) -> str:
+        """
+        Get the path of a block without its compression suffix
+
+        Args:
+            block_hash: Hash of the block rows
+
+        Returns:
+            blocks/<first two hash characters>/<hash>.json
+        """
+        return os.path.join(self.blocks_dir, block_hash[:2], block_hash + BLOCK_SUFFIX)
+
+    def find_block(self, block_hash: str) -> Optional[str]:
+        """
+        Find the file of a block, whichever compression it was written with
+
+        Args:
+            block_hash: Hash of the block rows
+
+        Returns:
+            Path of the block file, or None if the store does not hold the block
+        """
+        base_path = self._block_base_path(block_hash)
+        for suffix in [COMPRESSION_SUFFIXES.get(self.compression, '')] + list(COMPRESSION_SUFFIXES.values()) + ['']:
+            if os.path.exists(base_path + suffix):
+                return base_path + suffix
+        return None
+
+    def write_block(self, rows: List[List[Any]]) -> Tuple[str, int]:
+        """
+        Store a block unless the store already holds the same rows
+
+        Args:
+            rows: Rows of the block
+
+        Returns:
+            Tuple of the block hash and the number of bytes written (0 if it existed)
+        """
+        data = canonical_json(rows)
+        block_hash = hashlib.sha256(data).hexdigest()
+        if self.find_block(block_hash):
+            return block_hash, 0
+
+        path = self._block_base_path(block_hash) + COMPRESSION_SUFFIXES.get(self.compression, '')
+        ensure_dir_exists(os.path.dirname(path))
+        compressed = compress_block(data, self.compression)
+        write_file_atomic(path, compressed)
+        return block_hash, len(compressed)
+
+    def read_block(self, block_hash: str) -> List[List[Any]]:
+        """
+        Read the rows of a block and verify them against the block hash
+
+        Args:
+            block_hash: Hash of the block rows
+
+        Returns:
+            Rows of the block
+
+        Raises:
+            FileNotFoundError: If the store does not hold the block
+            ValueError: If the block contents do not match its hash
+        """
+        path = self.find_block(block_hash)
+        if path is None:
+            raise FileNotFoundError(f"Snapshot block {block_hash} not found in {self.blocks_dir}")
+
+        with open(path, 'rb') as f:
+            data = decompress_block(f.read(), path)
+        if hashlib.sha256(data).hexdigest() != block_hash:
+            raise ValueError(f"Snapshot block {path} is corrupt: contents do not match its hash")
+        return json.loads(data)
+
+    def list_manifests(self, sheet_name: Optional[str] = None) -> List[Tuple[str, datetime.datetime, str]]:
+        """
+        List the snapshot manifests, oldest first
+
+        Args:
+            sheet_name: Only list snapshots of this sheet
+
+        Returns:
+            List of (sheet name, snapshot time, manifest path) tuples
+        """
+        if not os.path.isdir(self.manifests_dir):
+            return []
+
+        manifests = []
+        with os.scandir(self.manifests_dir) as entries:
+            for entry in entries:
+                match = SNAPSHOT_FILE_PATTERN.fullmatch(entry.name)
+                if not match or (sheet_name is not None and match.group(1) != sheet_name):
+                    continue
+                timestamp = datetime.datetime.strptime(match.group(2), SNAPSHOT_TIMESTAMP_FORMAT)
+                manifests.append((match.group(1), timestamp, entry.path))
+        return sorted(manifests, key=lambda manifest: (manifest[1], manifest[2]))
+
+    @staticmethod
+    def load_manifest(manifest_path: str) -> Dict[str, Any]:
+        """
+        Load a snapshot manifest
+
+        Args:
+            manifest_path: Path of the manifest
+
+        Returns:
+            Manifest dictionary
+        """
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+
+    def latest_manifest(self, sheet_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the latest snapshot manifest of a sheet
+
+        Args:
+            sheet_name: Name of the sheet
+
+        Returns:
+            Manifest dictionary, or None if the sheet has no readable snapshot
+        """
+        manifests = self.list_manifests(sheet_name)
+        if not manifests:
+            return None
+        try:
+            return self.load_manifest(manifests[-1][2])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot manifest {manifests[-1][2]}: {e}")
+            return None
+
+    def write_snapshot(self, sheet_name: str, spreadsheet_id: str, values: List[List[Any]],
+                       created: Optional[datetime.datetime] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Store a snapshot of a sheet, writing only the blocks the store does not hold yet
+
+        Args:
+            sheet_name: Name of the sheet
+            spreadsheet_id: ID of the spreadsheet
+            values: Sheet values, the first row holding the headers
+            created: Time of the snapshot, defaults to now
+
+        Returns:
+            Tuple of the manifest path and the manifest, whose 'changed' entry tells
+            whether the sheet differs from its previous snapshot
+        """
+        headers = values[0] if values else []
+        rows = values[1:]
+
+        blocks = []
+        bytes_written = 0
+        blocks_written = 0
+        for block in split_into_blocks(rows, self.block_rows):
+            block_hash, written = self.write_block(block)
+            blocks.append({'hash': block_hash, 'rows': len(block)})
+            bytes_written += written
+            blocks_written += 1 if written else 0
+
+        content_hash = hashlib.sha256(canonical_json([headers, [block['hash'] for block in blocks]])).hexdigest()
+        previous = self.latest_manifest(sheet_name)
+
+        created = created or datetime.datetime.now()
+        manifest = {
+            'format_version': MANIFEST_FORMAT_VERSION,
+            'sheet_name': sheet_name,
+            'spreadsheet_id': spreadsheet_id,
+            'created': created.isoformat(),
+            'headers': headers,
+            'row_count': len(rows),
+            'content_hash': content_hash,
+            'changed': previous is None or previous.get('content_hash') != content_hash,
+            'blocks_written': blocks_written,
+            'bytes_written': bytes_written,
+            'blocks': blocks
+        }
+
+        ensure_dir_exists(self.manifests_dir)
+        manifest_path = os.path.join(
+            self.manifests_dir, f"{sheet_name}_snapshot_{created.strftime(SNAPSHOT_TIMESTAMP_FORMAT)}.json"
+        )
+        write_file_atomic(manifest_path, json.dumps(manifest, indent=2).encode('utf-8'))
+
+        logger.info(f"Snapshot of {sheet_name}: {len(rows)} rows in {len(blocks)} blocks, "
+                    f"{blocks_written} new blocks ({bytes_written} bytes) written to {manifest_path}")
+        return manifest_path, manifest
+
+    def iter_blocks(self, manifest: Dict[str, Any], skip_rows: int = 0) -> Iterator[List[List[Any]]]:
+        """
+        Read the rows of a snapshot block by block, verifying every block
+
+        Args:
+            manifest: Snapshot manifest
+            skip_rows: Number of leading rows to skip; blocks holding only skipped rows
+                are not read
+
+        Yields:
+            Rows of each block, in sheet order (without the header row)
+        """
+        for block in manifest['blocks']:
+            if skip_rows >= block['rows']:
+                skip_rows -= block['rows']
+                continue
+            rows = self.read_block(block['hash'])
+            if len(rows) != block['rows']:
+                raise ValueError(f"Snapshot block {block['hash']} holds {len(rows)} rows, expected {block['rows']}")
+            yield rows[skip_rows:]
+            skip_rows = 0
+
+    def prune(self, keep: int) -> Tuple[int, int]:
+        """
+        Delete all but the newest snapshots of every sheet and the blocks no snapshot uses
+
+        Must not run while a snapshot is being written, as its new blocks are not yet
+        referenced by a manifest.
+
+        Args:
+            keep: Number of snapshots to keep per sheet
+
+        Returns:
+            Tuple of the number of manifests and blocks deleted
+        """
+        manifests_by_sheet: Dict[str, List[str]] = {}
+        for sheet_name, _, manifest_path in self.list_manifests():
+            manifests_by_sheet.setdefault(sheet_name, []).append(manifest_path)
+
+        manifests_deleted = 0
+        referenced = set()
+        for manifest_paths in manifests_by_sheet.values():
+            cutoff = max(len(manifest_paths) - max(keep, 1), 0)
+            for manifest_path in manifest_paths[:cutoff]:
+                os.remove(manifest_path)
+                manifests_deleted += 1
+            for manifest_path in manifest_paths[cutoff:]:
+                try:
+                    referenced.update(block['hash'] for block in self.load_manifest(manifest_path)['blocks'])
+                except (OSError, ValueError, KeyError) as e:
+                    # Without its block list no block can be deleted safely
+                    logger.warning(f"Not pruning snapshot blocks, unreadable manifest {manifest_path}: {e}")
+                    return manifests_deleted, 0
+
+        blocks_deleted = 0
+        if os.path.isdir(self.blocks_dir):
+            with os.scandir(self.blocks_dir) as prefixes:
+                for prefix in prefixes:
+                    if not prefix.is_dir():
+                        continue
+                    with os.scandir(prefix.path) as entries:
+                        for entry in entries:
+                            if entry.name.split('.', 1)[0] not in referenced:
+                                os.remove(entry.path)
+                                blocks_deleted += 1
+
+        logger.info(f"Pruned {manifests_deleted} snapshot manifests and {blocks_deleted} unused blocks")
+        return manifests_deleted, blocks_deleted
@@ -89,6 +89,42 @@ def get_job_logs(project_id: str, job_name: str, execution_id: str, limit: int =
         return []
 
 
+def get_local_job_logs(log_file, execution_id: str, days: int = None) -> list:
+    """
+    Retrieves the logs of a job execution from local log files through the log index.
+    
+    Args:
+        log_file: Path, or list of paths, to log files, directories or glob patterns
+        execution_id: Correlation ID of the execution
+        days: Number of days to search from today (all indexed days if None)
+        
+    Returns:
+        List of log entries in Cloud Logging format (timestamp, severity, jsonPayload)
+    """
+    try:
+        from ..monitoring.log_index import LogIndex, to_log_entries
+        
+        index = LogIndex()
+        sources = index.update(log_file)
+        entries = to_log_entries(index.query(days=days, correlation_id=execution_id, sources=sources))
+        
+        logs = [
+            {
+                'timestamp': entry.timestamp.isoformat(),
+                'severity': entry.level,
+                'jsonPayload': dict(entry.context, message=entry.message, component=entry.component,
+                                    correlation_id=entry.correlation_id)
+            }
+            for entry in entries
+        ]
+        logger.info(f"Retrieved {len(logs)} local log entries for execution {execution_id}")
+        return logs
+    
+    except Exception as e:
+        logger.error(f"Error retrieving local job logs: {str(e)}")
+        return []
+
+
 def analyze_logs(logs: list) -> dict:
     """
     Analyzes job logs to identify errors and issues.
@@ -741,6 +777,13 @@ def parse_arguments():
         action='store_true'
     )
     
+    parser.add_argument(
+        '--log-file',
+        help='Read execution logs from these local log files, through the log index, instead of Cloud Logging',
+        nargs='+',
+        default=None
+    )
+    
     parser.add_argument(
         '--analyze-logs',
         help='Analyze job logs for issues',
@@ -1082,7 +1125,10 @@ def main():
             # Get job logs
             if args.get_logs:
                 logger.info(f"Getting logs for execution: {args.execution_id}")
-                logs = get_job_logs(args.project_id, args.job_name, args.execution_id)
+                if args.log_file:
+                    logs = get_local_job_logs(args.log_file, args.execution_id)
+                else:
+                    logs = get_job_logs(args.project_id, args.job_name, args.execution_id)
                 
                 print(f"\nRetrieved {len(logs)} log entries for execution {args.execution_id}")
                 
@@ -14,6 +14,7 @@ Options:
     --region REGION              Google Cloud region (default: us-east1)
     --job-name JOB_NAME          Cloud Run job name (default: budget-management-job)
     --correlation-id ID          Custom correlation ID for job execution
+    --resume ID                  Resume a failed execution from its first incomplete stage
     --wait                       Wait for job completion
     --timeout SECONDS            Wait timeout in seconds (default: 300)
     --check-health               Run system health check only
@@ -85,6 +86,12 @@ def parse_arguments():
         default=None
     )
     
+    parser.add_argument(
+        '--resume',
+        help='Correlation ID of a failed execution to resume from its first incomplete stage',
+        default=None
+    )
+    
     parser.add_argument(
         '--wait',
         help='Wait for job completion',
@@ -188,7 +195,24 @@ def check_job_exists(project_id, region, job_name):
         return False
 
 
-def trigger_job_gcloud(project_id, region, job_name, correlation_id):
+def build_job_env_vars(correlation_id, resume=False):
+    """
+    Builds the environment variable overrides passed to the job execution.
+    
+    Args:
+        correlation_id (str): Correlation ID for the job execution
+        resume (bool): Whether the job should resume the run with this correlation ID
+        
+    Returns:
+        dict: Environment variable names and values
+    """
+    env_vars = {'CORRELATION_ID': correlation_id}
+    if resume:
+        env_vars['RESUME_CORRELATION_ID'] = correlation_id
+    return env_vars
+
+
+def trigger_job_gcloud(project_id, region, job_name, correlation_id, resume=False):
     """
     Triggers a Cloud Run job using gcloud CLI.
     
@@ -197,6 +221,7 @@ def trigger_job_gcloud(project_id, region, job_name, correlation_id):
         region (str): Google Cloud region
         job_name (str): Cloud Run job name
         correlation_id (str): Correlation ID for the job execution
+        resume (bool): Whether to resume the run with this correlation ID from its checkpoints
         
     Returns:
         dict: Job execution details including execution ID
@@ -206,7 +231,7 @@ def trigger_job_gcloud(project_id, region, job_name, correlation_id):
             'gcloud', 'run', 'jobs', 'execute', job_name,
             '--project', project_id,
             '--region', region,
-            '--update-env-vars', f'CORRELATION_ID={correlation_id}',
+            '--update-env-vars', ','.join(f'{name}={value}' for name, value in build_job_env_vars(correlation_id, resume).items()),
             '--format', 'json'
         ]
         
@@ -245,7 +270,7 @@ def trigger_job_gcloud(project_id, region, job_name, correlation_id):
         }
 
 
-def trigger_job_api(project_id, region, job_name, correlation_id):
+def trigger_job_api(project_id, region, job_name, correlation_id, resume=False):
     """
     Triggers a Cloud Run job using Google Cloud Run API.
     
@@ -254,6 +279,7 @@ def trigger_job_api(project_id, region, job_name, correlation_id):
         region (str): Google Cloud region
         job_name (str): Cloud Run job name
         correlation_id (str): Correlation ID for the job execution
+        resume (bool): Whether to resume the run with this correlation ID from its checkpoints
         
     Returns:
         dict: Job execution details including execution ID
@@ -287,7 +313,8 @@ def trigger_job_api(project_id, region, job_name, correlation_id):
                 "container_overrides": [
                     {
                         "env": [
-                            {"name": "CORRELATION_ID", "value": correlation_id}
+                            {"name": name, "value": value}
+                            for name, value in build_job_env_vars(correlation_id, resume).items()
                         ]
                     }
                 ]
@@ -507,8 +534,8 @@ def main():
     # Parse command line arguments
     args = parse_arguments()
     
-    # Generate a correlation ID if not provided
-    correlation_id = args.correlation_id or str(uuid.uuid4())
+    # Resuming reuses the failed run's correlation ID; otherwise generate one if not provided
+    correlation_id = args.resume or args.correlation_id or str(uuid.uuid4())
     
     # Set up logging context for this operation
     with LoggingContext(logger, "manual_job_trigger", context={
@@ -516,7 +543,8 @@ def main():
         "region": args.region,
         "job_name": args.job_name,
         "wait": args.wait,
-        "timeout": args.timeout
+        "timeout": args.timeout,
+        "resume": bool(args.resume)
     }, correlation_id=correlation_id):
         
         # Enable debug logging if requested
@@ -548,11 +576,11 @@ def main():
         logger.info("Triggering Cloud Run job: %s (correlation ID: %s)", args.job_name, correlation_id)
         
         # Try to use the API first, fall back to gcloud CLI if needed
-        execution_result = trigger_job_api(args.project_id, args.region, args.job_name, correlation_id)
+        execution_result = trigger_job_api(args.project_id, args.region, args.job_name, correlation_id, bool(args.resume))
         
         if execution_result.get('status') in ('error', 'fallback'):
             logger.warning("Falling back to gcloud CLI for job triggering")
-            execution_result = trigger_job_gcloud(args.project_id, args.region, args.job_name, correlation_id)
+            execution_result = trigger_job_gcloud(args.project_id, args.region, args.job_name, correlation_id, bool(args.resume))
         
         # Check if job was triggered successfully
         if execution_result.get('status') != 'triggered':
@@ -7,8 +7,17 @@ and generate reports on system behavior. It provides functionality for loading,
 filtering, and analyzing log data to monitor application health, track performance
 metrics, and detect potential issues.
 
+Logs are streamed line by line from plain, gzip- or zstd-rotated files, date/level/component/
+pattern filters are applied before log entries are created, and several files are read
+in parallel worker processes, so months of logs can be analyzed without loading them
+whole into memory. When pyarrow is installed, lines are also added to the persistent
+log index (log_index.py) and repeated queries read only the new lines and the
+day/component partitions they need.
+
 Usage:
     python analyze_logs.py --log-file=application.log --days=7 --format=html --visualize
+    python analyze_logs.py --log-file logs/ 'archive/application.log.*.gz' --days=90 --level=ERROR
+    python analyze_logs.py --log-file=application.log --days=7 --no-index
 """
 
 import argparse
@@ -16,15 +25,26 @@ import os
 import sys
 import json
 import re
+import io
+import gzip
+import glob
 import datetime
+import functools
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import matplotlib.pyplot as plt
 
+try:
+    import zstandard  # zstandard 0.21.0+ (optional, reading zstd-compressed log files)
+except ImportError:
+    zstandard = None
+
 # Internal imports
 from ..config.logging_setup import get_logger
 from ..config.script_settings import SCRIPT_SETTINGS, MAINTENANCE_SETTINGS
 from ..config.path_constants import LOGS_DIR, ensure_dir_exists
+from .quantile_sketch import QuantileSketch
 
 # Initialize logger
 logger = get_logger('analyze_logs')
@@ -39,6 +59,26 @@ ERROR_PATTERNS = [
     r'error', r'exception', r'fail', r'timeout', r'unable to', r'invalid'
 ]
 
+# Every known error pattern in one regex, so a message is scanned once for all of them
+ERROR_PATTERN_REGEX = re.compile(
+    '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(ERROR_PATTERNS)), re.IGNORECASE
+)
+
+# Variable parts of error messages masked to build message templates
+MESSAGE_VARIABLE_PATTERN = re.compile(
+    r'(?P<uuid>\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b)'
+    r'|(?P<num>\b\d+(?:\.\d+)?\b)'
+    r'|(?P<id>\b[^\W\d]*\d\w*)',
+    re.IGNORECASE
+)
+
+# Number of distinct messages whose template is cached
+TEMPLATE_CACHE_SIZE = 65536
+
+# Words never reported as error patterns
+ERROR_STOPWORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
+                   'in', 'on', 'at', 'to', 'for', 'with', 'by', 'of'}
+
 # Component name mapping patterns
 COMPONENT_PATTERNS = {
     r'transaction_retriever': r'TransactionRetriever',
@@ -49,6 +89,18 @@ COMPONENT_PATTERNS = {
     r'savings_automator': r'SavingsAutomator'
 }
 
+# Text log line format: TIMESTAMP - level: LEVEL - component: COMPONENT - correlation_id: ID - message: MESSAGE
+TEXT_LOG_PATTERN = re.compile(
+    r'(?P<timestamp>[\d\-T:\.Z]+) - level: (?P<level>\w+) - component: (?P<component>[^-]+) - correlation_id: (?P<correlation_id>[^-]*) - message: (?P<message>.*)'
+)
+
+# Suffixes of gzip- and zstd-compressed (rotated) log files
+GZIP_SUFFIX = '.gz'
+ZSTD_SUFFIX = '.zst'
+
+# Columns of the log DataFrame, in order
+LOG_COLUMNS = ['timestamp', 'level', 'component', 'message', 'correlation_id', 'context']
+
 # Patterns for extracting performance metrics from logs
 PERFORMANCE_METRICS = [
     r'execution time: (\d+\.?\d*)',
@@ -57,9 +109,56 @@ PERFORMANCE_METRICS = [
     r'response time: (\d+\.?\d*)'
 ]
 
+# Compiled performance metric patterns, and the pattern naming the measured operation
+PERFORMANCE_METRIC_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in PERFORMANCE_METRICS]
+OPERATION_PATTERN = re.compile(r'(completed|executed|processed|finished) (.+?) in', re.IGNORECASE)
+
+def parse_log_timestamp(timestamp_str):
+    """
+    Parse a log timestamp into a datetime object
+    
+    Args:
+        timestamp_str: Timestamp string (or an already parsed datetime)
+        
+    Returns:
+        Parsed datetime (the current time if the timestamp cannot be parsed)
+    """
+    if isinstance(timestamp_str, datetime.datetime):
+        return timestamp_str
+    
+    if not timestamp_str:
+        return datetime.datetime.now()
+    
+    try:
+        # Try parsing ISO format
+        return datetime.datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        try:
+            # Try common log formats
+            formats = [
+                '%Y-%m-%d %H:%M:%S,%f',
+                '%Y-%m-%d %H:%M:%S.%f',
+                '%Y-%m-%dT%H:%M:%S.%fZ',
+                '%d/%b/%Y:%H:%M:%S %z'
+            ]
+            
+            for fmt in formats:
+                try:
+                    return datetime.datetime.strptime(timestamp_str, fmt)
+                except ValueError:
+                    continue
+                    
+            # If all formats fail, use current time
+            return datetime.datetime.now()
+        except Exception:
+            return datetime.datetime.now()
+
 class LogEntry:
     """Class representing a structured log entry"""
     
+    # Slots keep the per-entry memory small when months of logs are loaded
+    __slots__ = ('timestamp', 'level', 'component', 'message', 'correlation_id', 'context')
+    
     def __init__(self, log_data):
         """
         Initialize a log entry from raw data
@@ -77,32 +176,7 @@ class LogEntry:
         
     def _parse_timestamp(self, timestamp_str):
         """Parse timestamp string into datetime object"""
-        if not timestamp_str:
-            return datetime.datetime.now()
-        
-        try:
-            # Try parsing ISO format
-            return datetime.datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            try:
-                # Try common log formats
-                formats = [
-                    '%Y-%m-%d %H:%M:%S,%f',
-                    '%Y-%m-%d %H:%M:%S.%f',
-                    '%Y-%m-%dT%H:%M:%S.%fZ',
-                    '%d/%b/%Y:%H:%M:%S %z'
-                ]
-                
-                for fmt in formats:
-                    try:
-                        return datetime.datetime.strptime(timestamp_str, fmt)
-                    except ValueError:
-                        continue
-                        
-                # If all formats fail, use current time
-                return datetime.datetime.now()
-            except Exception:
-                return datetime.datetime.now()
+        return parse_log_timestamp(timestamp_str)
     
     def to_dict(self):
         """
@@ -149,6 +223,58 @@ class LogEntry:
         except Exception:
             return False
 
+class LogFilter:
+    """Filters applied to raw log records while streaming, before LogEntry objects are created"""
+    
+    def __init__(self, days=None, level=None, component=None, pattern=None):
+        """
+        Initialize the log filter
+        
+        Args:
+            days: Number of days to include from today
+            level: Log level to keep
+            component: Component name to keep (records whose component contains it)
+            pattern: Regex pattern the message must match
+        """
+        self.cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days) if days is not None else None
+        self.level = level.upper() if level else None
+        self.component = component.lower() if component else None
+        self.pattern = None
+        if pattern:
+            try:
+                self.pattern = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                logger.error(f"Invalid regex pattern '{pattern}': {e}")
+    
+    def matches(self, log_data):
+        """
+        Check if a raw log record passes the filters, parsing its timestamp in place
+        
+        Args:
+            log_data: Dictionary parsed from a log line
+            
+        Returns:
+            True if the record should be kept, False otherwise
+        """
+        # Cheap string checks first, the timestamp is only parsed for candidate records
+        if self.level and str(log_data.get('level', 'INFO')).upper() != self.level:
+            return False
+        if self.component and self.component not in str(log_data.get('component', 'unknown')).lower():
+            return False
+        if self.pattern and not self.pattern.search(str(log_data.get('message', ''))):
+            return False
+        
+        if self.cutoff_date is not None:
+            timestamp = parse_log_timestamp(log_data.get('timestamp', ''))
+            log_data['timestamp'] = timestamp
+            if timestamp.tzinfo is not None:
+                # Compare timezone-aware timestamps in local time
+                timestamp = timestamp.astimezone().replace(tzinfo=None)
+            if timestamp < self.cutoff_date:
+                return False
+        
+        return True
+
 class ErrorPattern:
     """Class representing an error pattern found in logs"""
     
@@ -181,6 +307,23 @@ class ErrorPattern:
         if log_entry.component not in self.components:
             self.components.append(log_entry.component)
     
+    def merge(self, other):
+        """
+        Add all occurrences of another error pattern
+        
+        Args:
+            other: ErrorPattern instance
+        """
+        self.count += other.count
+        
+        for example in other.examples:
+            if len(self.examples) < 5 and example not in self.examples:
+                self.examples.append(example)
+        
+        for component in other.components:
+            if component not in self.components:
+                self.components.append(component)
+    
     def to_dict(self):
         """
         Convert error pattern to dictionary
@@ -198,41 +341,96 @@ class ErrorPattern:
 class LogAnalyzer:
     """Class that handles log loading, filtering, and analysis"""
     
-    def __init__(self, log_file):
+    def __init__(self, log_file, workers=None, use_index=None):
         """
         Initialize the log analyzer with log file path
         
         Args:
-            log_file: Path to log file
+            log_file: Path to log file, or a list of files, directories and glob patterns
+            workers: Maximum worker processes reading files in parallel (defaults to the CPU count)
+            use_index: Whether to query the persistent log index (defaults to using it when available)
         """
         self.log_file = log_file
+        self.workers = workers
+        self.use_index = use_index
         self.logs = []
         self.logs_df = None
         self._analysis_results = None
     
-    def load_logs(self):
+    def load_logs(self, days=None, level=None, component=None, pattern=None):
         """
-        Load logs from file
+        Load logs from file, keeping only the entries that pass the given filters
         
+        Args:
+            days: Number of days to include from today
+            level: Log level to filter by
+            component: Component name to filter by
+            pattern: Regex pattern to filter by
+            
         Returns:
             List of parsed log entries
         """
-        self.logs = load_log_file(self.log_file)
-        self._update_dataframe()
+        self.logs = None
+        if self._should_use_index():
+            self.logs = self._load_indexed_logs(days, level, component, pattern)
+        
+        if self.logs is None:
+            log_filter = None
+            if any(value is not None for value in (days, level, component, pattern)):
+                log_filter = LogFilter(days=days, level=level, component=component, pattern=pattern)
+            
+            self.logs = load_log_files(self.log_file, log_filter, workers=self.workers)
+        
+        # Streaming keeps every component containing the name; prefer exact matches
+        if component:
+            self.logs = filter_logs_by_component(self.logs, component)
+        
+        # The DataFrame is built once, when it is first needed
+        self.logs_df = None
         return self.logs
     
+    def _should_use_index(self):
+        """
+        Check whether logs should be loaded through the persistent log index
+        
+        Returns:
+            True if the index was requested, or is enabled and available
+        """
+        # Imported here because log_index builds on this module
+        from .log_index import is_log_index_available
+        return self.use_index if self.use_index is not None else is_log_index_available()
+    
+    def _load_indexed_logs(self, days, level, component, pattern):
+        """
+        Index the new lines of the log files and query the index
+        
+        Args:
+            days: Number of days to include from today
+            level: Log level to filter by
+            component: Component name to filter by
+            pattern: Regex pattern to filter by
+            
+        Returns:
+            List of log entries, or None if the index could not be used
+        """
+        from .log_index import LogIndex, to_log_entries
+        try:
+            index = LogIndex()
+            sources = index.update(self.log_file)
+            df = index.query(days=days, level=level, component=component, pattern=pattern, sources=sources)
+        except Exception as e:
+            logger.warning(f"Log index unavailable, reading log files directly: {e}")
+            return None
+        return to_log_entries(df)
+    
     def _update_dataframe(self):
         """Convert logs to DataFrame for analysis"""
-        if not self.logs:
-            self.logs_df = pd.DataFrame(columns=['timestamp', 'level', 'component', 'message'])
-            return
-            
-        # Convert logs to DataFrame
-        data = [log.to_dict() for log in self.logs]
-        self.logs_df = pd.DataFrame(data)
+        # Build the DataFrame column by column instead of from one dictionary per entry
+        columns = {column: [getattr(log, column) for log in self.logs] for column in LOG_COLUMNS}
+        self.logs_df = pd.DataFrame(columns, columns=LOG_COLUMNS)
         
         # Ensure timestamp column is datetime
-        if 'timestamp' in self.logs_df.columns:
+        if self.logs:
             self.logs_df['timestamp'] = pd.to_datetime(self.logs_df['timestamp'])
     
     def filter_logs(self, days=None, level=None, component=None, pattern=None):
@@ -269,9 +467,9 @@ class LogAnalyzer:
         if pattern:
             filtered_logs = filter_logs_by_pattern(filtered_logs, pattern)
         
-        # Update logs and DataFrame
+        # Update logs; the DataFrame is rebuilt when it is next needed
         self.logs = filtered_logs
-        self._update_dataframe()
+        self.logs_df = None
         
         return filtered_logs
     
@@ -291,7 +489,9 @@ class LogAnalyzer:
         # Perform various analyses
         level_counts = count_logs_by_level(self.logs)
         component_counts = count_logs_by_component(self.logs)
-        error_patterns = extract_error_patterns(self.logs)
+        error_clusters = cluster_error_messages(self.logs)
+        error_patterns = extract_error_patterns(self.logs, error_clusters)
+        error_templates = extract_error_templates(self.logs, error_clusters)
         performance_metrics = extract_performance_metrics(self.logs)
         trend_analysis = analyze_log_trends(self.logs)
         performance_analysis = analyze_performance_metrics(self.logs)
@@ -306,6 +506,7 @@ class LogAnalyzer:
             'level_distribution': level_counts,
             'component_distribution': component_counts,
             'error_patterns': error_patterns,
+            'error_templates': error_templates,
             'performance_metrics': performance_metrics,
             'trend_analysis': trend_analysis,
             'performance_analysis': performance_analysis,
@@ -365,6 +566,13 @@ class LogAnalyzer:
                     summary.append(f"    Example: {pattern['examples'][0]}")
             summary.append("\n")
         
+        # Add most common error messages
+        if results.get('error_templates'):
+            summary.append("TOP ERROR MESSAGES:")
+            for template in results['error_templates'][:5]:
+                summary.append(f"  {template['count']}x {template['template']}")
+            summary.append("\n")
+        
         # Add performance highlights
         if results['performance_analysis'].get('slowest_operations'):
             summary.append("PERFORMANCE HIGHLIGHTS:")
@@ -421,8 +629,21 @@ def parse_arguments(args=None):
     
     parser.add_argument(
         '--log-file',
-        default=DEFAULT_LOG_FILE,
-        help=f'Path to the log file (default: {DEFAULT_LOG_FILE})'
+        nargs='+',
+        default=[DEFAULT_LOG_FILE],
+        help=f'Log files, directories or glob patterns; plain, gzip- or zstd-compressed (default: {DEFAULT_LOG_FILE})'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Maximum worker processes reading log files in parallel (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Read the log files directly instead of through the persistent log index'
     )
     
     parser.add_argument(
@@ -475,12 +696,111 @@ def parse_arguments(args=None):
     
     return parser.parse_args(args)
 
-def load_log_file(log_file):
+def resolve_log_files(log_paths):
     """
-    Load and parse log file into structured format
+    Expand log paths into the list of log files to read
+    
+    Args:
+        log_paths: Path, or list of paths, to log files, directories (every file with
+            '.log' in its name, including rotated and gzip-compressed ones) or glob patterns
+        
+    Returns:
+        List of log file paths
+    """
+    if isinstance(log_paths, str):
+        log_paths = [log_paths]
+    
+    log_files = []
+    for path in log_paths:
+        if os.path.isdir(path):
+            log_files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if '.log' in name and os.path.isfile(os.path.join(path, name))
+            ))
+        elif any(char in path for char in '*?['):
+            log_files.extend(sorted(glob.glob(path)))
+        else:
+            log_files.append(path)
+    return log_files
+
+def open_log_file(log_file, binary=False):
+    """
+    Open a plain, gzip- or zstd-compressed log file for reading
     
     Args:
         log_file: Path to log file
+        binary: Whether to read bytes instead of text
+        
+    Returns:
+        Text (or binary) file object
+    """
+    if log_file.endswith(GZIP_SUFFIX):
+        f = gzip.open(log_file, 'rb')
+    elif log_file.endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {log_file}")
+        f = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(log_file, 'rb'), closefd=True))
+    else:
+        f = open(log_file, 'rb')
+    return f if binary else io.TextIOWrapper(f, encoding='utf-8', errors='replace')
+
+def parse_log_line(line):
+    """
+    Parse a JSON or text log line into a log record
+    
+    Args:
+        line: Line read from a log file
+        
+    Returns:
+        Dictionary of log fields, or None if the line holds no log record
+    """
+    line = line.strip()
+    if not line:
+        return None
+    
+    # Parse JSON logs
+    if line.startswith('{'):
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON log line: {line[:100]}...")
+            return None
+    
+    # Parse text logs using regex
+    match = TEXT_LOG_PATTERN.search(line)
+    if match:
+        return match.groupdict()
+    
+    # Fallback: try to extract basic info
+    parts = line.split(' - ')
+    if len(parts) < 3:
+        return None
+    
+    log_data = {
+        'timestamp': parts[0],
+        'level': 'INFO', 
+        'component': 'unknown',
+        'message': line
+    }
+    
+    # Try to extract level and component
+    for part in parts[1:]:
+        if part.startswith('level:'):
+            log_data['level'] = part.split(':', 1)[1].strip()
+        elif part.startswith('component:'):
+            log_data['component'] = part.split(':', 1)[1].strip()
+        elif part.startswith('message:'):
+            log_data['message'] = part.split(':', 1)[1].strip()
+    
+    return log_data
+
+def load_log_file(log_file, log_filter=None):
+    """
+    Load and parse log file into structured format, streaming it line by line
+    
+    Args:
+        log_file: Path to plain or gzip-compressed log file
+        log_filter: Optional LogFilter applied before log entries are created
         
     Returns:
         List of LogEntry objects
@@ -490,76 +810,55 @@ def load_log_file(log_file):
         return []
     
     log_entries = []
+    record_count = 0
     
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-            
-        # Determine if logs are in JSON format
-        is_json = False
-        try:
-            # Check if the first non-empty line is valid JSON
-            for line in lines:
-                if line.strip():
-                    json.loads(line.strip())
-                    is_json = True
-                    break
-        except json.JSONDecodeError:
-            is_json = False
-            
-        # Parse logs based on format
-        if is_json:
-            # Parse JSON logs
-            for line in lines:
-                if not line.strip():
+        with open_log_file(log_file) as f:
+            for line in f:
+                log_data = parse_log_line(line)
+                if log_data is None:
                     continue
-                    
-                try:
-                    log_data = json.loads(line.strip())
-                    log_entries.append(LogEntry(log_data))
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON log line: {line[:100]}...")
-        else:
-            # Parse text logs using regex
-            # Example pattern for common log format: TIMESTAMP - LEVEL - COMPONENT - MESSAGE
-            pattern = r'(?P<timestamp>[\d\-T:\.Z]+) - level: (?P<level>\w+) - component: (?P<component>[^-]+) - correlation_id: (?P<correlation_id>[^-]*) - message: (?P<message>.*)'
-            for line in lines:
-                if not line.strip():
-                    continue
-                    
-                match = re.search(pattern, line)
-                if match:
-                    log_data = match.groupdict()
+                
+                record_count += 1
+                if log_filter is None or log_filter.matches(log_data):
                     log_entries.append(LogEntry(log_data))
-                else:
-                    # Fallback: try to extract basic info
-                    parts = line.split(' - ')
-                    if len(parts) >= 3:
-                        log_data = {
-                            'timestamp': parts[0],
-                            'level': 'INFO', 
-                            'component': 'unknown',
-                            'message': line
-                        }
-                        
-                        # Try to extract level and component
-                        for part in parts[1:]:
-                            if part.startswith('level:'):
-                                log_data['level'] = part.split(':', 1)[1].strip()
-                            elif part.startswith('component:'):
-                                log_data['component'] = part.split(':', 1)[1].strip()
-                            elif part.startswith('message:'):
-                                log_data['message'] = part.split(':', 1)[1].strip()
-                                
-                        log_entries.append(LogEntry(log_data))
-        
-        logger.info(f"Loaded {len(log_entries)} log entries from {log_file}")
+        
+        logger.info(f"Loaded {len(log_entries)} of {record_count} log entries from {log_file}")
         return log_entries
     
     except Exception as e:
         logger.error(f"Error loading log file {log_file}: {e}")
         return []
 
+def load_log_files(log_paths, log_filter=None, workers=None):
+    """
+    Load several log files, reading them in parallel worker processes
+    
+    Args:
+        log_paths: Path, or list of paths, to log files, directories or glob patterns
+        log_filter: Optional LogFilter applied before log entries are created
+        workers: Maximum worker processes (defaults to the CPU count)
+        
+    Returns:
+        List of LogEntry objects from every file, in file order
+    """
+    log_files = resolve_log_files(log_paths)
+    if not log_files:
+        logger.error(f"No log files found in {log_paths}")
+        return []
+    
+    workers = min(len(log_files), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        results = [load_log_file(log_file, log_filter) for log_file in log_files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(load_log_file, log_files, [log_filter] * len(log_files)))
+    
+    log_entries = [entry for entries in results for entry in entries]
+    if len(log_files) > 1:
+        logger.info(f"Loaded {len(log_entries)} log entries from {len(log_files)} files")
+    return log_entries
+
 def filter_logs_by_date(logs, days):
     """
     Filter logs by date range
@@ -678,12 +977,73 @@ def count_logs_by_component(logs):
     component_counts = Counter(log.component for log in logs)
     return dict(component_counts)
 
-def extract_error_patterns(logs):
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_message_template(message):
+    """
+    Mask the numbers and IDs of a message, so similar messages share a template
+    
+    Args:
+        message: Log message
+        
+    Returns:
+        Message template, e.g. 'Request <ID> failed after <NUM> seconds'
+    """
+    return MESSAGE_VARIABLE_PATTERN.sub(lambda match: '<NUM>' if match.lastgroup == 'num' else '<ID>', message)
+
+def cluster_error_messages(logs):
+    """
+    Group error and critical logs by message template in a single pass
+    
+    Args:
+        logs: List of LogEntry objects
+        
+    Returns:
+        Dictionary mapping message templates to ErrorPattern objects, in order of first occurrence
+    """
+    clusters = {}
+    for log in logs:
+        if log.level not in ('ERROR', 'CRITICAL'):
+            continue
+        template = get_message_template(log.message)
+        cluster = clusters.get(template)
+        if cluster is None:
+            cluster = clusters[template] = ErrorPattern(template)
+        cluster.add_occurrence(log)
+    return clusters
+
+def extract_error_templates(logs, clusters=None):
+    """
+    Extract the most common error message templates from logs
+    
+    Args:
+        logs: List of LogEntry objects
+        clusters: Result of cluster_error_messages for the logs, computed if not provided
+        
+    Returns:
+        List of dictionaries with template, count, examples and components, most common first
+    """
+    if clusters is None:
+        clusters = cluster_error_messages(logs)
+    
+    result = [
+        {'template': cluster.pattern, 'count': cluster.count, 'examples': cluster.examples, 'components': cluster.components}
+        for cluster in clusters.values()
+    ]
+    result.sort(key=lambda x: x['count'], reverse=True)
+    
+    return result[:20]
+
+def extract_error_patterns(logs, clusters=None):
     """
     Extract common error patterns from logs
     
+    Error logs are grouped by message template once; known patterns and common words are
+    then matched against each template instead of rescanning every log. Known patterns
+    should therefore not rely on the numbers or IDs masked out of the templates.
+    
     Args:
         logs: List of LogEntry objects
+        clusters: Result of cluster_error_messages for the logs, computed if not provided
         
     Returns:
         List of dictionaries with error pattern information
@@ -691,39 +1051,37 @@ def extract_error_patterns(logs):
     if not logs:
         return []
     
-    # Filter to error and critical logs
-    error_logs = [log for log in logs if log.level in ('ERROR', 'CRITICAL')]
-    if not error_logs:
+    if clusters is None:
+        clusters = cluster_error_messages(logs)
+    if not clusters:
         return []
     
     # Track error patterns
     patterns = {}
-    
-    # First pass: extract errors matching known patterns
-    for pattern in ERROR_PATTERNS:
-        for log in error_logs:
-            if log.matches_pattern(pattern):
-                if pattern not in patterns:
-                    patterns[pattern] = ErrorPattern(pattern)
-                patterns[pattern].add_occurrence(log)
-    
-    # Second pass: look for other common words in error messages
-    if len(error_logs) > 10:
-        # Extract words from error messages
-        all_words = []
-        for log in error_logs:
-            words = re.findall(r'\b\w+\b', log.message.lower())
-            all_words.extend(words)
-        
-        # Count word frequency
-        word_counts = Counter(all_words)
-        
-        # Find common words not in stopwords
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'was', 'were', 
-                    'in', 'on', 'at', 'to', 'for', 'with', 'by', 'of'}
-        
+    word_counts = Counter()
+    word_clusters = defaultdict(list)
+    
+    for template, cluster in clusters.items():
+        # Known patterns: one scan of the template with the combined regex
+        matched = {match.lastgroup for match in ERROR_PATTERN_REGEX.finditer(template)}
+        for group in sorted(matched, key=lambda name: int(name[1:])):
+            pattern = ERROR_PATTERNS[int(group[1:])]
+            if pattern not in patterns:
+                patterns[pattern] = ErrorPattern(pattern)
+            patterns[pattern].merge(cluster)
+        
+        # Common words: count every occurrence, weighted by the logs sharing the template
+        words = re.findall(r'\b\w+\b', template.lower())
+        for word in words:
+            word_counts[word] += cluster.count
+        for word in set(words):
+            word_clusters[word].append(cluster)
+    
+    # Look for other common words in error messages
+    error_count = sum(cluster.count for cluster in clusters.values())
+    if error_count > 10:
         for word, count in word_counts.most_common(20):
-            if count >= 3 and word not in stopwords and len(word) > 3:
+            if count >= 3 and word not in ERROR_STOPWORDS and len(word) > 3:
                 pattern = r'\b' + re.escape(word) + r'\b'
                 
                 # Skip if we already have this pattern
@@ -731,16 +1089,10 @@ def extract_error_patterns(logs):
                     continue
                 
                 # Check if this word appears in multiple error messages
-                matches = 0
-                for log in error_logs:
-                    if re.search(pattern, log.message, re.IGNORECASE):
-                        matches += 1
-                
-                if matches >= 3:
+                if sum(cluster.count for cluster in word_clusters[word]) >= 3:
                     patterns[pattern] = ErrorPattern(pattern)
-                    for log in error_logs:
-                        if re.search(pattern, log.message, re.IGNORECASE):
-                            patterns[pattern].add_occurrence(log)
+                    for cluster in word_clusters[word]:
+                        patterns[pattern].merge(cluster)
     
     # Convert patterns to list of dictionaries and sort by count
     result = [pattern.to_dict() for pattern in patterns.values()]
@@ -748,34 +1100,29 @@ def extract_error_patterns(logs):
     
     return result
 
-def extract_performance_metrics(logs):
+def extract_performance_sketches(logs):
     """
-    Extract performance metrics from logs
+    Extract performance timings from logs into quantile sketches, in a single pass
     
     Args:
         logs: List of LogEntry objects
         
     Returns:
-        Dictionary with performance metrics by component and operation
+        Dictionary mapping components to operations to QuantileSketch objects
     """
-    if not logs:
-        return {}
-    
-    metrics = defaultdict(lambda: defaultdict(list))
+    sketches = defaultdict(dict)
     
     # Search for performance metrics in log messages
     for log in logs:
-        component = log.component
-        
-        for pattern in PERFORMANCE_METRICS:
-            matches = re.search(pattern, log.message, re.IGNORECASE)
+        for regex in PERFORMANCE_METRIC_REGEXES:
+            matches = regex.search(log.message)
             if matches:
                 try:
                     # Extract timing value
                     time_value = float(matches.group(1))
                     
                     # Try to extract operation name from message
-                    operation_match = re.search(r'(completed|executed|processed|finished) (.+?) in', log.message, re.IGNORECASE)
+                    operation_match = OPERATION_PATTERN.search(log.message)
                     if operation_match:
                         operation = operation_match.group(2).strip()
                     else:
@@ -785,28 +1132,33 @@ def extract_performance_metrics(logs):
                             operation = 'operation'
                     
                     # Store metric
-                    metrics[component][operation].append(time_value)
+                    operations = sketches[log.component]
+                    if operation not in operations:
+                        operations[operation] = QuantileSketch()
+                    operations[operation].add(time_value)
                 except (ValueError, IndexError):
                     continue
     
-    # Calculate statistics for each metric
-    result = {}
-    for component, operations in metrics.items():
-        component_metrics = {}
-        for operation, values in operations.items():
-            if values:
-                component_metrics[operation] = {
-                    'min': min(values),
-                    'max': max(values),
-                    'avg': sum(values) / len(values),
-                    'median': sorted(values)[len(values) // 2],
-                    'count': len(values)
-                }
-        
-        if component_metrics:
-            result[component] = component_metrics
+    return dict(sketches)
+
+def extract_performance_metrics(logs):
+    """
+    Extract performance metrics from logs
     
-    return result
+    Args:
+        logs: List of LogEntry objects
+        
+    Returns:
+        Dictionary with performance metrics (min, max, avg, median, p95, p99, count) by
+        component and operation
+    """
+    if not logs:
+        return {}
+    
+    return {
+        component: {operation: sketch.summary() for operation, sketch in operations.items()}
+        for component, operations in extract_performance_sketches(logs).items()
+    }
 
 def analyze_log_trends(logs):
     """
@@ -1293,6 +1645,19 @@ def generate_log_report(analysis_results, output_format, output_dir, visualizati
             
             html_content.append('  </table>')
         
+        # Add error message templates
+        if analysis_results.get('error_templates'):
+            html_content.append('  <h2>Error Messages</h2>')
+            html_content.append('  <table>')
+            html_content.append('    <tr><th>Message</th><th>Count</th><th>Components</th></tr>')
+            
+            for template in analysis_results['error_templates']:
+                components = ', '.join(template['components']) if template['components'] else 'N/A'
+                message = template['template'].replace('<', '&lt;').replace('>', '&gt;')
+                html_content.append(f'    <tr><td>{message}</td><td>{template["count"]}</td><td>{components}</td></tr>')
+            
+            html_content.append('  </table>')
+        
         # Add performance analysis
         if 'performance_analysis' in analysis_results:
             perf = analysis_results['performance_analysis']
@@ -1442,6 +1807,20 @@ def generate_log_report(analysis_results, output_format, output_dir, visualizati
             
             md_content.append('')
         
+        # Add error message templates
+        if analysis_results.get('error_templates'):
+            md_content.append('## Error Messages')
+            md_content.append('')
+            md_content.append('| Message | Count | Components |')
+            md_content.append('| --- | --- | --- |')
+            
+            for template in analysis_results['error_templates']:
+                components = ', '.join(template['components']) if template['components'] else 'N/A'
+                message = template['template'].replace('|', '\\|')
+                md_content.append(f'| {message} | {template["count"]} | {components} |')
+            
+            md_content.append('')
+        
         # Add performance analysis
         if 'performance_analysis' in analysis_results:
             perf = analysis_results['performance_analysis']
@@ -1503,6 +1882,27 @@ def generate_log_report(analysis_results, output_format, output_dir, visualizati
     logger.info(f"Generated {output_format} report at {filepath}")
     return filepath
 
+def analyze_logs(log_file=DEFAULT_LOG_FILE, days=DEFAULT_DAYS, level=None, component=None, pattern=None, workers=None,
+                 use_index=None):
+    """
+    Load and analyze logs in one call
+    
+    Args:
+        log_file: Path, or list of paths, to log files, directories or glob patterns
+        days: Number of days of logs to analyze
+        level: Log level to filter by
+        component: Component name to filter by
+        pattern: Regex pattern to filter by
+        workers: Maximum worker processes reading log files in parallel
+        use_index: Whether to query the persistent log index (defaults to using it when available)
+        
+    Returns:
+        Dictionary containing analysis results
+    """
+    analyzer = LogAnalyzer(log_file, workers=workers, use_index=use_index)
+    analyzer.load_logs(days=days, level=level, component=component, pattern=pattern)
+    return analyzer.analyze()
+
 def main():
     """
     Main function that orchestrates log analysis
@@ -1518,18 +1918,10 @@ def main():
         logger.info(f"Starting log analysis for {args.log_file}")
         
         # Create log analyzer
-        analyzer = LogAnalyzer(args.log_file)
-        
-        # Load logs
-        logs = analyzer.load_logs()
-        if not logs:
-            logger.error(f"No logs found in {args.log_file}")
-            return 1
-        
-        logger.info(f"Loaded {len(logs)} log entries")
+        analyzer = LogAnalyzer(args.log_file, workers=args.workers, use_index=False if args.no_index else None)
         
-        # Apply filters
-        filtered_logs = analyzer.filter_logs(
+        # Load logs, applying the filters while the files are streamed
+        filtered_logs = analyzer.load_logs(
             days=args.days,
             level=args.level,
             component=args.component,
@@ -1539,7 +1931,7 @@ def main():
         logger.info(f"After filtering: {len(filtered_logs)} log entries")
         
         if not filtered_logs:
-            logger.warning("No logs remain after filtering")
+            logger.warning(f"No logs found in {args.log_file} after filtering")
             return 1
         
         # Perform analysis
@@ -5,6 +5,11 @@ Job Status Checker for Budget Management Application
 This script checks the status of the Cloud Run job for the Budget Management Application,
 retrieves execution history, analyzes metrics, and reports on failures or performance issues.
 
+Execution details are fetched concurrently by a bounded thread pool. Executions that have
+finished never change, so their details are cached on disk and each check only fetches
+the executions that are new or still running:
+    <JOB_STATUS_CACHE_DIR>/<project>_<region>_<job>.json
+
 Usage:
     python check_job_status.py --project-id=your-project-id --job-name=budget-management-job
 """
@@ -14,7 +19,10 @@ import os
 import sys
 import json
 import datetime
+import functools
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Union, Any
 
 from google.cloud import run_v2
@@ -22,8 +30,9 @@ import google.auth
 
 # Internal imports
 from ..config.logging_setup import get_logger, LoggingContext
-from ..config.script_settings import SCRIPT_SETTINGS, MAINTENANCE_SETTINGS
-from ../../backend.api_clients.gmail_client import GmailClient
+from ..config.script_settings import SCRIPT_SETTINGS, MAINTENANCE_SETTINGS, JOB_STATUS_SETTINGS
+from ..config.path_constants import ensure_dir_exists
+from ...backend.api_clients.gmail_client import GmailClient
 from .analyze_logs import LogAnalyzer
 
 # Initialize logger
@@ -37,11 +46,122 @@ DEFAULT_DAYS = 7
 DEFAULT_OUTPUT_FORMAT = 'json'
 DEFAULT_OUTPUT_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'logs', 'job_status_report.json')
 
+# Execution states that never change again
+FINAL_EXECUTION_STATES = ['SUCCEEDED', 'FAILED', 'CANCELLED']
+
+
+def is_execution_final(execution: Dict[str, Any]) -> bool:
+    """
+    Check whether an execution has finished, so its details can be cached
+    
+    Args:
+        execution: Execution details dictionary
+        
+    Returns:
+        True if the execution is in a final state
+    """
+    return execution.get('status') in FINAL_EXECUTION_STATES
+
+
+class ExecutionCache:
+    """File-backed cache of the details of finished executions of one job"""
+    
+    def __init__(self, path: str, retention_days: Optional[int] = None):
+        """
+        Initialize the execution cache
+        
+        Args:
+            path: Cache file
+            retention_days: Days finished executions are kept, defaults to
+                JOB_STATUS_SETTINGS['CACHE_RETENTION_DAYS']
+        """
+        self.path = path
+        self.retention_days = retention_days if retention_days is not None else JOB_STATUS_SETTINGS['CACHE_RETENTION_DAYS']
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_job(cls, project_id: str, job_name: str, region: str,
+                directory: Optional[str] = None) -> 'ExecutionCache':
+        """
+        Create the cache of a job
+        
+        Args:
+            project_id: Google Cloud project ID
+            job_name: Name of the Cloud Run job
+            region: Region where the job is deployed
+            directory: Cache directory, defaults to JOB_STATUS_SETTINGS['CACHE_DIR']
+            
+        Returns:
+            Execution cache stored in <directory>/<project>_<region>_<job>.json
+        """
+        directory = directory or JOB_STATUS_SETTINGS['CACHE_DIR']
+        return cls(os.path.join(directory, f"{project_id}_{region}_{job_name}.json"))
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the cached executions on first use
+        
+        Returns:
+            Execution details by execution ID
+        """
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable execution cache {self.path}: {e}")
+        return self._entries
+    
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached details of an execution
+        
+        Args:
+            execution_id: ID of the execution
+            
+        Returns:
+            Execution details, or None if the execution is not cached
+        """
+        with self._lock:
+            return self._load().get(execution_id)
+    
+    def put(self, executions: List[Dict[str, Any]]) -> None:
+        """
+        Cache the details of finished executions and drop the ones past the retention period
+        
+        Args:
+            executions: Execution details; executions that have not finished are ignored
+        """
+        final = {execution['execution_id']: execution for execution in executions if is_execution_final(execution)}
+        if not final:
+            return
+        
+        with self._lock:
+            entries = self._load()
+            entries.update(final)
+            
+            cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=self.retention_days)).isoformat()
+            for execution_id in [key for key, value in entries.items() if (value.get('start_time') or cutoff) < cutoff]:
+                del entries[execution_id]
+            
+            try:
+                ensure_dir_exists(os.path.dirname(self.path))
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write execution cache {self.path}: {e}")
+
 
 class JobStatusChecker:
     """Class that handles Cloud Run job status checking operations"""
     
-    def __init__(self, project_id: str, job_name: str, region: str):
+    def __init__(self, project_id: str, job_name: str, region: str, client=None,
+                 cache: Optional[ExecutionCache] = None, max_workers: Optional[int] = None):
         """
         Initialize the job status checker with project and job details
         
@@ -49,14 +169,23 @@ class JobStatusChecker:
             project_id: Google Cloud project ID
             job_name: Name of the Cloud Run job
             region: Region where the job is deployed
+            client: Cloud Run Jobs client, defaults to run_v2.JobsClient()
+            cache: Cache of finished executions, defaults to the job's cache in
+                JOB_STATUS_SETTINGS['CACHE_DIR'] (None if JOB_STATUS_CACHE_ENABLED is false)
+            max_workers: Execution details fetched at the same time, defaults to
+                JOB_STATUS_SETTINGS['MAX_WORKERS']
         """
         self.project_id = project_id
         self.job_name = job_name
         self.region = region
+        self.max_workers = max_workers or JOB_STATUS_SETTINGS['MAX_WORKERS']
+        if cache is None and JOB_STATUS_SETTINGS['CACHE_ENABLED']:
+            cache = ExecutionCache.for_job(project_id, job_name, region)
+        self.cache = cache
         
         # Initialize Cloud Run Jobs client
         try:
-            self.client = run_v2.JobsClient()
+            self.client = client or run_v2.JobsClient()
             logger.info(f"Initialized JobStatusChecker for {job_name} in {project_id}")
             
             # Validate that job exists
@@ -190,8 +319,8 @@ class JobStatusChecker:
                     task_details = {
                         'index': task.index if hasattr(task, 'index') else None,
                         'status': task.status.state.name if hasattr(task, 'status') else None,
-                        'start_time': task.creation_timestamp.isoformat() if hasattr(task, 'creation_timestamp') else None,
-                        'end_time': task.completion_timestamp.isoformat() if hasattr(task, 'completion_timestamp') else None,
+                        'start_time': task.creation_timestamp.isoformat() if getattr(task, 'creation_timestamp', None) else None,
+                        'end_time': task.completion_timestamp.isoformat() if getattr(task, 'completion_timestamp', None) else None,
                         'error': None
                     }
                     
@@ -211,6 +340,56 @@ class JobStatusChecker:
             logger.error(f"Error retrieving execution details: {e}")
             return {'execution_id': execution_id, 'error': str(e)}
     
+    def get_executions_details(self, execution_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information about several executions, fetching only the uncached ones
+        
+        Args:
+            execution_ids: IDs of the executions to retrieve
+            
+        Returns:
+            Detailed execution information by execution ID
+        """
+        details = {}
+        missing = []
+        for execution_id in execution_ids:
+            cached = self.cache.get(execution_id) if self.cache is not None else None
+            if cached is not None:
+                details[execution_id] = cached
+            else:
+                missing.append(execution_id)
+        
+        if missing:
+            # The API calls wait on the network, so a bounded pool runs them side by side
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                fetched = list(executor.map(self.get_execution_details, missing))
+            details.update((execution_id, result) for execution_id, result in zip(missing, fetched))
+            if self.cache is not None:
+                self.cache.put(fetched)
+        
+        logger.info(f"Execution details: {len(execution_ids) - len(missing)} cached, {len(missing)} fetched")
+        return details
+    
+    def get_execution_history(self, days: int = 7, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get job execution history including the details and tasks of every execution
+        
+        Args:
+            days: Number of days of history to retrieve
+            limit: Maximum number of executions to retrieve
+            
+        Returns:
+            List of detailed job executions, in the order listed by the API
+        """
+        executions = self.get_executions(days=days, limit=limit)
+        details = self.get_executions_details([execution['execution_id'] for execution in executions])
+        
+        # Keep the listed summary when the details could not be retrieved
+        return [
+            details[execution['execution_id']] if 'status' in details.get(execution['execution_id'], {}) else execution
+            for execution in executions
+        ]
+    
     def analyze_executions(self, executions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Analyze job execution history
@@ -301,6 +480,12 @@ def parse_arguments():
         help=f'Output file path (default: {DEFAULT_OUTPUT_FILE})'
     )
     
+    parser.add_argument(
+        '--details',
+        action='store_true',
+        help='Include the details and tasks of every execution (finished executions are cached)'
+    )
+    
     parser.add_argument(
         '--email',
         action='store_true',
@@ -392,6 +577,32 @@ def get_job_executions(project_id: str, job_name: str, region: str, days: int) -
         return get_job_executions_cli(project_id, job_name, region, days)
 
 
+@functools.lru_cache(maxsize=8)
+def list_executions_cli(project_id: str, job_name: str, region: str, limit: int = 100) -> tuple:
+    """
+    List job executions with the gcloud CLI, once per process for the same job
+    
+    Args:
+        project_id: Google Cloud project ID
+        job_name: Name of the Cloud Run job
+        region: Region where the job is deployed
+        limit: Maximum number of executions to list
+        
+    Returns:
+        Executions as returned by gcloud (failed calls raise and are not cached)
+    """
+    command = [
+        'gcloud', 'run', 'jobs', 'executions', 'list',
+        f'--project={project_id}',
+        f'--region={region}',
+        f'--job={job_name}',
+        '--format=json',
+        f'--limit={limit}'
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return tuple(json.loads(result.stdout))
+
+
 def get_job_executions_cli(project_id: str, job_name: str, region: str, days: int) -> List[Dict[str, Any]]:
     """
     Fallback method to retrieve job execution history using gcloud CLI
@@ -406,21 +617,8 @@ def get_job_executions_cli(project_id: str, job_name: str, region: str, days: in
         List of job execution details
     """
     try:
-        # Construct gcloud command
-        command = [
-            'gcloud', 'run', 'jobs', 'executions', 'list',
-            f'--project={project_id}',
-            f'--region={region}',
-            f'--job={job_name}',
-            '--format=json',
-            '--limit=100'
-        ]
-        
-        # Execute command
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        
-        # Parse JSON output
-        executions = json.loads(result.stdout)
+        # Run gcloud (reusing its output if another fallback already listed this job)
+        executions = list_executions_cli(project_id, job_name, region)
         
         # Calculate start date based on days parameter
         start_time = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
@@ -871,7 +1069,7 @@ def send_alert_email(report: Dict[str, Any], recipient_email: str) -> bool:
         return False
     
     try:
-        from ../../backend.services.authentication_service import AuthenticationService
+        from ...backend.services.authentication_service import AuthenticationService
         
         # Prepare email content
         job_name = report['job_info']['name']
@@ -956,7 +1154,10 @@ def main():
             # Try to get executions using the client library
             with LoggingContext(logger, "retrieving job executions"):
                 job_checker = JobStatusChecker(args.project_id, args.job_name, args.region)
-                executions = job_checker.get_executions(days=args.days)
+                if args.details:
+                    executions = job_checker.get_execution_history(days=args.days)
+                else:
+                    executions = job_checker.get_executions(days=args.days)
                 
                 if not executions and job_checker.client:
                     # If client exists but no executions, try the CLI method
@@ -1012,8 +1213,7 @@ def main():
                 # Alternatively, use the LogAnalyzer if we have logs locally
                 log_analyzer = LogAnalyzer(os.path.join(os.path.dirname(args.output), 'application.log'))
                 if os.path.exists(log_analyzer.log_file):
-                    log_analyzer.load_logs()
-                    log_analyzer.filter_logs(days=args.days)
+                    log_analyzer.load_logs(days=args.days)
                     log_analysis = log_analyzer.analyze()
                     logger.info("Log analysis completed successfully")
         except Exception as e:
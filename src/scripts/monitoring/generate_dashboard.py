@@ -449,8 +449,7 @@ def get_performance_metrics(project_id, job_name, region):
         
         # Try to load and analyze logs
         try:
-            log_analyzer.load_logs()
-            log_analyzer.filter_logs(days=14)  # Filter to last 2 weeks
+            log_analyzer.load_logs(days=14)  # Filter to last 2 weeks
             log_analysis = log_analyzer.analyze()
             
             # Extract performance metrics from log analysis
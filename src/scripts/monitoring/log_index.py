@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Persistent columnar index of application logs
+
+analyze_logs.py, performance_report.py and debug_job.py used to re-parse every raw log
+file on each run. The log index converts log lines into Parquet files partitioned by
+day and component, remembering how far each source file was read, so every run only
+parses the lines written since the previous one and queries read only the partitions
+they need:
+
+    <LOG_INDEX_DIR>/
+        watermarks.json
+        day=2024-05-06/component=budget_analyzer/part-<uuid>.parquet
+
+Source files are identified by their first line rather than their path, so a log file
+that is rotated (application.log -> application.log.1 -> application.log.1.gz) is not
+indexed twice.
+
+Usage:
+    index = LogIndex()
+    sources = index.update(['logs/'])
+    errors = index.query(days=90, level='ERROR', sources=sources)
+"""
+
+import os
+import re
+import json
+import uuid
+import hashlib
+import itertools
+import datetime
+import pandas as pd
+
+try:
+    import pyarrow  # pyarrow 14.0.0+ (optional, required to read and write the index)
+except ImportError:
+    pyarrow = None
+
+# Internal imports
+from ..config.logging_setup import get_logger
+from ..config.script_settings import LOG_INDEX_SETTINGS
+from ..config.path_constants import ensure_dir_exists
+from .analyze_logs import LOG_COLUMNS, LogEntry, open_log_file, parse_log_line, resolve_log_files
+
+# Initialize logger
+logger = get_logger('log_index')
+
+# File holding the byte offset indexed in each source file
+WATERMARKS_FILE = 'watermarks.json'
+
+# Columns stored in the index: the log columns plus the source file they came from
+INDEX_COLUMNS = LOG_COLUMNS + ['source']
+
+
+def is_log_index_available():
+    """
+    Check whether the log index can be used
+    
+    Returns:
+        True if the index is enabled and pyarrow is installed
+    """
+    return LOG_INDEX_SETTINGS['ENABLED'] and pyarrow is not None
+
+
+def to_local_time(timestamp):
+    """
+    Convert a timestamp to naive local time, so timestamps of every log format compare
+    
+    Args:
+        timestamp: Naive or timezone-aware datetime
+        
+    Returns:
+        Naive datetime in local time
+    """
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+def partition_name(value):
+    """
+    Make a value safe to use as a partition directory name
+    
+    Args:
+        value: Partition value
+        
+    Returns:
+        Directory-safe string
+    """
+    return re.sub(r'[^\w.-]', '_', str(value)) or 'unknown'
+
+
+def skip_to_offset(f, first_line, offset):
+    """
+    Position a log file opened in binary mode at an offset, after its first line was read
+    
+    Args:
+        f: Binary file object
+        first_line: First line already read from the file
+        offset: Offset of the first line to read
+        
+    Returns:
+        Iterable of the lines from the offset
+    """
+    if f.seekable():
+        f.seek(offset)
+        return f
+    
+    # zstd streams cannot seek, so they are read forward up to the offset
+    if offset == 0:
+        return itertools.chain([first_line], f)
+    remaining = offset - len(first_line)
+    while remaining > 0:
+        chunk = f.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+    return f
+
+
+class LogIndex:
+    """Incremental Parquet index of log files, partitioned by day and component"""
+    
+    def __init__(self, index_dir=None):
+        """
+        Initialize the log index
+        
+        Args:
+            index_dir: Directory of the index, defaults to LOG_INDEX_SETTINGS['DIR']
+        """
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for the log index")
+        
+        self.index_dir = index_dir or LOG_INDEX_SETTINGS['DIR']
+        self.watermarks_path = os.path.join(self.index_dir, WATERMARKS_FILE)
+    
+    def _read_watermarks(self):
+        """
+        Read the indexed byte offset of each source file
+        
+        Returns:
+            Dictionary mapping source fingerprints to their watermark
+        """
+        if not os.path.exists(self.watermarks_path):
+            return {}
+        try:
+            with open(self.watermarks_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable log index watermarks {self.watermarks_path}: {e}")
+            return {}
+    
+    def _write_watermarks(self, watermarks):
+        """
+        Write the watermarks atomically
+        
+        Args:
+            watermarks: Dictionary mapping source fingerprints to their watermark
+        """
+        ensure_dir_exists(self.index_dir)
+        temp_path = f"{self.watermarks_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(temp_path, self.watermarks_path)
+    
+    def _write_entries(self, entries, source):
+        """
+        Append log entries to the index, one Parquet file per day and component
+        
+        Args:
+            entries: LogEntry objects read from a source file
+            source: Fingerprint of the source file
+        """
+        df = pd.DataFrame({column: [getattr(entry, column) for entry in entries] for column in LOG_COLUMNS})
+        df['timestamp'] = pd.to_datetime([to_local_time(timestamp) for timestamp in df['timestamp']])
+        df['context'] = [json.dumps(context, default=str) for context in df['context']]
+        df['correlation_id'] = df['correlation_id'].astype(str)
+        df['source'] = source
+        
+        days = df['timestamp'].dt.strftime('%Y-%m-%d')
+        for (day, component), partition in df.groupby([days, df['component']], sort=False):
+            partition_dir = os.path.join(self.index_dir, f"day={day}", f"component={partition_name(component)}")
+            ensure_dir_exists(partition_dir)
+            partition.to_parquet(os.path.join(partition_dir, f"part-{uuid.uuid4().hex}.parquet"), index=False)
+    
+    def update(self, log_paths):
+        """
+        Index the lines written to the log files since the last update
+        
+        Args:
+            log_paths: Path, or list of paths, to log files, directories or glob patterns
+            
+        Returns:
+            Fingerprints of the source files, to restrict queries to them
+        """
+        watermarks = self._read_watermarks()
+        sources = []
+        
+        for log_file in resolve_log_files(log_paths):
+            if not os.path.exists(log_file):
+                logger.error(f"Log file not found: {log_file}")
+                continue
+            
+            with open_log_file(log_file, binary=True) as f:
+                # A file is identified by its first complete line
+                first_line = f.readline()
+                if not first_line.endswith(b'\n'):
+                    continue
+                source = hashlib.sha256(first_line).hexdigest()
+                sources.append(source)
+                
+                # Read only the complete lines after the watermark
+                offset = watermarks.get(source, {}).get('offset', 0)
+                lines = skip_to_offset(f, first_line, offset)
+                entries = []
+                for line in lines:
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    log_data = parse_log_line(line.decode('utf-8', errors='replace'))
+                    if log_data is not None:
+                        entries.append(LogEntry(log_data))
+            
+            if entries:
+                self._write_entries(entries, source)
+                logger.info(f"Indexed {len(entries)} new log entries from {log_file}")
+            watermarks[source] = {'path': log_file, 'offset': offset}
+        
+        # Written after the entries: an interrupted update re-indexes lines rather than losing them
+        self._write_watermarks(watermarks)
+        return sources
+    
+    def _partition_files(self, days=None, component=None):
+        """
+        List the Parquet files of the partitions a query needs
+        
+        Args:
+            days: Number of days to include from today
+            component: Component name the records must contain
+            
+        Returns:
+            List of Parquet file paths
+        """
+        if not os.path.isdir(self.index_dir):
+            return []
+        
+        first_day = None
+        if days is not None:
+            first_day = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime('%Y-%m-%d')
+        component_name = partition_name(component).lower() if component else None
+        
+        files = []
+        for day_dir in sorted(os.listdir(self.index_dir)):
+            if not day_dir.startswith('day=') or (first_day and day_dir[len('day='):] < first_day):
+                continue
+            day_path = os.path.join(self.index_dir, day_dir)
+            for component_dir in sorted(os.listdir(day_path)):
+                if component_name and component_name not in component_dir.lower():
+                    continue
+                component_path = os.path.join(day_path, component_dir)
+                files.extend(
+                    os.path.join(component_path, name) for name in sorted(os.listdir(component_path))
+                    if name.endswith('.parquet')
+                )
+        return files
+    
+    def query(self, days=None, level=None, component=None, pattern=None, correlation_id=None, sources=None):
+        """
+        Query indexed log records, reading only the partitions that can match
+        
+        Args:
+            days: Number of days to include from today
+            level: Log level to filter by
+            component: Component name the records must contain
+            pattern: Regex pattern the message must match
+            correlation_id: Correlation ID to filter by
+            sources: Fingerprints of the source files to include (all if None)
+            
+        Returns:
+            DataFrame of matching records ordered by timestamp, with the context as a JSON string
+        """
+        files = self._partition_files(days, component)
+        if not files:
+            return pd.DataFrame(columns=INDEX_COLUMNS)
+        
+        df = pd.concat((pd.read_parquet(path, columns=INDEX_COLUMNS) for path in files), ignore_index=True)
+        
+        mask = pd.Series(True, index=df.index)
+        if days is not None:
+            mask &= df['timestamp'] >= datetime.datetime.now() - datetime.timedelta(days=days)
+        if level:
+            mask &= df['level'].str.upper() == level.upper()
+        if component:
+            mask &= df['component'].str.lower().str.contains(component.lower(), regex=False)
+        if pattern:
+            mask &= df['message'].str.contains(pattern, case=False, regex=True)
+        if correlation_id:
+            mask &= df['correlation_id'] == correlation_id
+        if sources is not None:
+            mask &= df['source'].isin(sources)
+        
+        return df[mask].sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def to_log_entries(df):
+    """
+    Convert indexed records into LogEntry objects
+    
+    Args:
+        df: DataFrame returned by LogIndex.query
+        
+    Returns:
+        List of LogEntry objects
+    """
+    return [
+        LogEntry({
+            'timestamp': timestamp.to_pydatetime(),
+            'level': level,
+            'component': component,
+            'message': message,
+            'correlation_id': correlation_id,
+            'context': json.loads(context) if context else {}
+        })
+        for timestamp, level, component, message, correlation_id, context in zip(
+            df['timestamp'], df['level'], df['component'], df['message'], df['correlation_id'], df['context']
+        )
+    ]
@@ -7,6 +7,10 @@ by analyzing execution metrics, API response times, and component performance. I
 from logs and Cloud Run job executions to provide insights on system efficiency and identify 
 potential bottlenecks.
 
+Timings are summarized by mergeable quantile sketches (quantile_sketch.py) in a single pass
+over the logs. Sketches of complete days are saved, so later reports merge them into
+weekly or monthly p50/p95/p99 and only read the logs of the days not saved yet.
+
 Usage:
     python performance_report.py --project-id=your-project-id --days=30 --visualize
 """
@@ -15,7 +19,9 @@ import argparse
 import os
 import sys
 import json
+import hashlib
 import datetime
+from collections import defaultdict
 from typing import Dict, List, Optional, Any, Union
 
 import pandas as pd
@@ -24,10 +30,11 @@ import seaborn as sns
 
 # Internal imports
 from ..config.logging_setup import get_logger
-from ..config.script_settings import SCRIPT_SETTINGS
+from ..config.script_settings import SCRIPT_SETTINGS, PERFORMANCE_SKETCH_SETTINGS
 from ..config.path_constants import LOGS_DIR, ensure_dir_exists
 from .check_job_status import JobStatusChecker
-from .analyze_logs import LogAnalyzer, extract_performance_metrics
+from .analyze_logs import LogAnalyzer, extract_performance_sketches
+from .quantile_sketch import QuantileSketch, SketchStore, merge_sketches
 
 # Initialize logger
 logger = get_logger('performance_report')
@@ -50,6 +57,9 @@ COMPONENT_NAMES = [
     'savings_automator'
 ]
 
+# External API services whose performance is reported
+API_SERVICES = ['Capital One', 'Google Sheets', 'Gemini', 'Gmail']
+
 # Performance thresholds for each component/operation in seconds
 PERFORMANCE_THRESHOLDS = {
     'job_execution': 300,  # 5 minutes total execution
@@ -65,7 +75,8 @@ PERFORMANCE_THRESHOLDS = {
 class PerformanceMetric:
     """Class representing a performance metric with statistics"""
     
-    def __init__(self, name: str, component: str, operation: str, values: List[float], threshold: float):
+    def __init__(self, name: str, component: str, operation: str, values: List[float], threshold: float,
+                 sketch: Optional[QuantileSketch] = None):
         """
         Initialize a performance metric
         
@@ -75,31 +86,26 @@ class PerformanceMetric:
             operation: Specific operation being measured
             values: List of measured values
             threshold: Performance threshold for this metric
+            sketch: Quantile sketch of the measured values, built from values if not provided
         """
         self.name = name
         self.component = component
         self.operation = operation
         self.values = values
         self.threshold = threshold
+        self.sketch = sketch or QuantileSketch.from_values(values)
         
         # Calculate statistics
-        if values:
-            self.min = min(values)
-            self.max = max(values)
-            self.avg = sum(values) / len(values)
-            
-            # Calculate median
-            sorted_values = sorted(values)
-            self.median = sorted_values[len(sorted_values) // 2]
-            
-            # Calculate 95th percentile if we have enough data
-            if len(values) >= 20:
-                self.p95 = sorted_values[int(len(sorted_values) * 0.95)]
-            else:
-                self.p95 = None
-        else:
-            self.min = self.max = self.avg = self.median = 0
-            self.p95 = None
+        stats = self.sketch.summary()
+        self.min = stats['min']
+        self.max = stats['max']
+        self.avg = stats['avg']
+        self.median = stats['median']
+        self.count = stats['count']
+        
+        # Calculate 95th and 99th percentiles if we have enough data
+        self.p95 = stats['p95'] if self.count >= 20 else None
+        self.p99 = stats['p99'] if self.count >= 100 else None
     
     def exceeds_threshold(self) -> bool:
         """
@@ -126,7 +132,8 @@ class PerformanceMetric:
             'avg': self.avg,
             'median': self.median,
             'p95': self.p95,
-            'count': len(self.values),
+            'p99': self.p99,
+            'count': self.count,
             'threshold': self.threshold,
             'exceeds_threshold': self.exceeds_threshold()
         }
@@ -147,8 +154,9 @@ class PerformanceMetric:
         operation = data.get('operation', 'unknown')
         values = data.get('values', [])
         threshold = data.get('threshold', 5.0)
+        sketch = QuantileSketch.from_dict(data['sketch']) if data.get('sketch') else None
         
-        return cls(name, component, operation, values, threshold)
+        return cls(name, component, operation, values, threshold, sketch)
 
 
 class PerformanceAnalyzer:
@@ -200,15 +208,14 @@ class PerformanceAnalyzer:
         # Collect job performance metrics
         job_metrics = collect_job_performance_data(self.project_id, self.job_name, self.region, self.days)
         
-        # Load and filter logs
-        self.log_analyzer.load_logs()
-        self.log_analyzer.filter_logs(days=self.days, component=component)
+        # Summarize the logs into quantile sketches once, for components and APIs
+        sketches = load_performance_sketches(self.log_file, self.days)
         
         # Collect component performance metrics
-        component_metrics = collect_component_performance_data(self.log_file, self.days, component)
+        component_metrics = collect_component_performance_data(self.log_file, self.days, component, sketches)
         
         # Collect API performance metrics
-        api_metrics = collect_api_performance_data(self.log_file, self.days)
+        api_metrics = collect_api_performance_data(self.log_file, self.days, sketches)
         
         # Combine all metrics
         metrics = {
@@ -348,7 +355,8 @@ class PerformanceAnalyzer:
                     avg_time = stats.get("avg", 0)
                     threshold = PERFORMANCE_THRESHOLDS.get(operation, 5.0)
                     status = "✓" if avg_time <= threshold else "⚠"
-                    summary.append(f"    {operation}: {avg_time:.2f}s (threshold: {threshold}s) {status}")
+                    p95 = f", p95 {stats['p95']:.2f}s" if stats.get("p95") is not None else ""
+                    summary.append(f"    {operation}: {avg_time:.2f}s{p95} (threshold: {threshold}s) {status}")
             summary.append("")
         
         # Add API performance summary
@@ -488,7 +496,165 @@ def collect_job_performance_data(project_id: str, job_name: str, region: str, da
     return job_performance
 
 
-def collect_component_performance_data(log_file: str, days: int, component: Optional[str] = None) -> Dict:
+def get_sketch_store(log_file) -> SketchStore:
+    """
+    Get the store of daily performance sketches of a set of log files
+    
+    Args:
+        log_file: Path, or list of paths, to log files, directories or glob patterns
+        
+    Returns:
+        SketchStore in a directory of PERFORMANCE_SKETCH_SETTINGS['DIR'] specific to the log files
+    """
+    log_paths = [log_file] if isinstance(log_file, str) else sorted(log_file)
+    source_key = hashlib.sha256(json.dumps(log_paths).encode('utf-8')).hexdigest()[:16]
+    return SketchStore(os.path.join(PERFORMANCE_SKETCH_SETTINGS['DIR'], source_key))
+
+
+def new_day_sketches() -> Dict:
+    """
+    Create the empty performance sketches of a day
+    
+    Returns:
+        Dictionary with component timings extracted by the performance patterns ('components'),
+        'completed in' timings by component ('messages') and API response times and outcomes ('apis')
+    """
+    return {'components': {}, 'messages': {}, 'apis': {}}
+
+
+def collect_daily_sketches(logs: List) -> Dict[str, Dict]:
+    """
+    Summarize component and API timings of logs into quantile sketches per day
+    
+    Args:
+        logs: List of LogEntry objects
+        
+    Returns:
+        Dictionary mapping days ('YYYY-MM-DD') to their performance sketches
+    """
+    logs_by_day = defaultdict(list)
+    for log in logs:
+        logs_by_day[log.timestamp.strftime('%Y-%m-%d')].append(log)
+    
+    daily_sketches = {}
+    for day, day_logs in logs_by_day.items():
+        sketches = new_day_sketches()
+        sketches['components'] = extract_performance_sketches(day_logs)
+        
+        for log in day_logs:
+            message = log.message.lower()
+            
+            # Example: "Operation X completed in 1.23 seconds"
+            if "completed in" in log.message:
+                parts = log.message.split("completed in")
+                if len(parts) == 2:
+                    try:
+                        operation = parts[0].strip()
+                        time_val = float(parts[1].strip().split()[0])
+                        for comp in COMPONENT_NAMES:
+                            if comp in log.component.lower():
+                                operations = sketches['messages'].setdefault(comp, {})
+                                operations.setdefault(operation, QuantileSketch()).add(time_val)
+                    except Exception:
+                        pass
+            
+            # Response times, successes and failures of the APIs named in the message
+            for api in API_SERVICES:
+                if api.lower() not in message:
+                    continue
+                
+                api_sketches = sketches['apis'].setdefault(
+                    api, {'response_time': QuantileSketch(), 'success_count': 0, 'failure_count': 0}
+                )
+                if "response time" in message:
+                    try:
+                        time_str = message.split("response time")[1].strip()
+                        api_sketches['response_time'].add(float(time_str.split()[0]))
+                    except Exception:
+                        pass
+                
+                if log.level == "INFO" and ("success" in message or "succeeded" in message):
+                    api_sketches['success_count'] += 1
+                elif log.level in ["ERROR", "CRITICAL"] or "fail" in message or "error" in message:
+                    api_sketches['failure_count'] += 1
+        
+        daily_sketches[day] = sketches
+    
+    return daily_sketches
+
+
+def load_performance_sketches(log_file, days: int, store: Optional[SketchStore] = None) -> Dict:
+    """
+    Get the performance sketches of the last days, reading only the logs of days not stored yet
+    
+    Sketches of complete days read from the logs are saved, so later reports merge them
+    instead of reading those logs again. Days are counted as whole days.
+    
+    Args:
+        log_file: Path, or list of paths, to log files, directories or glob patterns
+        days: Number of days of data to analyze
+        store: Store of daily sketches, defaults to the store of the log files
+        
+    Returns:
+        Performance sketches of all the days merged
+    """
+    store = store or get_sketch_store(log_file)
+    today = datetime.date.today()
+    first_day = (datetime.datetime.now() - datetime.timedelta(days=days)).date()
+    window = [(first_day + datetime.timedelta(days=i)).isoformat() for i in range((today - first_day).days + 1)]
+    
+    # Reuse the stored days, today is never complete
+    stored_days = set(store.days())
+    daily_sketches = {day: store.load(day) for day in window[:-1] if day in stored_days}
+    daily_sketches = {day: sketches for day, sketches in daily_sketches.items() if sketches is not None}
+    missing_days = [day for day in window if day not in daily_sketches]
+    
+    # Read the logs from the oldest missing day on
+    oldest_missing = datetime.date.fromisoformat(missing_days[0])
+    log_analyzer = LogAnalyzer(log_file)
+    log_analyzer.load_logs(days=(today - oldest_missing).days + 1)
+    read_sketches = collect_daily_sketches(log_analyzer.logs)
+    
+    for day in missing_days:
+        sketches = read_sketches.get(day, new_day_sketches())
+        daily_sketches[day] = sketches
+        if day != window[-1]:
+            try:
+                store.save(day, sketches)
+            except OSError as e:
+                logger.warning(f"Could not save performance sketches for {day}: {e}")
+    
+    logger.info(f"Performance sketches: {len(window) - len(missing_days)} days stored, {len(missing_days)} days read from logs")
+    
+    # Merge the days into sketches of the whole period
+    merged = new_day_sketches()
+    for day in window:
+        merge_sketches(merged, daily_sketches[day])
+    return merged
+
+
+def select_component_sketches(component_sketches: Dict, component: Optional[str] = None) -> Dict:
+    """
+    Select the sketches of a component, preferring an exact name match
+    
+    Args:
+        component_sketches: Dictionary mapping components to operations to sketches
+        component: Component name to filter by (all components if None)
+        
+    Returns:
+        Dictionary of the selected components
+    """
+    if not component:
+        return component_sketches
+    
+    selected = {name: operations for name, operations in component_sketches.items() if name.lower() == component.lower()}
+    if not selected:
+        selected = {name: operations for name, operations in component_sketches.items() if component.lower() in name.lower()}
+    return selected
+
+
+def collect_component_performance_data(log_file: str, days: int, component: Optional[str] = None,
+                                       sketches: Optional[Dict] = None) -> Dict:
     """
     Collect performance data for individual application components
     
@@ -496,152 +662,77 @@ def collect_component_performance_data(log_file: str, days: int, component: Opti
         log_file: Path to log file
         days: Number of days of data to analyze
         component: Optional component name to filter by
+        sketches: Performance sketches from load_performance_sketches, loaded if not provided
         
     Returns:
         Component performance metrics by operation
     """
     logger.info(f"Collecting component performance data from {log_file}")
     
-    # Initialize log analyzer
-    log_analyzer = LogAnalyzer(log_file)
-    
-    # Load logs
-    log_analyzer.load_logs()
+    if sketches is None:
+        sketches = load_performance_sketches(log_file, days)
     
-    # Filter logs by date and component
-    log_analyzer.filter_logs(days=days, component=component)
+    # Timings in the structured format, else the "completed in" timings of log messages
+    component_sketches = select_component_sketches(sketches['components'], component)
+    if not component_sketches:
+        component_sketches = select_component_sketches(sketches['messages'], component)
     
-    # Extract performance metrics
-    metrics = extract_performance_metrics(log_analyzer.logs)
-    
-    # If no metrics found in the structured format, try to extract from log messages
-    if not metrics:
-        # Custom extraction logic for each component
-        component_metrics = {}
-        
-        for comp in COMPONENT_NAMES if not component else [component]:
-            # Filter logs for this component
-            comp_logs = log_analyzer.filter_logs(component=comp)
-            
-            operations = {}
-            
-            # Look for common timing patterns in log messages
-            for log in comp_logs:
-                # Example: "Operation X completed in 1.23 seconds"
-                # Example: "Function Y executed in 2.34s"
-                # Example: "Processed Z in 3.45ms"
-                
-                if "completed in" in log.message:
-                    parts = log.message.split("completed in")
-                    if len(parts) == 2:
-                        try:
-                            operation = parts[0].strip()
-                            time_str = parts[1].strip()
-                            time_val = float(time_str.split()[0])
-                            
-                            if operation not in operations:
-                                operations[operation] = []
-                            
-                            operations[operation].append(time_val)
-                        except Exception:
-                            pass
-            
-            # Calculate statistics for each operation
-            for operation, values in operations.items():
-                if values:
-                    operations[operation] = {
-                        "min": min(values),
-                        "max": max(values),
-                        "avg": sum(values) / len(values),
-                        "median": sorted(values)[len(values) // 2],
-                        "count": len(values)
-                    }
-            
-            if operations:
-                component_metrics[comp] = operations
-        
-        metrics = component_metrics
+    metrics = {
+        comp: {operation: sketch.summary() for operation, sketch in operations.items() if sketch.count}
+        for comp, operations in component_sketches.items()
+    }
+    metrics = {comp: operations for comp, operations in metrics.items() if operations}
     
     logger.info(f"Collected performance data for {len(metrics)} components")
     return metrics
 
 
-def collect_api_performance_data(log_file: str, days: int) -> Dict:
+def collect_api_performance_data(log_file: str, days: int, sketches: Optional[Dict] = None) -> Dict:
     """
     Collect performance data for external API interactions
     
     Args:
         log_file: Path to log file
         days: Number of days of data to analyze
+        sketches: Performance sketches from load_performance_sketches, loaded if not provided
         
     Returns:
         API performance metrics by service
     """
     logger.info(f"Collecting API performance data from {log_file}")
     
-    # Initialize log analyzer
-    log_analyzer = LogAnalyzer(log_file)
-    
-    # Load logs
-    log_analyzer.load_logs()
-    
-    # Filter logs by date
-    log_analyzer.filter_logs(days=days)
-    
-    # Define API service names
-    api_services = ['Capital One', 'Google Sheets', 'Gemini', 'Gmail']
+    if sketches is None:
+        sketches = load_performance_sketches(log_file, days)
     
     # Initialize result structure
     api_metrics = {}
     
-    # For each API service, extract performance data
-    for api in api_services:
-        # Filter logs related to this API
-        api_logs = log_analyzer.filter_logs(pattern=api.lower())
-        
-        # Extract response times
-        response_times = []
-        success_count = 0
-        failure_count = 0
-        
-        for log in api_logs:
-            # Look for response time information
-            if "response time" in log.message.lower():
-                try:
-                    time_str = log.message.split("response time")[1].strip()
-                    time_val = float(time_str.split()[0])
-                    response_times.append(time_val)
-                except Exception:
-                    pass
-            
-            # Count successes and failures
-            if log.level == "INFO" and ("success" in log.message.lower() or "succeeded" in log.message.lower()):
-                success_count += 1
-            elif log.level in ["ERROR", "CRITICAL"] or "fail" in log.message.lower() or "error" in log.message.lower():
-                failure_count += 1
+    for api in API_SERVICES:
+        api_sketches = sketches['apis'].get(api)
+        if not api_sketches or not api_sketches['response_time'].count:
+            continue
         
         # Calculate statistics
-        if response_times:
-            avg_response_time = sum(response_times) / len(response_times)
-            min_response_time = min(response_times)
-            max_response_time = max(response_times)
-            sorted_times = sorted(response_times)
-            median_response_time = sorted_times[len(sorted_times) // 2]
-            
-            # Calculate success rate
-            total_operations = success_count + failure_count
-            success_rate = (success_count / total_operations * 100) if total_operations > 0 else 0
-            
-            api_metrics[api] = {
-                "avg_response_time": avg_response_time,
-                "min_response_time": min_response_time,
-                "max_response_time": max_response_time,
-                "median_response_time": median_response_time,
-                "response_time_samples": len(response_times),
-                "success_count": success_count,
-                "failure_count": failure_count,
-                "success_rate": success_rate
-            }
+        stats = api_sketches['response_time'].summary()
+        success_count = api_sketches['success_count']
+        failure_count = api_sketches['failure_count']
+        
+        # Calculate success rate
+        total_operations = success_count + failure_count
+        success_rate = (success_count / total_operations * 100) if total_operations > 0 else 0
+        
+        api_metrics[api] = {
+            "avg_response_time": stats['avg'],
+            "min_response_time": stats['min'],
+            "max_response_time": stats['max'],
+            "median_response_time": stats['median'],
+            "p95_response_time": stats['p95'],
+            "p99_response_time": stats['p99'],
+            "response_time_samples": stats['count'],
+            "success_count": success_count,
+            "failure_count": failure_count,
+            "success_rate": success_rate
+        }
     
     logger.info(f"Collected performance data for {len(api_metrics)} API services")
     return api_metrics
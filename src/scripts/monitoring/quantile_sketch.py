@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Mergeable quantile sketches for performance statistics
+
+Performance statistics used to keep every timing value in a list and sort it to find the
+median. A QuantileSketch (DDSketch-style: logarithmic buckets with a bounded relative
+error) summarizes any number of values in a few kilobytes, in a single pass, and two
+sketches merge into the sketch of all their values. performance_report.py stores one
+sketch per day, component/operation and API, so weekly and monthly p50/p95/p99 are
+merged from the daily sketches instead of re-reading the history:
+
+    <PERFORMANCE_SKETCH_DIR>/<log source>/2024-05-06.json
+
+Usage:
+    sketch = QuantileSketch()
+    for value in durations:
+        sketch.add(value)
+    sketch.quantile(0.95)
+    weekly = QuantileSketch.from_dict(monday).merge(QuantileSketch.from_dict(tuesday))
+"""
+
+import os
+import json
+import math
+
+# Internal imports
+from ..config.logging_setup import get_logger
+from ..config.script_settings import PERFORMANCE_SKETCH_SETTINGS
+from ..config.path_constants import ensure_dir_exists
+
+# Initialize logger
+logger = get_logger('quantile_sketch')
+
+# Smallest value given its own bucket; smaller values (and zero) share the zero bucket
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """Quantile sketch of non-negative values with a bounded relative error"""
+    
+    def __init__(self, relative_accuracy=None, max_bins=None):
+        """
+        Initialize an empty sketch
+        
+        Args:
+            relative_accuracy: Maximum relative error of quantiles, defaults to
+                PERFORMANCE_SKETCH_SETTINGS['RELATIVE_ACCURACY']
+            max_bins: Maximum number of buckets, the lowest buckets are merged beyond it,
+                defaults to PERFORMANCE_SKETCH_SETTINGS['MAX_BINS']
+        """
+        self.relative_accuracy = relative_accuracy or PERFORMANCE_SKETCH_SETTINGS['RELATIVE_ACCURACY']
+        self.max_bins = max_bins or PERFORMANCE_SKETCH_SETTINGS['MAX_BINS']
+        self.gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+    
+    @classmethod
+    def from_values(cls, values, **kwargs):
+        """
+        Create a sketch of a list of values
+        
+        Args:
+            values: Values to add
+            **kwargs: Sketch parameters
+            
+        Returns:
+            QuantileSketch instance
+        """
+        sketch = cls(**kwargs)
+        for value in values:
+            sketch.add(value)
+        return sketch
+    
+    def add(self, value):
+        """
+        Add a value to the sketch
+        
+        Args:
+            value: Non-negative value (negative values are counted as zero)
+        """
+        value = float(value)
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += 1
+            return
+        
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+    
+    def _collapse(self):
+        """Merge the lowest buckets, so the sketch stays within max_bins"""
+        indexes = sorted(self.bins)
+        excess = len(indexes) - self.max_bins + 1
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            self.bins[target] += self.bins.pop(index)
+    
+    def merge(self, other):
+        """
+        Add every value of another sketch
+        
+        Args:
+            other: QuantileSketch with the same relative accuracy
+            
+        Returns:
+            This sketch
+        """
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Cannot merge quantile sketches with different relative accuracy")
+        if not other.count:
+            return self
+        
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        return self
+    
+    def quantile(self, q):
+        """
+        Estimate a quantile of the values
+        
+        Args:
+            q: Quantile between 0 and 1 (0.5 for the median)
+            
+        Returns:
+            Estimated value within the relative accuracy, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # Midpoint of the bucket, in the relative sense
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    @property
+    def avg(self):
+        """Average of the values (exact), 0 if the sketch is empty"""
+        return self.sum / self.count if self.count else 0
+    
+    def summary(self):
+        """
+        Summarize the values
+        
+        Returns:
+            Dictionary with min, max, avg, median, p95, p99 and count
+        """
+        return {
+            'min': self.min if self.count else 0,
+            'max': self.max if self.count else 0,
+            'avg': self.avg,
+            'median': self.quantile(0.5) if self.count else 0,
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'count': self.count
+        }
+    
+    def to_dict(self):
+        """
+        Convert the sketch to a JSON-serializable dictionary
+        
+        Returns:
+            Dictionary representation
+        """
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'bins': {str(index): count for index, count in self.bins.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a sketch from its dictionary representation
+        
+        Args:
+            data: Dictionary created by to_dict
+            
+        Returns:
+            QuantileSketch instance
+        """
+        sketch = cls(relative_accuracy=data.get('relative_accuracy'))
+        sketch.bins = {int(index): count for index, count in data.get('bins', {}).items()}
+        sketch.zero_count = data.get('zero_count', 0)
+        sketch.count = data.get('count', 0)
+        sketch.sum = data.get('sum', 0.0)
+        sketch.min = data.get('min')
+        sketch.max = data.get('max')
+        return sketch
+
+
+def sketches_to_dict(sketches):
+    """
+    Convert nested dictionaries of sketches to JSON-serializable dictionaries
+    
+    Args:
+        sketches: Dictionary whose leaves are QuantileSketch objects or plain values
+        
+    Returns:
+        Dictionary with every sketch converted by to_dict
+    """
+    if isinstance(sketches, QuantileSketch):
+        return sketches.to_dict()
+    if isinstance(sketches, dict):
+        return {key: sketches_to_dict(value) for key, value in sketches.items()}
+    return sketches
+
+
+def sketches_from_dict(data):
+    """
+    Restore nested dictionaries of sketches converted by sketches_to_dict
+    
+    Args:
+        data: Dictionary created by sketches_to_dict
+        
+    Returns:
+        Dictionary whose sketch leaves are QuantileSketch objects
+    """
+    if isinstance(data, dict):
+        if 'bins' in data and 'zero_count' in data:
+            return QuantileSketch.from_dict(data)
+        return {key: sketches_from_dict(value) for key, value in data.items()}
+    return data
+
+
+def merge_sketches(target, source):
+    """
+    Merge nested dictionaries of sketches, adding numbers and merging sketches with the same keys
+    
+    Args:
+        target: Dictionary receiving the merged sketches (modified in place)
+        source: Dictionary of sketches to add
+        
+    Returns:
+        The target dictionary
+    """
+    for key, value in source.items():
+        if key not in target:
+            target[key] = sketches_from_dict(sketches_to_dict(value))
+        elif isinstance(value, QuantileSketch):
+            target[key].merge(value)
+        elif isinstance(value, dict):
+            merge_sketches(target[key], value)
+        else:
+            target[key] += value
+    return target
+
+
+class SketchStore:
+    """Daily performance sketches saved as one JSON file per day"""
+    
+    def __init__(self, directory=None):
+        """
+        Initialize the sketch store
+        
+        Args:
+            directory: Directory of the store, defaults to PERFORMANCE_SKETCH_SETTINGS['DIR']
+        """
+        self.directory = directory or PERFORMANCE_SKETCH_SETTINGS['DIR']
+    
+    def _path(self, day):
+        """
+        Get the file of a day
+        
+        Args:
+            day: Day as a 'YYYY-MM-DD' string
+            
+        Returns:
+            Path of the day's JSON file
+        """
+        return os.path.join(self.directory, f"{day}.json")
+    
+    def days(self):
+        """
+        List the days with stored sketches
+        
+        Returns:
+            Sorted list of 'YYYY-MM-DD' strings
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json'))
+    
+    def load(self, day):
+        """
+        Load the sketches of a day
+        
+        Args:
+            day: Day as a 'YYYY-MM-DD' string
+            
+        Returns:
+            Nested dictionary of sketches, or None if the day is not stored or unreadable
+        """
+        try:
+            with open(self._path(day), 'r') as f:
+                return sketches_from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable performance sketches for {day}: {e}")
+            return None
+    
+    def save(self, day, sketches):
+        """
+        Save the sketches of a day atomically
+        
+        Args:
+            day: Day as a 'YYYY-MM-DD' string
+            sketches: Nested dictionary of sketches
+        """
+        ensure_dir_exists(self.directory)
+        path = self._path(day)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(sketches_to_dict(sketches), f)
+        os.replace(temp_path, path)
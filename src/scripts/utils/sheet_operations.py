@@ -232,6 +232,99 @@ def clear_sheet_range(spreadsheet_id: str, range_name: str, service=None) -> dic
         raise
 
 
+def batch_update_values(spreadsheet_id: str, data: List[Dict[str, Any]], service=None,
+                        value_input_option: str = VALUE_INPUT_OPTION,
+                        include_values_in_response: bool = False) -> dict:
+    """
+    Writes values to several Google Sheet ranges in one request
+
+    Args:
+        spreadsheet_id: ID of the spreadsheet
+        data: Ranges to write, as dictionaries with 'range' and 'values'
+        service: Google Sheets API service (will be created if None)
+        value_input_option: How input should be interpreted
+        include_values_in_response: Whether the response includes the written values,
+            as rendered by the sheet, under responses[i]['updatedData']
+
+    Returns:
+        API response with update details
+    """
+    try:
+        if service is None:
+            service = get_sheets_service()
+
+        body = {
+            'valueInputOption': value_input_option,
+            'data': data,
+            'includeValuesInResponse': include_values_in_response,
+            'responseValueRenderOption': VALUE_RENDER_OPTION
+        }
+
+        result = service.spreadsheets().values().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body=body
+        ).execute()
+
+        logger.debug(f"Updated {result.get('totalUpdatedCells')} cells in {len(data)} ranges")
+        return result
+
+    except googleapiclient.errors.HttpError as error:
+        logger.error(f"Google Sheets API error while batch writing to sheet: {str(error)}")
+        raise
+    except Exception as e:
+        logger.error(f"Error batch writing to sheet: {str(e)}")
+        raise
+
+
+def ensure_sheet_rows(spreadsheet_id: str, sheet_name: str, row_count: int, service=None) -> bool:
+    """
+    Grows a sheet to at least the given number of rows, as values cannot be written beyond it
+
+    Args:
+        spreadsheet_id: ID of the spreadsheet
+        sheet_name: Name of the sheet
+        row_count: Number of rows the sheet must have
+        service: Google Sheets API service (will be created if None)
+
+    Returns:
+        True if the sheet has enough rows, False if the sheet was not found
+    """
+    try:
+        if service is None:
+            service = get_sheets_service()
+
+        metadata = get_sheet_metadata(spreadsheet_id, service)
+        for sheet in metadata.get('sheets', []):
+            properties = sheet.get('properties', {})
+            if properties.get('title') != sheet_name:
+                continue
+
+            current_rows = properties.get('gridProperties', {}).get('rowCount', 0)
+            if current_rows < row_count:
+                service.spreadsheets().batchUpdate(
+                    spreadsheetId=spreadsheet_id,
+                    body={'requests': [{
+                        'appendDimension': {
+                            'sheetId': properties.get('sheetId'),
+                            'dimension': 'ROWS',
+                            'length': row_count - current_rows
+                        }
+                    }]}
+                ).execute()
+                logger.info(f"Added {row_count - current_rows} rows to sheet '{sheet_name}'")
+            return True
+
+        logger.warning(f"Sheet '{sheet_name}' not found in spreadsheet")
+        return False
+
+    except googleapiclient.errors.HttpError as error:
+        logger.error(f"Google Sheets API error while resizing sheet: {str(error)}")
+        raise
+    except Exception as e:
+        logger.error(f"Error resizing sheet: {str(e)}")
+        raise
+
+
 def get_sheet_as_dataframe(spreadsheet_id: str, range_name: str, 
                           service=None, header: bool = True) -> pd.DataFrame:
     """
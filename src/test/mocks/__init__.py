@@ -40,6 +40,13 @@ from .cloud_scheduler import (
     calculate_next_execution,
 )
 
+# Cloud Run Jobs mock client and utilities
+from .cloud_run_client import (
+    MockJobsClient,
+    create_mock_execution,
+    create_mock_executions,
+)
+
 # Secret Manager mock client and utilities
 from .secret_manager import (
     MockSecretManagerServiceClient,
@@ -75,6 +82,11 @@ __all__ = [
     'parse_cron_expression',
     'calculate_next_execution',
     
+    # Cloud Run Jobs mocks
+    'MockJobsClient',
+    'create_mock_execution',
+    'create_mock_executions',
+    
     # Secret Manager mocks
     'MockSecretManagerServiceClient',
     'MockSecretManagerClient',
@@ -0,0 +1,164 @@
+"""
+Mock implementation of the Google Cloud Run Jobs API for testing purposes.
+
+This module provides a fake JobsClient serving a generated execution history, with an
+optional per-call latency, so job status checks can be tested and benchmarked locally
+without GCP credentials.
+"""
+
+import time
+import datetime
+import threading
+from types import SimpleNamespace
+from typing import List, Dict, Optional, Any
+
+# Execution states generated by create_mock_executions
+MOCK_FINAL_STATES = ['SUCCEEDED', 'FAILED', 'CANCELLED']
+
+
+def create_mock_execution(job_path: str, index: int, state: str, created: datetime.datetime,
+                          duration: float = 120.0, task_count: int = 1) -> SimpleNamespace:
+    """
+    Create an execution object shaped like a run_v2.Execution.
+
+    Args:
+        job_path: Resource name of the job (projects/.../jobs/...)
+        index: Number of the execution, used in its name
+        state: Execution state name (e.g. SUCCEEDED, FAILED, RUNNING)
+        created: Creation time of the execution
+        duration: Seconds the execution took (ignored while it is running)
+        task_count: Number of tasks of the execution
+
+    Returns:
+        Execution with name, status, timestamps, logging URI and tasks
+    """
+    completed = created + datetime.timedelta(seconds=duration) if state in MOCK_FINAL_STATES else None
+    error = SimpleNamespace(code=13, message='Container exited with status 1') if state == 'FAILED' else None
+    status = SimpleNamespace(state=SimpleNamespace(name=state), error=error)
+    execution_name = f"{job_path}/executions/mock-execution-{index:05d}"
+
+    tasks = [
+        SimpleNamespace(index=task_index, status=status, creation_timestamp=created, completion_timestamp=completed)
+        for task_index in range(task_count)
+    ]
+    return SimpleNamespace(
+        name=execution_name,
+        status=status,
+        creation_timestamp=created,
+        completion_timestamp=completed,
+        logging_uri=f"https://console.cloud.google.com/logs?execution={execution_name}",
+        tasks=tasks
+    )
+
+
+def create_mock_executions(job_path: str, count: int, interval_hours: float = 24.0,
+                           failure_every: int = 10, running: int = 0) -> List[SimpleNamespace]:
+    """
+    Create an execution history, newest first like the API lists it.
+
+    Args:
+        job_path: Resource name of the job
+        count: Number of executions
+        interval_hours: Hours between two executions
+        failure_every: Every n-th execution failed (0 for none)
+        running: Number of newest executions that are still running
+
+    Returns:
+        Executions, newest first
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    executions = []
+    for index in range(count):
+        if index < running:
+            state = 'RUNNING'
+        elif failure_every and index % failure_every == failure_every - 1:
+            state = 'FAILED'
+        else:
+            state = 'SUCCEEDED'
+        created = now - datetime.timedelta(hours=interval_hours * index + 1)
+        executions.append(create_mock_execution(job_path, count - index, state, created))
+    return executions
+
+
+class MockJobsClient:
+    """
+    Mock implementation of google.cloud.run_v2.JobsClient.
+
+    Every call sleeps for the configured latency, like a round trip to the API, and is
+    counted so tests can check which executions were fetched.
+    """
+
+    def __init__(self, executions: Optional[List[SimpleNamespace]] = None, latency: float = 0.0):
+        """
+        Initialize the mock client.
+
+        Args:
+            executions: Execution history, newest first
+            latency: Seconds every API call takes
+        """
+        self.executions = list(executions or [])
+        self.latency = latency
+        self.calls: Dict[str, int] = {'get_job': 0, 'list_executions': 0, 'get_execution': 0}
+        self.fetched_executions: List[str] = []
+        self._lock = threading.Lock()
+
+    def _call(self, method: str) -> None:
+        """
+        Record an API call and wait for its latency.
+
+        Args:
+            method: Name of the API method
+        """
+        with self._lock:
+            self.calls[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_job(self, name: str) -> SimpleNamespace:
+        """
+        Get a job.
+
+        Args:
+            name: Resource name of the job
+
+        Returns:
+            Job with its name
+        """
+        self._call('get_job')
+        return SimpleNamespace(name=name)
+
+    def list_executions(self, request: Any = None, parent: Optional[str] = None) -> List[SimpleNamespace]:
+        """
+        List the executions of a job, newest first.
+
+        Args:
+            request: ListExecutionsRequest (only its limit is used)
+            parent: Resource name of the job
+
+        Returns:
+            Executions up to the request limit
+        """
+        self._call('list_executions')
+        limit = getattr(request, 'limit', None) or len(self.executions)
+        return self.executions[:limit]
+
+    def get_execution(self, name: str) -> SimpleNamespace:
+        """
+        Get an execution.
+
+        Args:
+            name: Resource name of the execution
+
+        Returns:
+            The execution
+
+        Raises:
+            KeyError: If the execution does not exist
+        """
+        self._call('get_execution')
+        with self._lock:
+            self.fetched_executions.append(name.split('/')[-1])
+        for execution in self.executions:
+            if execution.name == name:
+                return execution
+        raise KeyError(f"Execution {name} not found")
@@ -306,6 +306,56 @@ class MockGmailClient:
             'status': 'sent'
         }
     
+    def send_emails_batch(self, emails, max_retries=None):
+        """
+        Simulates sending several emails with Gmail batch requests
+        
+        Args:
+            emails (list): Emails with subject, html_content, recipients and optional attachment_paths
+            max_retries (int): Ignored by the mock
+            
+        Returns:
+            list: Send result for each email, in order, shaped like GmailClient.send_emails_batch
+        """
+        results = []
+        for email in emails:
+            try:
+                response = self.send_email(
+                    email['subject'], email['html_content'], email['recipients'], email.get('attachment_paths')
+                )
+                results.append({
+                    'status': 'success',
+                    'message_id': response['id'],
+                    'recipients': email['recipients']
+                })
+            except APIError as e:
+                results.append({
+                    'status': 'error',
+                    'recipients': email['recipients'],
+                    'status_code': e.status_code,
+                    'error': str(e)
+                })
+        return results
+    
+    def get_delivery_statuses(self, message_ids):
+        """
+        Simulates looking up the delivery status of several messages
+        
+        Args:
+            message_ids (list): IDs of the messages to check
+            
+        Returns:
+            dict: Delivery status by message ID
+        """
+        statuses = {}
+        for message_id in message_ids:
+            status = self.verify_delivery(message_id)['status']
+            statuses[message_id] = {
+                'message_id': message_id,
+                'status': 'delivered' if status == 'sent' else status
+            }
+        return statuses
+    
     def verify_delivery(self, message_id):
         """
         Simulates verifying email delivery status
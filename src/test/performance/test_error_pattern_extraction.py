@@ -0,0 +1,91 @@
+"""
+Performance test module for error pattern extraction in analyze_logs.
+Benchmarks error lines/sec through the single-pass matcher and message template
+clustering on one million error lines, and checks that the counts of every pattern and
+template are exact.
+"""
+
+import time  # standard library
+import uuid  # standard library
+import logging  # standard library
+import datetime  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.monitoring import analyze_logs  # ../../scripts/monitoring/analyze_logs.py
+from src.scripts.monitoring.analyze_logs import LogEntry, cluster_error_messages, extract_error_patterns, extract_error_templates
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Number of error lines per benchmark run
+ERROR_LINE_COUNT = 1000000
+
+# Minimum throughput of error pattern extraction (error lines per second)
+ERROR_LINES_PER_SECOND_THRESHOLD = 50000
+
+# Error messages of the benchmark, built from the line number like real variable messages
+ERROR_MESSAGES = [
+    lambda i: f"Capital One request failed: timeout after {i % 30} seconds",
+    lambda i: f"Transaction {uuid.UUID(int=i)} could not be categorized",
+    lambda i: f"Invalid amount {i}.50 for account acct{i % 1000}",
+    lambda i: f"Unable to send report: SMTP error 55{i % 3}",
+    lambda i: f"Gemini API exception: quota exceeded (request {i})"
+]
+
+
+def create_error_logs(count: int) -> list:
+    """
+    Create error log entries cycling through the benchmark messages
+
+    Args:
+        count (int): Number of log entries
+
+    Returns:
+        list: LogEntry objects
+    """
+    timestamp = datetime.datetime.now()
+    return [
+        LogEntry({
+            'timestamp': timestamp,
+            'level': 'ERROR',
+            'component': f"component_{i % 6}",
+            'message': ERROR_MESSAGES[i % len(ERROR_MESSAGES)](i),
+            'correlation_id': 'benchmark',
+            'context': {}
+        })
+        for i in range(count)
+    ]
+
+
+@pytest.mark.performance
+def test_error_pattern_extraction_throughput():
+    """Benchmark error lines/sec through clustering and pattern extraction"""
+    logs = create_error_logs(ERROR_LINE_COUNT)
+    analyze_logs.get_message_template.cache_clear()
+
+    start_time = time.perf_counter()
+    clusters = cluster_error_messages(logs)
+    patterns = extract_error_patterns(logs, clusters)
+    templates = extract_error_templates(logs, clusters)
+    lines_per_second = ERROR_LINE_COUNT / (time.perf_counter() - start_time)
+
+    # Each message shape is one template, whatever its numbers and IDs
+    per_message = ERROR_LINE_COUNT // len(ERROR_MESSAGES)
+    assert len(clusters) == len(ERROR_MESSAGES)
+    assert {template['template']: template['count'] for template in templates} == {
+        'Capital One request failed: timeout after <NUM> seconds': per_message,
+        'Transaction <ID> could not be categorized': per_message,
+        'Invalid amount <NUM> for account <ID>': per_message,
+        'Unable to send report: SMTP error <NUM>': per_message,
+        'Gemini API exception: quota exceeded (request <NUM>)': per_message
+    }
+
+    counts = {pattern['pattern']: pattern['count'] for pattern in patterns}
+    assert counts['timeout'] == counts['error'] == counts['exception'] == per_message
+    assert counts[r'\brequest\b'] == 2 * per_message
+    assert not any(any(char.isdigit() for char in pattern) for pattern in counts)
+
+    logger.info(f"Error pattern extraction: {lines_per_second:.0f} error lines/sec "
+                f"({ERROR_LINE_COUNT} lines, {len(clusters)} templates, {len(patterns)} patterns)")
+    assert lines_per_second >= ERROR_LINES_PER_SECOND_THRESHOLD
@@ -0,0 +1,85 @@
+"""
+Performance test module for retrieving Cloud Run execution history in check_job_status.
+Benchmarks fetching execution details from the mock Jobs API with a simulated network
+latency: concurrently instead of one by one, and again with finished executions cached.
+"""
+
+import time  # standard library
+import logging  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.monitoring.check_job_status import ExecutionCache, JobStatusChecker  # ../../scripts/monitoring/check_job_status.py
+from src.test.mocks.cloud_run_client import MockJobsClient, create_mock_executions
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Simulated latency of every Cloud Run API call, in seconds
+API_LATENCY = 0.02
+
+# Number of executions in the history (about three months of daily runs)
+EXECUTION_COUNT = 90
+
+# Minimum speedup of concurrent detail fetching over fetching one by one
+CONCURRENT_SPEEDUP_THRESHOLD = 4
+
+JOB_PATH = 'projects/test-project/locations/us-east1/jobs/budget-management-job'
+
+
+def create_checker(client: MockJobsClient, cache_path: str) -> JobStatusChecker:
+    """
+    Create a job status checker using the mock API and a cache file
+
+    Args:
+        client (MockJobsClient): Mock Cloud Run Jobs client
+        cache_path (str): Execution cache file
+
+    Returns:
+        JobStatusChecker: Checker fetching up to 8 executions at a time
+    """
+    return JobStatusChecker('test-project', 'budget-management-job', 'us-east1', client=client,
+                            cache=ExecutionCache(cache_path), max_workers=8)
+
+
+@pytest.mark.performance
+def test_execution_history_fetch_time(tmp_path):
+    """Test that details are fetched concurrently and finished executions only once"""
+    executions = create_mock_executions(JOB_PATH, EXECUTION_COUNT, running=1)
+    client = MockJobsClient(executions, latency=API_LATENCY)
+    checker = create_checker(client, str(tmp_path / 'executions.json'))
+    execution_ids = [execution['execution_id'] for execution in checker.get_executions(days=EXECUTION_COUNT + 1)]
+    assert len(execution_ids) == EXECUTION_COUNT
+
+    # Baseline: one detail request after the other
+    start_time = time.perf_counter()
+    for execution_id in execution_ids:
+        checker.get_execution_details(execution_id)
+    sequential_time = time.perf_counter() - start_time
+
+    # First check: every execution is fetched, 8 at a time
+    client.fetched_executions.clear()
+    start_time = time.perf_counter()
+    history = checker.get_execution_history(days=EXECUTION_COUNT + 1)
+    concurrent_time = time.perf_counter() - start_time
+
+    assert len(history) == EXECUTION_COUNT
+    assert len(client.fetched_executions) == EXECUTION_COUNT
+    assert all(len(execution['tasks']) == 1 for execution in history)
+
+    # Later check by a new process: only the running execution is fetched again
+    client.fetched_executions.clear()
+    checker = create_checker(client, str(tmp_path / 'executions.json'))
+    start_time = time.perf_counter()
+    cached_history = checker.get_execution_history(days=EXECUTION_COUNT + 1)
+    cached_time = time.perf_counter() - start_time
+
+    assert cached_history == history
+    assert client.fetched_executions == [execution_ids[0]]
+
+    logger.info(f"Execution details of {EXECUTION_COUNT} executions with {API_LATENCY * 1000:.0f} ms latency: "
+                f"sequential {sequential_time:.2f}s, concurrent {concurrent_time:.2f}s, cached {cached_time:.2f}s")
+
+    assert sequential_time / concurrent_time >= CONCURRENT_SPEEDUP_THRESHOLD, \
+        f"Concurrent fetching only {sequential_time / concurrent_time:.1f}x faster"
+    assert cached_time < concurrent_time
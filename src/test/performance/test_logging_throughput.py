@@ -0,0 +1,101 @@
+"""
+Performance test module for the structured logging path.
+Benchmarks records/sec through the sensitive data filter and JSON formatter of both the
+application logging (config/logging_config.py) and the script logging
+(scripts/config/logging_setup.py), and checks that records below the effective level
+are skipped before any masking or formatting.
+"""
+
+import io  # standard library
+import json  # standard library
+import time  # standard library
+import logging  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.config import log_fastpath, logging_config  # ../../backend/config/
+from src.scripts.config import logging_setup  # ../../scripts/config/logging_setup.py
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Number of records logged per benchmark run
+RECORD_COUNT = 5000
+
+# Minimum throughput of the filter and formatter (records per second)
+RECORDS_PER_SECOND_THRESHOLD = 5000
+
+# Context attached to every benchmark record, shaped like the pipeline's log context
+RECORD_CONTEXT = {
+    'transaction_count': 42,
+    'category': 'Groceries',
+    'api_token': 'abc123',
+    'request': {'endpoint': '/accounts/checking', 'attempt': 1, 'client_secret': 'xyz'},
+    'categories': ['Groceries', 'Dining', 'Transportation']
+}
+
+
+def create_benchmark_logger(module, name: str) -> (logging.Logger, io.StringIO):
+    """
+    Create a logger writing JSON records through a module's filter and formatter
+
+    Args:
+        module: logging_config or logging_setup
+        name (str): Logger name
+
+    Returns:
+        tuple: Logger and the stream receiving its output
+    """
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(module.JsonFormatter(module.LOG_FORMAT))
+    handler.addFilter(module.SensitiveDataFilter())
+
+    benchmark_logger = logging.getLogger(name)
+    benchmark_logger.handlers = [handler]
+    benchmark_logger.propagate = False
+    benchmark_logger.setLevel(logging.INFO)
+    return benchmark_logger, stream
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('module', [logging_config, logging_setup], ids=['logging_config', 'logging_setup'])
+def test_structured_logging_throughput(module):
+    """Benchmark records/sec through the sensitive data filter and JSON formatter"""
+    benchmark_logger, stream = create_benchmark_logger(module, f"benchmark.{module.__name__}")
+
+    start_time = time.perf_counter()
+    for i in range(RECORD_COUNT):
+        benchmark_logger.info(f"Processed batch {i} with auth header",
+                              extra={'correlation_id': 'benchmark', 'context': RECORD_CONTEXT})
+    records_per_second = RECORD_COUNT / (time.perf_counter() - start_time)
+
+    # Every record is complete JSON with the message rendered and sensitive data redacted
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == RECORD_COUNT
+    record = json.loads(lines[-1])
+    assert record['message'].startswith(f"Processed batch {RECORD_COUNT - 1}")
+    assert 'auth' not in record['message']
+    assert record['context']['api_token'] == '[REDACTED]'
+    assert record['context']['request']['client_secret'] == '[REDACTED]'
+    assert record['context']['transaction_count'] == 42
+
+    logger.info(f"{module.__name__}: {records_per_second:,.0f} records/sec "
+                f"({'orjson' if log_fastpath.orjson is not None else 'json'})")
+    assert records_per_second > RECORDS_PER_SECOND_THRESHOLD
+
+
+@pytest.mark.performance
+def test_records_below_level_are_skipped():
+    """Test that debug records of a context logger never reach masking or formatting"""
+    benchmark_logger, stream = create_benchmark_logger(logging_config, 'benchmark.below_level')
+    adapter = logging_config.ContextAdapter(benchmark_logger, {'correlation_id': 'benchmark'})
+
+    start_time = time.perf_counter()
+    for i in range(RECORD_COUNT):
+        adapter.debug(f"Debug detail {i}", context=RECORD_CONTEXT)
+    skipped_per_second = RECORD_COUNT / (time.perf_counter() - start_time)
+
+    assert stream.getvalue() == ''
+    logger.info(f"Records below the effective level: {skipped_per_second:,.0f} records/sec")
+    assert skipped_per_second > RECORDS_PER_SECOND_THRESHOLD * 10
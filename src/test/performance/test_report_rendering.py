@@ -0,0 +1,76 @@
+"""
+Performance test module for rendering budget report emails with the compiled email template.
+Benchmarks a 200-category report: formatting the analysis once, then rendering the body
+repeatedly, as for multi-recipient personalized reports.
+"""
+
+import time  # standard library
+import logging  # standard library
+from decimal import Decimal  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.models.budget import Budget  # ../../backend/models/budget.py
+from src.backend.models.category import Category  # ../../backend/models/category.py
+from src.backend.models.report import Report  # ../../backend/models/report.py
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Number of budget categories in the benchmark report
+CATEGORY_COUNT = 200
+
+# Number of personalized renders per benchmark run
+RENDER_COUNT = 100
+
+# Maximum average time to render one email body once the analysis is formatted (seconds)
+RENDER_TIME_THRESHOLD = 0.005
+
+
+def create_large_report(category_count: int) -> Report:
+    """
+    Create an analyzed report with the given number of budget categories
+
+    Args:
+        category_count (int): Number of categories in the budget
+
+    Returns:
+        Report: Report with insights for the generated budget
+    """
+    categories = [Category(f"Category {i}", Decimal('100.00') + i) for i in range(category_count)]
+    actual_spending = {category.name: Decimal('90.00') + (i % 25) for i, category in enumerate(categories)}
+
+    budget = Budget(categories, actual_spending)
+    budget.analyze()
+
+    report = Report(budget)
+    report.set_insights("<p>Spending is on track for most categories.</p>")
+    return report
+
+
+@pytest.mark.performance
+def test_render_large_report_email_body():
+    """Benchmark formatting a 200-category analysis once and rendering personalized bodies"""
+    report = create_large_report(CATEGORY_COUNT)
+
+    # First render formats the analysis and compiles the template
+    start_time = time.perf_counter()
+    email_body = report.generate_email_body()
+    first_render_time = time.perf_counter() - start_time
+
+    assert email_body.count('class="category ') == CATEGORY_COUNT
+    assert '{category_details}' not in email_body
+
+    # Personalized renders reuse the formatted analysis
+    start_time = time.perf_counter()
+    for i in range(RENDER_COUNT):
+        body = report.render_email_body({'ai_generated_insights': f"<p>Insights for household {i}</p>"})
+    average_render_time = (time.perf_counter() - start_time) / RENDER_COUNT
+
+    assert f"Insights for household {RENDER_COUNT - 1}" in body
+    logger.info(
+        f"Rendered {CATEGORY_COUNT}-category report: first render {first_render_time * 1000:.2f}ms, "
+        f"personalized render {average_render_time * 1000:.3f}ms"
+    )
+    assert average_render_time < RENDER_TIME_THRESHOLD
+    assert average_render_time < first_render_time
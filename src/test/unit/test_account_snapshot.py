@@ -0,0 +1,75 @@
+"""
+Unit tests for the per-run account snapshot of the SavingsAutomator component.
+Tests that both accounts are fetched once and concurrently, reused by every validation
+step and fetched again after a transfer.
+"""
+
+import threading  # standard library
+from decimal import Decimal  # standard library
+from unittest.mock import MagicMock  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.components.savings_automator import SavingsAutomator  # Internal imports
+
+TEST_SURPLUS_AMOUNT = Decimal('50.00')
+CHECKING_ACCOUNT = {'accountId': 'checking-1', 'status': 'active', 'availableBalance': '1000.00'}
+SAVINGS_ACCOUNT = {'accountId': 'savings-1', 'status': 'active'}
+
+
+def create_client():
+    """Creates a Capital One client mock whose account requests only return when both are in flight"""
+    both_requested = threading.Barrier(2, timeout=5)
+    client = MagicMock()
+
+    def get_account(account):
+        def request():
+            both_requested.wait()
+            return dict(account)
+        return request
+
+    client.get_checking_account_details.side_effect = get_account(CHECKING_ACCOUNT)
+    client.get_savings_account_details.side_effect = get_account(SAVINGS_ACCOUNT)
+    return client
+
+
+@pytest.mark.unit
+def test_account_snapshot_is_fetched_once_for_all_validations():
+    """Test that account status and funds checks share one concurrent fetch of both accounts"""
+    client = create_client()
+    automator = SavingsAutomator(capital_one_client=client, auth_service=MagicMock())
+
+    assert automator.verify_account_status() is True
+    assert automator.verify_sufficient_funds(TEST_SURPLUS_AMOUNT) is True
+
+    assert client.get_checking_account_details.call_count == 1
+    assert client.get_savings_account_details.call_count == 1
+
+
+@pytest.mark.unit
+def test_account_snapshot_is_invalidated_after_transfer():
+    """Test that balances are fetched again once a transfer was initiated"""
+    client = create_client()
+    client.transfer_to_savings.return_value = {'status': 'error', 'error_message': 'declined'}
+    automator = SavingsAutomator(capital_one_client=client, auth_service=MagicMock())
+
+    automator.get_account_snapshot()
+    automator.initiate_transfer(TEST_SURPLUS_AMOUNT)
+    assert automator.account_snapshot is None
+
+    assert automator.get_account_snapshot()['checking'] == CHECKING_ACCOUNT
+    assert client.get_checking_account_details.call_count == 2
+
+
+@pytest.mark.unit
+def test_account_snapshot_with_error_is_not_kept():
+    """Test that a failed account request is retried by the next validation step"""
+    client = MagicMock()
+    client.get_checking_account_details.side_effect = [{'status': 'error', 'error_message': 'timeout'}, CHECKING_ACCOUNT]
+    client.get_savings_account_details.return_value = SAVINGS_ACCOUNT
+    automator = SavingsAutomator(capital_one_client=client, auth_service=MagicMock())
+
+    assert automator.verify_account_status() is False
+    assert automator.verify_account_status() is True
+    assert automator.verify_sufficient_funds(TEST_SURPLUS_AMOUNT) is True
+    assert client.get_checking_account_details.call_count == 2
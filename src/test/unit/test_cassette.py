@@ -0,0 +1,143 @@
+"""
+Unit tests for the API client record/replay cassette layer.
+Tests secret masking, cassette persistence and replay of recorded interactions
+through the patched requests transport.
+"""
+
+import gzip  # standard library
+import datetime  # standard library
+import json  # standard library
+
+import pytest  # pytest 7.4.0+
+import requests  # requests 2.31.0+
+
+from src.backend.api_clients.cassette import (  # Internal imports
+    Cassette, CassetteMissError, use_cassette, get_active_cassette,
+    mask_url, mask_headers, encode_body, decode_body, get_service_name, is_sensitive_key
+)
+
+
+@pytest.mark.unit
+def test_mask_url_redacts_api_key():
+    """Test that sensitive query parameters such as the Gemini API key are masked"""
+    url = 'https://generativelanguage.googleapis.com/v1/models/gemini-pro:generateContent?key=abc123'
+
+    masked = mask_url(url)
+
+    assert 'abc123' not in masked
+    assert 'key=%5BREDACTED%5D' in masked
+
+
+@pytest.mark.unit
+def test_mask_headers_redacts_authorization():
+    """Test that authorization headers are masked while other headers are kept"""
+    masked = mask_headers({'Authorization': 'Bearer secret', 'Content-Type': 'application/json'})
+
+    assert masked['Authorization'] == '[REDACTED]'
+    assert masked['Content-Type'] == 'application/json'
+
+
+@pytest.mark.unit
+def test_encode_body_masks_json_and_form_fields():
+    """Test that sensitive JSON keys and form fields are masked in stored bodies"""
+    json_body = encode_body(b'{"access_token": "tok", "expires_in": 3600}')
+    form_body = encode_body('grant_type=client_credentials&client_secret=shh')
+
+    assert json_body == {'encoding': 'json', 'data': {'access_token': '[REDACTED]', 'expires_in': 3600}}
+    assert 'shh' not in form_body['data']
+    assert json.loads(decode_body(json_body)) == {'access_token': '[REDACTED]', 'expires_in': 3600}
+
+
+@pytest.mark.unit
+def test_get_service_name_from_url():
+    """Test that interactions are labelled with the service they belong to"""
+    assert get_service_name('https://api.capitalone.com/accounts/1') == 'capital_one'
+    assert get_service_name('https://sheets.googleapis.com/v4/spreadsheets/x') == 'google_sheets'
+    assert get_service_name('https://gmail.googleapis.com/gmail/v1/users/me') == 'gmail'
+
+
+@pytest.mark.unit
+def test_cassette_round_trip_and_replay(tmp_path):
+    """Test that a recorded cassette is saved compressed and replayed through requests"""
+    url = 'https://api.capitalone.com/accounts/123/transactions'
+    cassette = Cassette('run-1', mode='record', cassette_dir=str(tmp_path))
+    cassette.record('GET', url, {'Authorization': 'Bearer t'}, None,
+                    200, {'Content-Type': 'application/json'}, b'{"transactions": []}', 0.25)
+    path = cassette.save()
+
+    with gzip.open(path, 'rt') as f:
+        payload = json.load(f)
+    assert payload['correlation_id'] == 'run-1'
+    assert payload['interactions'][0]['request']['headers']['Authorization'] == '[REDACTED]'
+
+    with use_cassette('run-1', mode='replay', replay_speed='max', cassette_dir=str(tmp_path)) as replay:
+        assert get_active_cassette() is replay
+        response = requests.get(url)
+        assert response.status_code == 200
+        assert response.json() == {'transactions': []}
+
+        with pytest.raises(CassetteMissError):
+            requests.get(url)
+
+    assert get_active_cassette() is None
+
+
+@pytest.mark.unit
+def test_use_cassette_off_mode_is_noop():
+    """Test that the 'off' mode does not install a cassette"""
+    with use_cassette('run-2', mode='off') as cassette:
+        assert cassette is None
+        assert get_active_cassette() is None
+
+
+@pytest.mark.unit
+def test_is_sensitive_key_matches_logging_patterns():
+    """Test that names redacted by the logging filter are masked, except pagination cursors"""
+    for key in ['access_token', 'client_secret', 'X-Goog-Api-Key', 'Authorization', 'accountId',
+                'account_holder_id', 'accountIdentifier', 'oauthState', 'card_last4_number']:
+        assert is_sensitive_key(key), key
+    for key in ['pageToken', 'nextPageToken', 'Content-Type', 'startDate']:
+        assert not is_sensitive_key(key), key
+
+
+@pytest.mark.unit
+def test_mask_headers_redacts_cookies():
+    """Test that cookies are masked although their names match no sensitive pattern"""
+    masked = mask_headers({'Cookie': 'sid=abc', 'Set-Cookie': 'sid=def', 'Accept': '*/*'})
+
+    assert masked == {'Cookie': '[REDACTED]', 'Set-Cookie': '[REDACTED]', 'Accept': '*/*'}
+
+
+@pytest.mark.unit
+def test_encode_body_masks_large_text():
+    """Test that text bodies are masked regardless of their size"""
+    text = 'log line\n' * 1000 + 'Bearer token for account 1234 id\n'
+
+    encoded = encode_body(text)
+
+    assert encoded['encoding'] == 'text'
+    assert 'token' not in encoded['data']
+    assert 'account 1234 id' not in encoded['data']
+
+
+@pytest.mark.unit
+def test_replay_on_a_later_day_matches_relative_dates(tmp_path, monkeypatch):
+    """Test that requests with dates computed from the current day replay on another day"""
+    def transactions_url(today):
+        start = today - datetime.timedelta(days=7)
+        return f'https://api.capitalone.com/accounts/123/transactions?startDate={start}&endDate={today}'
+
+    recorded_on = datetime.date(2024, 5, 6)
+    cassette = Cassette('run-3', mode='record', cassette_dir=str(tmp_path))
+    cassette.record('GET', transactions_url(recorded_on), {}, None, 200, {}, b'{"transactions": [1]}', 0.1)
+    cassette.interactions[0]['recorded_on'] = recorded_on.isoformat()
+    cassette.save()
+
+    replayed_on = datetime.date.today()
+    assert replayed_on != recorded_on
+    with use_cassette('run-3', mode='replay', cassette_dir=str(tmp_path)):
+        assert requests.get(transactions_url(replayed_on)).json() == {'transactions': [1]}
+
+    with use_cassette('run-3', mode='replay', cassette_dir=str(tmp_path)):
+        with pytest.raises(CassetteMissError):
+            requests.get(transactions_url(replayed_on - datetime.timedelta(days=1)))
@@ -0,0 +1,70 @@
+"""
+Unit tests for report chart rendering in the insight generator.
+Tests the content-hash cache key, in-process rendering and reuse of cached charts.
+"""
+
+import os  # standard library
+from decimal import Decimal  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.components import insight_generator  # Internal imports
+from src.backend.components.insight_generator import get_chart_cache_key, render_charts
+
+BUDGET_ANALYSIS = {
+    'total_budget': Decimal('300.00'),
+    'total_spent': Decimal('254.33'),
+    'total_variance': Decimal('45.67'),
+    'category_analysis': {
+        'Groceries': {'budget_amount': Decimal('150.00'), 'actual_amount': Decimal('120.50'), 'variance_amount': Decimal('29.50')},
+        'Dining': {'budget_amount': Decimal('100.00'), 'actual_amount': Decimal('110.83'), 'variance_amount': Decimal('-10.83')},
+        'Gas': {'budget_amount': Decimal('50.00'), 'actual_amount': Decimal('23.00'), 'variance_amount': Decimal('27.00')}
+    },
+    'analysis_time': '2024-05-05T12:00:00'
+}
+
+
+@pytest.fixture
+def chart_dir(tmp_path, monkeypatch):
+    """Render charts in-process into a temporary directory"""
+    monkeypatch.setattr(insight_generator, 'CHART_DIR', str(tmp_path))
+    monkeypatch.setitem(insight_generator.CHART_SETTINGS, 'RENDER_WORKERS', 0)
+    monkeypatch.setitem(insight_generator.CHART_SETTINGS, 'CACHE_ENABLED', True)
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_chart_cache_key_only_depends_on_chart_inputs():
+    """Test that the cache key ignores fields the charts are not drawn from"""
+    changed_time = dict(BUDGET_ANALYSIS, analysis_time='2024-05-06T08:00:00')
+    changed_total = dict(BUDGET_ANALYSIS, total_spent=Decimal('260.00'))
+
+    assert get_chart_cache_key(changed_time) == get_chart_cache_key(BUDGET_ANALYSIS)
+    assert get_chart_cache_key(changed_total) != get_chart_cache_key(BUDGET_ANALYSIS)
+
+
+@pytest.mark.unit
+def test_render_charts_writes_content_addressed_pngs(chart_dir):
+    """Test that both charts are rendered as PNG files named by the cache key"""
+    chart_files = render_charts(BUDGET_ANALYSIS)
+
+    cache_key = get_chart_cache_key(BUDGET_ANALYSIS)[:16]
+    assert [os.path.basename(path) for path in chart_files] == [
+        f'category_comparison_{cache_key}.png', f'budget_overview_{cache_key}.png'
+    ]
+    for path in chart_files:
+        with open(path, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+    assert not [name for name in os.listdir(chart_dir) if name.endswith('.tmp')]
+
+
+@pytest.mark.unit
+def test_render_charts_reuses_cached_files(chart_dir, monkeypatch):
+    """Test that a retry with the same analysis does not render again"""
+    first = render_charts(BUDGET_ANALYSIS)
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError('chart should have been served from the cache')
+    monkeypatch.setattr(insight_generator, 'render_chart', fail_render)
+
+    assert render_charts(dict(BUDGET_ANALYSIS)) == first
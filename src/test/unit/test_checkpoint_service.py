@@ -0,0 +1,88 @@
+"""
+Unit tests for the pipeline stage checkpoint service.
+Tests saving, restoring and resuming stage outputs keyed by correlation ID and week.
+"""
+
+import datetime  # standard library
+import os  # standard library
+from decimal import Decimal  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.services.checkpoint_service import (  # Internal imports
+    CheckpointStore, get_week_key, find_checkpoint_week, validate_correlation_id
+)
+
+
+@pytest.mark.unit
+def test_get_week_key_uses_iso_week():
+    """Test that week keys follow the ISO calendar"""
+    assert get_week_key(datetime.date(2024, 1, 1)) == '2024-W01'
+    assert get_week_key(datetime.date(2023, 1, 1)) == '2022-W52'
+
+
+@pytest.mark.unit
+def test_save_and_load_stage_round_trip(tmp_path):
+    """Test that stage outputs, including non-JSON values, survive a round trip"""
+    store = CheckpointStore('run-1', week='2024-W18', checkpoint_dir=str(tmp_path))
+    status = {'status': 'success', 'transfer_amount': Decimal('12.34')}
+
+    store.save_stage('analyzer', status)
+
+    reloaded = CheckpointStore('run-1', checkpoint_dir=str(tmp_path))
+    assert reloaded.week == '2024-W18'
+    assert reloaded.is_stage_complete('analyzer')
+    assert reloaded.load_stage('analyzer') == status
+    assert find_checkpoint_week('run-1', str(tmp_path)) == '2024-W18'
+
+
+@pytest.mark.unit
+def test_failed_stage_is_not_complete(tmp_path):
+    """Test that stages which returned an error are re-run on resume"""
+    store = CheckpointStore('run-2', week='2024-W18', checkpoint_dir=str(tmp_path))
+    store.save_stage('retriever', {'status': 'success'})
+    store.save_stage('report', {'status': 'error', 'message': 'Failed to send email'})
+
+    assert store.get_completed_stages() == ['retriever']
+    assert not store.is_stage_complete('report')
+
+
+@pytest.mark.unit
+def test_artifacts_are_restored_when_original_is_missing(tmp_path):
+    """Test that chart files are copied with the checkpoint and resolved on resume"""
+    chart = tmp_path / 'chart.png'
+    chart.write_bytes(b'png-data')
+    store = CheckpointStore('run-3', week='2024-W18', checkpoint_dir=str(tmp_path / 'checkpoints'))
+    store.save_stage('insight', {'status': 'success'}, artifacts=[str(chart)])
+
+    os.remove(chart)
+    restored = store.get_artifact_path('insight', str(chart))
+
+    assert restored != str(chart)
+    with open(restored, 'rb') as f:
+        assert f.read() == b'png-data'
+
+
+@pytest.mark.unit
+def test_clear_removes_checkpoints(tmp_path):
+    """Test that clearing a run removes all of its checkpoints"""
+    store = CheckpointStore('run-4', week='2024-W18', checkpoint_dir=str(tmp_path))
+    store.save_stage('retriever', {'status': 'success'})
+
+    store.clear()
+
+    assert not store.exists()
+    assert store.get_completed_stages() == []
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('correlation_id', ['../../etc', 'run/1', '*', '..', '', 'run 1'])
+def test_unsafe_correlation_ids_are_rejected(tmp_path, correlation_id):
+    """Test that correlation IDs are never used to build paths outside the checkpoint directory"""
+    with pytest.raises(ValueError):
+        find_checkpoint_week(correlation_id, str(tmp_path))
+    with pytest.raises(ValueError):
+        CheckpointStore(correlation_id, checkpoint_dir=str(tmp_path))
+
+    assert validate_correlation_id('3f2b8c1e-9d4a-4c6b-8e2f-1a2b3c4d5e6f') == '3f2b8c1e-9d4a-4c6b-8e2f-1a2b3c4d5e6f'
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,115 @@
+"""
+Unit tests for circuit breaker state stores.
+Tests atomic state changes under concurrent threads and processes, circuits shared
+through SQLite and the single probe call allowed while a circuit is HALF_OPEN.
+"""
+
+import multiprocessing  # standard library
+import threading  # standard library
+import time  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.services import error_handling_service  # Internal imports
+from src.backend.services.circuit_breaker_store import MemoryCircuitStore, SQLiteCircuitStore, create_circuit_store
+from src.backend.services.error_handling_service import CircuitBreaker, get_circuit_state, with_circuit_breaker
+
+
+def increment_failures(path, count):
+    """Records failures in a SQLite circuit store (runs in a child process)"""
+    store = SQLiteCircuitStore(path)
+    for _ in range(count):
+        store.update('capital_one', lambda circuit: circuit.update(failure_count=circuit['failure_count'] + 1))
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Fresh in-memory store used by with_circuit_breaker"""
+    store = MemoryCircuitStore()
+    monkeypatch.setattr(error_handling_service, '_circuit_store', store)
+    return store
+
+
+@pytest.mark.unit
+def test_concurrent_failures_are_all_counted():
+    """Test that failures recorded from many threads are counted exactly once each"""
+    breaker = CircuitBreaker(default_failure_threshold=10000)
+    error = Exception('unavailable')
+
+    threads = [
+        threading.Thread(target=lambda: [breaker.record_failure('gemini', error) for _ in range(200)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert breaker.get_circuit('gemini')['failure_count'] == 1600
+    assert breaker.get_circuit('gemini')['state'] == 'CLOSED'
+
+
+@pytest.mark.unit
+def test_sqlite_store_is_shared_between_processes(tmp_path):
+    """Test that processes updating the same database never lose an update"""
+    path = str(tmp_path / 'circuit_breakers.db')
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=increment_failures, args=(path, 50)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+    assert SQLiteCircuitStore(path).get('capital_one')['failure_count'] == 200
+
+    # A breaker in another process sees the circuit tripped by this one
+    CircuitBreaker(default_failure_threshold=1, store=SQLiteCircuitStore(path)).record_failure('gmail', Exception('down'))
+    assert create_circuit_store('sqlite', path).get('gmail')['state'] == 'OPEN'
+
+
+@pytest.mark.unit
+def test_half_open_circuit_allows_a_single_probe(store):
+    """Test that only one call probes a recovering service and its success closes the circuit"""
+    probe_started = threading.Event()
+    release_probe = threading.Event()
+    calls = []
+
+    @with_circuit_breaker('google_sheets', failure_threshold=1, recovery_timeout=60)
+    def call_api():
+        calls.append(threading.current_thread().name)
+        probe_started.set()
+        release_probe.wait(5)
+        return 'ok'
+
+    # Trip the circuit and let its recovery timeout expire
+    store.update('google_sheets', lambda circuit: circuit.update(state='OPEN', failure_count=1,
+                                                                last_failure_time=time.time() - 120))
+
+    probe = threading.Thread(target=call_api, name='probe')
+    probe.start()
+    assert probe_started.wait(5)
+
+    rejected = call_api()
+    assert rejected['error_type'] == 'circuit_open'
+    assert get_circuit_state('google_sheets')['state'] == 'HALF_OPEN'
+
+    release_probe.set()
+    probe.join(5)
+    assert calls == ['probe']
+    assert get_circuit_state('google_sheets')['state'] == 'CLOSED'
+    assert call_api() == 'ok'
+
+
+@pytest.mark.unit
+def test_failed_probe_reopens_circuit():
+    """Test that a failing probe call trips the circuit again without reaching the threshold"""
+    breaker = CircuitBreaker(default_failure_threshold=3, default_recovery_timeout=60)
+    breaker.store.update('gemini', lambda circuit: circuit.update(state='OPEN', failure_count=0,
+                                                                 last_failure_time=time.time() - 120))
+
+    with pytest.raises(ValueError):
+        breaker.execute('gemini', lambda: (_ for _ in ()).throw(ValueError('still down')))
+
+    assert breaker.get_circuit('gemini')['state'] == 'OPEN'
+    assert breaker.is_circuit_open('gemini') is True
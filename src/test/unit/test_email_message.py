@@ -0,0 +1,99 @@
+"""
+Unit tests for single-pass email message building in the Gmail client.
+Tests inline chart Content-IDs, streamed attachments, PNG size budgets, message size reporting
+and uploading large messages from disk.
+"""
+
+import email  # standard library
+import io  # standard library
+import os  # standard library
+
+import pytest  # pytest 7.4.0+
+from PIL import Image  # pillow 9.0.0+
+
+from src.backend.api_clients import gmail_client  # Internal imports
+from src.backend.api_clients.gmail_client import build_email_message, write_email_message
+from src.backend.utils.error_handlers import ValidationError
+
+TEST_SENDER = 'njdifiore@gmail.com'
+TEST_RECIPIENTS = ['njdifiore@gmail.com']
+TEST_SUBJECT = 'Budget Update: $45.67 under budget this week'
+TEST_HTML_CONTENT = '<html><body><img src="cid:image_0"><img src="cid:image_1"></body></html>'
+
+
+@pytest.fixture
+def chart_files(tmp_path):
+    """Creates two noisy PNG charts that do not compress well"""
+    paths = []
+    for i in range(2):
+        path = str(tmp_path / f'chart_{i}.png')
+        Image.effect_noise((1200, 800), 64 + i).convert('RGB').save(path)
+        paths.append(path)
+    return paths
+
+
+def parse_upload(message):
+    """Reads a Gmail API message upload back into an email message"""
+    with message.stream():
+        assert message.mimetype() == 'message/rfc822'
+        return email.message_from_bytes(message.getbytes(0, message.size()))
+
+
+@pytest.mark.unit
+def test_build_email_message_references_charts_by_content_id(chart_files):
+    """Test that every chart is attached once, inline, with the Content-ID used in the body"""
+    parsed = parse_upload(build_email_message(TEST_SENDER, TEST_RECIPIENTS, TEST_SUBJECT, TEST_HTML_CONTENT, chart_files))
+
+    assert parsed.get_content_type() == 'multipart/related'
+    assert parsed['Subject'] == TEST_SUBJECT
+    html_part, *image_parts = parsed.get_payload()
+    assert html_part.get_payload(decode=True).decode() == TEST_HTML_CONTENT
+    assert [part['Content-ID'] for part in image_parts] == ['<image_0>', '<image_1>']
+    for part, path in zip(image_parts, chart_files):
+        assert part.get_content_disposition() == 'inline'
+        with open(path, 'rb') as f:
+            assert part.get_payload(decode=True) == f.read()
+
+
+@pytest.mark.unit
+def test_write_email_message_reports_size(chart_files):
+    """Test that the written size matches the stream and the Gmail message upload"""
+    stream = io.BytesIO()
+    size = write_email_message(stream, TEST_SENDER, TEST_RECIPIENTS, TEST_SUBJECT, TEST_HTML_CONTENT, chart_files)
+
+    assert size == len(stream.getvalue())
+    message = build_email_message(TEST_SENDER, TEST_RECIPIENTS, TEST_SUBJECT, TEST_HTML_CONTENT, chart_files)
+    assert message.size() == size
+    message.stream().close()
+
+    with pytest.raises(ValidationError):
+        write_email_message(io.BytesIO(), TEST_SENDER, TEST_RECIPIENTS, '', TEST_HTML_CONTENT)
+
+
+@pytest.mark.unit
+def test_build_email_message_fits_png_budget(chart_files, monkeypatch):
+    """Test that PNG charts over the image budget are optimized to fit it"""
+    budget = 100 * 1024
+    assert all(os.path.getsize(path) > budget for path in chart_files)
+    monkeypatch.setitem(gmail_client.EMAIL_SETTINGS, 'MAX_IMAGE_BYTES', budget)
+
+    parsed = parse_upload(build_email_message(TEST_SENDER, TEST_RECIPIENTS, TEST_SUBJECT, TEST_HTML_CONTENT, chart_files))
+
+    for part in parsed.get_payload()[1:]:
+        data = part.get_payload(decode=True)
+        assert len(data) <= budget
+        assert Image.open(io.BytesIO(data)).format == 'PNG'
+
+
+@pytest.mark.unit
+def test_large_message_is_uploaded_from_disk(chart_files, monkeypatch):
+    """Test that a message spooled to disk is uploaded in resumable chunks, small ones in one request"""
+    monkeypatch.setitem(gmail_client.EMAIL_SETTINGS, 'MAX_IMAGE_BYTES', 10 * 1024 * 1024)
+    small = build_email_message(TEST_SENDER, TEST_RECIPIENTS, TEST_SUBJECT, TEST_HTML_CONTENT)
+    large = build_email_message(TEST_SENDER, TEST_RECIPIENTS, TEST_SUBJECT, TEST_HTML_CONTENT, chart_files)
+
+    assert not small.resumable()
+    assert large.size() > gmail_client.MESSAGE_SPOOL_SIZE
+    assert large.resumable() and large.chunksize() == gmail_client.MESSAGE_UPLOAD_CHUNK_SIZE
+    small.stream().close()
+    assert len(parse_upload(large).get_payload()) == 3
@@ -0,0 +1,55 @@
+"""
+Unit tests for error pattern extraction in analyze_logs.
+Tests message templates masking numbers and IDs, clustering of similar error messages
+and the known and common-word patterns found across the clusters.
+"""
+
+import datetime  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.monitoring.analyze_logs import (  # Internal imports
+    LogEntry, cluster_error_messages, extract_error_patterns, extract_error_templates, get_message_template
+)
+
+
+def log_entry(level, component, message):
+    """Creates a log entry written now"""
+    return LogEntry({
+        'timestamp': datetime.datetime.now(),
+        'level': level,
+        'component': component,
+        'message': message,
+        'correlation_id': 'run-1',
+        'context': {}
+    })
+
+
+@pytest.mark.unit
+def test_message_template_masks_numbers_and_ids():
+    """Test that numbers, UUIDs and alphanumeric IDs are masked but words are kept"""
+    assert get_message_template('Request 3f2b1c4d-0000-4a5b-8c9d-0123456789ab failed after 2.5 seconds') == \
+        'Request <ID> failed after <NUM> seconds'
+    assert get_message_template('Invalid account acct123 (HTTP 404)') == 'Invalid account <ID> (HTTP <NUM>)'
+    assert get_message_template('Gmail authentication failed') == 'Gmail authentication failed'
+
+
+@pytest.mark.unit
+def test_error_patterns_are_counted_per_template():
+    """Test that similar errors are grouped and every matching pattern counts each log once"""
+    logs = [log_entry('ERROR', 'transaction_retriever', f"Capital One request {i} failed: timeout") for i in range(8)]
+    logs += [log_entry('CRITICAL', 'savings_automator', f"Transfer error: invalid amount {i}.00") for i in range(4)]
+    logs += [log_entry('INFO', 'budget_analyzer', 'Budget analysis failed to start')]
+
+    clusters = cluster_error_messages(logs)
+    assert list(clusters) == ['Capital One request <NUM> failed: timeout', 'Transfer error: invalid amount <NUM>']
+
+    templates = extract_error_templates(logs, clusters)
+    assert templates[0]['count'] == 8
+    assert templates[0]['examples'][:2] == ['Capital One request 0 failed: timeout', 'Capital One request 1 failed: timeout']
+
+    counts = {pattern['pattern']: pattern['count'] for pattern in extract_error_patterns(logs)}
+    assert counts['fail'] == counts['timeout'] == 8
+    assert counts['error'] == counts['invalid'] == 4
+    assert counts[r'\bcapital\b'] == 8
+    assert 'exception' not in counts
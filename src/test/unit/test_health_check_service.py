@@ -0,0 +1,109 @@
+"""
+Unit tests for concurrent health checks.
+Tests that probes run concurrently, hung probes time out, results are cached for the
+TTL and every result reports the latency of its dependency.
+"""
+
+import time  # standard library
+import threading  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.services.health_check_service import (  # Internal imports
+    HealthCheckCache, resolve_probe_status, run_health_checks
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Health check cache in a temporary file"""
+    return HealthCheckCache(str(tmp_path / 'health_check_cache.json'))
+
+
+@pytest.mark.unit
+def test_resolve_probe_status():
+    """Test that probe results map to healthy or unhealthy"""
+    assert resolve_probe_status(True) == 'healthy'
+    assert resolve_probe_status(False) == 'unhealthy'
+    assert resolve_probe_status({'status': 'success'}) == 'healthy'
+    assert resolve_probe_status({'status': 'failed', 'error': 'unauthorized'}) == 'unhealthy'
+
+
+@pytest.mark.unit
+def test_probes_run_concurrently(cache):
+    """Test that every probe runs at the same time and reports its latency"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def probe():
+        barrier.wait()
+        return True
+
+    def failing_probe():
+        barrier.wait()
+        raise ConnectionError('connection refused')
+
+    results = run_health_checks({'a': probe, 'b': probe, 'c': failing_probe}, timeout=10, cache=cache)
+
+    assert [results[name]['status'] for name in 'abc'] == ['healthy', 'healthy', 'unhealthy']
+    assert results['c']['error'] == 'connection refused'
+    assert all(result['latency_ms'] >= 0 and not result['cached'] for result in results.values())
+
+
+@pytest.mark.unit
+def test_hung_probe_times_out(cache):
+    """Test that a probe that does not respond is reported without waiting for it"""
+    release = threading.Event()
+
+    start_time = time.monotonic()
+    results = run_health_checks({'slow': lambda: release.wait(30), 'fast': lambda: True}, timeout=0.2, cache=cache)
+    release.set()
+
+    assert time.monotonic() - start_time < 5
+    assert results['slow']['status'] == 'timeout'
+    assert results['fast']['status'] == 'healthy'
+
+
+@pytest.mark.unit
+def test_results_are_cached_for_ttl(cache):
+    """Test that results within the TTL are reused, also by another process reading the cache file"""
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return {'status': 'success'}
+
+    run_health_checks({'capital_one': probe}, timeout=5, ttl=60, cache=cache)
+    cached = run_health_checks({'capital_one': probe}, timeout=5, ttl=60, cache=cache)
+    from_file = run_health_checks({'capital_one': probe}, timeout=5, ttl=60, cache=HealthCheckCache(cache.path))
+
+    assert len(calls) == 1
+    assert cached['capital_one']['cached'] and from_file['capital_one']['cached']
+    assert from_file['capital_one']['details'] == {'status': 'success'}
+
+    # Expired results and refreshes probe again
+    run_health_checks({'capital_one': probe}, timeout=5, ttl=0, cache=cache)
+    run_health_checks({'capital_one': probe}, timeout=5, use_cache=False, cache=cache)
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+def test_failed_results_are_not_cached(cache):
+    """Test that unhealthy and timed-out results are probed again within the TTL"""
+    calls = []
+    release = threading.Event()
+
+    def failing_probe():
+        calls.append(1)
+        return False
+
+    def hung_probe():
+        calls.append(1)
+        return release.wait(30)
+
+    for _ in range(2):
+        results = run_health_checks({'gmail': failing_probe, 'gemini': hung_probe}, timeout=0.2, ttl=60, cache=cache)
+        assert results['gmail']['status'] == 'unhealthy' and not results['gmail']['cached']
+        assert results['gemini']['status'] == 'timeout' and not results['gemini']['cached']
+    release.set()
+
+    assert len(calls) == 4
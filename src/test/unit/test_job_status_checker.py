@@ -0,0 +1,60 @@
+"""
+Unit tests for retrieving Cloud Run execution history in check_job_status.
+Tests that finished executions are cached and never fetched again, while running
+executions and failed requests are fetched again by the next check.
+"""
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.monitoring.check_job_status import ExecutionCache, JobStatusChecker  # Internal imports
+from src.test.mocks.cloud_run_client import MockJobsClient, create_mock_executions
+
+JOB_PATH = 'projects/test-project/locations/us-east1/jobs/budget-management-job'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Execution cache in a temporary directory"""
+    return ExecutionCache(str(tmp_path / 'executions.json'))
+
+
+def create_checker(client, cache):
+    """Creates a job status checker using the mock Cloud Run API"""
+    return JobStatusChecker('test-project', 'budget-management-job', 'us-east1', client=client, cache=cache)
+
+
+@pytest.mark.unit
+def test_only_new_and_running_executions_are_fetched(cache):
+    """Test that a later check only fetches executions that were not finished before"""
+    executions = create_mock_executions(JOB_PATH, 5, running=1)
+    client = MockJobsClient(executions)
+
+    history = create_checker(client, cache).get_execution_history(days=30)
+    assert [execution['status'] for execution in history] == ['RUNNING', 'SUCCEEDED', 'SUCCEEDED', 'SUCCEEDED', 'SUCCEEDED']
+    assert len(client.fetched_executions) == 5
+
+    # The running execution finishes and a new one starts
+    executions[0].status.state.name = 'SUCCEEDED'
+    client.executions = create_mock_executions(JOB_PATH, 6, running=1)[:1] + executions
+    client.fetched_executions.clear()
+
+    history = create_checker(client, ExecutionCache(cache.path)).get_execution_history(days=30)
+    assert len(history) == 6
+    assert sorted(client.fetched_executions) == sorted(execution['execution_id'] for execution in history[:2])
+
+
+@pytest.mark.unit
+def test_failed_requests_are_not_cached(cache):
+    """Test that an execution whose details could not be retrieved is fetched again"""
+    executions = create_mock_executions(JOB_PATH, 2)
+    client = MockJobsClient(executions)
+    checker = create_checker(client, cache)
+
+    client.executions = executions[1:]
+    details = checker.get_executions_details([executions[0].name.split('/')[-1]])
+    assert 'status' not in list(details.values())[0]
+
+    client.executions = executions
+    history = checker.get_execution_history(days=30)
+    assert [execution['status'] for execution in history] == ['SUCCEEDED', 'SUCCEEDED']
+    assert cache.get(history[0]['execution_id']) == history[0]
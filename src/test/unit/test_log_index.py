@@ -0,0 +1,115 @@
+"""
+Unit tests for the persistent Parquet log index.
+Tests that only new lines are indexed on each update, that rotated and compressed
+log files are not indexed twice, that queries filter on the index partitions and that
+LogAnalyzer reads logs through the index.
+"""
+
+import gzip  # standard library
+import json  # standard library
+import datetime  # standard library
+
+import pytest  # pytest 7.4.0+
+
+pytest.importorskip('pyarrow')
+
+from src.scripts.monitoring import log_index  # Internal imports
+from src.scripts.monitoring.log_index import LogIndex, to_log_entries
+from src.scripts.monitoring.analyze_logs import LogAnalyzer
+
+
+def log_line(days_ago, level, component, message, correlation_id='run-1'):
+    """Creates a JSON log line written the given number of days ago"""
+    timestamp = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+    return json.dumps({
+        'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S,%f')[:-3],
+        'level': level,
+        'component': component,
+        'correlation_id': correlation_id,
+        'message': message,
+        'context': {'attempt': 1}
+    }) + '\n'
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    """Log index in a temporary directory, also used by LogAnalyzer"""
+    index_dir = str(tmp_path / 'index')
+    monkeypatch.setitem(log_index.LOG_INDEX_SETTINGS, 'DIR', index_dir)
+    monkeypatch.setitem(log_index.LOG_INDEX_SETTINGS, 'ENABLED', True)
+    return LogIndex(index_dir)
+
+
+@pytest.mark.unit
+def test_update_indexes_only_new_complete_lines(tmp_path, index):
+    """Test that each update parses only the lines appended since the previous one"""
+    log_file = tmp_path / 'application.log'
+    log_file.write_text(log_line(0, 'INFO', 'budget_analyzer', 'Budget analysis started'))
+    sources = index.update(str(log_file))
+    assert len(index.query(sources=sources)) == 1
+
+    # A partially written line is left for the next update
+    with open(log_file, 'a') as f:
+        f.write(log_line(0, 'ERROR', 'budget_analyzer', 'Budget analysis failed'))
+        f.write('{"timestamp": "2024')
+    index.update(str(log_file))
+    assert list(index.query(sources=sources)['message']) == ['Budget analysis started', 'Budget analysis failed']
+
+    assert index.update(str(log_file)) == sources
+    assert len(index.query()) == 2
+
+
+@pytest.mark.unit
+def test_rotated_and_compressed_file_is_not_indexed_twice(tmp_path, index):
+    """Test that a log file moved to a gzip rotation keeps its watermark"""
+    first = log_line(1, 'ERROR', 'transaction_retriever', 'Capital One request failed: timeout')
+    log_file = tmp_path / 'application.log'
+    log_file.write_text(first)
+    index.update(str(tmp_path))
+
+    # Rotate: the old file is compressed with one more line, a new file is started
+    log_file.unlink()
+    with gzip.open(tmp_path / 'application.log.1.gz', 'wt') as f:
+        f.write(first + log_line(1, 'INFO', 'transaction_retriever', 'Retrieved 12 transactions'))
+    log_file.write_text(log_line(0, 'INFO', 'savings_automator', 'Transfer initiated'))
+    sources = index.update(str(tmp_path))
+
+    df = index.query(sources=sources)
+    assert list(df['message']) == ['Capital One request failed: timeout', 'Retrieved 12 transactions', 'Transfer initiated']
+
+
+@pytest.mark.unit
+def test_query_filters_and_prunes_partitions(tmp_path, index):
+    """Test the date, level, component, pattern and correlation ID filters"""
+    log_file = tmp_path / 'application.log'
+    log_file.write_text(
+        log_line(30, 'ERROR', 'budget_analyzer', 'Budget analysis failed: 503')
+        + log_line(2, 'ERROR', 'budget_analyzer', 'Budget analysis failed: timeout', correlation_id='run-2')
+        + log_line(1, 'INFO', 'budget_analyzer_async', 'Budget analysis completed')
+        + log_line(0, 'ERROR', 'transaction_retriever', 'Capital One request failed: timeout')
+    )
+    index.update(str(log_file))
+
+    assert len(index._partition_files(days=7, component='budget_analyzer')) == 2
+    assert len(index.query(days=7)) == 3
+    assert list(index.query(days=7, level='error', component='budget')['correlation_id']) == ['run-2']
+    assert list(index.query(pattern='TIMEOUT')['component']) == ['budget_analyzer', 'transaction_retriever']
+
+    entries = to_log_entries(index.query(correlation_id='run-2'))
+    assert entries[0].context == {'attempt': 1}
+    assert isinstance(entries[0].timestamp, datetime.datetime)
+
+
+@pytest.mark.unit
+def test_log_analyzer_reads_through_the_index(tmp_path, index):
+    """Test that LogAnalyzer queries the index with the same semantics as streaming"""
+    log_file = tmp_path / 'application.log'
+    log_file.write_text(
+        log_line(1, 'ERROR', 'budget_analyzer', 'Budget analysis failed: timeout')
+        + log_line(0, 'INFO', 'budget_analyzer_async', 'Budget analysis completed', correlation_id='run-2')
+    )
+
+    indexed = LogAnalyzer(str(log_file)).load_logs(days=7, component='budget_analyzer')
+    streamed = LogAnalyzer(str(log_file), workers=1, use_index=False).load_logs(days=7, component='budget_analyzer')
+    assert [log.to_dict() for log in indexed] == [log.to_dict() for log in streamed]
+    assert index.query()['source'].nunique() == 1
@@ -0,0 +1,97 @@
+"""
+Unit tests for streaming log ingestion in analyze_logs.
+Tests reading plain and gzip-rotated files from a directory, applying filters before
+log entries are created, reading files in parallel worker processes and building the
+DataFrame once.
+"""
+
+import gzip  # standard library
+import json  # standard library
+import datetime  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.monitoring import analyze_logs  # Internal imports
+from src.scripts.monitoring.analyze_logs import LogAnalyzer, LogEntry, LogFilter, load_log_files
+
+
+def log_line(days_ago, level, component, message):
+    """Creates a JSON log line written the given number of days ago"""
+    timestamp = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+    return json.dumps({
+        'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S,%f')[:-3],
+        'level': level,
+        'component': component,
+        'correlation_id': 'run-1',
+        'message': message,
+        'context': {'attempt': 1}
+    }) + '\n'
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Directory with the current log file and a gzip-compressed rotated one"""
+    (tmp_path / 'application.log').write_text(
+        log_line(0, 'ERROR', 'budget_analyzer', 'Budget analysis failed: timeout')
+        + log_line(1, 'INFO', 'budget_analyzer_async', 'Budget analysis completed in 1.2 seconds')
+        + '\n'
+        + log_line(2, 'INFO', 'savings_automator', 'Transfer initiated')
+    )
+    with gzip.open(tmp_path / 'application.log.1.gz', 'wt') as f:
+        f.write(log_line(5, 'ERROR', 'transaction_retriever', 'Capital One request failed: timeout'))
+        f.write(log_line(30, 'ERROR', 'transaction_retriever', 'Capital One request failed: 503'))
+    (tmp_path / 'notes.txt').write_text('not a log file\n')
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_directory_of_plain_and_gzip_files_is_streamed(log_dir):
+    """Test that every plain and rotated log file in a directory is read"""
+    entries = load_log_files(str(log_dir), workers=1)
+
+    assert len(entries) == 5
+    assert {entry.component for entry in entries} >= {'budget_analyzer', 'transaction_retriever'}
+    assert entries[0].context == {'attempt': 1}
+
+
+@pytest.mark.unit
+def test_filters_are_applied_before_entries_are_created(log_dir, monkeypatch):
+    """Test that only records passing the date and level filters become LogEntry objects"""
+    created = []
+
+    class CountingLogEntry(LogEntry):
+        def __init__(self, log_data):
+            created.append(log_data['message'])
+            super().__init__(log_data)
+
+    monkeypatch.setattr(analyze_logs, 'LogEntry', CountingLogEntry)
+    entries = load_log_files(str(log_dir), LogFilter(days=7, level='error'), workers=1)
+
+    assert [entry.message for entry in entries] == created
+    assert sorted(created) == ['Budget analysis failed: timeout', 'Capital One request failed: timeout']
+
+
+@pytest.mark.unit
+def test_parallel_workers_match_sequential_loading(log_dir):
+    """Test that reading files in worker processes returns the same entries"""
+    log_filter = LogFilter(days=7, pattern='timeout')
+    sequential = load_log_files([str(log_dir / 'application.log*')], log_filter, workers=1)
+    parallel = load_log_files([str(log_dir / 'application.log*')], log_filter, workers=2)
+
+    assert [entry.to_dict() for entry in parallel] == [entry.to_dict() for entry in sequential]
+    assert len(parallel) == 2
+
+
+@pytest.mark.unit
+def test_analyzer_prefers_exact_component_and_builds_dataframe_once(log_dir):
+    """Test the component filter semantics and the columnar DataFrame"""
+    analyzer = LogAnalyzer(str(log_dir), workers=1, use_index=False)
+    logs = analyzer.load_logs(days=7, component='budget_analyzer')
+
+    assert [log.component for log in logs] == ['budget_analyzer']
+    assert analyzer.logs_df is None
+
+    df = analyzer.export_to_dataframe()
+    assert list(df.columns) == ['timestamp', 'level', 'component', 'message', 'correlation_id', 'context']
+    assert len(df) == 1
+    assert analyzer.export_to_dataframe() is df
@@ -0,0 +1,114 @@
+"""
+Unit tests for background logging through a bounded queue.
+Tests that records are handled on the listener thread in batches, that records are
+dropped and counted when the queue is full, and that shutdown drains every queued record.
+"""
+
+import io  # standard library
+import logging  # standard library
+import threading  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.config import logging_config  # Internal imports
+from src.backend.config.logging_config import (
+    DroppingQueueHandler, get_dropped_log_count, shutdown_logging, start_queue_listener
+)
+
+
+class RecordingHandler(logging.Handler):
+    """Handler collecting records, their handling thread and its flushes"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+        self.flushes = 0
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+    def flush(self):
+        self.flushes += 1
+
+
+@pytest.fixture
+def queue_logger(monkeypatch):
+    """Logger routed through the log queue, shut down after the test"""
+    monkeypatch.setitem(logging_config.LOG_QUEUE_SETTINGS, 'MAX_SIZE', 100)
+    monkeypatch.setitem(logging_config.LOG_QUEUE_SETTINGS, 'BATCH_SIZE', 50)
+
+    logger = logging.getLogger('test_log_queue')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = RecordingHandler()
+    start_queue_listener(logger, handler)
+    yield logger, handler
+    shutdown_logging()
+    logger.handlers = []
+
+
+@pytest.mark.unit
+def test_records_are_handled_in_background_batches(queue_logger):
+    """Test that records reach the handler on the listener thread, flushed per batch"""
+    logger, handler = queue_logger
+    values = ['first']
+
+    logger.info("Value is %s", values)
+    values.append('changed later')
+    for i in range(99):
+        logger.info(f"Record {i}")
+    shutdown_logging()
+
+    assert handler.messages[0] == "Value is ['first']"
+    assert len(handler.messages) == 100
+    assert threading.current_thread().name not in handler.threads
+    assert handler.flushes < 100
+
+    # After shutdown records are handled synchronously by the same handler
+    logger.info("After shutdown")
+    assert handler.messages[-1] == "After shutdown"
+
+
+@pytest.mark.unit
+def test_full_queue_drops_and_counts_records():
+    """Test that logging never blocks on a full queue"""
+    import queue
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger('test_log_queue_full')
+    logger.propagate = False
+    logger.handlers = [handler]
+
+    for i in range(5):
+        logger.warning(f"Record {i}")
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    logger.handlers = []
+
+
+@pytest.mark.unit
+def test_dropped_log_count(queue_logger):
+    """Test that the dropped record count is reported until shutdown"""
+    assert get_dropped_log_count() == 0
+    shutdown_logging()
+    assert get_dropped_log_count() == 0
+
+
+@pytest.mark.unit
+def test_shutdown_with_closed_stream_does_not_raise(monkeypatch):
+    """Test that shutdown at interpreter exit survives handlers whose stream is already closed"""
+    monkeypatch.setitem(logging_config.LOG_QUEUE_SETTINGS, 'MAX_SIZE', 100)
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    logger = logging.getLogger('test_log_queue_closed')
+    logger.propagate = False
+    start_queue_listener(logger, handler)
+
+    logger.warning("Before close")
+    stream.close()
+    shutdown_logging()
+
+    logger.handlers = []
@@ -0,0 +1,94 @@
+"""
+Unit tests for rotating, compressed log files.
+Tests size- and age-based rotation with background compression and pruning, and the log
+cleanup that compresses older plain logs and deletes expired ones in one directory scan.
+"""
+
+import os  # standard library
+import gzip  # standard library
+import time  # standard library
+import logging  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.config.logging_config import CompressingRotatingFileHandler  # Internal imports
+from src.scripts.maintenance.cleanup_logs import cleanup_logs
+
+RECORD = 'x' * 200
+
+
+def make_logger(handler):
+    """Creates a logger writing plain messages to the handler"""
+    logger = logging.getLogger(f"test_log_rotation_{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def set_age(path, days):
+    """Sets the modification time of a file to the given number of days ago"""
+    modified = time.time() - days * 24 * 3600
+    os.utime(path, (modified, modified))
+
+
+@pytest.mark.unit
+def test_rotated_files_are_compressed_and_pruned(tmp_path):
+    """Test that the file rotates by size and only the newest compressed files are kept"""
+    log_file = str(tmp_path / 'application.log')
+    handler = CompressingRotatingFileHandler(log_file, max_bytes=1000, backup_count=2)
+    logger = make_logger(handler)
+
+    for i in range(40):
+        logger.info(f"{i} {RECORD}")
+    handler.close()
+
+    rotated = sorted(name for name in os.listdir(tmp_path) if name != 'application.log')
+    assert len(rotated) == 2
+    assert all(name.startswith('application.log.') and name.endswith('.gz') for name in rotated)
+
+    with gzip.open(tmp_path / rotated[-1], 'rt') as f:
+        assert RECORD in f.read()
+    assert os.path.getsize(log_file) < 1000 + len(RECORD) * 2
+
+
+@pytest.mark.unit
+def test_file_from_an_earlier_period_is_rotated(tmp_path):
+    """Test that a file last written in an earlier period is rotated by the next record"""
+    log_file = tmp_path / 'application.log'
+    log_file.write_text("yesterday\n")
+    set_age(log_file, 2)
+
+    handler = CompressingRotatingFileHandler(str(log_file), interval_hours=24, compression='none')
+    make_logger(handler).info("today")
+    handler.close()
+
+    assert log_file.read_text() == "today\n"
+    rotated = [name for name in os.listdir(tmp_path) if name != 'application.log']
+    assert len(rotated) == 1
+    assert (tmp_path / rotated[0]).read_text() == "yesterday\n"
+
+
+@pytest.mark.unit
+def test_cleanup_compresses_old_logs_and_deletes_expired_ones(tmp_path):
+    """Test that expired logs are deleted, older plain logs compressed and recent ones kept"""
+    content = ''.join(f'{{"level": "INFO", "message": "Record {i} {RECORD}"}}\n' for i in range(500))
+    for name, age_days in [('expired.log', 40), ('expired.log.1.gz', 40), ('old.log', 3),
+                           ('old.log.20240101-000000', 2), ('current.log', 0), ('notes.txt', 40)]:
+        (tmp_path / name).write_text(content)
+        set_age(tmp_path / name, age_days)
+
+    deleted_count, freed_space = cleanup_logs(30, compress_after_hours=24, compression='gzip',
+                                              workers=2, logs_dir=str(tmp_path))
+
+    assert deleted_count == 2
+    assert sorted(os.listdir(tmp_path)) == [
+        'current.log', 'notes.txt', 'old.log.20240101-000000.gz', 'old.log.gz'
+    ]
+    assert os.path.getsize(tmp_path / 'old.log.gz') * 10 < len(content)
+    assert freed_space > 3 * len(content)
+
+    # Compressed files keep their age, so they still expire on time
+    assert os.path.getmtime(tmp_path / 'old.log.gz') < time.time() - 2 * 24 * 3600
+    with gzip.open(tmp_path / 'old.log.gz', 'rt') as f:
+        assert f.read() == content
@@ -0,0 +1,131 @@
+"""
+Unit tests for load-test mode of the mock API server.
+Tests latency and error sampling of endpoint behaviors, clamping of error rates,
+Retry-After headers on injected errors, the /__metrics counters and switching controllers.
+"""
+
+import random  # standard library
+import statistics  # standard library
+
+import pytest  # pytest 7.4.0+
+from flask import jsonify  # flask 2.3.0+
+
+from src.scripts.development import mock_api_server  # Internal imports
+from src.scripts.development.mock_api_server import EndpointBehavior, LoadTestController
+
+
+@pytest.fixture(scope='module')
+def client():
+    """Test client of the mock server app with a test endpoint"""
+    app = mock_api_server.app
+    app.add_url_rule('/__test/ping', 'ping', lambda: jsonify({'status': 'ok'}))
+    yield app.test_client()
+    mock_api_server.install_load_test_hooks(None)
+
+
+def use_controller(monkeypatch, controller):
+    """Makes the load-test hooks apply a controller"""
+    monkeypatch.setattr(mock_api_server, 'load_test_controller', controller)
+    return controller
+
+
+@pytest.mark.unit
+def test_latency_samples_follow_distribution():
+    """Test that latencies are drawn from the configured distribution and never negative"""
+    rng = random.Random(7)
+    assert EndpointBehavior('fixed', latency_ms=120).sample_latency(rng) == 0.12
+
+    uniform = [EndpointBehavior('uniform', 100, 50).sample_latency(rng) for _ in range(1000)]
+    assert all(0.1 <= value <= 0.15 for value in uniform)
+
+    lognormal = [EndpointBehavior('lognormal', 200, 80).sample_latency(rng) for _ in range(5000)]
+    assert statistics.mean(lognormal) == pytest.approx(0.2, rel=0.05)
+
+    normal = [EndpointBehavior('normal', 10, 50).sample_latency(rng) for _ in range(1000)]
+    assert min(normal) == 0.0
+
+    behavior = EndpointBehavior('exponential', 50)
+    assert ([behavior.sample_latency(random.Random(1)) for _ in range(3)] ==
+            [behavior.sample_latency(random.Random(1)) for _ in range(3)])
+
+
+@pytest.mark.unit
+def test_error_samples_match_configured_rates():
+    """Test that 429 and 5xx responses are injected at their configured rates"""
+    rng = random.Random(11)
+    behavior = EndpointBehavior(rate_limit_rate=0.2, server_error_rate=0.1, server_error_codes=[502])
+
+    samples = [behavior.sample_error(rng) for _ in range(20000)]
+
+    assert samples.count(429) / len(samples) == pytest.approx(0.2, abs=0.01)
+    assert samples.count(502) / len(samples) == pytest.approx(0.1, abs=0.01)
+    assert set(samples) == {None, 429, 502}
+
+
+@pytest.mark.unit
+def test_error_rates_are_clamped():
+    """Test that rates outside [0, 1], also from endpoint overrides, are clamped"""
+    behavior = EndpointBehavior(rate_limit_rate=1.5, server_error_rate=-0.2)
+    assert (behavior.rate_limit_rate, behavior.server_error_rate) == (1.0, 0.0)
+
+    controller = LoadTestController.from_profile({
+        'default': {'rate_limit_rate': 0.6},
+        'endpoints': {'gemini': {'server_error_rate': 0.7}}
+    })
+    gemini = controller.get_behavior('gemini.generate_content')
+    assert gemini.rate_limit_rate == 0.6
+    assert gemini.server_error_rate == pytest.approx(0.4)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('status_code,retry_after', [(429, '7'), (503, '7'), (500, None)])
+def test_injected_errors_carry_retry_after(client, monkeypatch, status_code, retry_after):
+    """Test that injected 429 and 503 responses tell the client when to retry"""
+    if status_code == 429:
+        behavior = EndpointBehavior(rate_limit_rate=1.0, retry_after_seconds=7)
+    else:
+        behavior = EndpointBehavior(server_error_rate=1.0, retry_after_seconds=7, server_error_codes=[status_code])
+    use_controller(monkeypatch, LoadTestController(behavior))
+
+    response = client.get('/__test/ping')
+
+    assert response.status_code == status_code
+    assert response.headers.get('Retry-After') == retry_after
+    assert response.get_json()['error']['code'] == status_code
+
+
+@pytest.mark.unit
+def test_metrics_count_requests_and_injected_errors(client, monkeypatch):
+    """Test that /__metrics reports requests and injected errors per endpoint until reset"""
+    controller = use_controller(monkeypatch, LoadTestController(seed=3))
+    for _ in range(3):
+        assert client.get('/__test/ping').status_code == 200
+    controller.endpoint_behaviors['ping'] = EndpointBehavior(rate_limit_rate=1.0)
+    assert client.get('/__test/ping').status_code == 429
+
+    metrics = client.get('/__metrics').get_json()
+
+    assert metrics['total_requests'] == 4
+    assert metrics['in_flight'] == 0 and metrics['peak_concurrency'] == 1
+    ping = metrics['endpoints']['ping']
+    assert ping['requests'] == 4 and ping['in_flight'] == 0
+    assert ping['injected_errors'] == {'429': 1}
+    assert 'metrics' not in metrics['endpoints']
+
+    assert client.post('/__metrics/reset').get_json() == {'status': 'reset'}
+    assert client.get('/__metrics').get_json()['total_requests'] == 0
+
+
+@pytest.mark.unit
+def test_load_test_hooks_can_be_installed_again(client):
+    """Test that installing the hooks again switches controllers instead of registering routes twice"""
+    mock_api_server.install_load_test_hooks(LoadTestController(EndpointBehavior(rate_limit_rate=1.0)))
+    assert client.get('/__test/ping').status_code == 429
+
+    mock_api_server.install_load_test_hooks(LoadTestController())
+    assert client.get('/__test/ping').status_code == 200
+    assert client.get('/__metrics').get_json()['total_requests'] == 1
+
+    mock_api_server.install_load_test_hooks(None)
+    assert client.get('/__test/ping').status_code == 200
+    assert client.get('/__metrics').status_code == 404
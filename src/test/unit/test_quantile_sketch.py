@@ -0,0 +1,87 @@
+"""
+Unit tests for the mergeable quantile sketches of performance statistics.
+Tests the relative accuracy of quantiles, merging daily sketches into the sketch of a
+longer period, saving and loading sketches and the percentiles reported by analyze_logs.
+"""
+
+import random  # standard library
+import datetime  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.monitoring.quantile_sketch import (  # Internal imports
+    QuantileSketch, SketchStore, merge_sketches, sketches_from_dict, sketches_to_dict
+)
+from src.scripts.monitoring.analyze_logs import LogEntry, extract_performance_metrics
+
+
+def exact_quantile(values, q):
+    """Computes a quantile by sorting, with the rank used by the sketch"""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+@pytest.mark.unit
+def test_quantiles_are_within_relative_accuracy():
+    """Test p50/p95/p99 of skewed timings against the exact values"""
+    generator = random.Random(42)
+    values = [generator.lognormvariate(0, 1.5) for _ in range(20000)] + [0.0] * 100
+    sketch = QuantileSketch.from_values(values, relative_accuracy=0.01)
+
+    for q in (0.5, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.011)
+    assert sketch.quantile(0) == 0.0
+    assert sketch.quantile(1) == max(values)
+    assert sketch.avg == pytest.approx(sum(values) / len(values))
+    assert len(sketch.bins) < 2048
+
+    assert QuantileSketch().summary() == {'min': 0, 'max': 0, 'avg': 0, 'median': 0, 'p95': None, 'p99': None, 'count': 0}
+
+
+@pytest.mark.unit
+def test_daily_sketches_merge_into_period_sketch(tmp_path):
+    """Test that saved daily sketches merge into the same statistics as all the values"""
+    generator = random.Random(7)
+    days = {f"2024-05-0{i}": [generator.uniform(0.1, 10 * i) for _ in range(1000)] for i in range(1, 8)}
+
+    store = SketchStore(str(tmp_path))
+    for day, values in days.items():
+        store.save(day, {'components': {'budget_analyzer': {'analysis': QuantileSketch.from_values(values)}},
+                         'apis': {'Gemini': {'success_count': 2}}})
+    assert store.days() == sorted(days)
+    assert store.load('2024-06-01') is None
+
+    weekly = {}
+    for day in store.days():
+        merge_sketches(weekly, store.load(day))
+
+    all_values = [value for values in days.values() for value in values]
+    merged = weekly['components']['budget_analyzer']['analysis']
+    direct = QuantileSketch.from_values(all_values)
+    assert merged.summary() == pytest.approx(direct.summary())
+    assert merged.quantile(0.99) == pytest.approx(exact_quantile(all_values, 0.99), rel=0.011)
+    assert weekly['apis']['Gemini']['success_count'] == 14
+
+    # Merging copies the sketches it adds, so the loaded days are left untouched
+    assert sketches_from_dict(sketches_to_dict(weekly))['components']['budget_analyzer']['analysis'].count == 7000
+
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=0.05).merge(direct)
+
+
+@pytest.mark.unit
+def test_performance_metrics_report_percentiles():
+    """Test that analyze_logs reports p95 and p99 from sketches of the timings"""
+    timestamp = datetime.datetime.now()
+    logs = [
+        LogEntry({'timestamp': timestamp, 'level': 'INFO', 'component': 'budget_analyzer',
+                  'message': f"Processed budget analysis in {i / 10:.1f} seconds, duration: {i / 10:.1f}", 'correlation_id': 'run-1', 'context': {}})
+        for i in range(1, 201)
+    ]
+
+    stats = extract_performance_metrics(logs)['budget_analyzer']['budget analysis']
+    assert stats['count'] == 200
+    assert stats['min'] == 0.1 and stats['max'] == 20.0
+    assert stats['avg'] == pytest.approx(10.05)
+    assert stats['median'] == pytest.approx(10.0, rel=0.011)
+    assert stats['p95'] == pytest.approx(19.0, rel=0.011)
+    assert stats['p99'] == pytest.approx(19.8, rel=0.011)
@@ -0,0 +1,198 @@
+"""
+Unit tests for batched report distribution and background delivery verification.
+Tests Gmail batch sending with retries of transient failures and delivery polling.
+"""
+
+from unittest.mock import MagicMock  # standard library
+
+import httplib2  # httplib2 0.20.0+
+import pytest  # pytest 7.4.0+
+from googleapiclient.errors import HttpError  # google-api-python-client 2.100.0+
+
+from src.backend.api_clients import gmail_client  # Internal imports
+from src.backend.api_clients.gmail_client import GmailClient, parse_delivery_status
+from src.backend.components import report_distributor
+from src.backend.components.report_distributor import DeliveryVerifier, ReportDistributor, wait_for_pending_deliveries
+from src.backend.services.checkpoint_service import CheckpointStore
+
+TEST_SENDER = 'njdifiore@gmail.com'
+TEST_HTML_CONTENT = '<html><body><h1>Weekly Budget Update</h1></body></html>'
+
+
+class FakeBatch:
+    """Batch request that answers each added request from a response function"""
+
+    def __init__(self, callback, respond):
+        self.callback = callback
+        self.respond = respond
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            response = self.respond(request)
+            if isinstance(response, Exception):
+                self.callback(request_id, None, response)
+            else:
+                self.callback(request_id, response, None)
+
+
+def create_client(respond):
+    """Creates a GmailClient whose batch requests are answered by respond"""
+    service = MagicMock()
+    service.users().messages().send.side_effect = lambda userId, media_body: media_body
+    batches = []
+
+    def new_batch_http_request(callback):
+        batches.append(FakeBatch(callback, respond))
+        return batches[-1]
+    service.new_batch_http_request.side_effect = new_batch_http_request
+
+    client = GmailClient(MagicMock(), sender_email=TEST_SENDER)
+    client.service = service
+    return client, batches
+
+
+def http_error(status):
+    """Creates a Gmail API HttpError with the given status"""
+    return HttpError(httplib2.Response({'status': status}), b'{}')
+
+
+@pytest.mark.unit
+def test_send_emails_batch_retries_transient_failures(monkeypatch):
+    """Test that emails are sent in batches and only transient failures are retried"""
+    monkeypatch.setitem(gmail_client.EMAIL_SETTINGS, 'BATCH_SIZE', 2)
+    monkeypatch.setattr(gmail_client.time, 'sleep', lambda seconds: None)
+    emails = [
+        {'subject': 'Budget Update', 'html_content': TEST_HTML_CONTENT, 'recipients': [f'household{i}@example.com']}
+        for i in range(3)
+    ]
+    attempts = {}
+
+    def respond(message):
+        # Household 1 fails once with a retriable status, household 2 with a permanent one
+        raw = message.getbytes(0, message.size()).decode()
+        index = next(i for i in range(3) if f'household{i}@' in raw)
+        attempts[index] = attempts.get(index, 0) + 1
+        if index == 1 and attempts[index] == 1:
+            return http_error(503)
+        if index == 2:
+            return http_error(400)
+        return {'id': f'message-{index}'}
+
+    client, batches = create_client(respond)
+    results = client.send_emails_batch(emails, max_retries=2)
+
+    assert [result['status'] for result in results] == ['success', 'success', 'error']
+    assert [result.get('message_id') for result in results[:2]] == ['message-0', 'message-1']
+    assert results[0]['size_bytes'] > 0
+    assert results[2]['status_code'] == 400
+    assert attempts == {0: 1, 1: 2, 2: 1}
+    assert [len(batch.requests) for batch in batches] == [2, 1, 1]
+
+
+@pytest.mark.unit
+def test_send_emails_batch_uploads_large_messages_on_their_own(monkeypatch):
+    """Test that messages spooled to disk are sent as resumable uploads outside the batch"""
+    monkeypatch.setattr(gmail_client, 'MESSAGE_SPOOL_SIZE', 0)
+    client, batches = create_client(lambda message: {'id': 'batched'})
+    uploads = []
+
+    def send(userId, media_body):
+        uploads.append(media_body)
+        request = MagicMock()
+        request.execute.return_value = {'id': f'message-{len(uploads)}'}
+        return request
+    client.service.users().messages().send.side_effect = send
+
+    emails = [{'subject': 'Budget Update', 'html_content': TEST_HTML_CONTENT, 'recipients': ['household@example.com']}]
+    results = client.send_emails_batch(emails)
+
+    assert results[0]['message_id'] == 'message-1'
+    assert uploads[0].resumable() and uploads[0].stream().closed
+    assert all(not batch.requests for batch in batches)
+
+
+@pytest.mark.unit
+def test_parse_delivery_status_is_pending_until_sent():
+    """Test that a message without the SENT label is still pending"""
+    assert parse_delivery_status('m1', {'labelIds': []})['status'] == 'pending'
+    assert parse_delivery_status('m1', {'labelIds': ['SENT']})['status'] == 'delivered'
+    assert parse_delivery_status('m1', {'labelIds': ['SENT', 'BOUNCED']})['status'] == 'failed'
+
+
+@pytest.mark.unit
+def test_delivery_verifier_polls_until_final_status():
+    """Test that pending messages are polled again until their status is final"""
+    polls = []
+
+    def get_delivery_statuses(message_ids):
+        # m2 only gets the SENT label on the second poll
+        polls.append(list(message_ids))
+        statuses = {'m1': 'delivered', 'm2': 'delivered' if len(polls) > 1 else 'pending'}
+        return {message_id: {'message_id': message_id, 'status': statuses[message_id]} for message_id in message_ids}
+
+    client = MagicMock()
+    client.get_delivery_statuses.side_effect = get_delivery_statuses
+
+    verifier = DeliveryVerifier(client, ['m1', 'm2'], max_attempts=5, delay=0).start()
+    verifier.wait(timeout=10)
+
+    assert verifier.is_done()
+    assert wait_for_pending_deliveries(timeout=0) == {}
+    assert {message_id: result['status'] for message_id, result in verifier.get_results().items()} == {
+        'm1': 'delivered', 'm2': 'delivered'
+    }
+    assert polls == [['m1', 'm2'], ['m2']]
+
+
+@pytest.mark.unit
+def test_delivery_verifier_gives_up_after_max_attempts():
+    """Test that messages that never reach a final status are reported as pending"""
+    client = MagicMock()
+    client.get_delivery_statuses.side_effect = [Exception('unavailable'), {'m1': {'message_id': 'm1', 'status': 'pending'}}]
+
+    verifier = DeliveryVerifier(client, ['m1'], max_attempts=2, delay=0).start()
+
+    assert verifier.wait(timeout=10)['m1']['status'] == 'pending'
+    assert client.get_delivery_statuses.call_count == 2
+
+
+@pytest.mark.unit
+def test_resumed_distribution_sends_only_to_failed_groups(tmp_path, monkeypatch):
+    """Test that resuming after a partial distribution skips the groups that got the report"""
+    # The component logs with a context keyword that plain loggers do not accept
+    monkeypatch.setattr(report_distributor, 'logger', MagicMock())
+    groups = [['a@example.com'], ['b@example.com'], ['c@example.com']]
+    gmail = MagicMock()
+    gmail.send_emails_batch.side_effect = [
+        [{'status': 'success', 'message_id': 'm1'}, {'status': 'error'}, {'status': 'success', 'message_id': 'm3'}],
+        [{'status': 'success', 'message_id': 'm2'}]
+    ]
+    report = MagicMock(email_subject='Budget Update', chart_files=[])
+    report.get_email_content.return_value = ('Budget Update', TEST_HTML_CONTENT)
+
+    def create_distributor():
+        distributor = ReportDistributor(gmail_client=gmail, auth_service=MagicMock(), recipients=['a@example.com'],
+                                        sender_email=TEST_SENDER, recipient_groups=groups)
+        distributor.validate_report = lambda report: True
+        distributor.start_delivery_verification = MagicMock()
+        return distributor
+
+    first = create_distributor().execute({'correlation_id': 'run-1', 'report': report})
+    CheckpointStore('run-1', checkpoint_dir=str(tmp_path)).save_stage('report', first)
+
+    store = CheckpointStore('run-1', checkpoint_dir=str(tmp_path))
+    assert not store.is_stage_complete('report')
+    previous_attempt = store.load_partial_stage('report')
+    resumed = create_distributor().execute({'correlation_id': 'run-1', 'report': report,
+                                            'previous_attempt': previous_attempt})
+
+    assert first['status'] == 'partial' and first['failed_recipient_groups'] == [['b@example.com']]
+    resent = gmail.send_emails_batch.call_args_list[1].args[0]
+    assert [email['recipients'] for email in resent] == [['b@example.com']]
+    assert resumed['status'] == 'success'
+    assert resumed['message_ids'] == ['m1', 'm3', 'm2']
+    assert resumed['failed_recipient_groups'] == []
@@ -235,7 +235,10 @@ def test_execute_success():
     assert mock_gmail_client.get_last_sent_email()['subject'] == report.generate_email_subject()
 
     # Verify that returned status contains success flag and delivery status
-    assert result['delivery_status'] == 'sent'
+    # (delivery is verified in the background after execute returns)
+    assert result['delivery_status'] == 'pending'
+    delivery = report_distributor.wait_for_delivery(timeout=30)
+    assert delivery[result['message_id']]['status'] == 'delivered'
     assert result['message_id'] == mock_gmail_client.get_last_sent_email()['message_id']
     assert result['email_subject'] == report.generate_email_subject()
     assert result['recipients'] == TEST_EMAIL_RECIPIENTS
@@ -0,0 +1,64 @@
+"""
+Unit tests for compiled email templates and report email rendering.
+Tests placeholder handling in CompiledTemplate and memoized formatting in Report.
+"""
+
+from decimal import Decimal  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.templates import CompiledTemplate, get_email_template, EMAIL_TEMPLATE_FIELDS  # Internal imports
+from src.backend.models.budget import Budget
+from src.backend.models.category import Category
+from src.backend.models.report import Report
+
+
+def create_report() -> Report:
+    """Creates a report for a small analyzed budget"""
+    categories = [Category('Groceries', Decimal('150.00')), Category('Dining', Decimal('100.00'))]
+    budget = Budget(categories, {'Groceries': Decimal('120.50'), 'Dining': Decimal('110.83')})
+    budget.analyze()
+    return Report(budget)
+
+
+@pytest.mark.unit
+def test_compiled_template_only_replaces_known_fields():
+    """Test that CSS braces and unknown placeholders are left untouched"""
+    template = CompiledTemplate('body { color: red; } {name} {other} {name}', ['name'])
+
+    assert template.render({'name': 'Budget'}) == 'body { color: red; } Budget {other} Budget'
+    with pytest.raises(KeyError):
+        template.render({})
+
+
+@pytest.mark.unit
+def test_email_template_has_every_field():
+    """Test that the email template is compiled once with all report placeholders"""
+    assert get_email_template() is get_email_template()
+    assert sorted(set(get_email_template().slots)) == sorted(EMAIL_TEMPLATE_FIELDS)
+
+
+@pytest.mark.unit
+def test_report_renders_template_and_memoizes_formatting(tmp_path, monkeypatch):
+    """Test that the analysis is formatted once and every placeholder is rendered"""
+    report = create_report()
+    chart_path = str(tmp_path / 'chart.png')
+    with open(chart_path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+    report.add_chart(chart_path)
+    report.set_insights('<p>Dining is over budget.</p>')
+
+    email_body = report.generate_email_body()
+
+    assert '<span class="surplus">$18.67 under budget</span>' in email_body
+    assert 'src="cid:image_0"' in email_body
+    assert '<p>Dining is over budget.</p>' in email_body
+    assert email_body.count('class="category ') == 2
+    for field in EMAIL_TEMPLATE_FIELDS:
+        assert '{' + field + '}' not in email_body
+
+    # The budget is not converted or formatted again for later renders
+    monkeypatch.setattr(report.budget, 'to_dict', lambda: pytest.fail('analysis formatted twice'))
+    personalized = report.render_email_body({'ai_generated_insights': '<p>Hello</p>'})
+    assert '<p>Hello</p>' in personalized
+    assert report.to_dict()['chart_count'] == 1
@@ -0,0 +1,129 @@
+"""
+Unit tests for the run-wide retry budget of retry_with_backoff.
+Tests that nested retries share one budget, waits respect Retry-After and are capped
+by the deadline, and that the budget follows the run into worker threads.
+"""
+
+import asyncio  # standard library
+import email.utils  # standard library
+import time  # standard library
+
+import pytest  # pytest 7.4.0+
+import requests  # requests 2.31.0+
+
+from src.backend.utils import error_handlers  # Internal imports
+from src.backend.utils.error_handlers import get_retry_after, retry_budget, retry_with_backoff
+
+
+def http_error(status_code, headers=None):
+    """Creates a requests HTTPError for a response with the given status and headers"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records retry waits instead of sleeping"""
+    waits = []
+    monkeypatch.setattr(error_handlers.time, 'sleep', waits.append)
+    return waits
+
+
+@pytest.mark.unit
+def test_nested_retries_share_one_budget(sleeps):
+    """Test that retries stacked at several levels stop once the run's budget is used"""
+    calls = []
+
+    @retry_with_backoff(requests.RequestException, max_retries=3, delay=0.01)
+    def client_call():
+        calls.append('client')
+        raise http_error(503)
+
+    @retry_with_backoff(requests.RequestException, max_retries=3, delay=0.01)
+    def component_call():
+        return client_call()
+
+    with pytest.raises(requests.HTTPError):
+        component_call()
+    assert len(calls) == 16
+
+    calls.clear()
+    sleeps.clear()
+    with retry_budget(max_retries=4):
+        with pytest.raises(requests.HTTPError):
+            component_call()
+    assert len(calls) == 5
+    assert len(sleeps) == 4
+
+
+@pytest.mark.unit
+def test_retry_after_is_respected_within_deadline(sleeps):
+    """Test that Retry-After extends the wait, and a wait past the deadline is not attempted"""
+    responses = [http_error(429, {'Retry-After': '7'}), 'ok']
+
+    @retry_with_backoff(requests.RequestException, max_retries=3, delay=0.01)
+    def rate_limited_call():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert rate_limited_call() == 'ok'
+    assert sleeps == [7.0]
+
+    responses[:] = [http_error(429, {'Retry-After': '7'}), 'ok']
+    with retry_budget(timeout=3):
+        with pytest.raises(requests.HTTPError):
+            rate_limited_call()
+    assert sleeps == [7.0]
+
+
+@pytest.mark.unit
+def test_backoff_is_capped_by_remaining_time(sleeps):
+    """Test that a stage budget caps the backoff at the time left before its deadline"""
+    @retry_with_backoff(requests.RequestException, max_retries=1, delay=100, jitter=0)
+    def failing_call():
+        raise http_error(503)
+
+    with retry_budget(timeout=60):
+        with retry_budget(timeout=5) as stage_budget:
+            with pytest.raises(requests.HTTPError):
+                failing_call()
+
+    assert 0 < sleeps[0] <= 5
+    assert stage_budget.deadline is not None
+
+
+@pytest.mark.unit
+def test_budget_follows_run_into_worker_threads(monkeypatch):
+    """Test that the budget set around the run applies in asyncio.to_thread workers"""
+    monkeypatch.setattr(error_handlers.time, 'sleep', lambda seconds: None)
+    calls = []
+
+    @retry_with_backoff(requests.RequestException, max_retries=5, delay=0)
+    def sync_call():
+        calls.append('sync')
+        raise http_error(503)
+
+    async def run():
+        results = await asyncio.gather(asyncio.to_thread(sync_call), asyncio.to_thread(sync_call),
+                                       return_exceptions=True)
+        assert all(isinstance(result, requests.HTTPError) for result in results)
+
+    with retry_budget(max_retries=3):
+        asyncio.run(run())
+
+    assert len(calls) == 2 + 3
+
+
+@pytest.mark.unit
+def test_get_retry_after_parses_seconds_and_dates():
+    """Test that Retry-After is read as seconds or as an HTTP date"""
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+    assert get_retry_after(http_error(503, {'Retry-After': '12'})) == 12.0
+    assert 25 <= get_retry_after(http_error(503, {'retry-after': retry_at})) <= 30
+    assert get_retry_after(http_error(503)) is None
+    assert get_retry_after(ValueError('no response')) is None
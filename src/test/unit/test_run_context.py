@@ -0,0 +1,157 @@
+"""
+Unit tests for the run context carried by log records.
+Tests that the correlation ID, stage and retry attempt reach records logged by thread
+pools, threads and asyncio tasks, also when logging through the background queue.
+"""
+
+import asyncio  # standard library
+import logging  # standard library
+import threading  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.config.logging_config import (  # Internal imports
+    ContextThreadPoolExecutor, RunContextFilter, bind_run_context, get_run_context, run_context,
+    shutdown_logging, start_queue_listener
+)
+from src.backend.services.logging_service import PerformanceLogger
+from src.backend.utils.error_handlers import retry_with_backoff
+
+TEST_CORRELATION_ID = 'test-correlation-123'
+
+
+class RecordingHandler(logging.Handler):
+    """Handler collecting records"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def context_logger():
+    """Logger adding the run context to its records"""
+    logger = logging.getLogger('test_run_context')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = RecordingHandler()
+    handler.addFilter(RunContextFilter())
+    logger.addHandler(handler)
+    yield logger, handler
+    logger.handlers = []
+
+
+@pytest.mark.unit
+def test_run_context_is_nested_and_restored():
+    """Test that nested run contexts keep outer values and are restored on exit"""
+    assert get_run_context() == {}
+
+    with run_context(correlation_id=TEST_CORRELATION_ID):
+        with run_context(stage='analyzer'):
+            assert get_run_context() == {'correlation_id': TEST_CORRELATION_ID, 'stage': 'analyzer'}
+        assert get_run_context() == {'correlation_id': TEST_CORRELATION_ID}
+
+    assert get_run_context() == {}
+
+
+@pytest.mark.unit
+def test_records_from_threads_and_tasks_share_the_correlation_id(context_logger):
+    """Test that thread pools, bound threads and asyncio tasks inherit the run context"""
+    logger, handler = context_logger
+
+    async def log_from_task():
+        logger.info("From task")
+        await asyncio.to_thread(logger.info, "From to_thread")
+
+    with run_context(correlation_id=TEST_CORRELATION_ID, stage='savings'):
+        with ContextThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda i: logger.info(f"From pool {i}"), range(4)))
+
+        thread = threading.Thread(target=bind_run_context(logger.info), args=("From thread",))
+        thread.start()
+        thread.join()
+
+        asyncio.run(log_from_task())
+
+    # Outside the run, records get neither a correlation ID nor a stage
+    logger.info("After run")
+
+    assert len(handler.records) == 8
+    for record in handler.records[:-1]:
+        assert record.correlation_id == TEST_CORRELATION_ID
+        assert record.context == {'stage': 'savings'}
+    assert not hasattr(handler.records[-1], 'correlation_id')
+
+
+@pytest.mark.unit
+def test_explicit_correlation_id_and_context_are_kept(context_logger):
+    """Test that values passed with the record win over the run context"""
+    logger, handler = context_logger
+    shared_context = {'stage': 'report'}
+
+    with run_context(correlation_id=TEST_CORRELATION_ID, stage='insight'):
+        logger.info("Explicit", extra={'correlation_id': 'explicit-id', 'context': shared_context})
+        logger.info("Unknown", extra={'correlation_id': 'unknown', 'context': {}})
+
+    assert handler.records[0].correlation_id == 'explicit-id'
+    assert handler.records[0].context == {'stage': 'report'}
+    assert handler.records[1].correlation_id == TEST_CORRELATION_ID
+    assert handler.records[1].context == {'stage': 'insight'}
+    assert shared_context == {'stage': 'report'}
+
+
+@pytest.mark.unit
+def test_performance_logger_uses_run_correlation_id(context_logger):
+    """Test that performance records reuse the run's correlation ID instead of new ones"""
+    logger, handler = context_logger
+
+    with run_context(correlation_id=TEST_CORRELATION_ID):
+        perf_logger = PerformanceLogger(logger, 'operation')
+        perf_logger.start()
+        perf_logger.checkpoint('step')
+        perf_logger.stop()
+
+    assert [record.correlation_id for record in handler.records] == [TEST_CORRELATION_ID] * 3
+
+
+@pytest.mark.unit
+def test_retried_calls_log_their_attempt(context_logger):
+    """Test that records logged by a retried call carry the retry attempt"""
+    logger, handler = context_logger
+    calls = []
+
+    @retry_with_backoff(ValueError, max_retries=2, delay=0, jitter=0)
+    def flaky():
+        calls.append(get_run_context().get('retry_attempt'))
+        logger.info("Attempt")
+        if len(calls) < 3:
+            raise ValueError("temporary")
+
+    flaky()
+
+    assert calls == [None, 1, 2]
+    assert [getattr(record, 'context', {}).get('retry_attempt') for record in handler.records] == [None, 1, 2]
+
+
+@pytest.mark.unit
+def test_queue_handler_applies_run_context_on_the_logging_thread():
+    """Test that the run context is captured before records are queued to the listener"""
+    logger = logging.getLogger('test_run_context_queue')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = RecordingHandler()
+    start_queue_listener(logger, handler, RunContextFilter())
+
+    try:
+        with run_context(correlation_id=TEST_CORRELATION_ID, stage='retriever'):
+            logger.info("Queued")
+        shutdown_logging()
+    finally:
+        shutdown_logging()
+        logger.handlers = []
+
+    assert handler.records[0].correlation_id == TEST_CORRELATION_ID
+    assert handler.records[0].context == {'stage': 'retriever'}
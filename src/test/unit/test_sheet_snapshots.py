@@ -0,0 +1,89 @@
+"""
+Unit tests for incremental, content-addressed Sheets snapshots.
+Tests that a snapshot only writes the row blocks that changed, that blocks are verified
+against their hash when read back, and that pruning keeps every block still in use.
+"""
+
+import gzip  # standard library
+import datetime  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.maintenance.snapshot_store import SnapshotStore  # Internal imports
+
+HEADERS = ['Transaction Location', 'Transaction Amount', 'Transaction Time', 'Corresponding Category']
+
+
+def make_rows(start, count):
+    """Creates transaction rows with distinct contents"""
+    return [[f"Store {i}", f"{i % 97 + 0.99:.2f}", f"2024-05-{i % 28 + 1:02d} 12:00", "Groceries"]
+            for i in range(start, start + count)]
+
+
+def read_rows(store, manifest):
+    """Reads all rows of a snapshot"""
+    return [row for rows in store.iter_blocks(manifest) for row in rows]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Snapshot store with small blocks in a temporary directory"""
+    return SnapshotStore(str(tmp_path / 'snapshots'), compression='gzip', block_rows=32)
+
+
+@pytest.mark.unit
+def test_snapshots_only_write_changed_blocks(store):
+    """Test that unchanged, appended and inserted rows only write the blocks around the change"""
+    rows = make_rows(0, 2000)
+    _, first = store.write_snapshot('Weekly Spending', 'sheet-id', [HEADERS] + rows)
+    assert first['changed'] and first['blocks_written'] == len(first['blocks']) > 20
+    assert read_rows(store, first) == rows
+
+    _, unchanged = store.write_snapshot('Weekly Spending', 'sheet-id', [HEADERS] + rows)
+    assert not unchanged['changed']
+    assert unchanged['blocks_written'] == 0
+
+    # New transactions only rewrite the last block
+    rows = rows + make_rows(2000, 10)
+    _, appended = store.write_snapshot('Weekly Spending', 'sheet-id', [HEADERS] + rows)
+    assert appended['changed'] and 1 <= appended['blocks_written'] <= 2
+    assert appended['bytes_written'] * 10 < first['bytes_written']
+
+    # An edit in the middle does not shift the blocks after it
+    rows = rows[:1000] + make_rows(5000, 1) + rows[1000:]
+    _, inserted = store.write_snapshot('Weekly Spending', 'sheet-id', [HEADERS] + rows)
+    assert 1 <= inserted['blocks_written'] <= 2
+    assert read_rows(store, inserted) == rows
+    assert inserted['headers'] == HEADERS and inserted['row_count'] == len(rows)
+
+
+@pytest.mark.unit
+def test_corrupt_block_is_detected(store):
+    """Test that a block whose contents do not match its hash is not read back"""
+    _, manifest = store.write_snapshot('Master Budget', 'sheet-id', [HEADERS] + make_rows(0, 100))
+    block_path = store.find_block(manifest['blocks'][0]['hash'])
+    with open(block_path, 'wb') as f:
+        f.write(gzip.compress(b'[["Store 0","0.99","2024-05-01 12:00","Dining Out"]]'))
+
+    with pytest.raises(ValueError, match="corrupt"):
+        read_rows(store, manifest)
+
+
+@pytest.mark.unit
+def test_prune_keeps_blocks_of_remaining_snapshots(store):
+    """Test that old snapshots are deleted together with the blocks only they used"""
+    for day in range(1, 5):
+        created = datetime.datetime(2024, 5, day)
+        store.write_snapshot('Weekly Spending', 'sheet-id', [HEADERS] + make_rows(day * 1000, 200), created)
+        store.write_snapshot('Master Budget', 'sheet-id', [HEADERS] + make_rows(0, 50), created)
+
+    manifests_deleted, blocks_deleted = store.prune(keep=2)
+
+    assert manifests_deleted == 4 and blocks_deleted > 0
+    remaining = store.list_manifests()
+    assert [(sheet_name, created.day) for sheet_name, created, _ in remaining] == [
+        ('Master Budget', 3), ('Weekly Spending', 3), ('Master Budget', 4), ('Weekly Spending', 4)
+    ]
+    for _, _, manifest_path in remaining:
+        manifest = store.load_manifest(manifest_path)
+        assert len(read_rows(store, manifest)) == manifest['row_count']
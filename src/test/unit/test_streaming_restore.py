@@ -0,0 +1,167 @@
+"""
+Unit tests for the streaming, resumable restore of Google Sheets backups.
+Tests that JSON backups and snapshots are written in chunks within the request payload
+limit, that an interrupted restore resumes after the last verified chunk, and that rows
+the sheet did not store as backed up are detected.
+"""
+
+import re  # standard library
+import json  # standard library
+import os  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.scripts.disaster_recovery import restore_from_backup  # Internal imports
+from src.scripts.disaster_recovery.restore_from_backup import iter_json_array, restore_from_json_backup
+from src.scripts.maintenance.snapshot_store import SnapshotStore
+
+SPREADSHEET_ID = 'test-spreadsheet-id'
+SHEET_NAME = 'Weekly Spending'
+HEADERS = ['Transaction Location', 'Transaction Amount', 'Transaction Time', 'Corresponding Category']
+MAX_REQUEST_BYTES = 24 * 1024
+
+
+class Request:
+    """Google API request returning a prepared response"""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def execute(self):
+        return self.handler()
+
+
+class FakeSheetsService:
+    """
+    Sheets API service holding one sheet in memory, failing writes beyond the grid like
+    the real API does
+    """
+
+    def __init__(self, row_count=1000):
+        self.row_count = row_count
+        self.rows = {}
+        self.writes = []
+        self.clears = 0
+        self.fail_after = None
+        self.transform = None
+
+    # spreadsheets() and spreadsheets().values() are both served by this object
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId):
+        properties = {'title': SHEET_NAME, 'sheetId': 0, 'gridProperties': {'rowCount': self.row_count}}
+        return Request(lambda: {'sheets': [{'properties': properties}]})
+
+    def clear(self, spreadsheetId, range, body):
+        def handler():
+            self.clears += 1
+            self.rows.clear()
+            return {}
+        return Request(handler)
+
+    def batchUpdate(self, spreadsheetId, body):
+        if 'requests' in body:
+            def resize():
+                self.row_count += body['requests'][0]['appendDimension']['length']
+                return {}
+            return Request(resize)
+        return Request(lambda: self._write(body))
+
+    def _write(self, body):
+        if self.fail_after is not None and len(self.writes) >= self.fail_after:
+            raise ConnectionError("Connection reset by peer")
+
+        responses = []
+        for data in body['data']:
+            first_row = int(re.search(r'!A(\d+)$', data['range']).group(1))
+            if first_row + len(data['values']) - 1 > self.row_count:
+                raise ValueError(f"Range {data['range']} exceeds grid limits")
+            self.writes.append((first_row, len(json.dumps(body))))
+            stored = [self.transform(row) if self.transform else row for row in data['values']]
+            for offset, row in enumerate(stored):
+                self.rows[first_row + offset] = row
+            responses.append({'updatedData': {'values': stored}})
+        return {'responses': responses}
+
+    def sheet_values(self):
+        return [self.rows[row] for row in sorted(self.rows)]
+
+
+def make_rows(count):
+    """Creates transaction rows with distinct contents"""
+    return [[f"Store {i}", f"{i % 97 + 0.99:.2f}", f"2024-05-{i % 28 + 1:02d} 12:00", "Groceries"]
+            for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def restore_settings(monkeypatch):
+    """Small requests and no retries, so restores take many chunks and fail fast"""
+    monkeypatch.setitem(restore_from_backup.RESTORE_SETTINGS, 'MAX_REQUEST_BYTES', MAX_REQUEST_BYTES)
+    monkeypatch.setitem(restore_from_backup.RESTORE_SETTINGS, 'CHUNK_ATTEMPTS', 1)
+
+
+@pytest.mark.unit
+def test_snapshot_is_restored_in_chunks(tmp_path):
+    """Test that a snapshot is written in chunks within the payload limit, growing the sheet"""
+    rows = make_rows(3000)
+    store = SnapshotStore(str(tmp_path / 'snapshots'), compression='gzip', block_rows=64)
+    manifest_path, _ = store.write_snapshot(SHEET_NAME, SPREADSHEET_ID, [HEADERS] + rows)
+    service = FakeSheetsService()
+
+    assert restore_from_json_backup(SPREADSHEET_ID, SHEET_NAME, manifest_path, service, str(tmp_path / 'progress'))
+
+    assert service.sheet_values() == [HEADERS] + rows
+    assert len(service.writes) > 5
+    assert all(size <= MAX_REQUEST_BYTES for _, size in service.writes)
+    assert service.row_count >= len(rows) + 1
+    assert os.listdir(tmp_path / 'progress') == []
+
+
+@pytest.mark.unit
+def test_interrupted_restore_resumes(tmp_path):
+    """Test that a restore failing midway continues after the last verified chunk"""
+    rows = make_rows(2000)
+    backup_file = tmp_path / f"{SHEET_NAME}_backup_20240506_120000.json"
+    backup_file.write_text(json.dumps([dict(zip(HEADERS, row)) for row in rows], indent=2))
+    progress_dir = str(tmp_path / 'progress')
+    service = FakeSheetsService()
+
+    service.fail_after = 3
+    assert not restore_from_json_backup(SPREADSHEET_ID, SHEET_NAME, str(backup_file), service, progress_dir)
+    restored_rows = len(service.rows)
+    assert 0 < restored_rows < len(rows)
+
+    service.fail_after = None
+    assert restore_from_json_backup(SPREADSHEET_ID, SHEET_NAME, str(backup_file), service, progress_dir)
+
+    assert service.sheet_values() == [HEADERS] + rows
+    assert service.clears == 1
+    assert service.writes[3][0] == restored_rows + 1
+
+
+@pytest.mark.unit
+def test_rows_not_stored_as_backed_up_are_detected(tmp_path):
+    """Test that a chunk the sheet stored differently fails the restore without recording it"""
+    backup_file = tmp_path / f"{SHEET_NAME}_backup_20240506_120000.json"
+    backup_file.write_text(json.dumps([dict(zip(HEADERS, row)) for row in make_rows(100)]))
+    progress_dir = tmp_path / 'progress'
+    service = FakeSheetsService()
+    service.transform = lambda row: [cell.upper() for cell in row]
+
+    assert not restore_from_json_backup(SPREADSHEET_ID, SHEET_NAME, str(backup_file), service, str(progress_dir))
+    assert not any(progress_dir.iterdir())
+
+
+@pytest.mark.unit
+def test_json_array_is_read_across_buffer_boundaries(tmp_path):
+    """Test that streamed records match the parsed file, whatever the buffer size"""
+    records = [{'Location': f'Café "{i}", [Main St]', 'Amount': i * 1.5, 'Notes': None} for i in range(50)]
+    backup_file = tmp_path / 'records.json'
+    backup_file.write_text(json.dumps(records, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    for buffer_size in [1, 7, 64, 1024 * 1024]:
+        assert list(iter_json_array(str(backup_file), buffer_size)) == records
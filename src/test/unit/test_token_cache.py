@@ -0,0 +1,110 @@
+"""
+Unit tests for the authentication token cache.
+Tests the encrypted token file shared across runs, single-flight authentication for
+concurrent callers and background refresh of tokens that are about to expire.
+"""
+
+import threading  # standard library
+import time  # standard library
+from unittest.mock import MagicMock  # standard library
+
+import pytest  # pytest 7.4.0+
+from cryptography.fernet import Fernet  # cryptography 41.0.0+
+
+from src.backend.services import authentication_service  # Internal imports
+from src.backend.services.authentication_service import (
+    AuthenticationService, cache_token, get_cached_token
+)
+
+TEST_TOKEN = 'capital-one-access-token'
+
+
+@pytest.fixture
+def token_cache(tmp_path, monkeypatch):
+    """Isolated token cache backed by an encrypted file in a temporary directory"""
+    path = str(tmp_path / 'tokens' / 'token_cache.bin')
+    monkeypatch.setattr(authentication_service, 'TOKEN_CACHE_SETTINGS', {
+        'BACKEND': 'file', 'PATH': path, 'KEY': Fernet.generate_key().decode(), 'REFRESH_MARGIN': 300
+    })
+    monkeypatch.setattr(authentication_service, 'TOKEN_CACHE', {})
+    monkeypatch.setattr(authentication_service, 'TOKEN_EXPIRY', {})
+    monkeypatch.setattr(authentication_service, '_token_file', None)
+    monkeypatch.setattr(authentication_service, '_token_file_loaded', False)
+    monkeypatch.setattr(authentication_service, '_refresh_threads', {})
+    monkeypatch.setattr(authentication_service, 'get_api_credentials',
+                        lambda service: {'client_id': 'client', 'client_secret': 'secret'})
+    return path
+
+
+def start_new_run(monkeypatch):
+    """Drops the in-memory cache, as a new job execution starts with an empty process"""
+    monkeypatch.setattr(authentication_service, 'TOKEN_CACHE', {})
+    monkeypatch.setattr(authentication_service, 'TOKEN_EXPIRY', {})
+    monkeypatch.setattr(authentication_service, '_token_file', None)
+    monkeypatch.setattr(authentication_service, '_token_file_loaded', False)
+
+
+def mock_token_endpoint(monkeypatch, tokens, delay=0):
+    """Replaces the OAuth token request with one returning the given tokens in order"""
+    post = MagicMock()
+
+    def respond(*args, **kwargs):
+        time.sleep(delay)
+        response = MagicMock()
+        response.json.return_value = {'access_token': tokens.pop(0), 'expires_in': 3600}
+        return response
+
+    post.side_effect = respond
+    monkeypatch.setattr(authentication_service.requests, 'post', post)
+    return post
+
+
+@pytest.mark.unit
+def test_token_survives_across_runs_encrypted(token_cache, monkeypatch):
+    """Test that a cached token is stored encrypted and reused by the next run"""
+    cache_token('CAPITAL_ONE', TEST_TOKEN, 3600)
+
+    with open(token_cache, 'rb') as f:
+        assert TEST_TOKEN.encode() not in f.read()
+
+    start_new_run(monkeypatch)
+    post = mock_token_endpoint(monkeypatch, ['new-token'])
+
+    assert AuthenticationService().authenticate_capital_one() == {'access_token': TEST_TOKEN}
+    assert not post.called
+
+
+@pytest.mark.unit
+def test_concurrent_callers_share_one_token_request(token_cache, monkeypatch):
+    """Test that callers without a cached token wait for a single OAuth request"""
+    post = mock_token_endpoint(monkeypatch, [TEST_TOKEN, 'second-token'], delay=0.1)
+    results = []
+
+    def authenticate():
+        results.append(AuthenticationService().authenticate_capital_one()['access_token'])
+
+    threads = [threading.Thread(target=authenticate) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [TEST_TOKEN] * 5
+    assert post.call_count == 1
+
+
+@pytest.mark.unit
+def test_expiring_token_is_refreshed_in_background(token_cache, monkeypatch):
+    """Test that a token close to expiry is returned at once and replaced in the background"""
+    cache_token('CAPITAL_ONE', TEST_TOKEN, 120)
+    mock_token_endpoint(monkeypatch, ['refreshed-token'], delay=0.1)
+    service = AuthenticationService()
+
+    assert service.authenticate_capital_one() == {'access_token': TEST_TOKEN}
+
+    authentication_service._refresh_threads['CAPITAL_ONE'].join(5)
+    assert get_cached_token('CAPITAL_ONE') == 'refreshed-token'
+    assert service.refresh_in_background('CAPITAL_ONE') is None
+
+    start_new_run(monkeypatch)
+    assert get_cached_token('CAPITAL_ONE') == 'refreshed-token'
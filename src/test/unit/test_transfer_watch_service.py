@@ -0,0 +1,142 @@
+"""
+Unit tests for background verification of savings transfers.
+Tests status resolution, polling until a transfer is final, persistence of transfers
+that are still pending and resuming their verification in a later run.
+"""
+
+import threading  # standard library
+from decimal import Decimal  # standard library
+from unittest.mock import MagicMock  # standard library
+
+import pytest  # pytest 7.4.0+
+
+from src.backend.services import transfer_watch_service  # Internal imports
+from src.backend.services.transfer_watch_service import (
+    PendingTransferStore, TransferWatcher, resolve_transfer_status, resume_pending_transfers
+)
+from src.backend.models.transfer import create_transfer
+
+TEST_TRANSFER_ID = 'test_transfer_123'
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Pending transfer store in a temporary directory, with no delay between polls"""
+    monkeypatch.setitem(transfer_watch_service.TRANSFER_WATCH_SETTINGS, 'DIR', str(tmp_path))
+    monkeypatch.setitem(transfer_watch_service.TRANSFER_WATCH_SETTINGS, 'POLL_DELAY', 0)
+    return PendingTransferStore(str(tmp_path))
+
+
+def make_transfer():
+    """Creates a pending transfer"""
+    return create_transfer(Decimal('45.67'), 'checking-1', 'savings-1', transfer_id=TEST_TRANSFER_ID)
+
+
+def make_client(*statuses):
+    """Creates a Capital One client mock returning the given transfer statuses in order"""
+    client = MagicMock()
+    client.get_transfer_status.side_effect = [{'transferId': TEST_TRANSFER_ID, 'status': status} for status in statuses]
+    return client
+
+
+@pytest.mark.unit
+def test_resolve_transfer_status():
+    """Test that API statuses map to completed, failed or pending"""
+    assert resolve_transfer_status({'status': 'completed'}) == 'completed'
+    assert resolve_transfer_status({'status': 'RETURNED'}) == 'failed'
+    assert resolve_transfer_status({'status': 'processing'}) == 'pending'
+    assert resolve_transfer_status({'status': 'error', 'error_message': 'timeout'}) == 'pending'
+
+
+@pytest.mark.unit
+def test_watcher_polls_until_transfer_completes(store):
+    """Test that the transfer is updated and removed from the store once completed"""
+    transfer = make_transfer()
+    statuses = iter(['pending', 'processing', 'completed'])
+    checked = threading.Event()
+
+    def get_transfer_status(*args, **kwargs):
+        # Hold the polls until the store has been checked, so the transfer is not removed yet
+        checked.wait(timeout=10)
+        return {'transferId': TEST_TRANSFER_ID, 'status': next(statuses)}
+
+    client = MagicMock()
+    client.get_transfer_status.side_effect = get_transfer_status
+
+    watcher = TransferWatcher(client, [transfer], store=store, delay=0).start()
+    assert store.load()[0].transfer_id == TEST_TRANSFER_ID
+    checked.set()
+    watcher.wait(timeout=10)
+
+    assert transfer.is_completed()
+    assert client.get_transfer_status.call_count == 3
+    assert store.load() == []
+
+
+@pytest.mark.unit
+def test_pending_transfer_is_resumed_by_a_later_run(store):
+    """Test that a transfer still pending at the deadline is finished by the next run"""
+    transfer = make_transfer()
+    TransferWatcher(make_client('pending'), [transfer], store=store, deadline=0, delay=0).start().wait(timeout=10)
+
+    assert transfer.is_pending()
+    assert [t.transfer_id for t in store.load()] == [TEST_TRANSFER_ID]
+
+    watcher = resume_pending_transfers(make_client('failed'), store=store)
+    resumed = watcher.wait(timeout=10)
+
+    assert [t.status for t in resumed] == ['failed']
+    assert resumed[0].amount == Decimal('45.67')
+    assert store.load() == []
+    assert resume_pending_transfers(make_client(), store=store) is None
+
+
+@pytest.mark.unit
+def test_savings_automator_watches_pending_transfer(store):
+    """Test that a transfer not yet completed is verified in the background, not marked failed"""
+    from src.backend.components.savings_automator import SavingsAutomator
+
+    client = make_client('completed')
+    client.verify_transfer_completion.return_value = False
+    automator = SavingsAutomator(capital_one_client=client, auth_service=MagicMock())
+    automator.transfer = make_transfer()
+
+    assert automator.verify_transfer(TEST_TRANSFER_ID) is False
+    assert automator.transfer.status in ('pending', 'completed')
+
+    automator.transfer_watcher.wait(timeout=10)
+    assert automator.transfer.is_completed()
+
+
+@pytest.mark.unit
+def test_stores_on_the_same_file_do_not_lose_updates(store, tmp_path):
+    """Test that transfers added concurrently through separate stores are all persisted"""
+    def add(index):
+        transfer = create_transfer(Decimal('1.00'), 'checking-1', 'savings-1', transfer_id=f'transfer_{index}')
+        PendingTransferStore(str(tmp_path)).add(transfer)
+
+    threads = [threading.Thread(target=add, args=(index,)) for index in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.load()) == 20
+    assert [path.name for path in tmp_path.iterdir()] == ['pending_transfers.json']
+
+
+@pytest.mark.unit
+def test_store_write_failure_does_not_stop_watcher(store, monkeypatch):
+    """Test that a transfer is still resolved when the store cannot be updated"""
+    transfer = make_transfer()
+    client = make_client('completed')
+    watcher = TransferWatcher(client, [transfer], store=store, delay=0)
+
+    def fail_write(records):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(store, '_write', fail_write)
+    watcher.start().wait(timeout=10)
+
+    assert transfer.is_completed()
+    assert watcher.is_done()